@@ -1,6 +1,7 @@
 """
 Add images to a listing via eBay API.
 """
+import os
 import sys
 from ebay_api_client import eBayAPIClient
 from config import Config
@@ -20,6 +21,19 @@ def add_images_to_listing(sku: str, image_urls: list):
     print(f"Images: {len(image_urls)}")
     print()
     
+    # Local files are hosted on eBay first (already-uploaded photos are reused)
+    local_paths = [img for img in image_urls if os.path.isfile(img)]
+    if local_paths:
+        from ebay_media import eBayMediaUploader
+        uploads = eBayMediaUploader(token=client.token).upload_images(local_paths)
+        failed = [path for path, result in uploads.items() if not result.get('success')]
+        for path in failed:
+            print(f"[ERROR] Could not upload {path}: {uploads[path].get('error')}")
+        if failed:
+            return
+        image_urls = [uploads[img]['url'] if img in uploads else img for img in image_urls]
+        print()
+    
     # Get the offer
     offer_result = client.get_offer_by_sku(sku)
     if not offer_result.get('success') or not offer_result.get('offer'):
@@ -93,10 +107,11 @@ def add_images_to_listing(sku: str, image_urls: list):
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: python add_images_to_listing.py <SKU> <image_url1> [image_url2] ...")
+        print("Usage: python add_images_to_listing.py <SKU> <image_url_or_file1> [image_url_or_file2] ...")
         print()
         print("Example:")
         print("  python add_images_to_listing.py CARD_BECKETT_COM_NEWS_202_TIM_HARDAWAY_JR_7_2 https://example.com/image1.jpg https://example.com/image2.jpg")
+        print("  python add_images_to_listing.py CARD_BECKETT_COM_NEWS_202_TIM_HARDAWAY_JR_7_2 \"Pictures/red brady.jpg\"")
         sys.exit(1)
     
     sku = sys.argv[1]
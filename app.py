@@ -1,10 +1,13 @@
 """eBay Card Listing Tool - Main Application
 Multi-user support with PayPal subscription
 """
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, send_from_directory
-from ebay_api_client import eBayAPIClient
-from ebay_listing import eBayListingManager
-from card_checklist import CardChecklistFetcher
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, send_from_directory, Response, stream_with_context
+from identifiers import sort_cards
+from card_record import CardRecord
+from parallel_variations import iter_variations, count_variations, variation_sku
+import web_assets
+from checklist_catalog import get_catalog
+from checklist_warmer import start_background_warmer
 import sys
 import time
 import uuid
@@ -81,12 +84,27 @@ def after_request(response):
     try:
         # Add CORS headers if needed
         response.headers['X-Request-ID'] = getattr(request, 'request_id', 'unknown')
+        
+        # Static files: fingerprinted URLs (?v=<hash>) are cached for a year
+        cache_key = None
+        if request.endpoint == 'static' and request.view_args:
+            cache_key = web_assets.static_cache_headers(
+                response, app.static_folder, request.view_args.get('filename', ''), request.args.get('v')
+            )
+        
+        # gzip/Brotli for JSON, HTML, CSS and JS (streamed JSON included)
+        web_assets.compress_response(response, request.headers.get('Accept-Encoding', ''), cache_key=cache_key)
         # Prevent crashes from response errors
         return response
     except Exception as e:
         print(f"[WARNING] Error in after_request: {e}")
         return response
 
+
+def static_asset(filename):
+    """Fingerprinted /static URL (e.g. /static/js/app.js?v=<hash>)."""
+    return web_assets.asset_url(app.static_url_path, app.static_folder, filename)
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -591,15 +609,17 @@ def app_page():
         if not email:
             return redirect('/login')
         
-        # Owner always has access
-        if email.lower() == OWNER_EMAIL.lower():
-            return render_template('app.html', email=email)
-        
-        # Check subscription for other users
-        if not is_subscribed(email):
+        # Check subscription for other users (owner always has access)
+        if email.lower() != OWNER_EMAIL.lower() and not is_subscribed(email):
             return redirect('/subscribe')
         
-        return render_template('app.html', email=email)
+        # Page HTML is cached per user; CSS/JS are separate fingerprinted files
+        return web_assets.render_cached(
+            app, 'app.html',
+            email=email,
+            css_url=static_asset('css/app.css'),
+            js_url=static_asset('js/app.js')
+        )
     except Exception as e:
         print(f"[ERROR] Error in app_page: {e}")
         import traceback
@@ -638,6 +658,7 @@ def _get_effective_token():
 def get_policies():
     """Get eBay policies (payment, shipping, return)."""
     try:
+        from ebay_api_client import eBayAPIClient
         token = _get_effective_token()
         client = eBayAPIClient(token_override=token)
         client._update_headers()
@@ -729,6 +750,26 @@ def get_policies():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def _stream_json(payload, array_key, items, batch_size=500):
+    """
+    Stream `payload` as one JSON object whose `array_key` is filled from the
+    `items` iterator, so large arrays are never built in memory.
+    """
+    head = json.dumps({k: v for k, v in payload.items() if k != array_key})
+    yield (head[:-1] + ', ' if len(head) > 2 else '{') + json.dumps(array_key) + ': ['
+    batch = []
+    first = True
+    for item in items:
+        batch.append(json.dumps(item))
+        if len(batch) >= batch_size:
+            yield ('' if first else ', ') + ', '.join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield ('' if first else ', ') + ', '.join(batch)
+    yield ']}'
+
+
 @app.route('/api/fetch-checklist', methods=['POST'])
 @require_subscription
 def fetch_checklist():
@@ -746,6 +787,9 @@ def fetch_checklist():
     checklist_type = data.get('type', 'base')
     default_price = float(data.get('defaultPrice', 1.00))
     default_qty = int(data.get('defaultQty', 0))
+    # Parallels/#'ed: stream every card x parallel variation instead of base cards
+    expand_parallels = bool(data.get('expandParallels', False))
+    parallel_filter = data.get('parallels') or None
     
     if not url:
         return jsonify({"error": "URL is required"}), 400
@@ -760,6 +804,7 @@ def fetch_checklist():
         print(f"[APP] Fetching checklist - type: '{checklist_type}', URL: {url}")
         print(f"[APP] ========================================")
         
+        from card_checklist import CardChecklistFetcher
         fetcher = CardChecklistFetcher(source='beckett')
         print(f"[APP] ========================================")
         print(f"[APP] ABOUT TO CALL PARSER")
@@ -774,7 +819,7 @@ def fetch_checklist():
         print(f"[APP] ========================================")
         sys.stdout.flush()
         
-        result = fetcher.fetch_from_beckett_url(url, checklist_type=checklist_type)
+        result = fetcher.fetch_from_beckett_url(url, checklist_type=checklist_type, refresh=bool(data.get('refresh', False)))
         
         print(f"[APP] ========================================")
         print(f"[APP] PARSER RETURNED!")
@@ -838,65 +883,7 @@ def fetch_checklist():
         
         # Sort cards - for inserts, sort by prefix first, then number
         # For other types, sort by number first
-        def sort_card_key(card):
-            num = str(card.get('number', ''))
-            if not num:
-                return (999, '', '')
-            # Extract numeric part for sorting
-            try:
-                if '-' in num:
-                    # Prefixed format: "BD-1", "FD-1", "A-1", etc.
-                    parts = num.split('-', 1)
-                    prefix = parts[0] if len(parts) > 1 else ''
-                    num_part = parts[-1] if len(parts) > 1 else parts[0]
-                    
-                    # For inserts, sort by prefix order first, then number
-                    if checklist_type == 'inserts':
-                        # Define prefix order: FD-, PP-, A-, BIA-, BDN-, BS-, C-, 79D-
-                        prefix_order = {
-                            'FD': 1,   # Final Draft
-                            'PP': 2,   # Prized Prospects
-                            'A': 3,    # Axis
-                            'BIA': 4,  # Bowman In Action
-                            'BDN': 5,  # Bowman Draft Night
-                            'BS': 6,   # Bowman Spotlights
-                            'C': 7,    # Crystallized
-                            '79D': 8,  # Dream Draft Pick
-                        }
-                        prefix_ord = prefix_order.get(prefix, 999)
-                        # Extract numeric part (handle cases like "79D-DM")
-                        import re
-                        num_match = re.search(r'\d+', num_part)
-                        if num_match:
-                            num_val = int(num_match.group())
-                        else:
-                            num_val = 0  # Special format like "79D-DM"
-                        # Return tuple: (prefix_order, number)
-                        sort_key = (prefix_ord, num_val)
-                        if len(cards) <= 10:  # Debug for small sets
-                            print(f"[APP] [SORT] Card {num}: prefix='{prefix}', prefix_ord={prefix_ord}, num_val={num_val}, sort_key={sort_key}")
-                        return sort_key
-                    elif checklist_type == 'autographs':
-                        # For autographs, sort alphabetically by the full card number
-                        # Examples: CPA-AE, DPPBA-EW, BIA-BC - sort alphabetically
-                        return (0, num)  # Use 0 as first sort key, then alphabetical
-                    else:
-                        # For base cards with prefixes (BD-1, BDC-1), sort by number first, then prefix
-                        return (int(num_part), prefix, num)
-                elif num.isdigit():
-                    # Plain number format: "1", "2", etc.
-                    return (int(num), '', num)
-                else:
-                    # Try to extract first number
-                    import re
-                    match = re.search(r'\d+', num)
-                    if match:
-                        return (int(match.group()), '', num)
-                    return (999, '', num)
-            except:
-                return (999, '', num)
-        
-        cards = sorted(cards, key=sort_card_key)
+        cards = sort_cards(cards, checklist_type)
         
         print(f"[APP] ========================================")
         print(f"[APP] STEP 3: After sorting")
@@ -918,26 +905,21 @@ def fetch_checklist():
         print(f"[APP] ========================================")
         
         for i, card in enumerate(cards):
-            card_data = {
-                "number": str(card.get('number', '')),
-                "name": card.get('name', ''),
-                "team": card.get('team', ''),
-                "price": default_price,
-                "quantity": default_qty,  # Set to 0 by default
-                "imageUrl": card.get('image_url', '')
-            }
+            record = CardRecord.from_dict(card)
+            card_data = record.to_api()
+            card_data["price"] = default_price
+            card_data["quantity"] = default_qty  # Set to 0 by default
             
             # For parallels/#'ed, include parallel type info
             if checklist_type in ['parallels', 'numbered']:
-                # Collect parallel types from cards (they all have the same list)
+                # Collect parallel types from cards (they all share one interned tuple)
                 # Only update if we haven't collected them yet
-                if not parallel_types and card.get('parallel_types'):
-                    parallel_types = card.get('parallel_types', [])
+                if not parallel_types and record.parallel_types:
+                    parallel_types = list(record.parallel_types)
                     print(f"[APP] Collected {len(parallel_types)} parallel types from cards")
-                if card.get('parallel_type'):
-                    card_data['parallelType'] = card.get('parallel_type', '')
-                if card.get('numbering'):
-                    card_data['numbering'] = card.get('numbering', '')
+            else:
+                card_data.pop('parallelType', None)
+                card_data.pop('numbering', None)
             
             formatted_cards.append(card_data)
             
@@ -988,7 +970,8 @@ def fetch_checklist():
             "count": formatted_count,
             "setName": set_name,
             "source": "beckett" if 'beckett.com' in url else ("cardsmiths" if 'cardsmithsbreaks.com' in url else "universal"),
-            "checklistType": checklist_type
+            "checklistType": checklist_type,
+            "fromCatalog": fetcher.last_from_catalog
         }
         
         # For parallels/#'ed, include the list of available parallel types
@@ -1056,6 +1039,23 @@ def fetch_checklist():
         print(f"[APP] Success in response: {response_data.get('success')}")
         print(f"[APP] ========================================")
         
+        if expand_parallels and checklist_type in ['parallels', 'numbered']:
+            # Variations are generated lazily and streamed - never held as one list
+            response_data['baseCount'] = formatted_count
+            response_data['count'] = count_variations(cards, parallel_types or None, parallel_filter)
+            response_data['expanded'] = True
+            
+            def variation_cards():
+                for variation in iter_variations(cards, parallel_types or None, parallel_filter, set_name=set_name):
+                    card_data = variation.to_api()
+                    card_data['price'] = default_price
+                    card_data['quantity'] = default_qty
+                    card_data['sku'] = variation_sku(variation)
+                    yield card_data
+            
+            print(f"[APP] Streaming {response_data['count']} parallel variations ({formatted_count} base cards)")
+            return Response(stream_with_context(_stream_json(response_data, 'cards', variation_cards())), mimetype='application/json')
+        
         return jsonify(response_data)
     except Exception as e:
         print(f"[APP] ========================================")
@@ -1077,6 +1077,27 @@ def fetch_checklist():
             "server_version": VERSION
         }), 500
 
+@app.route('/api/search-checklists', methods=['GET'])
+@require_subscription
+def search_checklists():
+    """Search every cataloged checklist by set name, player, team or card number (offline)."""
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+    catalog = get_catalog()
+    if catalog is None:
+        return jsonify({"error": "Checklist catalog is disabled (CHECKLIST_CATALOG_FILE=off)"}), 404
+    if not query:
+        return jsonify({"success": True, "sets": catalog.sets()[:limit], "cards": []})
+    started = time.perf_counter()
+    results = catalog.search(query, limit=limit)
+    return jsonify({
+        "success": True,
+        "query": query,
+        "sets": results['sets'],
+        "cards": results['cards'],
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 2)
+    })
+
 @app.route('/api/list', methods=['POST'])
 @require_subscription
 def create_listing():
@@ -1125,18 +1146,23 @@ def create_listing():
         listing_cards = []
         prices = {}
         for card in valid_cards:
-            card_data = {
-                'name': card.get('name', ''),
-                'number': str(card.get('number', '')),
-                'quantity': int(card.get('quantity', 1)),
-                'team': card.get('team', ''),
-                'image_url': card.get('imageUrl', image_url)
-            }
+            card_data = CardRecord(
+                name=card.get('name', ''),
+                number=str(card.get('number', '')),
+                quantity=int(card.get('quantity', 1)),
+                team=card.get('team', ''),
+                image_url=card.get('imageUrl', image_url),
+                parallel_type=card.get('parallelType') or None,
+                numbering=card.get('numbering') or None,
+                # Same set and SKU as /api/fetch-checklist streamed for this card
+                set_name=card.get('setName') or set_name,
+                extra={'sku': card['sku']} if card.get('sku') else None
+            )
             listing_cards.append(card_data)
             price = float(card.get('price', 1.00))
             # Use card name as key for pricing
-            if card_data['name']:
-                prices[card_data['name']] = price
+            if card_data.name:
+                prices[card_data.name] = price
         
         # Use base price if all cards have same price, otherwise use dict
         if len(set(prices.values())) == 1:
@@ -1145,6 +1171,7 @@ def create_listing():
             base_price = prices
         
         # Create listing manager with current user's token
+        from ebay_listing import eBayListingManager
         token = _get_effective_token()
         listing_manager = eBayListingManager(token_override=token)
         
@@ -1281,6 +1308,7 @@ def create_listing():
                 "sellerHubScheduled": result.get('seller_hub_scheduled', f"{base_url}/sh/lst/scheduled"),
                 "message": result.get('message', 'Listing created successfully'),
                 "skus": result.get('skus', [])[:5],  # Include first few SKUs for reference
+                "shards": result.get('shards'),  # Per-listing results when the set was split
                 # Add listing status information if available
                 "listingStatus": result.get('listingStatus'),
                 "sellerHubLocation": result.get('sellerHubLocation'),
@@ -1762,6 +1790,7 @@ def verify_draft():
         return jsonify({"error": "Group key required"}), 400
     
     try:
+        from ebay_api_client import eBayAPIClient
         token = _get_effective_token()
         client = eBayAPIClient(token_override=token)
         client._update_headers()
@@ -1828,6 +1857,9 @@ def verify_draft():
 # MAIN
 # =============================================================================
 
+# Warm popular checklists into the catalog in the background (never blocks startup)
+checklist_warmer = start_background_warmer()
+
 if __name__ == '__main__':
     # Auto-kill old Python processes to ensure fresh start
     import subprocess
@@ -0,0 +1,99 @@
+"""
+Microbenchmark: SKU, group key and sort key generation for 10k-card inputs.
+
+Compares the old per-card chained str.replace / inline re.sub code with the
+precompiled fast path in identifiers.py.
+
+Usage: python bench_identifiers.py [card_count]
+"""
+import re
+import sys
+import time
+from identifiers import generate_skus, make_group_key, sort_cards
+
+
+def legacy_skus(cards):
+    """SKU generation as previously inlined in _create_listing_via_inventory_api."""
+    skus = []
+    for idx, card in enumerate(cards):
+        card_name = card.get('name', 'Unknown')
+        card_number = str(card.get('number', idx))
+        card_name_clean = card_name.replace(' ', '_').replace("'", '').replace('-', '_').replace('.', '').upper()[:20]
+        set_name_clean = card.get('set_name', 'SET').replace('https://', '').replace('http://', '').replace('www.', '').replace('/', '_').replace(':', '_').replace('.', '_').upper()[:20]
+        sku = f"CARD_{set_name_clean}_{card_name_clean}_{card_number}_{idx}".replace(' ', '_').replace('-', '_')
+        import re
+        sku = re.sub(r'[^A-Z0-9_]', '', sku)[:50]
+        skus.append(sku)
+    return skus
+
+
+def legacy_group_key(set_name):
+    set_name_clean = re.sub(r'[^a-zA-Z0-9]', '', set_name.replace('https://', '').replace('http://', '').replace('www.', '').upper())[:20] or "CARDSET"
+    return re.sub(r'[^A-Z0-9]', '', f"GROUP{set_name_clean}{int(time.time())}".upper())[:50]
+
+
+def legacy_sort_key(card, checklist_type):
+    num = str(card.get('number', ''))
+    if not num:
+        return (999, '', '')
+    try:
+        if '-' in num:
+            parts = num.split('-', 1)
+            if checklist_type == 'inserts':
+                prefix_order = {'FD': 1, 'PP': 2, 'A': 3, 'BIA': 4, 'BDN': 5, 'BS': 6, 'C': 7, '79D': 8}
+                import re
+                num_match = re.search(r'\d+', parts[1])
+                return (prefix_order.get(parts[0], 999), int(num_match.group()) if num_match else 0)
+            return (int(parts[1]), parts[0], num)
+        elif num.isdigit():
+            return (int(num), '', num)
+        import re
+        match = re.search(r'\d+', num)
+        return (int(match.group()), '', num) if match else (999, '', num)
+    except:
+        return (999, '', num)
+
+
+def timed(label, func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<34} {best * 1000:8.2f} ms")
+    return best
+
+
+def main(count=10000):
+    set_url = "https://www.beckett.com/news/2025-26-topps-chrome-basketball-checklist/"
+    cards = [
+        {"name": f"Player O'Name-{i % 900} Jr.", "number": f"BD-{i}" if i % 3 else str(i), "set_name": set_url}
+        for i in range(count)
+    ]
+    insert_cards = [{"number": f"{('FD', 'PP', 'A', 'BIA', '79D')[i % 5]}-{i}"} for i in range(count)]
+
+    print(f"Benchmarking {count} cards (best of 5)")
+    print()
+    print("SKU generation:")
+    old = timed("legacy chained replace + re.sub", lambda: legacy_skus(cards))
+    new = timed("identifiers.generate_skus", lambda: generate_skus(cards, namespace="2025-26 Topps Chrome"))
+    print(f"  speedup: {old / new:.1f}x")
+    print()
+    print(f"Group keys ({count}):")
+    old = timed("legacy", lambda: [legacy_group_key(set_url) for _ in range(count)])
+    new = timed("identifiers.make_group_key", lambda: [make_group_key(set_url, str(int(time.time()))) for _ in range(count)])
+    print(f"  speedup: {old / new:.1f}x")
+    print()
+    print("Insert checklist sort:")
+    old = timed("legacy sort_card_key", lambda: sorted(insert_cards, key=lambda c: legacy_sort_key(c, 'inserts')))
+    new = timed("identifiers.sort_cards", lambda: sort_cards(insert_cards, 'inserts'))
+    print(f"  speedup: {old / new:.1f}x")
+
+    skus = generate_skus(cards, namespace="2025-26 Topps Chrome")
+    legacy = legacy_skus(cards)
+    print()
+    print(f"Unique SKUs: new {len(set(skus))}/{count}, legacy {len(set(legacy))}/{count}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
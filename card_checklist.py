@@ -3,16 +3,55 @@ import requests
 import csv
 import os
 import re
+import time
+import traceback
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from config import Config
+import http_session
+from card_record import intern_parallel_types
+from checklist_catalog import ChecklistCatalog, get_catalog
+
+# CSV card field -> accepted (normalized) column names, in priority order
+CSV_COLUMN_ALIASES = {
+    'name': ('name', 'card_name'),
+    'number': ('number', 'card_number', 'collector_number'),
+    'set_name': ('set_name', 'set'),
+    'rarity': ('rarity',),
+    'image_url': ('image_url', 'image'),
+    'price': ('price',),
+    'quantity': ('quantity',),
+    'condition': ('condition',),
+    'weight': ('weight',),
+}
+
+
+def _parse_price(value: str) -> float:
+    return float(value.replace('$', '').replace(',', ''))
+
+
+# CSV card field -> (converter, default when the cell is empty); None = keep the string
+CSV_FIELD_CONVERTERS = {
+    'name': (None, ''),
+    'number': (None, ''),
+    'set_name': (None, ''),
+    'rarity': (None, ''),
+    'image_url': (None, ''),
+    'price': (_parse_price, None),
+    'quantity': (int, 1),
+    'condition': (None, ''),
+    'weight': (float, 0.1),
+}
 
 class CardChecklistFetcher:
     """Fetches card checklists from various sources."""
     
-    def __init__(self, source: Optional[str] = None):
+    def __init__(self, source: Optional[str] = None, catalog: Optional[ChecklistCatalog] = None):
         self.config = Config()
         self.source = source or self.config.CARD_DATA_SOURCE
+        self.last_csv_errors = []
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.last_from_catalog = False
     
     def get_set_checklist(self, set_name: str = None, csv_file: str = None) -> List[Dict]:
         """
@@ -55,7 +94,7 @@ class CardChecklistFetcher:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = http_session.get(url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -88,7 +127,7 @@ class CardChecklistFetcher:
             "client_secret": ""  # TCGPlayer uses client_id as secret for some endpoints
         }
         
-        response = requests.post(url, headers=headers, json=data)
+        response = http_session.post(url, headers=headers, json=data)
         response.raise_for_status()
         return response.json().get('access_token', '')
     
@@ -107,7 +146,7 @@ class CardChecklistFetcher:
             has_more = True
             
             while has_more:
-                response = requests.get(url, params=params)
+                response = http_session.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -134,53 +173,103 @@ class CardChecklistFetcher:
             return []
     
     def _fetch_from_csv(self, csv_file: str) -> List[Dict]:
-        """Fetch checklist from CSV file."""
+        """Fetch checklist from CSV file (invalid rows are skipped and reported)."""
+        errors = []
+        cards = list(self.iter_csv_cards(csv_file, errors=errors))
+        self.last_csv_errors = errors
+        for error in errors[:20]:
+            print(f"[WARNING] {csv_file} line {error['line']}: {error['error']}")
+        if len(errors) > 20:
+            print(f"[WARNING] ... and {len(errors) - 20} more invalid rows")
+        print(f"Loaded {len(cards)} cards from CSV file: {csv_file}")
+        return cards
+    
+    def iter_csv_cards(self, csv_file: str, errors: Optional[List[Dict]] = None) -> Iterator[Dict]:
+        """
+        Stream cards from a CSV file one row at a time.
+        
+        The header is normalized once (case-insensitive, spaces -> underscores) and
+        each card field is read through a precomputed column index. Rows that fail
+        validation are skipped; if `errors` is given, each failure is appended as
+        {'line', 'column', 'value', 'error'}.
+        """
         if not os.path.exists(csv_file):
             raise FileNotFoundError(f"CSV file not found: {csv_file}")
         
-        cards = []
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                # Try to detect delimiter
-                sample = f.read(1024)
-                f.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
+        with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+            # Try to detect delimiter
+            sample = f.read(1024)
+            f.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample).delimiter
+            except csv.Error:
+                delimiter = ','
+            
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if not header:
+                return
+            columns = [name.strip().lower().replace(' ', '_') for name in header]
+            
+            # Card field -> column index (first matching alias wins)
+            field_index = {}
+            for field, aliases in CSV_COLUMN_ALIASES.items():
+                for alias in aliases:
+                    if alias in columns:
+                        field_index[field] = columns.index(alias)
+                        break
+            known_columns = {alias for aliases in CSV_COLUMN_ALIASES.values() for alias in aliases}
+            extra_index = [(name, i) for i, name in enumerate(columns) if name and name not in known_columns]
+            width = len(columns)
+            
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                if len(row) < width:
+                    row = row + [''] * (width - len(row))
                 
-                reader = csv.DictReader(f, delimiter=delimiter)
+                card = {}
+                row_error = None
+                for field, i in field_index.items():
+                    value = row[i].strip()
+                    converter, default = CSV_FIELD_CONVERTERS.get(field, (None, ''))
+                    if not value:
+                        card[field] = default
+                        continue
+                    if converter is None:
+                        card[field] = value
+                        continue
+                    try:
+                        card[field] = converter(value)
+                    except ValueError:
+                        row_error = {"line": reader.line_num, "column": header[i], "value": value,
+                                     "error": f"Invalid {field} '{value}' in column '{header[i]}'"}
+                        break
                 
-                for row in reader:
-                    # Normalize column names (case-insensitive, handle spaces)
-                    normalized_row = {k.strip().lower().replace(' ', '_'): v for k, v in row.items()}
-                    
-                    card = {
-                        'name': normalized_row.get('name') or normalized_row.get('card_name') or '',
-                        'number': normalized_row.get('number') or normalized_row.get('card_number') or normalized_row.get('collector_number') or '',
-                        'set_name': normalized_row.get('set_name') or normalized_row.get('set') or '',
-                        'rarity': normalized_row.get('rarity') or '',
-                        'image_url': normalized_row.get('image_url') or normalized_row.get('image') or '',
-                        'price': float(normalized_row.get('price', 0)) if normalized_row.get('price') else None,
-                        'quantity': int(normalized_row.get('quantity', 1)) if normalized_row.get('quantity') else 1,
-                        'condition': normalized_row.get('condition') or '',
-                        'weight': float(normalized_row.get('weight', 0.1)) if normalized_row.get('weight') else 0.1
-                    }
-                    
-                    # Add any additional fields
-                    for key, value in normalized_row.items():
-                        if key not in ['name', 'card_name', 'number', 'card_number', 'collector_number',
-                                      'set_name', 'set', 'rarity', 'image_url', 'image', 'price',
-                                      'quantity', 'condition', 'weight']:
-                            card[key] = value
-                    
-                    if card['name']:  # Only add if name exists
-                        cards.append(card)
-            
-            print(f"Loaded {len(cards)} cards from CSV file: {csv_file}")
-            return cards
-            
-        except Exception as e:
-            print(f"Error reading CSV file: {e}")
-            raise
+                if row_error is None and not card.get('name'):
+                    row_error = {"line": reader.line_num, "column": "name", "value": "", "error": "Missing card name"}
+                if row_error is not None:
+                    if errors is not None:
+                        errors.append(row_error)
+                    continue
+                
+                for field, (converter, default) in CSV_FIELD_CONVERTERS.items():
+                    card.setdefault(field, default)
+                # Add any additional fields
+                for name, i in extra_index:
+                    card[name] = row[i] if i < len(row) else ''
+                yield card
+    
+    def iter_csv_chunks(self, csv_file: str, chunk_size: int = 250, errors: Optional[List[Dict]] = None) -> Iterator[List[Dict]]:
+        """Stream a CSV file as lists of at most `chunk_size` cards."""
+        chunk = []
+        for card in self.iter_csv_cards(csv_file, errors=errors):
+            chunk.append(card)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
     
     def _fetch_from_beckett(self, set_name_or_url: str) -> List[Dict]:
         """Fetch checklist from Beckett.com - ONLY base set cards with numbers."""
@@ -198,11 +287,10 @@ class CardChecklistFetcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             # Increase timeout for slow connections
-            import time
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(url, headers=headers, timeout=60)  # Increased to 60 seconds
+                    response = http_session.get_page(url, headers=headers, timeout=60)  # Increased to 60 seconds
                     response.raise_for_status()
                     break
                 except requests.exceptions.Timeout:
@@ -350,7 +438,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"Error fetching from Beckett: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -459,7 +546,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"[DEBUG] Error extracting description: {e}")
-            import traceback
             traceback.print_exc()
         
         # Fallback: create a basic description with title if we found one
@@ -478,11 +564,14 @@ class CardChecklistFetcher:
 <p>All cards are in Near Mint or better condition.</p>
 <p>Ships in penny sleeve + top loader via PWE with eBay tracking.</p>"""
     
-    def fetch_from_beckett_url(self, url: str, checklist_type: str = 'base') -> tuple[List[Dict], str]:
+    def fetch_from_beckett_url(self, url: str, checklist_type: str = 'base', refresh: bool = False) -> tuple[List[Dict], str]:
         """
         Fetch checklist directly from a Beckett URL or Cardsmiths Breaks.
         Automatically detects the source and uses the appropriate parser.
         
+        Checklists already in the local catalog are returned without any
+        network request; freshly parsed ones are added to it.
+        
         Args:
             url: Beckett or Cardsmiths checklist URL
             checklist_type: Type of checklist to fetch
@@ -491,10 +580,40 @@ class CardChecklistFetcher:
                 - 'parallels': Parallel cards only
                 - 'autographs': Autograph cards only
                 - 'numbered': Numbered cards only
+            refresh: Ignore the catalog and re-parse the page
         
         Returns:
             Tuple of (list of cards, description string)
         """
+        self.last_from_catalog = False
+        if self.catalog is None:
+            return self._fetch_checklist_from_url(url, checklist_type)
+        
+        if not refresh:
+            cached = self.catalog.get(url, checklist_type)
+            if cached and cached[0]:
+                print(f"[CATALOG] {checklist_type} checklist served from catalog: {url} ({len(cached[0])} cards)")
+                self.last_from_catalog = True
+                return cached
+        
+        # One download/parse per checklist at a time (user requests + warmer)
+        with self.catalog.fetch_lock(url, checklist_type):
+            if not refresh:
+                cached = self.catalog.get(url, checklist_type)
+                if cached and cached[0]:
+                    print(f"[CATALOG] {checklist_type} checklist parsed by a concurrent request: {url}")
+                    self.last_from_catalog = True
+                    return cached
+            cards, description = self._fetch_checklist_from_url(url, checklist_type)
+            if cards:
+                try:
+                    self.catalog.put(url, checklist_type, cards, description)
+                except Exception as e:
+                    print(f"[WARNING] Could not add checklist to catalog: {e}")
+        return cards, description
+    
+    def _fetch_checklist_from_url(self, url: str, checklist_type: str = 'base') -> tuple[List[Dict], str]:
+        """Download and parse a checklist page (see fetch_from_beckett_url)."""
         # Detect source from URL
         is_cardsmiths = 'cardsmithsbreaks.com' in url.lower()
         is_beckett = 'beckett.com' in url.lower()
@@ -507,7 +626,7 @@ class CardChecklistFetcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             print(f"[DESC] Fetching page to extract description from: {url}")
-            response = requests.get(url, headers=headers, timeout=60)
+            response = http_session.get_page(url, headers=headers, timeout=60)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             description = self.extract_description_from_page(soup, url, checklist_type)
@@ -517,7 +636,6 @@ class CardChecklistFetcher:
                 print(f"[DESC] No description extracted, using fallback")
         except Exception as e:
             print(f"[DEBUG] Could not extract description: {e}")
-            import traceback
             traceback.print_exc()
             # Even if extraction fails, provide a basic description
             description = """<p>Select your card from the dropdown menu.</p>
@@ -756,7 +874,6 @@ class CardChecklistFetcher:
             # To: https://cardsmithsbreaks.com/full-checklist/2025-26-topps-chrome-basketball-hobby/
             
             # Try to extract the set identifier
-            import re
             # Look for patterns like "2025-26-topps-chrome-basketball"
             match = re.search(r'/([^/]+-cards?)/?$', beckett_url)
             if match:
@@ -776,12 +893,11 @@ class CardChecklistFetcher:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            import time
             if soup is None:
                 response = None
                 for attempt in range(3):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         response.raise_for_status()
                         break
                     except (requests.exceptions.Timeout, requests.exceptions.RequestException):
@@ -931,7 +1047,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"Error fetching from Cardsmiths Breaks: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -953,11 +1068,10 @@ class CardChecklistFetcher:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            import time
             response = None
             for attempt in range(5):
                 try:
-                    response = requests.get(url, headers=headers, timeout=120)
+                    response = http_session.get_page(url, headers=headers, timeout=120)
                     if response.status_code == 200:
                         break
                     elif response.status_code == 504:
@@ -1687,7 +1801,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"Error parsing sections from Beckett: {e}")
-            import traceback
             traceback.print_exc()
             return sections
     
@@ -1718,11 +1831,10 @@ class CardChecklistFetcher:
             # Fetch page if needed
             if soup is None:
                 headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                import time
                 response = None
                 for attempt in range(3):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         if response.status_code == 200:
                             break
                         time.sleep(2)
@@ -2137,7 +2249,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"[NEW PARSER] ERROR: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -2158,11 +2269,10 @@ class CardChecklistFetcher:
             # Fetch page if needed
             if soup is None:
                 headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                import time
                 response = None
                 for attempt in range(3):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         if response.status_code == 200:
                             break
                         time.sleep(2)
@@ -2366,7 +2476,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"[AUTO PARSER] Error: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -2386,11 +2495,10 @@ class CardChecklistFetcher:
             # Fetch page if needed
             if soup is None:
                 headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                import time
                 response = None
                 for attempt in range(3):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         if response.status_code == 200:
                             break
                         time.sleep(2)
@@ -2625,7 +2733,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"[INSERT PARSER] Error: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -2643,11 +2750,10 @@ class CardChecklistFetcher:
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                 }
-                import time
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         response.raise_for_status()
                         break
                     except requests.exceptions.Timeout:
@@ -2718,11 +2824,12 @@ class CardChecklistFetcher:
             # Step 4: Extract parallel types from the "Parallels" section
             print("[PARSER] Extracting parallel types from checklist...")
             parallel_types = self._extract_parallel_types(soup)
+            shared_types = intern_parallel_types(parallel_types)
             
-            # Add parallel type info to all cards
+            # Add parallel type info to all cards (one shared tuple, not a list per card)
             for card in cards:
                 if not card.get('parallel_types'):
-                    card['parallel_types'] = parallel_types  # Store all available parallel types
+                    card['parallel_types'] = shared_types  # Store all available parallel types
             
             print(f"Found {len(cards)} total cards for parallels")
             print(f"Available parallel types: {', '.join(parallel_types[:10])}..." if len(parallel_types) > 10 else f"Available parallel types: {', '.join(parallel_types)}")
@@ -2730,7 +2837,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"Error fetching parallels from Beckett: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -2824,11 +2930,10 @@ class CardChecklistFetcher:
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                 }
-                import time
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
-                        response = requests.get(url, headers=headers, timeout=60)
+                        response = http_session.get_page(url, headers=headers, timeout=60)
                         response.raise_for_status()
                         break
                     except requests.exceptions.Timeout:
@@ -2899,11 +3004,12 @@ class CardChecklistFetcher:
             # Step 4: Extract parallel types from the "Parallels" section
             print("[PARSER] Extracting parallel types from checklist...")
             parallel_types = self._extract_parallel_types(soup)
+            shared_types = intern_parallel_types(parallel_types)
             
-            # Add parallel type info to all cards
+            # Add parallel type info to all cards (one shared tuple, not a list per card)
             for card in cards:
                 if not card.get('parallel_types'):
-                    card['parallel_types'] = parallel_types  # Store all available parallel types
+                    card['parallel_types'] = shared_types  # Store all available parallel types
             
             print(f"Found {len(cards)} total cards for parallels")
             print(f"Available parallel types: {', '.join(parallel_types[:10])}..." if len(parallel_types) > 10 else f"Available parallel types: {', '.join(parallel_types)}")
@@ -2911,7 +3017,6 @@ class CardChecklistFetcher:
             
         except Exception as e:
             print(f"Error fetching parallels from Beckett: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -3012,10 +3117,19 @@ class CardChecklistFetcher:
         return []
     
     def search_set(self, query: str) -> List[Dict]:
-        """Search for sets matching a query."""
+        """
+        Search for sets matching a query.
+        
+        Searches the local checklist catalog (offline) by set name, player,
+        team and card number; a set matches if its name or any of its cards do.
+        """
+        if self.catalog is not None:
+            sets = self.catalog.search_sets(query)
+            if sets:
+                return sets
         if self.source == 'scryfall':
             url = "https://api.scryfall.com/sets"
-            response = requests.get(url)
+            response = http_session.get(url)
             response.raise_for_status()
             sets = response.json().get('data', [])
             return [s for s in sets if query.lower() in s.get('name', '').lower()]
@@ -0,0 +1,209 @@
+"""Compact card record for the checklist -> listing pipeline.
+
+Cards used to travel as loose dicts that were copied and re-keyed at every hop
+(checklist parser, /api/fetch-checklist, /api/list, eBayListingManager).
+CardRecord keeps one slotted object per card instead:
+
+- no per-instance __dict__; repeated strings (team, set, section, parallel)
+  are interned so a 10k-card checklist stores each distinct value once
+- the parallel-type list is a shared, interned tuple - every card of a
+  parallel checklist points at the same object
+- it reads like a dict (card.get('name'), card['number'], 'team' in card), so
+  the listing code consumes records without changes
+- to_dict()/to_api()/from_dict() convert to and from the snake_case and
+  camelCase (frontend) JSON shapes
+"""
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# camelCase (frontend JSON) -> attribute name
+_API_ALIASES = {
+    'imageUrl': 'image_url',
+    'image': 'image_url',
+    'parallelType': 'parallel_type',
+    'parallel': 'parallel_type',
+    'parallelTypes': 'parallel_types',
+    'setName': 'set_name',
+    'type': 'card_type',
+}
+
+_INTERNED_FIELDS = ('team', 'set_name', 'card_type', 'parallel_type', 'numbering')
+
+_parallel_types_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_parallel_types_lock = threading.Lock()
+
+
+def intern_parallel_types(parallel_types: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Return the one shared tuple for this list of parallel types."""
+    if not parallel_types:
+        return ()
+    key = tuple(sys.intern(str(p)) for p in parallel_types)
+    with _parallel_types_lock:
+        return _parallel_types_cache.setdefault(key, key)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CardRecord:
+    """One checklist card. Dict-like reads; see module docstring."""
+
+    __slots__ = (
+        'number', 'name', 'team', 'set_name', 'image_url', 'price', 'quantity',
+        'card_type', 'parallel_type', 'numbering', 'parallel_types', 'extra'
+    )
+
+    FIELDS = __slots__[:-1]
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        number: Optional[str] = None,
+        team: Optional[str] = None,
+        set_name: Optional[str] = None,
+        image_url: Optional[str] = None,
+        price: Optional[float] = None,
+        quantity: Optional[int] = None,
+        card_type: Optional[str] = None,
+        parallel_type: Optional[str] = None,
+        numbering: Optional[str] = None,
+        parallel_types: Optional[Iterable[str]] = None,
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        # None = field not provided (like a missing dict key)
+        self.name = name
+        self.number = str(number) if number is not None else None
+        self.team = _intern(team)
+        self.set_name = _intern(set_name)
+        self.image_url = image_url
+        self.price = price
+        self.quantity = quantity
+        self.card_type = _intern(card_type)
+        self.parallel_type = _intern(parallel_type)
+        self.numbering = _intern(numbering)
+        self.parallel_types = intern_parallel_types(parallel_types) if parallel_types is not None else None
+        self.extra = extra or None
+
+    # --- dict-style access -------------------------------------------------
+
+    @staticmethod
+    def _attr(key: str) -> str:
+        return _API_ALIASES.get(key, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._attr(key)
+        if attr in self.FIELDS:
+            value = getattr(self, attr)
+            return default if value is None else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self._attr(key)
+        if attr in self.FIELDS and getattr(self, attr) is not None:
+            return getattr(self, attr)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        attr = self._attr(key)
+        if attr == 'parallel_types':
+            self.parallel_types = intern_parallel_types(value) if value is not None else None
+        elif attr in _INTERNED_FIELDS:
+            setattr(self, attr, _intern(value))
+        elif attr in self.FIELDS:
+            setattr(self, attr, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        attr = self._attr(key)
+        if attr in self.FIELDS:
+            return getattr(self, attr) is not None
+        return bool(self.extra) and key in self.extra
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def copy(self) -> 'CardRecord':
+        clone = CardRecord.__new__(CardRecord)
+        for attr in self.__slots__:
+            setattr(clone, attr, getattr(self, attr))
+        if self.extra:
+            clone.extra = dict(self.extra)
+        return clone
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CardRecord):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"CardRecord(number={self.number!r}, name={self.name!r}, parallel_type={self.parallel_type!r})"
+
+    # --- conversion --------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **overrides) -> 'CardRecord':
+        """Build from a parser/CSV dict (snake_case) or a frontend card (camelCase)."""
+        if isinstance(data, CardRecord):
+            record = data.copy()
+            for key, value in overrides.items():
+                record[key] = value
+            return record
+        fields = {}
+        extra = {}
+        for key, value in data.items():
+            attr = _API_ALIASES.get(key, key)
+            if attr in cls.FIELDS and attr != 'extra':
+                fields[attr] = value
+            else:
+                extra[key] = value
+        for key, value in overrides.items():
+            fields[_API_ALIASES.get(key, key)] = value
+        for attr, convert in (('price', float), ('quantity', int)):
+            if attr in fields:
+                fields[attr] = convert(fields[attr]) if fields[attr] not in (None, '') else None
+        return cls(extra=extra, **fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """snake_case dict of the provided fields (parser/CSV shape)."""
+        data = {}
+        for attr in self.FIELDS:
+            value = getattr(self, attr)
+            if value is None:
+                continue
+            data['type' if attr == 'card_type' else attr] = list(value) if attr == 'parallel_types' else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_api(self, price: Optional[float] = None, quantity: Optional[int] = None) -> Dict[str, Any]:
+        """camelCase card for /api/fetch-checklist (parallel types are sent once per response, not per card)."""
+        data = {
+            "number": self.number or '',
+            "name": self.name or '',
+            "team": self.team or '',
+            "price": self.price if self.price is not None else price,
+            "quantity": self.quantity if self.quantity is not None else quantity,
+            "imageUrl": self.image_url or ''
+        }
+        if self.parallel_type:
+            data["parallelType"] = self.parallel_type
+        if self.numbering:
+            data["numbering"] = self.numbering
+        return data
+
+
+def to_records(cards: Iterable[Dict], **overrides) -> List[CardRecord]:
+    """Convert a card list (dicts or records) to CardRecords."""
+    return [CardRecord.from_dict(card, **overrides) for card in cards]
@@ -73,36 +73,30 @@ def check_listings():
         
         # Check for draft offers
         print("Checking for draft/unscheduled offers...")
-        draft_response = api_client._make_request('GET', active_endpoint, params={
-            'limit': 100,
-            'offset': 0
-        })
+        # Stream every page of offers (fetched ahead concurrently) instead of only the first 100
+        drafts = [
+            o for o in api_client.iter_collection(active_endpoint, 'offers')
+            if o.get('listing', {}).get('listingStatus') in ['DRAFT', 'UNPUBLISHED']
+        ]
         
-        if draft_response.status_code == 200:
-            draft_data = draft_response.json()
-            all_offers = draft_data.get('offers', [])
-            
-            # Filter for drafts
-            drafts = [o for o in all_offers if o.get('listing', {}).get('listingStatus') in ['DRAFT', 'UNPUBLISHED']]
-            
-            if drafts:
-                print(f"[OK] Found {len(drafts)} draft listings:")
-                print("-" * 80)
-                for i, draft in enumerate(drafts, 1):
-                    offer_id = draft.get('offerId', 'N/A')
-                    sku = draft.get('sku', 'N/A')
-                    title = draft.get('listing', {}).get('title', 'No title')
-                    
-                    print(f"\n{i}. Draft Offer")
-                    print(f"   Offer ID: {offer_id}")
-                    print(f"   SKU: {sku}")
-                    print(f"   Title: {title}")
-            else:
-                print("No draft listings found via offers endpoint.")
-                print()
-                print("💡 Note: Variation listings created via publishOfferByInventoryItemGroup")
-                print("   may not appear in the offers endpoint until published.")
-                print("   They should be visible in eBay Seller Hub once you can access it.")
+        if drafts:
+            print(f"[OK] Found {len(drafts)} draft listings:")
+            print("-" * 80)
+            for i, draft in enumerate(drafts, 1):
+                offer_id = draft.get('offerId', 'N/A')
+                sku = draft.get('sku', 'N/A')
+                title = draft.get('listing', {}).get('title', 'No title')
+                
+                print(f"\n{i}. Draft Offer")
+                print(f"   Offer ID: {offer_id}")
+                print(f"   SKU: {sku}")
+                print(f"   Title: {title}")
+        else:
+            print("No draft listings found via offers endpoint.")
+            print()
+            print("💡 Note: Variation listings created via publishOfferByInventoryItemGroup")
+            print("   may not appear in the offers endpoint until published.")
+            print("   They should be visible in eBay Seller Hub once you can access it.")
         
     except Exception as e:
         print(f"[ERROR] Error: {e}")
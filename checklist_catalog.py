@@ -0,0 +1,343 @@
+"""Local catalog of parsed checklists with an inverted search index.
+
+Every checklist the parsers produce is stored once (per URL and checklist
+type) in a JSON file, so:
+
+- /api/fetch-checklist answers an already cataloged URL instantly, without
+  re-downloading and re-parsing the page
+- search works offline and in milliseconds, by set name, player, team and
+  card number, across every checklist we have parsed
+
+The index maps tokens to set entries and (entry, card) postings; queries are
+AND-ed, with prefix matching on words ("flag" finds "Flagg") and exact
+matching on card numbers.
+"""
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from card_record import intern_parallel_types
+
+CATALOG_FILE = ".checklist_catalog.json"
+CATALOG_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+_NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]')
+
+
+def normalize_url(url: str) -> str:
+    """Catalog key for a checklist URL (scheme, www, query and trailing slash ignored)."""
+    parts = urlsplit((url or '').strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(str(text or '').lower())
+
+
+def _number_tokens(number: str) -> Set[str]:
+    tokens = set(tokenize(number))
+    joined = _NON_ALNUM_PATTERN.sub('', str(number or '').lower())
+    if joined:
+        tokens.add(joined)  # "BCP-12" is also found as "bcp12"
+    return tokens
+
+
+_STRONG_PATTERN = re.compile(r'<strong>(.*?)</strong>', re.IGNORECASE | re.DOTALL)
+
+
+def set_name_from_description(description: Optional[str]) -> str:
+    """Set name from the first <strong> of an extracted description (as app.py does)."""
+    match = _STRONG_PATTERN.search(description or '')
+    return re.sub(r'<[^>]+>', '', match.group(1)).strip() if match else ''
+
+
+def set_name_from_url(url: str) -> str:
+    """Readable set name from a checklist URL slug."""
+    slug = urlsplit(url or '').path.rstrip('/').rsplit('/', 1)[-1]
+    slug = re.sub(r'-(checklist|cards?|set)(-\w+)?$', '', slug)
+    return slug.replace('-', ' ').title()
+
+
+class ChecklistCatalog:
+    """Thread-safe store of parsed checklists plus an in-memory inverted index."""
+
+    def __init__(self, catalog_file: Optional[str] = CATALOG_FILE, max_age_hours: float = 168):
+        """
+        Args:
+            catalog_file: JSON file the catalog persists to (None = memory only)
+            max_age_hours: Entries older than this are re-fetched by get()
+                           (they stay searchable until replaced); 0 = never expire
+        """
+        self.catalog_file = catalog_file
+        self.max_age = max_age_hours * 3600
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict] = {}
+        self._set_postings: Dict[str, Set[str]] = {}
+        self._card_postings: Dict[str, Set[Tuple[str, int]]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._file_mtime = None
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+        self._merge_from_disk()
+
+    @staticmethod
+    def entry_key(url: str, checklist_type: str) -> str:
+        return f"{normalize_url(url)}|{(checklist_type or 'base').lower()}"
+
+    # --- persistence ---------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.catalog_file or not os.path.exists(self.catalog_file):
+            return {}
+        try:
+            with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CATALOG_VERSION:
+                print(f"[CATALOG] Ignoring {self.catalog_file} (format version {data.get('version')})")
+                return {}
+            return data.get('checklists', {})
+        except Exception as e:
+            print(f"[WARNING] Could not read checklist catalog {self.catalog_file}: {e}")
+            return {}
+
+    def _disk_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.catalog_file) if self.catalog_file else None
+        except OSError:
+            return None
+
+    def _merge_from_disk(self):
+        """
+        Pick up entries other processes (gunicorn workers, the warmer) wrote.
+
+        Only re-reads the file when its mtime changed; the newer fetch wins.
+        """
+        mtime = self._disk_mtime()
+        if mtime is None or mtime == self._file_mtime:
+            return
+        with self._lock:
+            for key, entry in self._load().items():
+                current = self._entries.get(key)
+                if current is None or entry.get('fetched_at', 0) > current.get('fetched_at', 0):
+                    self._add_entry(key, entry)
+            self._file_mtime = mtime
+
+    def save(self):
+        """Write the catalog to disk (atomic replace), merging what is already there."""
+        if not self.catalog_file:
+            return
+        with self._lock:
+            self._merge_from_disk()
+            snapshot = {"version": CATALOG_VERSION, "checklists": dict(self._entries)}
+            tmp_file = f"{self.catalog_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_file, self.catalog_file)
+            self._file_mtime = self._disk_mtime()
+
+    def fetch_lock(self, url: str, checklist_type: str) -> threading.Lock:
+        """
+        Per-checklist lock held while a page is downloaded and parsed, so a
+        user request for a checklist the warmer is already fetching waits for
+        that result instead of parsing the page a second time.
+        """
+        key = self.entry_key(url, checklist_type)
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    # --- index ---------------------------------------------------------------
+
+    def _add_entry(self, key: str, entry: Dict):
+        self._remove_entry(key)
+        self._entries[key] = entry
+        for token in set(tokenize(entry.get('set_name'))):
+            self._set_postings.setdefault(token, set()).add(key)
+        for idx, card in enumerate(entry.get('cards', [])):
+            tokens = set(tokenize(card.get('name'))) | set(tokenize(card.get('team')))
+            tokens |= _number_tokens(card.get('number'))
+            for token in tokens:
+                self._card_postings.setdefault(token, set()).add((key, idx))
+        self._sorted_tokens = None
+
+    def _remove_entry(self, key: str):
+        if key not in self._entries:
+            return
+        del self._entries[key]
+        for postings in (self._set_postings, self._card_postings):
+            for token in list(postings):
+                kept = {p for p in postings[token] if (p[0] if isinstance(p, tuple) else p) != key}
+                if kept:
+                    postings[token] = kept
+                else:
+                    del postings[token]
+        self._sorted_tokens = None
+
+    def _expand(self, token: str) -> List[str]:
+        """Index tokens matching a query token: exact for numbers, prefix for words."""
+        if token.isdigit():
+            return [token]
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(set(self._set_postings) | set(self._card_postings))
+        start = bisect.bisect_left(self._sorted_tokens, token)
+        end = bisect.bisect_left(self._sorted_tokens, token + '\uffff')
+        return self._sorted_tokens[start:end]
+
+    # --- public API ----------------------------------------------------------
+
+    def put(self, url: str, checklist_type: str, cards: List[Dict], description: Optional[str] = None,
+            set_name: Optional[str] = None, save: bool = True) -> str:
+        """Store (or replace) a parsed checklist; returns its catalog key."""
+        key = self.entry_key(url, checklist_type)
+        entry = {
+            "url": url,
+            "checklist_type": (checklist_type or 'base').lower(),
+            "set_name": set_name or set_name_from_description(description) or set_name_from_url(url),
+            "description": description,
+            "cards": [card.to_dict() if hasattr(card, 'to_dict') else dict(card) for card in cards],
+            "fetched_at": time.time()
+        }
+        for card in entry["cards"]:
+            if isinstance(card.get('parallel_types'), tuple):
+                card['parallel_types'] = list(card['parallel_types'])
+        with self._lock:
+            self._add_entry(key, entry)
+        if save:
+            self.save()
+        return key
+
+    def get(self, url: str, checklist_type: str) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """
+        Cached (cards, description) for a URL, or None when it is not cataloged
+        or older than max_age_hours. Cards are copies - safe to modify.
+        """
+        self._merge_from_disk()
+        with self._lock:
+            entry = self._entries.get(self.entry_key(url, checklist_type))
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if self.max_age and time.time() - entry.get('fetched_at', 0) > self.max_age:
+                self.stats["stale"] += 1
+                return None
+            self.stats["hits"] += 1
+            cards = [dict(card) for card in entry['cards']]
+        for card in cards:
+            if card.get('parallel_types'):
+                card['parallel_types'] = intern_parallel_types(card['parallel_types'])
+        return cards, entry.get('description')
+
+    def has(self, url: str, checklist_type: str) -> bool:
+        """True when get() would return a fresh entry."""
+        self._merge_from_disk()
+        with self._lock:
+            entry = self._entries.get(self.entry_key(url, checklist_type))
+            return entry is not None and not (self.max_age and time.time() - entry.get('fetched_at', 0) > self.max_age)
+
+    def sets(self) -> List[Dict]:
+        """One summary per cataloged checklist."""
+        with self._lock:
+            return [self._summary(key, entry) for key, entry in sorted(self._entries.items())]
+
+    @staticmethod
+    def _summary(key: str, entry: Dict) -> Dict:
+        return {
+            "key": key,
+            "name": entry.get('set_name'),
+            "url": entry.get('url'),
+            "checklist_type": entry.get('checklist_type'),
+            "cards": len(entry.get('cards', [])),
+            "fetched_at": entry.get('fetched_at')
+        }
+
+    def search(self, query: str, limit: int = 50) -> Dict[str, List[Dict]]:
+        """
+        Search set names, players, teams and card numbers.
+
+        Every query word must match, either on the card itself or on its set
+        name ("chrome flagg" = Flagg cards in sets named ...Chrome...).
+
+        Returns:
+            {'sets': [set summaries matching on set name alone],
+             'cards': [{'card', 'set_name', 'url', 'checklist_type'}, ...]}
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {"sets": [], "cards": []}
+        with self._lock:
+            set_hits = []
+            card_hits = []
+            for token in tokens:
+                expanded = self._expand(token)
+                sets_for_token = set()
+                cards_for_token = set()
+                for index_token in expanded:
+                    sets_for_token |= self._set_postings.get(index_token, set())
+                    cards_for_token |= self._card_postings.get(index_token, set())
+                set_hits.append(sets_for_token)
+                card_hits.append(cards_for_token)
+
+            matching_sets = set.intersection(*set_hits)
+            # A card matches when every word hits the card or its set, and at
+            # least one word hits the card itself (else it is just a set match)
+            candidates = set().union(*card_hits)
+            matching_cards = [
+                posting for posting in candidates
+                if all(posting in card_hits[i] or posting[0] in set_hits[i] for i in range(len(tokens)))
+            ]
+            matching_cards.sort(key=lambda p: (self._entries[p[0]].get('set_name', ''), p[0], p[1]))
+
+            return {
+                "sets": [self._summary(key, self._entries[key]) for key in sorted(matching_sets)][:limit],
+                "cards": [
+                    {
+                        "key": key,
+                        "card": dict(self._entries[key]['cards'][idx]),
+                        "set_name": self._entries[key].get('set_name'),
+                        "url": self._entries[key].get('url'),
+                        "checklist_type": self._entries[key].get('checklist_type')
+                    }
+                    for key, idx in matching_cards[:limit]
+                ]
+            }
+
+    def search_sets(self, query: str, limit: int = 50) -> List[Dict]:
+        """
+        Checklists matching a query - by set name or by any of their cards.
+
+        Card matches are attached to their set under 'matches'.
+        """
+        results = self.search(query, limit=max(limit, 500))
+        sets = {summary['key']: summary for summary in results['sets']}
+        with self._lock:
+            for hit in results['cards']:
+                if hit['key'] not in sets and hit['key'] in self._entries:
+                    sets[hit['key']] = self._summary(hit['key'], self._entries[hit['key']])
+                if hit['key'] in sets:
+                    sets[hit['key']].setdefault('matches', []).append(hit['card'])
+        return list(sets.values())[:limit]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Optional[ChecklistCatalog]:
+    """Shared process-wide catalog (None when CHECKLIST_CATALOG_FILE is set to 'off')."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from config import Config
+                config = Config()
+                catalog_file = config.CHECKLIST_CATALOG_FILE
+                if catalog_file.lower() == 'off':
+                    return None
+                _catalog = ChecklistCatalog(catalog_file, max_age_hours=config.CHECKLIST_CATALOG_MAX_AGE_HOURS)
+    return _catalog
@@ -0,0 +1,178 @@
+"""Background warm-up of popular checklists into the checklist catalog.
+
+The first /api/fetch-checklist for a new release otherwise blocks on a slow
+external page (long timeouts and retries in the Beckett parsers). The warmer
+fetches and parses a configurable list of popular set URLs in a daemon thread
+at app boot and again on a schedule, so user requests for those sets are
+catalog hits.
+
+Prefetch list: CHECKLIST_PREFETCH_FILE (JSON) and/or CHECKLIST_PREFETCH_URLS
+(comma-separated). File format:
+
+    [
+        "https://www.beckett.com/news/2025-26-topps-chrome-basketball-cards/",
+        {"url": "https://www.beckett.com/news/2025-bowman-draft-baseball-cards/",
+         "types": ["base", "inserts", "autographs"]}
+    ]
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+from checklist_catalog import ChecklistCatalog, get_catalog
+
+
+def load_prefetch_jobs(
+    prefetch_file: Optional[str] = None,
+    urls: Optional[str] = None,
+    default_types: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Build the prefetch list as [{'url', 'checklist_type'}, ...] (deduplicated, in order).
+
+    Args:
+        prefetch_file: JSON list of URLs or {"url", "types"} objects
+        urls: Comma-separated URLs
+        default_types: Checklist types for entries that do not name any
+    """
+    default_types = default_types or ['base']
+    entries = []
+    if prefetch_file and os.path.exists(prefetch_file):
+        try:
+            with open(prefetch_file, 'r', encoding='utf-8') as f:
+                entries.extend(json.load(f))
+        except Exception as e:
+            print(f"[WARMER] Could not read prefetch list {prefetch_file}: {e}")
+    entries.extend(u.strip() for u in (urls or '').split(',') if u.strip())
+
+    jobs = []
+    seen = set()
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"url": entry}
+        url = (entry.get('url') or '').strip()
+        if not url:
+            continue
+        for checklist_type in entry.get('types') or default_types:
+            key = ChecklistCatalog.entry_key(url, checklist_type)
+            if key not in seen:
+                seen.add(key)
+                jobs.append({"url": url, "checklist_type": checklist_type})
+    return jobs
+
+
+class ChecklistWarmer:
+    """Fetches a prefetch list into the catalog with bounded concurrency."""
+
+    def __init__(
+        self,
+        jobs: List[Dict],
+        catalog: ChecklistCatalog,
+        fetcher_factory: Optional[Callable] = None,
+        max_workers: int = 2,
+        interval_hours: float = 6
+    ):
+        """
+        Args:
+            jobs: [{'url', 'checklist_type'}, ...] (see load_prefetch_jobs)
+            catalog: Catalog the parsed checklists go into
+            fetcher_factory: Returns a CardChecklistFetcher bound to `catalog`
+            max_workers: Checklist pages fetched at the same time
+            interval_hours: Re-warm period after the boot run (0 = boot only)
+        """
+        self.jobs = jobs
+        self.catalog = catalog
+        self.fetcher_factory = fetcher_factory or self._default_fetcher
+        self.max_workers = max(1, max_workers)
+        self.interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+
+    def _default_fetcher(self):
+        from card_checklist import CardChecklistFetcher
+        return CardChecklistFetcher(source='beckett', catalog=self.catalog)
+
+    def _warm_one(self, job: Dict) -> Dict:
+        url, checklist_type = job['url'], job['checklist_type']
+        if self.catalog.has(url, checklist_type):
+            return {**job, "status": "fresh"}
+        if self._stop.is_set():
+            return {**job, "status": "skipped"}
+        started = time.monotonic()
+        try:
+            cards, _ = self.fetcher_factory().fetch_from_beckett_url(url, checklist_type)
+            status = "fetched" if cards else "empty"
+            return {**job, "status": status, "cards": len(cards or []), "seconds": round(time.monotonic() - started, 1)}
+        except Exception as e:
+            print(f"[WARMER] {checklist_type} {url} failed: {e}")
+            return {**job, "status": "error", "error": str(e)}
+
+    def warm(self) -> Dict:
+        """Fetch every stale or missing checklist once; returns a summary."""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._warm_one, self.jobs))
+        summary = {
+            "jobs": len(results),
+            "fetched": sum(1 for r in results if r['status'] == 'fetched'),
+            "fresh": sum(1 for r in results if r['status'] == 'fresh'),
+            "failed": sum(1 for r in results if r['status'] in ('error', 'empty')),
+            "seconds": round(time.monotonic() - started, 1),
+            "results": results
+        }
+        self.last_run = summary
+        print(f"[WARMER] Warmed {summary['jobs']} checklists in {summary['seconds']}s: "
+              f"{summary['fetched']} fetched, {summary['fresh']} already fresh, {summary['failed']} failed")
+        return summary
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.warm()
+            except Exception as e:
+                print(f"[WARMER] Warm run failed: {e}")
+            if not self.interval or self._stop.wait(self.interval):
+                return
+
+    def start(self) -> 'ChecklistWarmer':
+        """Warm in a daemon thread now and every interval_hours; returns immediately."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="checklist-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def start_background_warmer(config: Optional[Config] = None) -> Optional[ChecklistWarmer]:
+    """Start the warmer from configuration; None when disabled or nothing to prefetch."""
+    config = config or Config()
+    if not config.CHECKLIST_PREFETCH_ENABLED:
+        return None
+    catalog = get_catalog()
+    if catalog is None:
+        return None
+    jobs = load_prefetch_jobs(
+        config.CHECKLIST_PREFETCH_FILE,
+        config.CHECKLIST_PREFETCH_URLS,
+        config.CHECKLIST_PREFETCH_TYPES
+    )
+    if not jobs:
+        return None
+    print(f"[WARMER] Prefetching {len(jobs)} checklists in the background "
+          f"({config.CHECKLIST_PREFETCH_CONCURRENCY} at a time, every {config.CHECKLIST_PREFETCH_INTERVAL_HOURS}h)")
+    return ChecklistWarmer(
+        jobs,
+        catalog,
+        max_workers=config.CHECKLIST_PREFETCH_CONCURRENCY,
+        interval_hours=config.CHECKLIST_PREFETCH_INTERVAL_HOURS
+    ).start()
@@ -101,6 +101,174 @@ class Config:
     def RETRY_DELAY(self):
         return float(os.getenv('RETRY_DELAY', '1.0'))
     
+    # Outbound HTTP settings (shared connection pools, see http_session.py)
+    @property
+    def HTTP_POOL_MAXSIZE(self):
+        return int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+    
+    @property
+    def HTTP_CONNECT_TIMEOUT(self):
+        return float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    
+    @property
+    def HTTP_READ_TIMEOUT(self):
+        return float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+    
+    @property
+    def HTTP2_ENABLED(self):
+        return os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+    
+    # eBay's variation limit per listing; bigger sets are split into several listings
+    @property
+    def MAX_VARIATIONS_PER_LISTING(self):
+        return int(os.getenv('MAX_VARIATIONS_PER_LISTING', '250'))
+    
+    # Batch listing (ebay_bot.py --batch)
+    @property
+    def BATCH_CONCURRENCY(self):
+        return int(os.getenv('BATCH_CONCURRENCY', '3'))
+    
+    @property
+    def EBAY_RATE_LIMIT(self):
+        """Max eBay API calls per second shared by all batch pipelines (0 = unlimited)."""
+        return float(os.getenv('EBAY_RATE_LIMIT', '5'))
+    
+    @property
+    def EBAY_PAGE_PREFETCH(self):
+        """Pages of a paginated eBay listing fetched concurrently ahead of the reader."""
+        return int(os.getenv('EBAY_PAGE_PREFETCH', '4'))
+    
+    @property
+    def EBAY_READ_CACHE_TTL(self):
+        """Seconds a successful eBay GET is reused by the same client (0 = no read cache)."""
+        return float(os.getenv('EBAY_READ_CACHE_TTL', '30'))
+    
+    @property
+    def EBAY_READ_CACHE_MAX_ENTRIES(self):
+        """Most GET responses one client's read cache keeps (oldest dropped first)."""
+        return int(os.getenv('EBAY_READ_CACHE_MAX_ENTRIES', '1000'))
+    
+    # Publish queue (publish_queue.py): many groups published concurrently, with retries
+    @property
+    def PUBLISH_QUEUE_FILE(self):
+        return os.getenv('PUBLISH_QUEUE_FILE', '.publish_queue.json')
+    
+    @property
+    def PUBLISH_CONCURRENCY(self):
+        return int(os.getenv('PUBLISH_CONCURRENCY', '3'))
+    
+    @property
+    def PUBLISH_MAX_ATTEMPTS(self):
+        return int(os.getenv('PUBLISH_MAX_ATTEMPTS', '5'))
+    
+    @property
+    def PUBLISH_RETRY_BASE_SECONDS(self):
+        """First retry delay after a transient publish error; doubles per attempt."""
+        return float(os.getenv('PUBLISH_RETRY_BASE_SECONDS', '15'))
+    
+    # Scheduled releases (publish_schedule.py): start times spread over daily windows
+    @property
+    def PUBLISH_SCHEDULE_FILE(self):
+        return os.getenv('PUBLISH_SCHEDULE_FILE', '.publish_schedule.json')
+    
+    @property
+    def PUBLISH_WINDOWS(self):
+        """Comma-separated local HH:MM-HH:MM windows listings may start in."""
+        return os.getenv('PUBLISH_WINDOWS', '09:00-11:00,18:00-21:00')
+    
+    @property
+    def PUBLISH_WINDOW_MAX(self):
+        """Most listings started in one window (0 = no cap beyond the minimum gap)."""
+        return int(os.getenv('PUBLISH_WINDOW_MAX', '20'))
+    
+    @property
+    def PUBLISH_MIN_GAP_MINUTES(self):
+        return float(os.getenv('PUBLISH_MIN_GAP_MINUTES', '2'))
+    
+    @property
+    def PUBLISH_RELEASE_LEAD_MINUTES(self):
+        """Publish this long before the start time; eBay holds it as a scheduled listing."""
+        return float(os.getenv('PUBLISH_RELEASE_LEAD_MINUTES', '30'))
+    
+    # Orphan sweeper (orphan_sweeper.py): leftovers of failed listing runs
+    @property
+    def ORPHAN_SWEEP_STATE_FILE(self):
+        return os.getenv('ORPHAN_SWEEP_STATE_FILE', '.orphan_sweeper.json')
+    
+    @property
+    def ORPHAN_GRACE_MINUTES(self):
+        """Only delete orphans first seen at least this long ago (listings still being created look orphaned)."""
+        return float(os.getenv('ORPHAN_GRACE_MINUTES', '60'))
+    
+    @property
+    def ORPHAN_SWEEP_CONCURRENCY(self):
+        return int(os.getenv('ORPHAN_SWEEP_CONCURRENCY', '4'))
+    
+    @property
+    def ORPHAN_SWEEP_INTERVAL_MINUTES(self):
+        return float(os.getenv('ORPHAN_SWEEP_INTERVAL_MINUTES', '30'))
+    
+    # Local inventory snapshot behind the HTML listing reports (listing_report.py)
+    @property
+    def LISTING_SNAPSHOT_FILE(self):
+        return os.getenv('LISTING_SNAPSHOT_FILE', '.listing_snapshot.json')
+    
+    @property
+    def LISTING_SNAPSHOT_MAX_AGE_MINUTES(self):
+        """Reports reuse a snapshot younger than this instead of re-reading the account."""
+        return float(os.getenv('LISTING_SNAPSHOT_MAX_AGE_MINUTES', '15'))
+    
+    @property
+    def LISTING_REPORT_PAGE_SIZE(self):
+        return int(os.getenv('LISTING_REPORT_PAGE_SIZE', '200'))
+    
+    # Listing manager dashboard (listing_manager_ui.py): served from the inventory snapshot
+    @property
+    def LISTING_INDEX_TTL_SECONDS(self):
+        """Listings older than this are refreshed in the background while the old ones are served."""
+        return float(os.getenv('LISTING_INDEX_TTL_SECONDS', '60'))
+    
+    @property
+    def LISTING_API_PAGE_SIZE(self):
+        return int(os.getenv('LISTING_API_PAGE_SIZE', '50'))
+    
+    # Local catalog of parsed checklists (search + instant re-fetch); 'off' disables it
+    @property
+    def CHECKLIST_CATALOG_FILE(self):
+        return os.getenv('CHECKLIST_CATALOG_FILE', '.checklist_catalog.json')
+    
+    @property
+    def CHECKLIST_CATALOG_MAX_AGE_HOURS(self):
+        """Cataloged checklists older than this are fetched again (0 = never)."""
+        return float(os.getenv('CHECKLIST_CATALOG_MAX_AGE_HOURS', '168'))
+    
+    # Background prefetch of popular checklists into the catalog (checklist_warmer.py)
+    @property
+    def CHECKLIST_PREFETCH_ENABLED(self):
+        return os.getenv('CHECKLIST_PREFETCH_ENABLED', 'true').lower() == 'true'
+    
+    @property
+    def CHECKLIST_PREFETCH_FILE(self):
+        return os.getenv('CHECKLIST_PREFETCH_FILE', 'prefetch_checklists.json')
+    
+    @property
+    def CHECKLIST_PREFETCH_URLS(self):
+        """Comma-separated checklist URLs, in addition to CHECKLIST_PREFETCH_FILE."""
+        return os.getenv('CHECKLIST_PREFETCH_URLS', '')
+    
+    @property
+    def CHECKLIST_PREFETCH_TYPES(self):
+        return [t.strip() for t in os.getenv('CHECKLIST_PREFETCH_TYPES', 'base').split(',') if t.strip()]
+    
+    @property
+    def CHECKLIST_PREFETCH_CONCURRENCY(self):
+        return int(os.getenv('CHECKLIST_PREFETCH_CONCURRENCY', '2'))
+    
+    @property
+    def CHECKLIST_PREFETCH_INTERVAL_HOURS(self):
+        """Re-warm period after the boot run (0 = boot only)."""
+        return float(os.getenv('CHECKLIST_PREFETCH_INTERVAL_HOURS', '6'))
+    
     # eBay API Endpoints
     @property
     def ebay_token(self):
@@ -5,6 +5,7 @@ This will show exactly what's on the page and why cards aren't being found
 import requests
 from bs4 import BeautifulSoup
 import re
+import http_session
 
 url = "https://www.beckett.com/news/2025-26-topps-chrome-basketball-cards/"
 
@@ -27,7 +28,7 @@ response = None
 for attempt in range(5):
     try:
         print(f"   Attempt {attempt + 1}/5...")
-        response = requests.get(url, headers=headers, timeout=120)
+        response = http_session.get(url, headers=headers, timeout=120)
         if response.status_code == 200:
             print(f"   OK: Success! Status: {response.status_code}")
             print(f"   OK: Content length: {len(response.content)} bytes")
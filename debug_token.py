@@ -57,14 +57,14 @@ print()
 # Test API call
 print("Testing API call...")
 try:
-    import requests
+    import http_session
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
         "X-EBAY-C-MARKETPLACE-ID": "EBAY_US"
     }
     url = "https://api.ebay.com/sell/account/v1/payment_policy"
-    response = requests.get(url, headers=headers, params={'marketplace_id': 'EBAY_US'}, timeout=10)
+    response = http_session.get(url, headers=headers, params={'marketplace_id': 'EBAY_US'}, timeout=10)
     print(f"  Status Code: {response.status_code}")
     if response.status_code == 200:
         print("  SUCCESS! Token is valid.")
@@ -1,9 +1,19 @@
 """Improved eBay API client with better error handling and policy management."""
 import requests
+from requests.structures import CaseInsensitiveDict
 import time
 import json
-from typing import Dict, List, Optional
+import re
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 from config import Config
+import http_session
+from payload_validator import validate_group, validate_offer
+from group_delta import GroupStateStore
+from publish_diagnostics import collect_snapshot, diagnose, format_report
 
 class eBayAPIClient:
     """Enhanced eBay API client with retry logic and policy management."""
@@ -15,7 +25,18 @@ class eBayAPIClient:
         self.base_url = self.config.ebay_api_url
         self.token_override = token_override
         self.token = token_override or self.config.ebay_token
-        self.session = requests.Session()
+        # Own headers (per-user token) but shared keep-alive pools across clients
+        self.session = http_session.new_session()
+        # Optional http_session.RateBudget shared by concurrent callers (batch mode)
+        self.rate_budget = None
+        # Repeated GETs (group/offer verification, diagnostics) are served from
+        # here until a write to the same resource; None when disabled
+        cache_ttl = self.config.EBAY_READ_CACHE_TTL
+        self.read_cache = http_session.ReadCache(
+            ttl=cache_ttl, max_entries=self.config.EBAY_READ_CACHE_MAX_ENTRIES
+        ) if cache_ttl > 0 else None
+        # Last group payload eBay accepted per key; unchanged group PUTs are skipped
+        self.group_state = GroupStateStore()
         self._update_headers()
     
     def _update_headers(self):
@@ -33,10 +54,9 @@ class eBayAPIClient:
         # Debug: Print token preview (first 50 chars) - only in debug mode
         # print(f"[DEBUG] Using token: {self.token[:50]}... (length: {len(self.token)})")
         
-        # Clear any existing headers first to avoid conflicts
-        self.session.headers.clear()
-        # Set required headers
-        self.session.headers.update({
+        # Replace the headers in one assignment (no conflicts with old headers, and
+        # threads sharing this client never see a half-updated header set)
+        self.session.headers = CaseInsensitiveDict({
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
             "X-EBAY-C-MARKETPLACE-ID": "EBAY_US",
@@ -51,23 +71,118 @@ class eBayAPIClient:
         params: Optional[Dict] = None,
         retries: int = None
     ) -> requests.Response:
-        """Make API request with retry logic."""
+        """Make API request with retry logic; GETs go through the read cache."""
+        if self.read_cache is None:
+            return self._send_request(method, endpoint, data, params, retries)
+        if method.upper() == 'GET':
+            def load():
+                response = self._send_request(method, endpoint, data, params, retries)
+                response.content  # read the body once so callers sharing it never race on the stream
+                return response
+            return self.read_cache.fetch(
+                http_session.ReadCache.key(endpoint, params), load,
+                cacheable=lambda response: response.status_code == 200
+            )
+        # Invalidate before (marks reads in flight as stale) and after the write
+        self.read_cache.invalidate(endpoint)
+        try:
+            return self._send_request(method, endpoint, data, params, retries)
+        finally:
+            self.read_cache.invalidate(endpoint)
+    
+    def read_cache_stats(self) -> Dict:
+        """Hit/miss/coalesced/invalidation counters of the read cache (empty when disabled)."""
+        return self.read_cache.stats() if self.read_cache is not None else {}
+    
+    def _get_page(self, endpoint: str, records_key: str, params: Optional[Dict], page_size: int, offset: int) -> Dict:
+        """One limit/offset page: {'records', 'total'}; raises requests.HTTPError on failure."""
+        # Not through the read cache: it would keep every page of the collection in memory
+        response = self._send_request('GET', endpoint, params=dict(params or {}, limit=page_size, offset=offset))
+        if response.status_code != 200:
+            raise requests.HTTPError(
+                f"GET {endpoint} (offset {offset}) failed: HTTP {response.status_code} {response.text[:200]}",
+                response=response
+            )
+        data = response.json()
+        total = data.get('total')
+        return {"records": data.get(records_key) or [], "total": int(total) if total is not None else None}
+    
+    def iter_collection(
+        self,
+        endpoint: str,
+        records_key: str,
+        params: Optional[Dict] = None,
+        page_size: int = 200,
+        prefetch: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream every record of a limit/offset paginated collection (e.g. inventory_item, offer).
+        
+        The first page gives 'total'; the remaining offset windows are then fetched
+        concurrently, at most `prefetch` pages ahead (default EBAY_PAGE_PREFETCH),
+        and yielded in order - so there is no page cap and never more than a few
+        pages in memory. Without a 'total', pages are followed until a short one.
+        Raises requests.HTTPError when a page cannot be fetched, so a partial
+        listing is never mistaken for the whole account.
+        """
+        first = self._get_page(endpoint, records_key, params, page_size, 0)
+        yield from first['records']
+        total = first['total']
+        if total is None:
+            offset, page = len(first['records']), first
+            while page['records'] and len(page['records']) >= page_size:
+                page = self._get_page(endpoint, records_key, params, page_size, offset)
+                yield from page['records']
+                offset += len(page['records'])
+            return
+        
+        offsets = iter(range(page_size, total, page_size))
+        prefetch = max(1, prefetch or self.config.EBAY_PAGE_PREFETCH)
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        pending = deque()
+        try:
+            for offset in islice(offsets, prefetch):
+                pending.append(executor.submit(self._get_page, endpoint, records_key, params, page_size, offset))
+            while pending:
+                page = pending.popleft().result()
+                # Keep the window full while the caller consumes this page
+                for offset in islice(offsets, 1):
+                    pending.append(executor.submit(self._get_page, endpoint, records_key, params, page_size, offset))
+                yield from page['records']
+        finally:
+            # Stopped early (or failed): don't wait for pages nobody will read
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def group_write_stats(self) -> Dict:
+        """Group PUTs sent/skipped and bytes sent/saved by delta tracking."""
+        return self.group_state.stats()
+    
+    def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        retries: int = None
+    ) -> requests.Response:
+        """Send one API request with retry logic (no caching)."""
         retries = retries or self.config.MAX_RETRIES
         url = f"{self.base_url}{endpoint}"
         
         for attempt in range(retries + 1):
+            if self.rate_budget:
+                self.rate_budget.acquire()
             try:
                 if method.upper() == 'GET':
                     response = self.session.get(url, params=params)
                 elif method.upper() == 'POST':
                     # For POST requests, log the exact data being sent (especially for offers)
                     if data:
-                        import json as json_module
                         try:
-                            request_body = json_module.dumps(data, indent=2)
+                            request_body = json.dumps(data, indent=2)
                             
                             # CRITICAL: Check for description in POST requests (create_offer)
-                            parsed_data = json_module.loads(request_body)
+                            parsed_data = json.loads(request_body)
                             
                             description_found = False
                             description_value = None
@@ -110,7 +225,7 @@ class eBayAPIClient:
                         print(f"[DEBUG] Status Code: {response.status_code}")
                     try:
                         response_json = response.json()
-                        print(json_module.dumps(response_json, indent=2))
+                        print(json.dumps(response_json, indent=2))
                     except json.JSONDecodeError as e:
                         print(f"[DEBUG] Response is not valid JSON: {e}")
                         print(f"[DEBUG] Response text (first 1000 chars): {response.text[:1000]}")
@@ -122,12 +237,11 @@ class eBayAPIClient:
                 elif method.upper() == 'PUT':
                     # For PUT requests, log the exact data being sent
                     if data:
-                        import json as json_module
                         try:
-                            request_body = json_module.dumps(data, indent=2)
+                            request_body = json.dumps(data, indent=2)
                             
                             # CRITICAL: Check for description in request
-                            parsed_data = json_module.loads(request_body)
+                            parsed_data = json.loads(request_body)
                             
                             # Check for description
                             description_found = False
@@ -167,7 +281,7 @@ class eBayAPIClient:
                                 if 'variationInformation' in parsed_data['groupDetails']:
                                     print(f"[DEBUG] [OK] groupDetails.variationInformation found")
                                     var_info = parsed_data['groupDetails']['variationInformation']
-                                    print(f"[DEBUG] variationInformation content: {json_module.dumps(var_info, indent=2)}")
+                                    print(f"[DEBUG] variationInformation content: {json.dumps(var_info, indent=2)}")
                                 else:
                                     print(f"[DEBUG] [ERROR] variationInformation NOT in groupDetails")
                                     print(f"[DEBUG] groupDetails keys: {list(parsed_data['groupDetails'].keys())}")
@@ -185,7 +299,6 @@ class eBayAPIClient:
                             
                         except Exception as e:
                             print(f"[DEBUG] Could not serialize request body for logging: {e}")
-                            import traceback
                             traceback.print_exc()
                     response = self.session.put(url, json=data, params=params)
                     
@@ -196,7 +309,7 @@ class eBayAPIClient:
                     print(f"[DEBUG] Full Response Body:")
                     try:
                         response_json = response.json()
-                        print(json_module.dumps(response_json, indent=2))
+                        print(json.dumps(response_json, indent=2))
                     except json.JSONDecodeError as e:
                         print(f"[DEBUG] Response is not valid JSON: {e}")
                         print(f"[DEBUG] Response text (first 2000 chars): {response.text[:2000]}")
@@ -527,7 +640,10 @@ class eBayAPIClient:
         
         if response.status_code == 200:
             try:
-                return {"success": True, "data": response.json()}
+                data = response.json()
+                if not self.group_state.reconcile(group_key, data):
+                    print(f"[INFO] Group {group_key} on eBay differs from the last write - next update will be sent in full")
+                return {"success": True, "data": data}
             except json.JSONDecodeError as e:
                 print(f"[ERROR] Response is not valid JSON: {e}")
                 print(f"[ERROR] Response text: {response.text[:1000]}")
@@ -548,6 +664,7 @@ class eBayAPIClient:
         """Delete an inventory item group."""
         endpoint = f"/sell/inventory/v1/inventory_item_group/{group_key}"
         response = self._make_request('DELETE', endpoint)
+        self.group_state.forget(group_key)
         
         if response.status_code in [200, 204]:
             return {"success": True}
@@ -564,10 +681,36 @@ class eBayAPIClient:
                 pass
             return {"success": False, "error": error_text}
     
-    def create_inventory_item_group(self, group_key: str, group_data: Dict) -> Dict:
-        """Create or update an inventory item group."""
+    def _delete(self, endpoint: str) -> Dict:
+        """DELETE a resource; {"success": True} on 200/204, else the eBay error message."""
+        response = self._make_request('DELETE', endpoint)
+        if response.status_code in [200, 204]:
+            return {"success": True}
+        error_text = response.text
+        try:
+            errors = response.json().get('errors', [])
+            if errors:
+                error_text = errors[0].get('message', error_text)
+        except Exception:
+            pass
+        return {"success": False, "error": error_text, "status_code": response.status_code}
+    
+    def delete_offer(self, offer_id: str) -> Dict:
+        """Delete an offer (unpublished offers only; published ones must be withdrawn first)."""
+        return self._delete(f"/sell/inventory/v1/offer/{offer_id}")
+    
+    def delete_inventory_item(self, sku: str) -> Dict:
+        """Delete an inventory item (eBay also deletes its unpublished offers)."""
+        return self._delete(f"/sell/inventory/v1/inventory_item/{sku}")
+    
+    def create_inventory_item_group(self, group_key: str, group_data: Dict, force: bool = False) -> Dict:
+        """
+        Create or update an inventory item group.
+        
+        The PUT is skipped (result has 'unchanged': True) when the payload equals
+        the last one eBay accepted for this group; force=True always sends it.
+        """
         # Validate group key format (eBay requires alphanumeric only, max 50 chars)
-        import re
         # Clean the group key to ensure it's alphanumeric only
         clean_group_key = re.sub(r'[^A-Z0-9]', '', str(group_key).upper())
         if len(clean_group_key) > 50:
@@ -680,7 +823,6 @@ class eBayAPIClient:
             clean_data['variantSKUs'] = group_data['variantSKUs']
         
         # Debug: Print the exact JSON being sent
-        import json
         json_payload = json.dumps(clean_data, indent=2)
         print(f"[DEBUG] ========== GROUP CREATION REQUEST ==========")
         print(f"[DEBUG] Full group data JSON:")
@@ -710,7 +852,8 @@ class eBayAPIClient:
             title_in_data = clean_data['inventoryItemGroup'].get('title')
             print(f"[DEBUG] Title in clean_data: {repr(title_in_data)}")
             print(f"[DEBUG] Title type: {type(title_in_data)}")
-            print(f"[DEBUG] Title in JSON: {'\"title\"' in json_payload}")
+            title_in_json = '"title"' in json_payload
+            print(f"[DEBUG] Title in JSON: {title_in_json}")
             if title_in_data:
                 print(f"[DEBUG] Title value: '{title_in_data}'")
                 print(f"[DEBUG] Title length: {len(title_in_data)}")
@@ -937,6 +1080,25 @@ This is a variation listing where you can select from multiple card options. Eac
         else:
             print(f"[DEBUG] [OK] Title is valid at ROOT level: '{title_check}' (length: {len(title_check)})")
         
+        # Last check before the request: anything still invalid would only fail at publish
+        validation_errors = validate_group(clean_data, publish=False)
+        if validation_errors:
+            print(f"[ERROR] Group payload failed validation - not sent: {validation_errors}")
+            return {
+                "success": False,
+                "error": "Group payload failed validation:\n" + "\n".join(validation_errors),
+                "validation_errors": validation_errors
+            }
+        
+        # eBay replaces the whole group on PUT, so the delta only decides whether to send
+        delta = None if force else self.group_state.diff(group_key, clean_data)
+        if delta == []:
+            saved = self.group_state.skipped(clean_data)
+            print(f"[INFO] Group {group_key} unchanged since last update - PUT skipped ({saved} bytes saved)")
+            return {"success": True, "data": {"inventoryItemGroupKey": group_key}, "unchanged": True}
+        if delta:
+            print(f"[INFO] Group {group_key} changed fields: {', '.join(delta)}")
+        
         # Use PUT method and include group_key in the path, not as query param
         response = self._make_request('PUT', endpoint, data=clean_data)
         
@@ -979,11 +1141,14 @@ This is a variation listing where you can select from multiple card options. Eac
         print(f"[DEBUG] =================================================")
         
         if response.status_code in [200, 201, 204]:
+            self.group_state.record(group_key, clean_data)
             # 204 No Content means success but no response body
             if response.status_code == 204:
                 return {"success": True, "data": {"inventoryItemGroupKey": group_key}}
             return {"success": True, "data": response.json()}
         else:
+            # A failed write may have partly applied; don't trust the known state
+            self.group_state.forget(group_key)
             error_text = response.text
             try:
                 error_json = response.json()
@@ -1039,6 +1204,38 @@ This is a variation listing where you can select from multiple card options. Eac
         else:
             return {"success": False, "offer": None, "offerId": None}
     
+    def bulk_update_price_quantity(self, requests_list: List[Dict]) -> Dict:
+        """
+        Update price and/or quantity for up to 25 SKUs in one call.
+
+        Each request: {"sku", "shipToLocationAvailability": {"quantity"},
+        "offers": [{"offerId", "availableQuantity", "price": {"value", "currency"}}]}.
+        eBay answers 200 (all OK) or 207 (per-SKU results in 'responses').
+        """
+        endpoint = "/sell/inventory/v1/bulk_update_price_quantity"
+        response = self._make_request('POST', endpoint, data={"requests": requests_list})
+
+        if response.status_code in (200, 207):
+            return {"success": True, "responses": response.json().get('responses', []), "status_code": response.status_code}
+        try:
+            error_data = response.json()
+        except Exception:
+            error_data = {"message": response.text[:1000]}
+        return {"success": False, "error": error_data, "status_code": response.status_code}
+
+    def bulk_get_inventory_item(self, skus: List[str]) -> Dict:
+        """Get up to 25 inventory items in one call. Returns {sku: inventoryItem}."""
+        endpoint = "/sell/inventory/v1/bulk_get_inventory_item"
+        response = self._make_request('POST', endpoint, data={"requests": [{"sku": sku} for sku in skus]})
+
+        if response.status_code in (200, 207):
+            items = {}
+            for entry in response.json().get('responses', []):
+                if entry.get('statusCode') == 200 and entry.get('inventoryItem'):
+                    items[entry.get('sku')] = entry['inventoryItem']
+            return {"success": True, "items": items}
+        return {"success": False, "items": {}, "error": response.text[:1000], "status_code": response.status_code}
+
     def create_or_update_offer(self, offer_data: Dict) -> Dict:
         """Create or update an offer. If offer exists, update it; otherwise create it."""
         sku = offer_data.get('sku')
@@ -1167,6 +1364,14 @@ All cards are in Near Mint or better condition unless otherwise noted."""
             if 'description' in offer_data['listing']:
                 print(f"[DEBUG] listing.description length: {len(offer_data['listing']['description'])}")
         print(f"[DEBUG] ========================================")
+        validation_errors = validate_offer(offer_data, publish=False)
+        if validation_errors:
+            print(f"[ERROR] Offer payload for {offer_data.get('sku')} failed validation - not sent: {validation_errors}")
+            return {
+                "success": False,
+                "error": {"message": "Offer payload failed validation: " + "; ".join(validation_errors)},
+                "validation_errors": validation_errors
+            }
         response = self._make_request('POST', endpoint, data=offer_data)
         
         # After response, check if listing object was accepted
@@ -1372,7 +1577,6 @@ All cards are in Near Mint or better condition unless otherwise noted."""
             # If Error 25016, try one more time after a longer wait
             if '25016' in response.text:
                 print(f"[RETRY] Error 25016 detected, waiting 15 seconds and retrying...")
-                import time
                 time.sleep(15)
                 
                 # Try one more time
@@ -1482,250 +1686,28 @@ All cards are in Near Mint or better condition unless otherwise noted."""
                 "raw_response": response.text[:1000] if hasattr(response, 'text') else None
             }
     
-    def _debug_fulfillment_policy_error(self, group_key: str) -> Dict:
-        """Get detailed debugging information for fulfillment policy errors."""
-        debug_info = {
-            "group_key": group_key,
-            "policies_checked": [],
-            "offers_checked": [],
-            "issues_found": []
-        }
-        
-        try:
-            # 1. Get the group to find associated SKUs
-            group_result = self.get_inventory_item_group(group_key)
-            if not group_result.get('success'):
-                debug_info["issues_found"].append(f"Could not get inventory item group: {group_result.get('error', 'Unknown')}")
-                return debug_info
-            
-            group_data = group_result.get('data', {})
-            variant_skus = []
-            
-            # First, try to get SKUs directly from variantSKUs field (most reliable)
-            if 'variantSKUs' in group_data:
-                variant_skus = group_data['variantSKUs']
-                debug_info["issues_found"].append(f"Found {len(variant_skus)} SKUs from variantSKUs field")
-            
-            # Extract SKUs from the group - try different possible structures
-            if not variant_skus and 'variants' in group_data:
-                for variant in group_data['variants']:
-                    sku = variant.get('sku') or variant.get('SKU')
-                    if sku:
-                        variant_skus.append(sku)
-            if not variant_skus and 'inventoryItems' in group_data:
-                for item in group_data['inventoryItems']:
-                    sku = item.get('sku') or item.get('SKU')
-                    if sku:
-                        variant_skus.append(sku)
-            
-            # If we still can't find SKUs, try to get them from offers endpoint
-            if not variant_skus:
-                # Try to get offers for the marketplace to find SKUs
-                try:
-                    offers_response = self._make_request('GET', '/sell/inventory/v1/offer', params={'limit': 20})
-                    if offers_response.status_code == 200:
-                        offers_data = offers_response.json()
-                        offers = offers_data.get('offers', [])
-                        # Get SKUs from offers that match this group key
-                        for offer in offers:
-                            offer_group_key = offer.get('inventoryItemGroupKey')
-                            if offer_group_key == group_key:
-                                sku = offer.get('sku')
-                                if sku:
-                                    variant_skus.append(sku)
-                except Exception as e:
-                    debug_info["issues_found"].append(f"Could not get offers: {str(e)}")
-            
-            if not variant_skus:
-                debug_info["issues_found"].append("Could not find any SKUs associated with this group")
-            
-            # 2. Check each offer's fulfillment policy
-            for sku in variant_skus[:3]:  # Check first 3 to avoid too many API calls
-                offer_info = {"sku": sku, "policy_id": None, "policy_valid": False, "issues": []}
-                
-                # Get offer by SKU
-                offer_result = self.get_offer_by_sku(sku)
-                if offer_result.get('success') and offer_result.get('offer'):
-                    offer = offer_result['offer']
-                    offer_id = offer.get('offerId')
-                    offer_info["offer_id"] = offer_id
-                    
-                    # Get fulfillment policy ID from offer
-                    listing_policies = offer.get('listing', {}).get('listingPolicies', {})
-                    fulfillment_policy_id = listing_policies.get('fulfillmentPolicyId')
-                    offer_info["policy_id"] = fulfillment_policy_id
-                    
-                    if fulfillment_policy_id:
-                        # Check the policy
-                        policy_response = self._make_request('GET', f'/sell/account/v1/fulfillment_policy/{fulfillment_policy_id}')
-                        if policy_response.status_code == 200:
-                            policy = policy_response.json()
-                            policy_name = policy.get('name', 'Unknown')
-                            shipping_options = policy.get('shippingOptions', [])
-                            
-                            offer_info["policy_name"] = policy_name
-                            offer_info["shipping_options_count"] = len(shipping_options)
-                            
-                            if shipping_options:
-                                offer_info["policy_valid"] = True
-                                # Check each shipping option
-                                for opt in shipping_options:
-                                    services = opt.get('shippingServices', [])
-                                    if not services:
-                                        offer_info["issues"].append(f"Option {opt.get('optionType')} has no shipping services")
-                                    else:
-                                        for svc in services:
-                                            svc_code = svc.get('shippingServiceCode', 'N/A')
-                                            carrier = svc.get('shippingCarrierCode', 'N/A')
-                                            cost = svc.get('shippingCost', {})
-                                            cost_value = cost.get('value', 'N/A')
-                                            buyer_responsible = svc.get('buyerResponsibleForShipping', None)
-                                            
-                                            service_info = f"{svc_code} ({carrier})"
-                                            if cost_value != 'N/A':
-                                                service_info += f" - ${cost_value}"
-                                            if buyer_responsible is not None:
-                                                service_info += f" - Buyer Pays: {buyer_responsible}"
-                                            
-                                            offer_info["services"] = offer_info.get("services", [])
-                                            offer_info["services"].append(service_info)
-                                            
-                                            # Check if buyerResponsibleForShipping is False (this could be the issue)
-                                            if buyer_responsible is False:
-                                                offer_info["issues"].append(f"Service {svc_code} has buyerResponsibleForShipping=False (seller pays). eBay may require buyer to pay for Trading Cards.")
-                            else:
-                                offer_info["issues"].append("Policy has no shipping options")
-                        else:
-                            offer_info["issues"].append(f"Could not get policy: HTTP {policy_response.status_code}")
-                    else:
-                        offer_info["issues"].append("No fulfillmentPolicyId in offer")
-                
-                debug_info["offers_checked"].append(offer_info)
-            
-            # 3. Check config policy with detailed shipping service info
-            config_policy_id = self.config.FULFILLMENT_POLICY_ID
-            if config_policy_id:
-                policy_response = self._make_request('GET', f'/sell/account/v1/fulfillment_policy/{config_policy_id}')
-                if policy_response.status_code == 200:
-                    policy = policy_response.json()
-                    shipping_options = policy.get('shippingOptions', [])
-                    
-                    # Extract detailed service information
-                    services_detail = []
-                    buyer_responsible_issues = []
-                    for opt in shipping_options:
-                        for svc in opt.get('shippingServices', []):
-                            svc_code = svc.get('shippingServiceCode', 'N/A')
-                            carrier = svc.get('shippingCarrierCode', 'N/A')
-                            cost = svc.get('shippingCost', {})
-                            cost_value = cost.get('value', 'N/A')
-                            buyer_responsible = svc.get('buyerResponsibleForShipping', None)
-                            
-                            service_info = {
-                                "code": svc_code,
-                                "carrier": carrier,
-                                "cost": cost_value,
-                                "buyer_pays": buyer_responsible
-                            }
-                            services_detail.append(service_info)
-                            
-                            # Flag if buyerResponsibleForShipping is False
-                            if buyer_responsible is False:
-                                buyer_responsible_issues.append(f"{svc_code} has buyerResponsibleForShipping=False")
-                    
-                    policy_info = {
-                        "policy_id": config_policy_id,
-                        "policy_name": policy.get('name'),
-                        "has_shipping_options": len(shipping_options) > 0,
-                        "shipping_options_count": len(shipping_options),
-                        "services": [s["code"] for s in services_detail],
-                        "services_detail": services_detail,
-                        "buyer_responsible_issues": buyer_responsible_issues
-                    }
-                    
-                    if buyer_responsible_issues:
-                        policy_info["warning"] = "Some services have buyerResponsibleForShipping=False. eBay may require buyer to pay for Trading Cards category."
-                    
-                    debug_info["policies_checked"].append(policy_info)
-                else:
-                    debug_info["issues_found"].append(f"Config policy {config_policy_id} not found: HTTP {policy_response.status_code}")
-            
-        except Exception as e:
-            debug_info["issues_found"].append(f"Debug error: {str(e)}")
-        
-        return debug_info
-    
-    def _debug_return_policy_error(self, group_key: str) -> Dict:
-        """Get detailed debugging information for return policy errors (Error 25009)."""
-        debug_info = {
-            "group_key": group_key,
-            "return_policies_checked": [],
-            "offers_checked": [],
-            "issues_found": []
-        }
+    def diagnose_publish_failure(
+        self,
+        group_key: str,
+        fulfillment_policy_id: Optional[str] = None,
+        return_policy_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Diagnose a failed group publish (fulfillment/return policy, description, offers).
         
+        Fetches the group, its offers and the policy lists concurrently once, then
+        runs every check locally over that snapshot (see publish_diagnostics).
+        """
         try:
-            # Get the group to find associated SKUs
-            group_result = self.get_inventory_item_group(group_key)
-            if not group_result.get('success'):
-                debug_info["issues_found"].append(f"Could not get inventory item group: {group_result.get('error', 'Unknown')}")
-                return debug_info
-            
-            group_data = group_result.get('data', {})
-            variant_skus = group_data.get('variantSKUs', [])
-            
-            if not variant_skus:
-                debug_info["issues_found"].append("No variant SKUs found in group")
-                return debug_info
-            
-            debug_info["issues_found"].append(f"Found {len(variant_skus)} SKUs from variantSKUs field")
-            
-            # Check return policy ID from config
-            return_policy_id = self.config.RETURN_POLICY_ID
-            if return_policy_id:
-                debug_info["return_policies_checked"].append({
-                    "policy_id": return_policy_id,
-                    "source": "config",
-                    "in_offers": False
-                })
-            
-            # Check each offer's return policy
-            for sku in variant_skus[:3]:  # Check first 3
-                offer_info = {"sku": sku, "return_policy_id": None, "issues": []}
-                
-                offer_result = self.get_offer_by_sku(sku)
-                if offer_result.get('success') and offer_result.get('offer'):
-                    offer = offer_result['offer']
-                    offer_id = offer.get('offerId')
-                    offer_info["offer_id"] = offer_id
-                    
-                    # Check for return policy in offer
-                    listing_policies = offer.get('listing', {}).get('listingPolicies', {})
-                    root_policies = offer.get('listingPolicies', {})
-                    
-                    return_policy_in_offer = listing_policies.get('returnPolicyId') or root_policies.get('returnPolicyId')
-                    offer_info["return_policy_id"] = return_policy_in_offer
-                    
-                    if not return_policy_in_offer:
-                        offer_info["issues"].append("No returnPolicyId in offer")
-                    elif return_policy_in_offer != return_policy_id:
-                        offer_info["issues"].append(f"Return policy ID mismatch: offer has {return_policy_in_offer}, config has {return_policy_id}")
-                
-                debug_info["offers_checked"].append(offer_info)
-            
-            # Print summary
-            print(f"\n[DEBUG] Return Policy Debug Summary:")
-            print(f"  Config RETURN_POLICY_ID: {return_policy_id}")
-            print(f"  Offers checked: {len(debug_info['offers_checked'])}")
-            for offer_info in debug_info["offers_checked"]:
-                print(f"    SKU {offer_info['sku']}: returnPolicyId = {offer_info.get('return_policy_id', 'NOT SET')}")
-                if offer_info.get('issues'):
-                    for issue in offer_info['issues']:
-                        print(f"      ISSUE: {issue}")
-            
+            report = diagnose(
+                collect_snapshot(self, group_key),
+                fulfillment_policy_id=fulfillment_policy_id or self.config.FULFILLMENT_POLICY_ID,
+                return_policy_id=return_policy_id or self.config.RETURN_POLICY_ID
+            )
         except Exception as e:
-            debug_info["issues_found"].append(f"Exception during debug: {str(e)}")
-            import traceback
             traceback.print_exc()
-        
-        return debug_info
+            return {"group_key": group_key, "policies_checked": [], "return_policies_checked": [],
+                    "offers_checked": [], "issues_found": [f"Debug error: {str(e)}"]}
+        print(f"[DEBUG] Publish diagnosis for {group_key}: {report['issue_count']} issue(s) from {report['api_calls']} API call(s)")
+        print(format_report(report))
+        return report
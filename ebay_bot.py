@@ -1,19 +1,36 @@
 """Main eBay posting bot for card listings."""
 import argparse
-from typing import List, Dict, Optional, Union
-from card_checklist import CardChecklistFetcher
-from ebay_listing import eBayListingManager
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
 from config import Config
-from ebay_oauth import eBayOAuth
-from ebay_setup import eBayAutoSetup
+from parallel_variations import iter_variations, count_variations, iter_chunks
+
+# The listing stack (requests, bs4, the eBay clients) is imported where it is
+# first used so `ebay_bot.py --help` and the OAuth/setup commands start fast.
+if TYPE_CHECKING:
+    from ebay_listing import eBayListingManager
+
+# Manifest job keys passed through to list_cards_from_set / list_cards_from_csv_chunks
+BATCH_JOB_OPTIONS = (
+    'set_name', 'csv_file', 'title', 'description', 'price', 'quantity',
+    'condition', 'category', 'filter_cards', 'publish'
+)
+
 
 class eBayCardBot:
     """Main bot for posting card listings to eBay."""
     
-    def __init__(self):
+    def __init__(self, listing_manager: Optional['eBayListingManager'] = None):
+        from card_checklist import CardChecklistFetcher
+        from ebay_listing import eBayListingManager
         self.config = Config()
         self.checklist_fetcher = CardChecklistFetcher()
-        self.listing_manager = eBayListingManager()
+        self.listing_manager = listing_manager or eBayListingManager()
     
     def list_cards_from_set(
         self,
@@ -63,6 +80,116 @@ class eBayCardBot:
         
         print(f"Found {len(cards)} cards in set")
         
+        return self.list_cards(
+            cards,
+            set_name=set_name,
+            title=title,
+            description=description,
+            price=price,
+            quantity=quantity,
+            condition=condition,
+            category=category,
+            filter_cards=filter_cards,
+            publish=publish
+        )
+    
+    def list_cards_from_csv_chunks(
+        self,
+        csv_file: str,
+        chunk_size: int = 250,
+        title: Optional[str] = None,
+        **listing_kwargs
+    ) -> Dict:
+        """
+        List a large CSV as one listing per chunk of `chunk_size` cards.
+        
+        The file is streamed, so only one chunk is held in memory at a time.
+        Invalid CSV rows are skipped and returned in 'csv_errors' with line numbers.
+        
+        Returns:
+            Dictionary with 'success', per-chunk 'listings' results and 'csv_errors'
+        """
+        csv_errors = []
+        listings = self._list_chunks(
+            self.checklist_fetcher.iter_csv_chunks(csv_file, chunk_size, errors=csv_errors),
+            title, "CSV chunk", **listing_kwargs
+        )
+        
+        for error in csv_errors:
+            print(f"[WARNING] {csv_file} line {error['line']}: {error['error']}")
+        
+        return {
+            "success": bool(listings) and all(r.get('success') for r in listings),
+            "error": None if listings else f"No valid cards found in CSV file: {csv_file}",
+            "listings": listings,
+            "csv_errors": csv_errors
+        }
+    
+    def list_parallel_variations(
+        self,
+        cards: List[Dict],
+        parallel_types: Optional[List[str]] = None,
+        parallels: Optional[List[str]] = None,
+        set_name: Optional[str] = None,
+        chunk_size: int = 250,
+        title: Optional[str] = None,
+        **listing_kwargs
+    ) -> Dict:
+        """
+        List every card x parallel combination, one listing per chunk of `chunk_size` variations.
+        
+        Variations are generated lazily, so only one chunk is held in memory at a time.
+        
+        Args:
+            cards: Base cards from a parallels/#'ed checklist
+            parallel_types: Parallel names (defaults to each card's 'parallel_types')
+            parallels: Optional filter - only list these parallels
+            set_name: Set name used for SKUs and the default title
+            chunk_size: Variations per listing
+            title: Listing title (suffixed with "(Part N)")
+            
+        Returns:
+            Dictionary with 'success', 'count' and per-chunk 'listings' results
+        """
+        total = count_variations(cards, parallel_types, parallels)
+        print(f"Listing {total} parallel variations of {len(cards)} cards in chunks of {chunk_size}")
+        variations = iter_variations(cards, parallel_types, parallels, set_name=set_name)
+        listings = self._list_chunks(
+            iter_chunks(variations, chunk_size), title or set_name, "variation chunk",
+            set_name=set_name, **listing_kwargs
+        )
+        return {
+            "success": bool(listings) and all(r.get('success') for r in listings),
+            "error": None if listings else "No parallel variations match the filter",
+            "count": total,
+            "listings": listings
+        }
+    
+    def _list_chunks(self, chunks, title: Optional[str], label: str, **listing_kwargs) -> List[Dict]:
+        """Create one listing per chunk of cards; titles get a "(Part N)" suffix."""
+        listings = []
+        for part, cards in enumerate(chunks, start=1):
+            part_title = f"{title} (Part {part})" if title else None
+            print(f"Creating listing for {label} {part} ({len(cards)} cards)...")
+            result = self.list_cards(cards, title=part_title, **listing_kwargs)
+            result['part'] = part
+            listings.append(result)
+        return listings
+    
+    def list_cards(
+        self,
+        cards: List[Dict],
+        set_name: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        price: Union[float, Dict[str, float]] = 0.99,
+        quantity: int = 1,
+        condition: Optional[str] = None,
+        category: str = "Trading Cards",
+        filter_cards: Optional[List[str]] = None,
+        publish: bool = True
+    ) -> Dict:
+        """List already-loaded cards as variations (see list_cards_from_set for arguments)."""
         # Filter cards if specified
         if filter_cards:
             filtered = []
@@ -144,6 +271,117 @@ class eBayCardBot:
         
         return description
     
+    def run_batch(
+        self,
+        manifest: Union[str, Dict, List[Dict]],
+        concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        report_file: Optional[str] = None
+    ) -> Dict:
+        """
+        List many sets/CSVs in one run.
+        
+        All pipelines share this bot's API client (one token, one set of fetched
+        policies, one connection pool) and one eBay rate budget.
+        
+        Args:
+            manifest: Path to a JSON manifest, or its parsed content: either a list of
+                      jobs or {"defaults": {...}, "listings": [...]}. Each job takes the
+                      list_cards_from_set arguments (set_name or csv_file, title, price,
+                      quantity, condition, category, filter_cards, publish, description)
+                      plus optional "chunk_size" for large CSVs.
+            concurrency: Listing pipelines run at the same time (default BATCH_CONCURRENCY)
+            rate_limit: eBay API calls per second across all pipelines (default EBAY_RATE_LIMIT)
+            report_file: Where to write the JSON results report
+            
+        Returns:
+            The report dictionary
+        """
+        if isinstance(manifest, str):
+            with open(manifest, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        if isinstance(manifest, list):
+            manifest = {"listings": manifest}
+        defaults = manifest.get('defaults', {})
+        jobs = [{**defaults, **job} for job in manifest.get('listings', [])]
+        
+        concurrency = concurrency or self.config.BATCH_CONCURRENCY
+        rate_limit = self.config.EBAY_RATE_LIMIT if rate_limit is None else rate_limit
+        from ebay_listing import eBayListingManager
+        from http_session import RateBudget
+        shared_client = self.listing_manager.api_client
+        shared_client.rate_budget = RateBudget(rate_limit)
+        
+        print(f"Batch: {len(jobs)} listing(s), {concurrency} concurrent pipeline(s), "
+              f"rate budget {rate_limit or 'unlimited'} call(s)/s")
+        started = time.time()
+        
+        def run_job(index_job):
+            index, job = index_job
+            name = job.get('name') or job.get('title') or job.get('set_name') or job.get('csv_file')
+            job_start = time.time()
+            try:
+                # Per-pipeline manager: listing state is per manager, client/policies are shared
+                manager = eBayListingManager(api_client=shared_client, policies=self.listing_manager.policies)
+                # Jobs started in the same second would otherwise share a group key
+                # (set names are cut to 20 characters, every Beckett URL looks alike)
+                manager.group_key_suffix = f"J{uuid.uuid4().hex[:6].upper()}"
+                bot = eBayCardBot(listing_manager=manager)
+                options = {k: v for k, v in job.items() if k in BATCH_JOB_OPTIONS}
+                if 'filter' in job and 'filter_cards' not in options:
+                    options['filter_cards'] = job['filter']
+                if job.get('csv_file') and job.get('chunk_size'):
+                    options.pop('set_name', None)
+                    result = bot.list_cards_from_csv_chunks(options.pop('csv_file'), chunk_size=job['chunk_size'], **options)
+                else:
+                    result = bot.list_cards_from_set(**options)
+            except Exception as e:
+                result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+            entry = {
+                "index": index,
+                "name": name,
+                "success": bool(result.get('success')),
+                "listingId": result.get('listingId'),
+                "offerId": result.get('offerId'),
+                "groupKey": result.get('group_key') or result.get('groupKey'),
+                "itemsCreated": result.get('itemsCreated'),
+                "error": None if result.get('success') else str(result.get('error')),
+                "duration_seconds": round(time.time() - job_start, 1)
+            }
+            if 'listings' in result:
+                entry["parts"] = [
+                    {"part": r.get('part'), "success": bool(r.get('success')), "listingId": r.get('listingId'),
+                     "error": None if r.get('success') else str(r.get('error'))}
+                    for r in result['listings']
+                ]
+                entry["csv_errors"] = result.get('csv_errors', [])
+            print(f"[BATCH] {'✓' if entry['success'] else '✗'} {name} ({entry['duration_seconds']}s)")
+            return entry
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = list(executor.map(run_job, enumerate(jobs)))
+        
+        report = {
+            "started_at": datetime.fromtimestamp(started).isoformat(),
+            "duration_seconds": round(time.time() - started, 1),
+            "concurrency": concurrency,
+            "rate_limit": rate_limit,
+            "api_calls": shared_client.rate_budget.calls,
+            "total": len(results),
+            "succeeded": sum(1 for r in results if r['success']),
+            "failed": sum(1 for r in results if not r['success']),
+            "results": results
+        }
+        shared_client.rate_budget = None
+        
+        report_file = report_file or f"batch_report_{datetime.fromtimestamp(started).strftime('%Y%m%d_%H%M%S')}.json"
+        tmp_file = f"{report_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_file, report_file)
+        report["report_file"] = report_file
+        return report
+    
     def search_sets(self, query: str) -> List[Dict]:
         """Search for card sets."""
         return self.checklist_fetcher.search_set(query)
@@ -153,6 +391,11 @@ def main():
     parser = argparse.ArgumentParser(description='eBay Card Listing Bot')
     parser.add_argument('set_name', nargs='?', help='Name of the card set to list')
     parser.add_argument('--csv', '--csv-file', dest='csv_file', help='Path to CSV file with card data')
+    parser.add_argument('--chunk-size', type=int, help='Stream the CSV and create one listing per this many cards')
+    parser.add_argument('--batch', metavar='MANIFEST', help='JSON manifest of many sets/CSVs to list in one run')
+    parser.add_argument('--concurrency', type=int, help='Concurrent listing pipelines for --batch (default: BATCH_CONCURRENCY)')
+    parser.add_argument('--rate-limit', type=float, help='eBay API calls per second across all --batch pipelines (default: EBAY_RATE_LIMIT, 0 = unlimited)')
+    parser.add_argument('--report', help='Where to write the --batch JSON results report')
     parser.add_argument('--title', help='Custom listing title')
     parser.add_argument('--description', help='Custom listing description')
     parser.add_argument('--price', type=float, default=0.99, help='Price per card (or use price column in CSV)')
@@ -173,6 +416,7 @@ def main():
     
     # Handle login/logout commands
     if args.login:
+        from ebay_oauth import eBayOAuth
         oauth = eBayOAuth()
         result = oauth.login()
         if result.get('success'):
@@ -183,11 +427,13 @@ def main():
         return
     
     if args.logout:
+        from ebay_oauth import eBayOAuth
         oauth = eBayOAuth()
         oauth.logout()
         return
     
     if args.refresh_token:
+        from ebay_oauth import eBayOAuth
         oauth = eBayOAuth()
         result = oauth.refresh_token()
         if result.get('success'):
@@ -198,6 +444,7 @@ def main():
         return
     
     if args.setup:
+        from ebay_setup import eBayAutoSetup
         setup = eBayAutoSetup()
         result = setup.setup_from_user_id(args.user_id)
         if result.get('success'):
@@ -210,6 +457,7 @@ def main():
         return
     
     if args.verify:
+        from ebay_setup import eBayAutoSetup
         setup = eBayAutoSetup()
         result = setup.verify_setup()
         if result.get('success'):
@@ -222,6 +470,15 @@ def main():
     
     bot = eBayCardBot()
     
+    if args.batch:
+        report = bot.run_batch(args.batch, concurrency=args.concurrency, rate_limit=args.rate_limit, report_file=args.report)
+        print(f"\nBatch finished in {report['duration_seconds']}s: {report['succeeded']} succeeded, {report['failed']} failed")
+        for entry in report['results']:
+            if not entry['success']:
+                print(f"  ✗ {entry['name']}: {entry['error']}")
+        print(f"  Report: {report['report_file']}")
+        return
+    
     if args.search:
         if not args.set_name:
             print("Error: set_name required for search")
@@ -234,6 +491,28 @@ def main():
         if not args.set_name and not args.csv_file:
             parser.error("Either set_name or --csv must be provided")
         
+        if args.csv_file and args.chunk_size:
+            result = bot.list_cards_from_csv_chunks(
+                args.csv_file,
+                chunk_size=args.chunk_size,
+                title=args.title,
+                description=args.description,
+                price=args.price,
+                quantity=args.quantity,
+                condition=args.condition,
+                category=args.category,
+                filter_cards=args.filter,
+                publish=not args.no_publish
+            )
+            for listing in result.get('listings', []):
+                status = "✓" if listing.get('success') else "✗"
+                print(f"  {status} Part {listing['part']}: {listing.get('listingId') or listing.get('offerId') or listing.get('error')}")
+            if result.get('csv_errors'):
+                print(f"  Skipped {len(result['csv_errors'])} invalid CSV row(s)")
+            if not result.get('success'):
+                print(f"\n✗ Error creating listings: {result.get('error') or 'see parts above'}")
+            return
+        
         result = bot.list_cards_from_set(
             set_name=args.set_name,
             csv_file=args.csv_file,
@@ -1,20 +1,44 @@
 """eBay listing creation with variation support."""
 import requests
 import json
+import re
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Union
 from config import Config
 from ebay_api_client import eBayAPIClient
+from listing_images import prepare_listing_images
+from identifiers import generate_skus, make_group_key, alnum_part
+from listing_shards import plan_shards, shard_title, summarize_shards
+from payload_validator import format_validation_errors, validate_listing, variation_errors
 
 class eBayListingManager:
     """Manages eBay listings with variation support."""
     
-    def __init__(self, token_override: Optional[str] = None):
-        """Optional token_override: per-user eBay token for multi-tenant support."""
+    def __init__(
+        self,
+        token_override: Optional[str] = None,
+        api_client: Optional[eBayAPIClient] = None,
+        policies: Optional[Dict] = None
+    ):
+        """
+        Optional token_override: per-user eBay token for multi-tenant support.
+        Optional api_client/policies: share one client and already-fetched policy IDs
+        between managers (e.g. concurrent batch pipelines) instead of re-fetching.
+        """
         self.config = Config()
         self.config.validate()
-        self.api_client = eBayAPIClient(token_override=token_override)
-        self.policies = self.api_client.get_policy_ids()
+        self.api_client = api_client or eBayAPIClient(token_override=token_override)
+        self.policies = policies if policies is not None else self.api_client.get_policy_ids()
+        # Appended to generated group keys; batch jobs and shards of one set get their
+        # own so that listings started in the same second don't share (and overwrite) one group
+        self.group_key_suffix = ''
+    
+    def _new_group_key(self, set_name: str) -> str:
+        """Group key for a new listing: set name + timestamp (+ job/shard suffix)."""
+        return make_group_key(set_name, f"{int(time.time())}{self.group_key_suffix}")
     
     def create_variation_listing(
         self,
@@ -53,6 +77,19 @@ class eBayListingManager:
         Returns:
             Dictionary with listing result
         """
+        # Sets over eBay's per-listing variation limit are split into several
+        # listings up front, before any inventory item is created
+        max_variations = self.config.MAX_VARIATIONS_PER_LISTING
+        if len(cards) > max_variations:
+            # One description for every shard (a default would otherwise differ per shard title)
+            return self._create_sharded_listing(
+                cards, title, max_variations,
+                description=self._listing_description(description, title), category_id=category_id, price=price, quantity=quantity,
+                condition=condition, images=images, shipping_profile=shipping_profile, publish=publish,
+                fulfillment_policy_id=fulfillment_policy_id, use_base_cards_policy=use_base_cards_policy,
+                schedule_draft=schedule_draft, schedule_hours=schedule_hours
+            )
+        
         condition = condition or self.config.DEFAULT_CONDITION
         
         # Determine which fulfillment policy to use
@@ -128,10 +165,25 @@ class eBayListingManager:
         if not self.policies.get('merchant_location_key'):
             print("Warning: MERCHANT_LOCATION_KEY not set. Some features may not work.")
         
+        description = self._listing_description(description, title)
+        
+        # CRITICAL: Store description for use in the loop
+        # This ensures it's available when creating offers
+        self._current_listing_description = description
+        print(f"[DEBUG] Stored description for listing (length: {len(description)})")
+        print(f"[DEBUG] Description preview: {description[:100]}...")
+        
+        return self._create_listing_via_inventory_api(
+            cards, title, description, category_id, price, quantity, condition, publish, selected_fulfillment_policy_id,
+            images=images
+        )
+    
+    
+    def _listing_description(self, description: Optional[str], title: str) -> str:
+        """The description as given, or the default for this title when it is missing or too short."""
         # Ensure description is provided - eBay requires it and it must be substantial
         # eBay typically requires descriptions to be at least 50-100 characters
         # CRITICAL: Preserve the full description - don't truncate it!
-        original_description = description
         if not description or not description.strip():
             description = None  # Will be set below
         elif len(description.strip()) < 50:
@@ -159,17 +211,110 @@ All cards are in Near Mint or better condition unless otherwise noted.
 
 Please select the specific card you want from the variation dropdown menu."""
             print(f"[INFO] No description provided or too short, using default description (length: {len(description)})")
+        return description
+    
+    def _create_sharded_listing(self, cards: List[Dict], title: str, max_variations: int, max_workers: int = 3, **listing_kwargs) -> Dict:
+        """
+        Create one listing per shard (see listing_shards.plan_shards), concurrently.
         
-        # CRITICAL: Store description for use in the loop
-        # This ensures it's available when creating offers
-        self._current_listing_description = description
-        print(f"[DEBUG] Stored description for listing (length: {len(description)})")
-        print(f"[DEBUG] Description preview: {description[:100]}...")
+        Every shard gets its own title and group but the same description and
+        listing options. Returns an aggregated result with per-shard outcomes.
+        """
+        shards = plan_shards(cards, max_variations)
+        print(f"[SHARDS] {len(cards)} cards exceed the {max_variations}-variation limit - creating {len(shards)} listings:")
+        for summary in summarize_shards(shards):
+            print(f"[SHARDS]   {summary['index']}. {summary['cards']} cards {summary['label']}")
         
-        return self._create_listing_via_inventory_api(
-            cards, title, description, category_id, price, quantity, condition, publish, selected_fulfillment_policy_id
-        )
+        def create_shard(index_shard):
+            index, shard = index_shard
+            shard_listing_title = shard_title(title, shard, index, len(shards))
+            # Separate manager per shard: listing state is per manager, client/policies are shared
+            manager = eBayListingManager(api_client=self.api_client, policies=self.policies)
+            manager.group_key_suffix = f"{self.group_key_suffix}S{index}"
+            try:
+                result = manager.create_variation_listing(shard["cards"], shard_listing_title, **listing_kwargs)
+            except Exception as e:
+                result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+            return {
+                "index": index,
+                "title": shard_listing_title,
+                "label": shard["label"],
+                "cards": len(shard["cards"]),
+                "success": bool(result.get("success")),
+                "listingId": result.get("listingId") or result.get("listing_id"),
+                "group_key": result.get("group_key") or result.get("groupKey"),
+                "itemsCreated": result.get("itemsCreated", 0),
+                "skus": result.get("skus", []),
+                "error": None if result.get("success") else result.get("error")
+            }
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(shards))) as executor:
+            shard_results = list(executor.map(create_shard, enumerate(shards, start=1)))
+        
+        succeeded = [r for r in shard_results if r["success"]]
+        for r in shard_results:
+            print(f"[SHARDS] {'[OK]' if r['success'] else '[ERROR]'} {r['title']}: {r['listingId'] or r['error']}")
+        first = succeeded[0] if succeeded else {}
+        return {
+            "success": len(succeeded) == len(shard_results),
+            "sharded": True,
+            "shards": [{k: v for k, v in r.items() if k != "skus"} for r in shard_results],
+            "listingId": first.get("listingId"),
+            "listingIds": [r["listingId"] for r in succeeded if r["listingId"]],
+            "group_key": first.get("group_key"),
+            "groupKeys": [r["group_key"] for r in succeeded if r["group_key"]],
+            "itemsCreated": sum(r["itemsCreated"] or 0 for r in shard_results),
+            "skus": [sku for r in shard_results for sku in r["skus"]],
+            "error": None if len(succeeded) == len(shard_results) else
+                     f"{len(shard_results) - len(succeeded)} of {len(shard_results)} shard listings failed: " +
+                     "; ".join(f"{r['title']}: {r['error']}" for r in shard_results if not r["success"]),
+            "message": f"Created {len(succeeded)} of {len(shard_results)} listings ({len(cards)} cards)"
+        }
     
+    def _preflight_payloads(
+        self,
+        planned_items: List[Dict],
+        category_id: str,
+        quantity: int,
+        fulfillment_policy_id: str = None,
+        publish: bool = True
+    ) -> Dict:
+        """
+        Validate a listing's payloads before anything is sent (see payload_validator).
+        
+        Checks the inventory items, the variesBy set the group will be built from,
+        and an offer preview per SKU (price, quantity, policies when publishing).
+        """
+        items = {planned["sku"]: planned["inventory_item"] for planned in planned_items}
+        listing_policies = {
+            "fulfillmentPolicyId": fulfillment_policy_id or self.policies.get('fulfillment_policy_id'),
+            "returnPolicyId": self.policies.get('return_policy_id')
+        }
+        offers = [
+            {
+                "sku": planned["sku"],
+                "marketplaceId": "EBAY_US",
+                "format": "FIXED_PRICE",
+                "categoryId": str(category_id),
+                "listingPolicies": listing_policies,
+                "pricingSummary": {"price": {"value": str(planned["price"]), "currency": "USD"}},
+                "availableQuantity": int(planned["card"].get('quantity', quantity))
+            }
+            for planned in planned_items
+        ]
+        variation_group = {
+            "variesBy": {"specifications": [{
+                "name": "Pick Your Card",
+                "values": [planned["variation_value"] for planned in planned_items]
+            }]},
+            "variantSKUs": list(items)
+        }
+        result = validate_listing(items, offers=offers, publish=publish)
+        for key, messages in variation_errors(variation_group, items).items():
+            result["errors"].setdefault(key, []).extend(messages)
+            result["error_count"] += len(messages)
+        result["valid"] = not result["errors"]
+        return result
     
     def _create_listing_via_inventory_api(
         self,
@@ -183,7 +328,8 @@ Please select the specific card you want from the variation dropdown menu."""
         publish: bool,
         fulfillment_policy_id: str = None,
         schedule_draft: bool = False,
-        schedule_hours: int = 24
+        schedule_hours: int = 24,
+        images: List[str] = None
     ) -> Dict:
         # Store cards data for later use in description update
         self._current_cards_data = cards
@@ -227,29 +373,24 @@ Please select the specific card you want from the variation dropdown menu."""
             }
             ebay_condition = condition_map.get(condition, "NEW")
         
+        # Step 0: Pre-flight image check - normalize, dedupe and HEAD-check every image
+        # before any item/group is created, so broken links never reach publish
+        image_preflight = prepare_listing_images(cards, extra_images=images)
+        card_images = image_preflight["card_images"]
+        self._current_image_urls = image_preflight["image_urls"]
+        if not self._current_image_urls:
+            print("[WARNING] No valid images for this listing - eBay may reject the publish")
+        
         # Step 1: Create inventory items for each variation
         print(f"Creating {len(cards)} inventory items...")
+        skus = generate_skus(cards, namespace=title)
+        planned_items = []
         for idx, card in enumerate(cards):
             card_name = card.get('name', 'Unknown')
             card_number = str(card.get('number', idx))
             
-            # Generate SKU - ensure it's unique for each card
-            # Clean card name for SKU (remove special chars, limit length)
-            card_name_clean = card_name.replace(' ', '_').replace("'", '').replace('-', '_').replace('.', '').upper()[:20]
-            # Clean set name
-            set_name_clean = card.get('set_name', 'SET').replace('https://', '').replace('http://', '').replace('www.', '').replace('/', '_').replace(':', '_').replace('.', '_').upper()[:20]
-            # Ensure SKU is unique: use card name, number, and index
-            sku = f"CARD_{set_name_clean}_{card_name_clean}_{card_number}_{idx}".replace(' ', '_').replace('-', '_')
-            # Remove any remaining invalid characters and limit length
-            import re
-            sku = re.sub(r'[^A-Z0-9_]', '', sku)[:50]  # Only alphanumeric and underscore, max 50 chars
-            # Final uniqueness check - add timestamp if needed
-            if idx == 0:
-                base_sku = sku
-            else:
-                # Ensure it's different from previous
-                if sku == base_sku:
-                    sku = f"{sku}_{idx}"
+            # SKU: readable prefix + hash of the card identity - stable across reruns
+            sku = skus[idx]
             
             print(f"[DEBUG] Generated SKU for card {idx} ({card_name} #{card_number}): {sku}")
             
@@ -274,9 +415,8 @@ Please select the specific card you want from the variation dropdown menu."""
                         "values": ["400010"]  # Near Mint or Better value ID
                     }
                 ]
-                import json as json_module
                 print(f"[DEBUG] Using Trading Cards condition: {condition_data}")
-                print(f"[DEBUG] Condition descriptors: {json_module.dumps(condition_descriptors, indent=2)}")
+                print(f"[DEBUG] Condition descriptors: {json.dumps(condition_descriptors, indent=2)}")
             else:
                 # Other categories use simple condition string
                 condition_data = ebay_condition
@@ -284,6 +424,10 @@ Please select the specific card you want from the variation dropdown menu."""
             
             # Build variation value for this card (used in variesBy)
             variation_value = f"{card_number} {card_name}".strip() if card_number else card_name
+            parallel = card.get('parallel_type')
+            if parallel:
+                # Parallel variations share name/number with the base card
+                variation_value = f"{variation_value} {parallel}"
             
             inventory_item = {
                 "product": {
@@ -296,7 +440,7 @@ Please select the specific card you want from the variation dropdown menu."""
                         "Sport": ["Basketball"],  # Default, can be customized
                         "Card Manufacturer": ["Topps"],  # Default, can be customized
                         "Season": ["2024-25"],
-                        "Features": ["Base"],
+                        "Features": ["Parallel/Variety"] if parallel else ["Base"],
                         "Type": ["Sports Trading Card"],
                         "Language": ["English"],
                         "Original/Licensed Reprint": ["Original"],
@@ -323,31 +467,62 @@ Please select the specific card you want from the variation dropdown menu."""
                 }
             }
             
+            if parallel:
+                inventory_item["product"]["aspects"]["Parallel/Variety"] = [parallel]
+                if card.get('numbering'):
+                    inventory_item["product"]["aspects"]["Print Run"] = [card.get('numbering').lstrip('/')]
+            
             # Add conditionDescriptors at ROOT level for Trading Cards (not inside condition)
             if category_id == "261328" or str(category_id) == "261328":
                 if condition_descriptors:
                     inventory_item["conditionDescriptors"] = condition_descriptors
             
             # Debug: Print inventory item structure
-            import json as json_module
             print(f"[DEBUG] Inventory item structure for {sku}:")
-            print(json_module.dumps(inventory_item, indent=2)[:500])
+            print(json.dumps(inventory_item, indent=2)[:500])
             
-            # Add imageUrls only if provided - no default image
-            if card.get('image_url'):
-                inventory_item["product"]["imageUrls"] = [card.get('image_url')]
+            # Add imageUrls only if provided and valid (see pre-flight) - no default image
+            if card_images[idx]:
+                inventory_item["product"]["imageUrls"] = [card_images[idx]]
             else:
                 # No image provided - use empty array
                 inventory_item["product"]["imageUrls"] = []
             
             # Note: Pricing is set at the offer level, not inventory item level
-            
+            planned_items.append({
+                "sku": sku,
+                "card": card,
+                "price": card_price,
+                "variation_value": variation_value,
+                "inventory_item": inventory_item
+            })
+        
+        # Step 1b: Validate every item, the variation set and the offer policies
+        # before any network I/O - a bad listing fails here instead of at publish
+        preflight = self._preflight_payloads(planned_items, category_id, quantity, fulfillment_policy_id, publish)
+        if not preflight["valid"]:
+            summary = format_validation_errors(preflight["errors"])
+            print(f"[ERROR] Listing payloads failed validation ({preflight['error_count']} error(s)) - nothing was sent to eBay:")
+            print(summary)
+            return {
+                "success": False,
+                "error": f"Listing failed validation before anything was sent to eBay:\n{summary}",
+                "validation_errors": preflight["errors"],
+                "errors": []
+            }
+        
+        # Step 1c: Create the inventory items
+        for planned in planned_items:
+            sku, card, inventory_item = planned["sku"], planned["card"], planned["inventory_item"]
+            card_name = card.get('name', 'Unknown')
+            card_number = str(card.get('number', ''))
             result = self.api_client.create_inventory_item(sku, inventory_item)
             if result.get("success"):
                 created_items.append({
                     "sku": sku,
                     "card": card,
-                    "price": card_price
+                    "price": planned["price"],
+                    "variation_value": planned["variation_value"]
                 })
                 print(f"  [OK] Created item: {sku}")
             else:
@@ -356,7 +531,6 @@ Please select the specific card you want from the variation dropdown menu."""
                 # Try to parse JSON error if possible
                 if isinstance(error_detail, str):
                     try:
-                        import json
                         error_json = json.loads(error_detail)
                         error_msg = error_json.get('errors', [{}])[0].get('message', error_detail) if isinstance(error_json, dict) else error_detail
                     except:
@@ -391,28 +565,8 @@ Please select the specific card you want from the variation dropdown menu."""
         # Step 2: Create inventory item group for variations
         print(f"Creating inventory item group...")
         set_name = cards[0].get('set_name', 'SET')
-        # Clean set_name for group key - eBay requires ONLY alphanumeric (no underscores, dashes, etc.)
-        # Max 50 characters total
-        import re
-        # Remove all non-alphanumeric characters
-        set_name_clean = re.sub(r'[^a-zA-Z0-9]', '', set_name.replace('https://', '').replace('http://', '').replace('www.', '').upper())
-        # Limit length to leave room for timestamp
-        set_name_clean = set_name_clean[:20] if len(set_name_clean) > 20 else set_name_clean
-        if not set_name_clean:
-            set_name_clean = "CARDSET"
-        
-        # Generate group key - ONLY alphanumeric, max 50 chars
-        # Format: GROUP + set_name + timestamp (all alphanumeric)
-        timestamp = str(int(time.time()))  # Timestamp for uniqueness
-        # Calculate max length for set_name to keep total under 50
-        max_set_len = 50 - len("GROUP") - len(timestamp)
-        if len(set_name_clean) > max_set_len:
-            set_name_clean = set_name_clean[:max_set_len]
-        
-        group_key = f"GROUP{set_name_clean}{timestamp}"  # No underscores or special chars
-        
-        # Final validation - ensure it's only alphanumeric and under 50 chars
-        group_key = re.sub(r'[^A-Z0-9]', '', group_key.upper())[:50]
+        # Group key: GROUP + set name + timestamp (+ shard suffix) - alphanumeric only, max 50 chars
+        group_key = self._new_group_key(set_name)
         
         print(f"[DEBUG] Generated group key: {group_key} (length: {len(group_key)}, alphanumeric only: {group_key.isalnum()})")
         
@@ -420,23 +574,9 @@ Please select the specific card you want from the variation dropdown menu."""
         # Based on user's working listings, they use a single aspect like "PICK YOUR BASE/PARALLEL/INSERT"
         # with values like "9 Tyger Campbell - UCLA 1st", "12 Rasir Bolton - Gonzaga 1st", etc.
         
-        # Build full card descriptions for variation values
-        variation_values = []
-        for card in cards:
-            card_name = card.get('name', '')
-            card_number = str(card.get('number', ''))
-            
-            # Build variation value: "Number Name" or "Name" if no number
-            if card_number and card_number.strip():
-                variation_value = f"{card_number} {card_name}".strip()
-            else:
-                variation_value = card_name.strip()
-            
-            # Add "1st" suffix if it's a rookie (you can detect this from card data if available)
-            # For now, just use the card name/number as-is
-            
-            if variation_value:
-                variation_values.append(variation_value)
+        # Variation values are the items' own "Pick Your Card" aspect values, so
+        # variesBy always matches the variants that were actually created
+        variation_values = [item["variation_value"] for item in created_items if item["variation_value"]]
         
         if not variation_values:
             return {
@@ -506,7 +646,6 @@ Please select the specific card you want from the variation dropdown menu."""
         # Build group data - eBay error suggests title might be required in group
         # Try with title first (despite docs saying otherwise)
         # The error "title = None" suggests eBay is checking for title and finding None
-        import json
         
         # Based on eBay API docs, title should be at ROOT level, not inside inventoryItemGroup
         # Structure: { "title": "...", "inventoryItemGroup": {...}, "variantSKUs": [...] }
@@ -548,7 +687,6 @@ Please select the specific card you want from the variation dropdown menu."""
         # This is required for publishOfferByInventoryItemGroup to work
         # Ensure description is valid - use the function parameter 'description'
         # CRITICAL: Strip ALL HTML tags for variation listings - eBay requires plain text
-        import re
         raw_description = description if description else getattr(self, '_current_listing_description', '')
         
         # Aggressively strip HTML tags and convert to plain text
@@ -651,17 +789,9 @@ This listing allows you to choose from multiple card options, each with individu
             "imageUrls": []  # Will be populated from card images
         }
         
-        # CRITICAL: Populate imageUrls from card images (REQUIRED for publishing)
-        # Collect unique image URLs from all cards
-        image_urls_set = set()
-        for item in created_items:
-            card = item.get("card", {})
-            image_url = card.get('image_url') or card.get('imageUrl')
-            if image_url:
-                image_urls_set.add(image_url)
-        
-        # Only use images from cards - no default image
-        clean_group_data["imageUrls"] = list(image_urls_set) if image_urls_set else []
+        # CRITICAL: Populate imageUrls (REQUIRED for publishing) from the pre-flight
+        # result: validated, normalized, deduped and capped at the per-listing limit
+        clean_group_data["imageUrls"] = list(self._current_image_urls)
         print(f"[DEBUG] [CRITICAL] Added {len(clean_group_data['imageUrls'])} image URL(s) to group")
         print(f"[DEBUG] Image URLs: {clean_group_data['imageUrls']}")
         
@@ -836,7 +966,6 @@ This listing allows you to choose from multiple card options, each with individu
             if '25703' in str(error_detail) or 'already a member of another group' in str(error_detail).lower():
                 print(f"[DEBUG] [ERROR 25703] SKUs are already in a group. Attempting to resolve...")
                 
-                import re
                 # Try multiple patterns to extract the old group ID
                 old_group_id = None
                 problematic_sku = None
@@ -850,7 +979,6 @@ This listing allows you to choose from multiple card options, each with individu
                 # Pattern 2: Extract from parameters in JSON response
                 if not old_group_id and raw_response:
                     try:
-                        import json
                         error_json = json.loads(raw_response)
                         if 'errors' in error_json and len(error_json['errors']) > 0:
                             params = error_json['errors'][0].get('parameters', [])
@@ -998,15 +1126,7 @@ This listing allows you to choose from multiple card options, each with individu
                                         print(f"[DEBUG] [25703] [WARNING] Could not update offer: {update_result.get('error')}")
                         
                         # Generate a new unique group key
-                        new_timestamp = str(int(time.time()))
-                        set_name_clean = re.sub(r'[^A-Z0-9]', '', set_name.replace('https://', '').replace('http://', '').replace('www.', '').upper())[:20]
-                        if not set_name_clean:
-                            set_name_clean = "CARDSET"
-                        max_set_len = 50 - len("GROUP") - len(new_timestamp)
-                        if len(set_name_clean) > max_set_len:
-                            set_name_clean = set_name_clean[:max_set_len]
-                        group_key = f"GROUP{set_name_clean}{new_timestamp}"
-                        group_key = re.sub(r'[^A-Z0-9]', '', group_key.upper())[:50]
+                        group_key = self._new_group_key(set_name)
                         
                         print(f"[DEBUG] New group key: {group_key}")
                         
@@ -1096,10 +1216,8 @@ This listing allows you to choose from multiple card options, each with individu
                         "variantSKUs": [item["sku"] for item in created_items]
                     }
                     # Generate alphanumeric-only group key for single aspect attempt
-                    import re
-                    base_key = re.sub(r'[^A-Z0-9]', '', group_key.upper())[:40]  # Leave room for suffix
-                    group_key_single = f"{base_key}SA{int(time.time()) % 10000}"  # SA = Single Aspect
-                    group_key_single = re.sub(r'[^A-Z0-9]', '', group_key_single.upper())[:50]  # Ensure alphanumeric only
+                    # SA = Single Aspect
+                    group_key_single = f"{alnum_part(group_key, 40)}SA{int(time.time()) % 10000}"
                     group_result = self.api_client.create_inventory_item_group(group_key_single, clean_group_data_single)
                     if group_result.get("success"):
                         group_key = group_key_single
@@ -1176,7 +1294,6 @@ This listing allows you to choose from multiple card options, each with individu
         # Calculate listingStartDate if schedule_draft is enabled (do this once before the loop)
         listing_start_date = None
         if schedule_draft and publish:
-            from datetime import datetime, timedelta, timezone
             # Use a longer delay (at least 24 hours, or use schedule_hours if it's longer)
             # This ensures the listing stays in "Scheduled" status long enough to be edited
             actual_hours = max(schedule_hours, 24)  # Minimum 24 hours to ensure it's scheduled
@@ -1232,7 +1349,6 @@ This listing allows you to choose from multiple card options, each with individu
             # Ensure description is valid and not empty
             # eBay requires a description - it cannot be empty or just whitespace
             # CRITICAL: Strip HTML from description for offers too
-            import re
             raw_listing_desc = description if description else ''
             
             # Strip HTML tags from offer description
@@ -1334,7 +1450,6 @@ Thank you for your interest!"""
                 item_specifics["Sport"] = ["Basketball"]
             
             # Try to extract season/year
-            import re
             year_match = re.search(r'20\d{2}', group_title)
             if year_match:
                 year = year_match.group()
@@ -1391,7 +1506,6 @@ Thank you for your interest!"""
             print(f"  [SCHEDULE] ✅ Added listingStartDate to offer {sku}: {listing_start_date}")
         elif schedule_draft and publish:
             # Safety check: if schedule_draft is True but listing_start_date wasn't set, calculate it now
-            from datetime import datetime, timedelta, timezone
             # Use longer delay for production to ensure scheduled status
             min_hours = 48 if self.config.EBAY_ENVIRONMENT == 'production' else 24
             actual_hours = max(schedule_hours, min_hours)
@@ -1414,7 +1528,6 @@ Thank you for your interest!"""
                 print(f"  [DEBUG] ❌ This will cause the listing to NOT appear in Scheduled section!")
                 # Try to fix it
                 if not listing_start_date:
-                    from datetime import datetime, timedelta, timezone
                     min_hours = 48 if self.config.EBAY_ENVIRONMENT == 'production' else 24
                     actual_hours = max(schedule_hours, min_hours)
                     try:
@@ -1498,7 +1611,6 @@ Thank you for your interest!"""
             elif schedule_draft and publish:
                 # Safety check: ensure listingStartDate is in update
                 if not listing_start_date:
-                    from datetime import datetime, timedelta, timezone
                     # Use longer delay for production to ensure scheduled status
                     min_hours = 48 if self.config.EBAY_ENVIRONMENT == 'production' else 24
                     actual_hours = max(schedule_hours, min_hours)
@@ -1519,7 +1631,6 @@ Thank you for your interest!"""
                     print(f"  [DEBUG] ❌ ERROR: listingStartDate is MISSING from update_offer_data for {sku}!")
                     # Force add it
                     if not listing_start_date:
-                        from datetime import datetime, timedelta, timezone
                         min_hours = 48 if self.config.EBAY_ENVIRONMENT == 'production' else 24
                         actual_hours = max(schedule_hours, min_hours)
                         try:
@@ -1707,7 +1818,6 @@ All cards are in Near Mint or better condition unless otherwise noted."""
         
         # Get the description to use
         # CRITICAL: Strip HTML tags - eBay may require plain text for variation listings
-        import re
         raw_desc = description if description else getattr(self, '_current_listing_description', '')
         
         # Strip HTML tags but keep the text content and preserve newlines
@@ -1859,7 +1969,6 @@ All cards are in Near Mint or better condition unless otherwise noted."""
                 raise Exception("CRITICAL: Cannot proceed without description in group!")
             
             print(f"[CRITICAL] Full update payload:")
-            import json
             print(json.dumps(update_group_data, indent=2))
             print(f"[CRITICAL] ===================================================")
             
@@ -1870,6 +1979,7 @@ All cards are in Near Mint or better condition unless otherwise noted."""
             if update_result.get('success'):
                 print(f"[CRITICAL] [OK] Group updated with description!")
                 print(f"[CRITICAL] Description location: inventoryItemGroup.description")
+                # Always wait: the group was PUT when it was created earlier in this flow
                 print(f"[CRITICAL] Waiting 10 seconds for eBay to fully process and persist the description...")
                 time.sleep(10)  # Reduced wait time for faster response
                 
@@ -2095,7 +2205,6 @@ This is a variation listing where you can select from multiple card options. Eac
                 # Get description to use - STRIP HTML for offers
                 raw_offer_desc = description if description else getattr(self, '_current_listing_description', '')
                 # Strip HTML from offer description
-                import re
                 if raw_offer_desc:
                     offer_description = re.sub(r'</(p|div|br|li|h[1-6])>', '\n', raw_offer_desc, flags=re.IGNORECASE)
                     offer_description = re.sub(r'<[^>]+>', '', offer_description)
@@ -2153,7 +2262,6 @@ All cards are in Near Mint or better condition unless otherwise noted."""
                             print(f"  [SCHEDULE] Added listingStartDate to offer update: {listing_start_date}")
                         elif schedule_draft and publish:
                             # Safety check: ensure listingStartDate is included
-                            from datetime import datetime, timedelta
                             min_hours = 48 if self.config.EBAY_ENVIRONMENT == 'production' else 24
                             actual_hours = max(schedule_hours, min_hours)
                             try:
@@ -2315,7 +2423,6 @@ All cards are in Near Mint or better condition unless otherwise noted."""
                         title_final = final_data.get('title', group_title)
                         
                         # Use the description parameter and aggressively strip ALL HTML
-                        import re
                         raw_final_desc = description if description else getattr(self, '_current_listing_description', '')
                         
                         # Aggressively strip ALL HTML tags and convert to plain text
@@ -2391,21 +2498,12 @@ This is a variation listing where you can select from multiple card options. Eac
                         # CRITICAL: imageUrls is REQUIRED for publishing - must have at least one
                         # If no images from cards, we need to add a minimal placeholder
                         if not final_update_payload.get('imageUrls') or len(final_update_payload.get('imageUrls', [])) == 0:
-                            # Try to get images from inventory items
-                            variant_skus = final_update_payload.get('variantSKUs', [])
-                            image_urls_from_items = []
-                            for sku in variant_skus[:1]:  # Just check first item
-                                item_result = self.api_client.get_inventory_item(sku)
-                                if item_result.get('success'):
-                                    item_data = item_result.get('data', {})
-                                    product = item_data.get('product', {})
-                                    item_images = product.get('imageUrls', [])
-                                    if item_images:
-                                        image_urls_from_items.extend(item_images)
+                            # Use the images validated in the pre-flight step (no refetch of items)
+                            image_urls_from_items = getattr(self, '_current_image_urls', [])
                             
                             if image_urls_from_items:
-                                final_update_payload['imageUrls'] = image_urls_from_items[:1]  # Use first image
-                                print(f"[WORKAROUND] Using image from inventory item: {final_update_payload['imageUrls']}")
+                                final_update_payload['imageUrls'] = list(image_urls_from_items)
+                                print(f"[WORKAROUND] Using pre-flight validated images: {final_update_payload['imageUrls']}")
                             else:
                                 # CRITICAL: eBay requires at least one image for variation listings
                                 # Use a minimal valid eBay image URL (must be from eBay CDN)
@@ -2423,7 +2521,11 @@ This is a variation listing where you can select from multiple card options. Eac
                         # Try up to 3 times with increasing wait times (increased for better persistence)
                         for retry_attempt in range(1, 4):
                             print(f"[WORKAROUND] Update attempt #{retry_attempt}...")
-                            final_update_result = self.api_client.create_inventory_item_group(group_key, final_update_payload)
+                            # force=True: re-sending the same payload is the point - it re-triggers
+                            # description propagation, so delta tracking must not skip it
+                            final_update_result = self.api_client.create_inventory_item_group(
+                                group_key, final_update_payload, force=True
+                            )
                             if final_update_result.get('success'):
                                 wait_time = 10 * retry_attempt  # 10, 20, 30 seconds (increased for better persistence)
                                 print(f"[WORKAROUND] Update successful - waiting {wait_time} seconds for persistence...")
@@ -2862,7 +2964,12 @@ Thank you for your interest!"""
             if not publish_result.get("success"):
                 error_detail = publish_result.get('error', 'Unknown error')
                 raw_response = publish_result.get('raw_response', '')
-                debug_info = publish_result.get('debug_info', {})
+                # One concurrent snapshot of group, offers and policies, checked locally
+                debug_info = publish_result.get('debug_info') or self.api_client.diagnose_publish_failure(
+                    group_key,
+                    fulfillment_policy_id=fulfillment_policy_id or self.policies.get('fulfillment_policy_id'),
+                    return_policy_id=self.policies.get('return_policy_id')
+                )
                 
                 # Enhanced error message with debug info
                 error_message = f"Failed to publish variation listing: {error_detail}"
@@ -2870,23 +2977,17 @@ Thank you for your interest!"""
                 # Add detailed debugging for Error 25016 (Description)
                 if '25016' in str(error_detail) or '25016' in str(raw_response):
                     # CRITICAL: Check if group actually has description
-                    print(f"[CRITICAL ERROR 25016] Checking group for description...")
-                    group_check = self.api_client.get_inventory_item_group(group_key)
-                    if group_check.get('success'):
-                        group_data_check = group_check.get('data', {})
-                        if 'inventoryItemGroup' in group_data_check:
-                            desc_in_group = group_data_check['inventoryItemGroup'].get('description', '')
-                            if desc_in_group and len(desc_in_group.strip()) >= 50:
-                                print(f"[CRITICAL ERROR 25016] Group HAS description (length: {len(desc_in_group)})")
-                                print(f"[CRITICAL ERROR 25016] This is strange - eBay should accept it!")
-                            else:
-                                print(f"[CRITICAL ERROR 25016] Group does NOT have valid description!")
-                                print(f"[CRITICAL ERROR 25016] Description in group: {desc_in_group[:100] if desc_in_group else 'NONE'}")
-                                print(f"[CRITICAL ERROR 25016] This confirms the problem!")
+                    group_summary = debug_info.get('group')
+                    if group_summary:
+                        desc_length = group_summary['description_length']
+                        if desc_length >= 50:
+                            print(f"[CRITICAL ERROR 25016] Group HAS description (length: {desc_length})")
+                            print(f"[CRITICAL ERROR 25016] This is strange - eBay should accept it!")
                         else:
-                            print(f"[CRITICAL ERROR 25016] inventoryItemGroup not found in group!")
+                            print(f"[CRITICAL ERROR 25016] Group does NOT have valid description (length: {desc_length})!")
+                            print(f"[CRITICAL ERROR 25016] This confirms the problem!")
                     else:
-                        print(f"[CRITICAL ERROR 25016] Could not retrieve group: {group_check.get('error')}")
+                        print(f"[CRITICAL ERROR 25016] Could not retrieve group: {debug_info.get('issues_found')}")
                     
                     error_message += "\n\n" + "=" * 80
                     error_message += "\n🔍 COMPREHENSIVE DEBUGGING FOR ERROR 25016 (DESCRIPTION REQUIRED)"
@@ -2909,7 +3010,6 @@ Thank you for your interest!"""
                         error_message += f"  SKU List: {variant_skus[:5]}\n"
                         
                         error_message += "\n[3. DETAILED OFFER INSPECTION]\n"
-                        import json
                         for idx, sku in enumerate(variant_skus[:5], 1):
                             error_message += f"\n  --- Offer {idx}: {sku} ---\n"
                             offer_result = self.api_client.get_offer_by_sku(sku)
@@ -3533,7 +3633,6 @@ Thank you for your interest!"""
             }
         except Exception as e:
             print(f"[FINAL CHECK] ❌ Error in comprehensive search: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -3552,43 +3651,14 @@ Thank you for your interest!"""
             
             endpoint = "/sell/inventory/v1/offer"
             
-            # Try multiple pagination requests to get all offers
-            all_offers = []
-            offset = 0
-            limit = 200
-            max_pages = 10  # Limit to prevent infinite loops
-            
-            for page in range(max_pages):
-                params = {"limit": limit, "offset": offset}
-                print(f"[SEARCH ALL] Fetching offers (offset: {offset}, limit: {limit})...")
-                response = self.api_client._make_request('GET', endpoint, params=params)
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        page_offers = data.get('offers', [])
-                        all_offers.extend(page_offers)
-                        print(f"[SEARCH ALL]   Found {len(page_offers)} offers on this page (total so far: {len(all_offers)})")
-                        
-                        if len(page_offers) < limit:
-                            # Last page
-                            break
-                        offset += limit
-                    except json.JSONDecodeError as e:
-                        print(f"[SEARCH ALL] ❌ Error parsing response: {e}")
-                        break
-                else:
-                    print(f"[SEARCH ALL] ❌ API request failed: {response.status_code}")
-                    print(f"[SEARCH ALL] Response: {response.text[:500]}")
-                    break
-            
-            print(f"[SEARCH ALL] Total offers retrieved: {len(all_offers)}")
-            
-            # Search for matching offers
+            # Stream every offer (pages fetched concurrently, no page cap), keeping only this group's
             matching_offers = []
-            for offer in all_offers:
-                offer_group_key = offer.get('inventoryItemGroupKey', '')
-                if offer_group_key == group_key:
+            searched = 0
+            try:
+                for offer in self.api_client.iter_collection(endpoint, 'offers'):
+                    searched += 1
+                    if offer.get('inventoryItemGroupKey', '') != group_key:
+                        continue
                     listing = offer.get('listing', {})
                     # Check both status fields (offer.status and listing.listingStatus)
                     offer_status = offer.get('status', 'UNKNOWN')
@@ -3612,6 +3682,10 @@ Thank you for your interest!"""
                         "is_scheduled": bool(start_date) and bool(listing_id),
                         "is_active": bool(listing_id) and not bool(start_date)
                     })
+            except requests.HTTPError as e:
+                print(f"[SEARCH ALL] ❌ {e} - searching the {searched} offers fetched so far")
+            
+            print(f"[SEARCH ALL] Total offers searched: {searched}")
             
             if matching_offers:
                 print(f"[SEARCH ALL] ✅ Found {len(matching_offers)} offers for this group!")
@@ -3645,11 +3719,11 @@ Thank you for your interest!"""
                     "found": True,
                     "offers": matching_offers,
                     "count": len(matching_offers),
-                    "total_offers_searched": len(all_offers)
+                    "total_offers_searched": searched
                 }
             else:
                 print(f"[SEARCH ALL] ❌ No offers found for group {group_key}")
-                print(f"[SEARCH ALL] Searched through {len(all_offers)} total offers")
+                print(f"[SEARCH ALL] Searched through {searched} total offers")
                 print(f"[SEARCH ALL] This means:")
                 print(f"  1. Offers may not be created yet")
                 print(f"  2. Offers may be in a different account/environment")
@@ -3657,7 +3731,6 @@ Thank you for your interest!"""
                 return None
         except Exception as e:
             print(f"[SEARCH ALL] ❌ Error: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -3725,9 +3798,7 @@ Thank you for your interest!"""
                         
                         # Parse and show when it will go live
                         try:
-                            from datetime import datetime
                             start_dt = datetime.fromisoformat(listing_start_date.replace('Z', '+00:00'))
-                            from datetime import timezone
                             try:
                                 now = datetime.now(timezone.utc)
                             except (OSError, ValueError):
@@ -3777,7 +3848,6 @@ Thank you for your interest!"""
             
         except Exception as e:
             print(f"[VERIFY] ❌ Error during verification: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -3875,7 +3945,6 @@ Thank you for your interest!"""
             
         except Exception as e:
             print(f"[VERIFY DRAFT] ❌ Error during verification: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -3933,7 +4002,6 @@ Thank you for your interest!"""
                     
                 except Exception as e:
                     print(f"[FIND LISTING] Error parsing offers response: {e}")
-                    import traceback
                     traceback.print_exc()
             else:
                 print(f"[FIND LISTING] ❌ API request failed: {response.status_code}")
@@ -3944,7 +4012,6 @@ Thank you for your interest!"""
             return None
         except Exception as e:
             print(f"[FIND LISTING] ❌ Exception searching for listing: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
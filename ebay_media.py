@@ -0,0 +1,242 @@
+"""Upload local card photos to eBay Picture Services via the Media API.
+
+Images are identified by content hash. A persistent index maps each hash to the
+EPS URL eBay returned, so re-listing the same cards never re-uploads a photo.
+Oversized photos are downsized/re-encoded in a process pool before upload.
+"""
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from config import Config
+import http_session
+
+MEDIA_API_URLS = {
+    'production': 'https://apim.ebay.com',
+    'sandbox': 'https://apim.sandbox.ebay.com'
+}
+CREATE_IMAGE_ENDPOINT = "/commerce/media/v1_beta/image/create_image_from_file"
+GET_IMAGE_ENDPOINT = "/commerce/media/v1_beta/image/{image_id}"
+
+# Persistent content-hash -> EPS URL index
+IMAGE_INDEX_FILE = ".ebay_image_index.json"
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff')
+
+# eBay recommends 1600px on the longest side; larger files only cost upload time
+MAX_DIMENSION = 1600
+MAX_UPLOAD_BYTES = 2 * 1024 * 1024
+JPEG_QUALITY = 90
+
+
+def hash_image_file(path: str) -> str:
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prepare_image_file(path: str, max_dimension: int = MAX_DIMENSION, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[bytes, str]:
+    """
+    Read an image and downsize/re-encode it to JPEG if it is oversized.
+
+    Module-level so it can run in a ProcessPoolExecutor. Returns (data, filename).
+    Without Pillow installed the original bytes are returned unchanged.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    filename = os.path.basename(path)
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return data, filename
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= max_dimension and len(data) <= max_bytes:
+                return data, filename
+            img = img.convert('RGB')
+            img.thumbnail((max_dimension, max_dimension))
+            out = io.BytesIO()
+            img.save(out, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    except Exception as e:
+        print(f"[WARNING] Could not re-encode {filename}, uploading original: {e}")
+        return data, filename
+
+    return out.getvalue(), f"{os.path.splitext(filename)[0]}.jpg"
+
+
+class eBayMediaUploader:
+    """Uploads local images through the eBay Media API with a content-hash cache."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        index_file: str = IMAGE_INDEX_FILE,
+        max_workers: int = 4,
+        process_workers: Optional[int] = None
+    ):
+        self.config = Config()
+        self.token = token or self.config.ebay_token
+        if not self.token:
+            raise ValueError("No eBay token available. Please check your .env file or run OAuth login.")
+        self.base_url = (base_url or MEDIA_API_URLS.get(self.config.EBAY_ENVIRONMENT, MEDIA_API_URLS['sandbox'])).rstrip('/')
+        self.index_file = index_file
+        self.max_workers = max_workers
+        self.process_workers = process_workers
+        self.session = http_session.new_session()
+        self.session.headers.update({"Authorization": f"Bearer {self.token}"})
+        self._index_lock = threading.Lock()
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not self.index_file or not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[WARNING] Could not read image index {self.index_file}: {e}")
+            return {}
+
+    def save_index(self):
+        """Write the hash index to disk (atomic replace)."""
+        if not self.index_file:
+            return
+        with self._index_lock:
+            snapshot = dict(self.index)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    def _upload_bytes(self, data: bytes, filename: str) -> Dict:
+        """Upload one image and resolve its EPS URL."""
+        url = f"{self.base_url}{CREATE_IMAGE_ENDPOINT}"
+        try:
+            response = self.session.post(url, files={"image": (filename, data)})
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        if response.status_code not in (200, 201):
+            error_text = response.text
+            try:
+                errors = response.json().get('errors', [])
+                if errors:
+                    error_text = f"{errors[0].get('message', error_text)} (Error ID: {errors[0].get('errorId', '')})"
+            except Exception:
+                pass
+            return {"success": False, "error": f"HTTP {response.status_code}: {error_text[:500]}", "status_code": response.status_code}
+
+        # The image URL is either in the body or behind the Location header
+        image_url = None
+        try:
+            image_url = response.json().get('imageUrl')
+        except Exception:
+            pass
+        if not image_url:
+            location = response.headers.get('Location', '')
+            image_id = location.rstrip('/').split('/')[-1] if location else ''
+            if not image_id:
+                return {"success": False, "error": "Media API response has no imageUrl or Location header"}
+            get_response = self.session.get(f"{self.base_url}{GET_IMAGE_ENDPOINT.format(image_id=image_id)}")
+            if get_response.status_code != 200:
+                return {"success": False, "error": f"Could not fetch uploaded image {image_id}: HTTP {get_response.status_code}"}
+            image_url = get_response.json().get('imageUrl')
+        if not image_url:
+            return {"success": False, "error": "Media API did not return an image URL"}
+        return {"success": True, "url": image_url}
+
+    def _prepare_all(self, paths: List[str]) -> List[Tuple[bytes, str]]:
+        """Downsize/re-encode in a process pool (CPU-bound), inline for tiny batches."""
+        if len(paths) < 2 or self.process_workers == 0:
+            return [prepare_image_file(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=self.process_workers) as executor:
+            return list(executor.map(prepare_image_file, paths))
+
+    def upload_images(self, paths: List[str]) -> Dict[str, Dict]:
+        """
+        Upload local images, skipping any whose content was uploaded before.
+
+        Returns {path: {'success', 'url', 'cached', 'hash', 'error'}}.
+        """
+        start = time.time()
+        results = {}
+        existing_paths = []
+        for path in paths:
+            if os.path.isfile(path):
+                existing_paths.append(path)
+            else:
+                results[path] = {"success": False, "url": None, "cached": False, "error": "File not found"}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hashes = dict(zip(existing_paths, executor.map(hash_image_file, existing_paths)))
+
+        # One upload per distinct content hash that is not in the index yet
+        to_upload = {}
+        for path, content_hash in hashes.items():
+            if content_hash not in self.index and content_hash not in to_upload:
+                to_upload[content_hash] = path
+
+        uploaded = {}
+        if to_upload:
+            print(f"[MEDIA] Uploading {len(to_upload)} new image(s) ({len(hashes) - len(to_upload)} already hosted)...")
+            prepared = self._prepare_all(list(to_upload.values()))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                upload_results = list(executor.map(lambda item: self._upload_bytes(*item), prepared))
+            for content_hash, upload_result in zip(to_upload, upload_results):
+                uploaded[content_hash] = upload_result
+                if upload_result.get('success'):
+                    with self._index_lock:
+                        self.index[content_hash] = {
+                            "url": upload_result['url'],
+                            "file": os.path.basename(to_upload[content_hash]),
+                            "uploaded_at": int(time.time())
+                        }
+            self.save_index()
+
+        for path, content_hash in hashes.items():
+            if content_hash in uploaded and not uploaded[content_hash].get('success'):
+                results[path] = {"success": False, "url": None, "cached": False, "hash": content_hash,
+                                 "error": uploaded[content_hash].get('error')}
+            else:
+                results[path] = {"success": True, "url": self.index[content_hash]['url'],
+                                 "cached": content_hash not in uploaded, "hash": content_hash, "error": None}
+
+        ok = sum(1 for r in results.values() if r.get('success'))
+        print(f"[MEDIA] {ok}/{len(paths)} image(s) hosted in {time.time() - start:.1f}s ({len(to_upload)} uploaded)")
+        return results
+
+    def upload_directory(self, directory: str = "Pictures") -> Dict[str, Dict]:
+        """Upload every image file in a directory."""
+        paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        return self.upload_images(paths)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    targets = sys.argv[1:] or ["Pictures"]
+    uploader = eBayMediaUploader()
+    all_results = {}
+    for target in targets:
+        if os.path.isdir(target):
+            all_results.update(uploader.upload_directory(target))
+        else:
+            all_results.update(uploader.upload_images([target]))
+
+    for path, result in all_results.items():
+        status = "CACHED" if result.get('cached') else ("OK" if result.get('success') else "ERROR")
+        print(f"  [{status}] {path} -> {result.get('url') or result.get('error')}")
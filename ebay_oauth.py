@@ -8,6 +8,7 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Dict, Optional
 from config import Config
+import http_session
 import os
 
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
@@ -284,7 +285,7 @@ class eBayOAuth:
         print(f"  Code: {auth_code[:20]}...")
         
         try:
-            response = requests.post(self.token_url, headers=headers, data=data, timeout=30)
+            response = http_session.post(self.token_url, headers=headers, data=data, timeout=30)
             
             # Check for server errors
             if response.status_code == 500:
@@ -445,7 +446,7 @@ class eBayOAuth:
         }
         
         try:
-            response = requests.post(self.token_url, headers=headers, data=data)
+            response = http_session.post(self.token_url, headers=headers, data=data)
             response.raise_for_status()
             
             token_data = response.json()
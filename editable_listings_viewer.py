@@ -1,101 +1,105 @@
 """
 Generate an editable HTML page for viewing and editing listings.
 Allows adding images and preparing for production migration.
+
+Listings come from the local inventory snapshot (see listing_report.py), and
+only listings that changed since the last run are rendered again. Large
+accounts are split into pages of LISTING_REPORT_PAGE_SIZE listings.
+
+    python editable_listings_viewer.py            # reuse a recent snapshot
+    python editable_listings_viewer.py --refresh  # re-read the account first
 """
+import argparse
 import sys
 import os
 import json
-from ebay_api_client import eBayAPIClient
 from config import Config
+from listing_report import ReportWriter, content_hash, listing_rows, load_snapshot, page_nav
 from datetime import datetime
 
-def generate_editable_html():
-    """Generate editable HTML file with all listings."""
-    print("=" * 80)
-    print("Generating Editable Listings Viewer")
-    print("=" * 80)
-    print()
-    
-    config = Config()
-    client = eBayAPIClient()
-    
-    print(f"Environment: {config.EBAY_ENVIRONMENT.upper()}")
-    print("Fetching listings...")
-    print()
-    
-    # Get inventory items
-    items_response = client._make_request('GET', '/sell/inventory/v1/inventory_item', params={'limit': 100})
-    
-    if items_response.status_code != 200:
-        print(f"[ERROR] Failed to fetch inventory items: {items_response.status_code}")
-        return
-    
-    items_data = items_response.json()
-    inventory_items = items_response.json().get('inventoryItems', [])
-    print(f"Found {len(inventory_items)} inventory item(s)")
-    
-    # Get offers for each item
-    offers_with_details = []
-    print("Fetching offer details...")
+
+def listing_key(sku):
+    """Stable DOM id suffix for a listing (SKUs may contain characters ids can't)."""
+    return content_hash(sku)[:12]
+
+
+def render_editable_card(listing):
+    """HTML of one editable listing card."""
+    key = listing_key(listing['sku'])
+    status_class = 'status-draft' if not listing['listing_id'] else 'status-published'
+    status_text = 'Draft' if not listing['listing_id'] else 'Published'
     
-    for i, item in enumerate(inventory_items, 1):
-        sku = item.get('sku')
-        if sku:
-            print(f"  [{i}/{len(inventory_items)}] {sku[:50]}...")
-            offer_result = client.get_offer_by_sku(sku)
-            if offer_result.get('success') and offer_result.get('offer'):
-                offer = offer_result['offer']
-                
-                # Get title
-                title = (
-                    offer.get('listing', {}).get('title', '') or
-                    offer.get('title', '') or
-                    offer.get('product', {}).get('title', '') or
-                    'Untitled Listing'
-                )
-                
-                listing_id = offer.get('listingId')
-                offer_id = offer.get('offerId')
-                group_key = offer.get('inventoryItemGroupKey', '')
-                status = offer.get('status', 'UNKNOWN')
-                
-                # Get pricing
-                pricing = offer.get('pricingSummary', {})
-                price = pricing.get('price', {}).get('value', 'N/A') if pricing else 'N/A'
-                currency = pricing.get('price', {}).get('currency', 'USD') if pricing else 'USD'
-                
-                # Get quantity
-                quantity = offer.get('availableQuantity', offer.get('quantity', 'N/A'))
-                
-                # Get description
-                description = offer.get('listing', {}).get('description', '') or ''
-                
-                # Get category
-                category_id = offer.get('categoryId', 'N/A')
-                
-                # Get existing images
-                images = offer.get('listing', {}).get('imageUrls', []) or []
-                
-                offers_with_details.append({
-                    'title': title,
-                    'sku': sku,
-                    'offer_id': offer_id,
-                    'listing_id': listing_id,
-                    'group_key': group_key,
-                    'status': status,
-                    'price': price,
-                    'currency': currency,
-                    'quantity': quantity,
-                    'description': description,
-                    'category_id': category_id,
-                    'images': images
-                })
+    if listing['status'] == 'UNPUBLISHED':
+        status_class = 'status-unpublished'
+        status_text = 'Unpublished'
     
-    print()
-    print(f"Found {len(offers_with_details)} listings with details")
-    print()
+    listing_url = f"https://sandbox.ebay.com/itm/{listing['listing_id']}" if listing['listing_id'] else None
     
-    # Generate HTML with editing capabilities
+    return f"""
+        <div class="listing-card" id="listing-{key}">
+            <div class="listing-header">
+                <div class="listing-title">{listing['title']}</div>
+                <div class="listing-status {status_class}">{status_text}</div>
+            </div>
+            
+            <div class="detail-item">
+                <div class="detail-label">SKU</div>
+                <div class="detail-value">{listing['sku']}</div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Price</div>
+                <div class="detail-value price">${listing['price']} {listing['currency']}</div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Quantity</div>
+                <div class="detail-value">{listing['quantity']}</div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Offer ID</div>
+                <div class="detail-value">{listing['offer_id']}</div>
+            </div>
+            {f'<div class="detail-item"><div class="detail-label">Listing ID</div><div class="detail-value">{listing["listing_id"]}</div></div>' if listing['listing_id'] else ''}
+            {f'<div class="detail-item"><div class="detail-label">Group Key</div><div class="detail-value">{listing["group_key"]}</div></div>' if listing['group_key'] else ''}
+            
+            <div class="edit-section">
+                <h3>📸 Add Images</h3>
+                <div class="image-upload">
+                    <input type="text" 
+                           class="image-input" 
+                           id="image-input-{key}" 
+                           placeholder="Enter image URL (e.g., https://example.com/image.jpg)"
+                           data-sku="{listing['sku']}"
+                           data-offer-id="{listing['offer_id']}">
+                    <button class="btn btn-primary" onclick="addImage('{key}', '{listing['sku']}', {listing['offer_id']})">
+                        ➕ Add Image
+                    </button>
+                </div>
+                <div class="image-preview" id="images-{key}">
+                    {''.join([f'<div class="image-preview-item"><img src="{img}" alt="Image"><button class="remove-btn" onclick="removeImage(&#39;{key}&#39;, {i})">×</button></div>' for i, img in enumerate(listing['images'])]) if listing['images'] else '<p style="color: #7f8c8d; font-style: italic;">No images added yet</p>'}
+                </div>
+            </div>
+            
+            <div class="actions">
+                {f'<a href="{listing_url}" target="_blank" class="btn btn-primary">🔗 View on eBay</a>' if listing_url else ''}
+                <button class="btn btn-success" onclick="publishListing('{listing['sku']}', {listing['offer_id']}, '{listing.get('group_key', '')}')" {'disabled' if listing['listing_id'] else ''} title="Publishes to SANDBOX (test), NOT live eBay">
+                    {'✅ Published (Sandbox)' if listing['listing_id'] else '🚀 Publish to SANDBOX'}
+                </button>
+                <button class="btn btn-primary" onclick="saveImages('{listing['sku']}', {listing['offer_id']})">
+                    💾 Save Images
+                </button>
+                <button class="btn btn-danger hidden" id="prod-btn-{key}" onclick="migrateToProduction('{listing['sku']}', {listing['offer_id']})" style="display: none;">
+                    ⚠️ MIGRATE TO PRODUCTION
+                </button>
+            </div>
+        </div>
+"""
+
+
+def render_editable_page(cards, rows, page, pages, context):
+    """One page of the editable viewer around already rendered cards."""
+    stats = context['stats']
+    nav = page_nav(page, pages)
+    page_label = f" | Page {page} of {len(pages)}" if len(pages) > 1 else ""
     html_content = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -333,6 +337,24 @@ def generate_editable_html():
             color: #7f8c8d;
             font-size: 0.9em;
         }}
+        .pagination {{
+            margin: 30px 0 10px;
+            text-align: center;
+        }}
+        .pagination a, .pagination span {{
+            display: inline-block;
+            padding: 8px 14px;
+            margin: 2px;
+            border-radius: 8px;
+            background: #f8f9fa;
+            color: #667eea;
+            text-decoration: none;
+            font-weight: bold;
+        }}
+        .pagination .current {{
+            background: #667eea;
+            color: white;
+        }}
         .hidden {{
             display: none;
         }}
@@ -341,10 +363,10 @@ def generate_editable_html():
 <body>
     <div class="container">
         <h1>📦 Editable eBay Listings Manager</h1>
-        <p class="subtitle">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | Environment: {config.EBAY_ENVIRONMENT.upper()}</p>
+        <p class="subtitle">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | Environment: {context['environment']}{page_label}</p>
         
         <div class="warning-banner">
-            <strong>⚠️ CURRENT ENVIRONMENT: {config.EBAY_ENVIRONMENT.upper()}</strong><br>
+            <strong>⚠️ CURRENT ENVIRONMENT: {context['environment']}</strong><br>
             <strong>📍 Publishing will go to SANDBOX (test environment), NOT your live eBay page (manhattanbreaks)</strong><br>
             To publish to your live page, you must switch to PRODUCTION environment first.<br>
             Production migration is disabled until you give the command.
@@ -352,95 +374,27 @@ def generate_editable_html():
         
         <div class="stats">
             <div class="stat-card">
-                <div class="stat-number">{len(offers_with_details)}</div>
+                <div class="stat-number">{stats['total']}</div>
                 <div class="stat-label">Total Listings</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len([o for o in offers_with_details if o['listing_id']])}</div>
+                <div class="stat-number">{stats['published']}</div>
                 <div class="stat-label">Published</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len([o for o in offers_with_details if not o['listing_id']])}</div>
+                <div class="stat-number">{stats['drafts']}</div>
                 <div class="stat-label">Drafts</div>
             </div>
         </div>
         
+        {nav}
         <div class="listings">
 """
     
-    # Add each listing with editing capabilities
-    for idx, listing in enumerate(offers_with_details):
-        status_class = 'status-draft' if not listing['listing_id'] else 'status-published'
-        status_text = 'Draft' if not listing['listing_id'] else 'Published'
-        
-        if listing['status'] == 'UNPUBLISHED':
-            status_class = 'status-unpublished'
-            status_text = 'Unpublished'
-        
-        listing_url = f"https://sandbox.ebay.com/itm/{listing['listing_id']}" if listing['listing_id'] else None
-        images_json = json.dumps(listing['images'])
-        
-        html_content += f"""
-            <div class="listing-card" id="listing-{idx}">
-                <div class="listing-header">
-                    <div class="listing-title">{listing['title']}</div>
-                    <div class="listing-status {status_class}">{status_text}</div>
-                </div>
-                
-                <div class="detail-item">
-                    <div class="detail-label">SKU</div>
-                    <div class="detail-value">{listing['sku']}</div>
-                </div>
-                <div class="detail-item">
-                    <div class="detail-label">Price</div>
-                    <div class="detail-value price">${listing['price']} {listing['currency']}</div>
-                </div>
-                <div class="detail-item">
-                    <div class="detail-label">Quantity</div>
-                    <div class="detail-value">{listing['quantity']}</div>
-                </div>
-                <div class="detail-item">
-                    <div class="detail-label">Offer ID</div>
-                    <div class="detail-value">{listing['offer_id']}</div>
-                </div>
-                {f'<div class="detail-item"><div class="detail-label">Listing ID</div><div class="detail-value">{listing["listing_id"]}</div></div>' if listing['listing_id'] else ''}
-                {f'<div class="detail-item"><div class="detail-label">Group Key</div><div class="detail-value">{listing["group_key"]}</div></div>' if listing['group_key'] else ''}
-                
-                <div class="edit-section">
-                    <h3>📸 Add Images</h3>
-                    <div class="image-upload">
-                        <input type="text" 
-                               class="image-input" 
-                               id="image-input-{idx}" 
-                               placeholder="Enter image URL (e.g., https://example.com/image.jpg)"
-                               data-sku="{listing['sku']}"
-                               data-offer-id="{listing['offer_id']}">
-                        <button class="btn btn-primary" onclick="addImage({idx}, '{listing['sku']}', {listing['offer_id']})">
-                            ➕ Add Image
-                        </button>
-                    </div>
-                    <div class="image-preview" id="images-{idx}">
-                        {''.join([f'<div class="image-preview-item"><img src="{img}" alt="Image"><button class="remove-btn" onclick="removeImage({idx}, {i})">×</button></div>' for i, img in enumerate(listing['images'])]) if listing['images'] else '<p style="color: #7f8c8d; font-style: italic;">No images added yet</p>'}
-                    </div>
-                </div>
-                
-                <div class="actions">
-                    {f'<a href="{listing_url}" target="_blank" class="btn btn-primary">🔗 View on eBay</a>' if listing_url else ''}
-                    <button class="btn btn-success" onclick="publishListing('{listing['sku']}', {listing['offer_id']}, '{listing.get('group_key', '')}')" {'disabled' if listing['listing_id'] else ''} title="Publishes to SANDBOX (test), NOT live eBay">
-                        {'✅ Published (Sandbox)' if listing['listing_id'] else '🚀 Publish to SANDBOX'}
-                    </button>
-                    <button class="btn btn-primary" onclick="saveImages('{listing['sku']}', {listing['offer_id']})">
-                        💾 Save Images
-                    </button>
-                    <button class="btn btn-danger hidden" id="prod-btn-{idx}" onclick="migrateToProduction('{listing['sku']}', {listing['offer_id']})" style="display: none;">
-                        ⚠️ MIGRATE TO PRODUCTION
-                    </button>
-                </div>
-            </div>
-"""
-    
+    html_content += "".join(cards)
     html_content += f"""
         </div>
+        {nav}
         
         <div class="footer">
             <p>This page allows you to add images and manage your listings.</p>
@@ -450,7 +404,7 @@ def generate_editable_html():
     </div>
     
     <script>
-        const listingsData = {json.dumps(offers_with_details)};
+        const listingsData = {json.dumps([dict(row, key=listing_key(row["sku"])) for row in rows])};
         
         function addImage(listingIdx, sku, offerId) {{
             const input = document.getElementById(`image-input-${{listingIdx}}`);
@@ -508,13 +462,13 @@ def generate_editable_html():
         }}
         
         function saveImages(sku, offerId) {{
-            const listingIdx = listingsData.findIndex(l => l.sku === sku);
-            if (listingIdx === -1) {{
+            const listing = listingsData.find(l => l.sku === sku);
+            if (!listing) {{
                 alert('Listing not found');
                 return;
             }}
             
-            const imageUrls = getImageUrls(listingIdx);
+            const imageUrls = getImageUrls(listing.key);
             
             if (imageUrls.length === 0) {{
                 alert('No images to save. Add images first using the "Add Image" button.');
@@ -656,11 +610,34 @@ pause
 </body>
 </html>
 """
+    return html_content
+
+
+def generate_editable_html(refresh=False):
+    """Generate (or update) the editable HTML view of all listings."""
+    print("=" * 80)
+    print("Generating Editable Listings Viewer")
+    print("=" * 80)
+    print()
+    
+    config = Config()
+    print(f"Environment: {config.EBAY_ENVIRONMENT.upper()}")
+    print()
+    
+    rows = listing_rows(load_snapshot(refresh=refresh))
+    published = len([row for row in rows if row['listing_id']])
+    context = {
+        'environment': config.EBAY_ENVIRONMENT.upper(),
+        'stats': {'total': len(rows), 'published': published, 'drafts': len(rows) - published},
+    }
     
-    # Save HTML file
     html_file = 'editable_listings.html'
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    result = ReportWriter(html_file, render_editable_card, render_editable_page).build(rows, context)
+    
+    print()
+    print(f"Found {result['listings']} listings: {result['rendered']} rendered, {result['reused']} unchanged")
+    print(f"Wrote {result['written']} of {result['pages']} page(s)")
+    print()
     
     file_path = os.path.abspath(html_file)
     print(f"[SUCCESS] Editable HTML file generated!")
@@ -680,4 +657,6 @@ pause
     print("=" * 80)
 
 if __name__ == "__main__":
-    generate_editable_html()
+    parser = argparse.ArgumentParser(description="Generate an editable HTML view of your listings")
+    parser.add_argument('--refresh', action='store_true', help="Re-read the account instead of using a recent snapshot")
+    generate_editable_html(refresh=parser.parse_args().refresh)
@@ -3,11 +3,17 @@ Fetch card images from checklist sites.
 Note: For production use, you should take your own photos of the actual cards.
 These stock images are for reference/placeholder purposes.
 """
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
 import sys
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import http_session
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -29,6 +35,10 @@ def fetch_from_ebay_search(player_name: str, set_name: str):
     """
     Search eBay for similar listings and get their image URLs.
     This is a more reliable approach as these images are already on eBay.
+    
+    Returns None only when the search worked and found no image; timeouts and
+    non-200 responses (429, 503, ...) raise, so callers don't mistake them for
+    "this card has no image".
     """
     print(f"Searching eBay for: {player_name} {set_name}")
     
@@ -36,26 +46,23 @@ def fetch_from_ebay_search(player_name: str, set_name: str):
     query = f"{player_name} {set_name}".replace(" ", "+")
     url = f"https://www.ebay.com/sch/i.html?_nkw={query}&_sacat=261328"
     
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find listing images
-            images = soup.find_all('img', class_='s-item__image-img')
-            
-            for img in images[:5]:  # Check first 5 results
-                src = img.get('src') or img.get('data-src')
-                if src and 'ebayimg.com' in src:
-                    # Convert to high-res version
-                    high_res = re.sub(r'/s-l\d+\.', '/s-l1600.', src)
-                    return high_res
-    except Exception as e:
-        print(f"  Error: {e}")
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    response = http_session.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    # Find listing images
+    images = soup.find_all('img', class_='s-item__image-img')
+    
+    for img in images[:5]:  # Check first 5 results
+        src = img.get('src') or img.get('data-src')
+        if src and 'ebayimg.com' in src:
+            # Convert to high-res version
+            high_res = re.sub(r'/s-l\d+\.', '/s-l1600.', src)
+            return high_res
     
     return None
 
@@ -66,13 +73,196 @@ def get_placeholder_image():
     return "https://i.ebayimg.com/images/g/WYsAAOSwpkFnRxqE/s-l1600.webp"
 
 
-def fetch_images_for_set(cards: list, set_name: str):
+# Persistent (player, set) -> image URL cache. Misses are stored as "" so a warm
+# run never re-scrapes a card we already know has no image. Only definitive misses
+# are stored: a lookup where a source failed (timeout, 429, ...) is retried next run.
+IMAGE_CACHE_FILE = ".card_image_cache.json"
+
+
+class HostRateLimiter:
+    """Thread-safe minimum interval between requests to the same host."""
+    
+    def __init__(self, min_interval: float = 0.25):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url_or_host: str):
+        """Block until the caller may send the next request to this host."""
+        host = urlparse(url_or_host).netloc or url_or_host
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiter = HostRateLimiter()
+
+
+def image_from_checklist(card: Dict, set_name: str) -> Optional[str]:
+    """Image URL already provided by the checklist/CSV row."""
+    return card.get('image_url') or card.get('imageUrl') or None
+
+
+def image_from_tradingcarddb(card: Dict, set_name: str) -> Optional[str]:
+    """Trading Card DB lookup (stub until the site parser exists)."""
+    images = fetch_from_tradingcarddb(set_name)
+    return images.get(str(card.get('number', ''))) if images else None
+
+
+def image_from_ebay_search(card: Dict, set_name: str) -> Optional[str]:
+    """First ebayimg.com result from an eBay search (rate limited per host)."""
+    _rate_limiter.wait('www.ebay.com')
+    return fetch_from_ebay_search(card.get('name', ''), set_name)
+
+
+DEFAULT_IMAGE_SOURCES = [image_from_checklist, image_from_tradingcarddb, image_from_ebay_search]
+
+# Sources answered from the card itself - never cached by (player, set)
+LOCAL_IMAGE_SOURCES = {image_from_checklist}
+
+
+class CardImageResolver:
+    """
+    Resolves card images concurrently from a pluggable list of sources.
+    
+    Each source is a callable (card, set_name) -> image URL or None and is tried
+    in order. Remote lookups are cached by (player, set) and de-duplicated, so a
+    set with repeated players only searches once per player.
+    """
+    
+    def __init__(
+        self,
+        sources: List[Callable[[Dict, str], Optional[str]]] = None,
+        max_workers: int = 8,
+        cache_file: Optional[str] = IMAGE_CACHE_FILE,
+        retry_misses: bool = False
+    ):
+        self.sources = list(sources) if sources is not None else list(DEFAULT_IMAGE_SOURCES)
+        self.max_workers = max_workers
+        self.cache_file = cache_file
+        self.retry_misses = retry_misses
+        self._cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+        self.stats = {"local": 0, "cache_hits": 0, "fetched": 0, "misses": 0}
+    
+    @staticmethod
+    def cache_key(card: Dict, set_name: str) -> str:
+        return f"{str(card.get('name', '')).strip().lower()}|{str(set_name).strip().lower()}"
+    
+    def _load_cache(self) -> Dict[str, str]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[WARNING] Could not read image cache {self.cache_file}: {e}")
+            return {}
+    
+    def save_cache(self):
+        """Write the cache to disk (atomic replace)."""
+        if not self.cache_file:
+            return
+        tmp_file = f"{self.cache_file}.tmp"
+        with self._cache_lock:
+            snapshot = dict(self._cache)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+    
+    def _resolve_local(self, card: Dict, set_name: str) -> Optional[str]:
+        for source in self.sources:
+            if source in LOCAL_IMAGE_SOURCES:
+                image_url = source(card, set_name)
+                if image_url:
+                    return image_url
+        return None
+    
+    def _resolve_remote(self, card: Dict, set_name: str) -> Optional[str]:
+        """Image URL, "" when every source answered "no image", None when a source failed."""
+        failed = False
+        for source in self.sources:
+            if source in LOCAL_IMAGE_SOURCES:
+                continue
+            try:
+                image_url = source(card, set_name)
+            except Exception as e:
+                print(f"  [WARNING] Image source {getattr(source, '__name__', source)} failed: {e}")
+                failed = True
+                continue
+            if image_url:
+                return image_url
+        return None if failed else ""
+    
+    def _cached(self, key: str) -> Optional[str]:
+        value = self._cache.get(key)
+        if value is None or (value == "" and self.retry_misses):
+            return None
+        return value
+    
+    def annotate_cards(self, cards: List[Dict], set_name: str) -> List[Dict]:
+        """
+        Resolve images for all cards in one pass.
+        
+        Returns copies of the cards with 'image_url' set; cards without any
+        image get the placeholder.
+        """
+        resolved = [None] * len(cards)
+        pending = {}  # cache key -> representative card
+        
+        for i, card in enumerate(cards):
+            image_url = self._resolve_local(card, set_name)
+            if image_url:
+                resolved[i] = image_url
+                self.stats["local"] += 1
+                continue
+            key = self.cache_key(card, set_name)
+            cached = self._cached(key)
+            if cached is not None:
+                resolved[i] = cached
+                self.stats["cache_hits"] += 1
+            elif key not in pending:
+                pending[key] = card
+        
+        if pending:
+            print(f"Resolving {len(pending)} image(s) with {self.max_workers} workers...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {key: executor.submit(self._resolve_remote, card, set_name) for key, card in pending.items()}
+                for key, future in futures.items():
+                    image_url = future.result()
+                    self.stats["fetched"] += 1
+                    if image_url is None:
+                        continue  # a source failed: placeholder for this run only, looked up again next run
+                    with self._cache_lock:
+                        self._cache[key] = image_url
+            self.save_cache()
+        
+        results = []
+        for i, card in enumerate(cards):
+            image_url = resolved[i]
+            if image_url is None:
+                image_url = self._cache.get(self.cache_key(card, set_name), "")
+            if not image_url:
+                image_url = get_placeholder_image()
+                self.stats["misses"] += 1
+            card_with_image = card.copy()
+            card_with_image['image_url'] = image_url
+            results.append(card_with_image)
+        return results
+
+
+def fetch_images_for_set(cards: list, set_name: str, max_workers: int = 8, sources: list = None):
     """
     Fetch images for a list of cards.
     
     Args:
         cards: List of dicts with 'name' and 'number' keys
         set_name: Name of the card set
+        max_workers: Concurrent lookups (requests per host are still rate limited)
+        sources: Optional list of image source callables (default: DEFAULT_IMAGE_SOURCES)
     
     Returns:
         List of cards with 'image_url' added
@@ -85,34 +275,16 @@ def fetch_images_for_set(cards: list, set_name: str):
     print(f"Cards: {len(cards)}")
     print()
     
-    results = []
-    
-    for i, card in enumerate(cards):
-        player_name = card.get('name', '')
-        card_number = card.get('number', '')
-        
-        print(f"[{i+1}/{len(cards)}] {card_number}. {player_name}...", end=" ")
-        
-        # Try to find an image
-        image_url = fetch_from_ebay_search(player_name, set_name)
-        
-        if image_url:
-            print(f"[FOUND]")
-        else:
-            image_url = get_placeholder_image()
-            print(f"[PLACEHOLDER]")
-        
-        # Add image URL to card data
-        card_with_image = card.copy()
-        card_with_image['image_url'] = image_url
-        results.append(card_with_image)
-        
-        # Be nice to servers
-        time.sleep(0.5)
+    start = time.time()
+    resolver = CardImageResolver(sources=sources, max_workers=max_workers)
+    results = resolver.annotate_cards(cards, set_name)
+    stats = resolver.stats
     
     print()
     print("=" * 80)
     print(f"Found images for {sum(1 for c in results if 'ebayimg' in c.get('image_url', ''))} cards")
+    print(f"From checklist: {stats['local']}, cache hits: {stats['cache_hits']}, fetched: {stats['fetched']}, placeholders: {stats['misses']}")
+    print(f"Completed in {time.time() - start:.1f}s")
     print("=" * 80)
     
     return results
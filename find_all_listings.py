@@ -35,101 +35,85 @@ def find_all_listings():
         print("✅ Using PRODUCTION environment")
         print()
     
-    # Get all offers with pagination
+    # Stream every offer (pages fetched concurrently, no page cap); only counts
+    # and the first few of each category are kept
     print("Fetching ALL offers from your account...")
     print()
     
-    all_offers = []
-    offset = 0
-    limit = 200
-    max_pages = 20
+    total_offers = 0
+    drafts = []
+    scheduled = []
+    active = []
+    counts = {"drafts": 0, "scheduled": 0, "active": 0}
+    groups = {}
     
-    for page in range(max_pages):
-        try:
-            params = {"limit": limit, "offset": offset}
-            response = client._make_request('GET', '/sell/inventory/v1/offer', params=params)
+    def keep(category, samples, offer_info):
+        counts[category] += 1
+        if len(samples) < 10:
+            samples.append(offer_info)
+    
+    try:
+        for offer in client.iter_collection('/sell/inventory/v1/offer', 'offers'):
+            total_offers += 1
+            if total_offers % 1000 == 0:
+                print(f"  ... {total_offers} offers so far")
+            offer_id = offer.get('offerId', '')
+            sku = offer.get('sku', '')
+            listing_id = offer.get('listingId', '')
+            status = offer.get('status', 'UNKNOWN')
+            listing = offer.get('listing', {})
+            listing_status = listing.get('listingStatus', 'UNKNOWN')
+            start_date = offer.get('listingStartDate', '') or listing.get('listingStartDate', '')
+            group_key = offer.get('inventoryItemGroupKey', '')
+            title = listing.get('title', offer.get('title', 'No title'))
             
-            if response.status_code == 200:
-                data = response.json()
-                offers = data.get('offers', [])
-                all_offers.extend(offers)
-                print(f"Page {page + 1}: Found {len(offers)} offers (total: {len(all_offers)})")
-                
-                if len(offers) < limit:
-                    break
-                offset += limit
+            offer_info = {
+                "offer_id": offer_id,
+                "sku": sku,
+                "listing_id": listing_id,
+                "status": listing_status or status,
+                "start_date": start_date,
+                "title": title,
+                "group_key": group_key
+            }
+            
+            # Categorize
+            if not listing_id:
+                keep("drafts", drafts, offer_info)
+            elif start_date:
+                # Check if start date is in future
+                try:
+                    start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+                    now = datetime.utcnow().replace(tzinfo=start_dt.tzinfo)
+                    if start_dt > now:
+                        keep("scheduled", scheduled, offer_info)
+                    else:
+                        keep("active", active, offer_info)
+                except:
+                    keep("scheduled", scheduled, offer_info)
             else:
-                print(f"Error on page {page + 1}: {response.status_code}")
-                print(f"Response: {response.text[:500]}")
-                break
-        except Exception as e:
-            print(f"Error fetching page {page + 1}: {e}")
-            break
+                keep("active", active, offer_info)
+            
+            # Track groups (per-group counts; details for the first few groups only)
+            if group_key:
+                group = groups.setdefault(group_key, {"offers": 0, "published": 0, "scheduled": 0, "title": title})
+                group["offers"] += 1
+                group["published"] += 1 if listing_id else 0
+                group["scheduled"] += 1 if start_date else 0
+    except Exception as e:
+        print(f"Error fetching offers after {total_offers}: {e}")
     
     print()
-    print(f"Total offers found: {len(all_offers)}")
+    print(f"Total offers found: {total_offers}")
     print()
     
-    # Categorize offers
-    drafts = []
-    scheduled = []
-    active = []
-    groups = {}
-    
-    for offer in all_offers:
-        offer_id = offer.get('offerId', '')
-        sku = offer.get('sku', '')
-        listing_id = offer.get('listingId', '')
-        status = offer.get('status', 'UNKNOWN')
-        listing = offer.get('listing', {})
-        listing_status = listing.get('listingStatus', 'UNKNOWN')
-        start_date = offer.get('listingStartDate', '') or listing.get('listingStartDate', '')
-        group_key = offer.get('inventoryItemGroupKey', '')
-        title = listing.get('title', offer.get('title', 'No title'))
-        
-        offer_info = {
-            "offer_id": offer_id,
-            "sku": sku,
-            "listing_id": listing_id,
-            "status": listing_status or status,
-            "start_date": start_date,
-            "title": title,
-            "group_key": group_key
-        }
-        
-        # Categorize
-        if not listing_id:
-            drafts.append(offer_info)
-        elif start_date:
-            # Check if start date is in future
-            try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                now = datetime.utcnow().replace(tzinfo=start_dt.tzinfo)
-                if start_dt > now:
-                    scheduled.append(offer_info)
-                else:
-                    active.append(offer_info)
-            except:
-                if start_date:
-                    scheduled.append(offer_info)
-                else:
-                    active.append(offer_info)
-        else:
-            active.append(offer_info)
-        
-        # Track groups
-        if group_key:
-            if group_key not in groups:
-                groups[group_key] = []
-            groups[group_key].append(offer_info)
-    
     # Print results
     print("=" * 80)
     print("LISTING CATEGORIES")
     print("=" * 80)
     print()
     
-    print(f"DRAFTS (Unpublished): {len(drafts)}")
+    print(f"DRAFTS (Unpublished): {counts['drafts']}")
     if drafts:
         print("  These should appear in Seller Hub 'Drafts' (if visible):")
         for i, draft in enumerate(drafts[:10], 1):
@@ -138,7 +122,7 @@ def find_all_listings():
             print(f"     Group: {draft['group_key'] or 'None'}")
     print()
     
-    print(f"SCHEDULED: {len(scheduled)}")
+    print(f"SCHEDULED: {counts['scheduled']}")
     if scheduled:
         print("  These should appear in Seller Hub 'Scheduled Listings':")
         for i, sched in enumerate(scheduled[:10], 1):
@@ -155,7 +139,7 @@ def find_all_listings():
                 pass
     print()
     
-    print(f"ACTIVE: {len(active)}")
+    print(f"ACTIVE: {counts['active']}")
     if active:
         print("  These should appear in Seller Hub 'Active Listings':")
         for i, act in enumerate(active[:10], 1):
@@ -167,15 +151,12 @@ def find_all_listings():
     print(f"VARIATION GROUPS: {len(groups)}")
     if groups:
         print("  Variation listings (grouped):")
-        for group_key, offers in list(groups.items())[:5]:
+        for group_key, group in list(groups.items())[:5]:
             print(f"  Group: {group_key}")
-            print(f"    Offers: {len(offers)}")
-            scheduled_in_group = sum(1 for o in offers if o.get('start_date'))
-            published_in_group = sum(1 for o in offers if o.get('listing_id'))
-            print(f"    - Published: {published_in_group}")
-            print(f"    - Scheduled: {scheduled_in_group}")
-            if offers:
-                print(f"    - Title: {offers[0].get('title', 'N/A')[:50]}")
+            print(f"    Offers: {group['offers']}")
+            print(f"    - Published: {group['published']}")
+            print(f"    - Scheduled: {group['scheduled']}")
+            print(f"    - Title: {(group['title'] or 'N/A')[:50]}")
     print()
     
     # Seller Hub URLs
@@ -1,97 +1,80 @@
 """
 Generate an HTML file showing all your sandbox listings.
 This bypasses the sandbox UI issues.
+
+Listings come from the local inventory snapshot (see listing_report.py), and
+only listings that changed since the last run are rendered again. Large
+accounts are split into pages of LISTING_REPORT_PAGE_SIZE listings.
+
+    python generate_listings_html.py            # reuse a recent snapshot
+    python generate_listings_html.py --refresh  # re-read the account first
 """
+import argparse
 import sys
 import os
-from ebay_api_client import eBayAPIClient
 from config import Config
-import json
+from listing_report import ReportWriter, listing_rows, load_snapshot, page_nav
 from datetime import datetime
 
-def generate_html():
-    """Generate HTML file with all listings."""
-    print("=" * 80)
-    print("Generating HTML View of Your Listings")
-    print("=" * 80)
-    print()
-    
-    config = Config()
-    client = eBayAPIClient()
-    
-    print(f"Environment: {config.EBAY_ENVIRONMENT.upper()}")
-    print("Fetching listings...")
-    print()
-    
-    # Get inventory items
-    items_response = client._make_request('GET', '/sell/inventory/v1/inventory_item', params={'limit': 100})
-    
-    if items_response.status_code != 200:
-        print(f"[ERROR] Failed to fetch inventory items: {items_response.status_code}")
-        return
-    
-    items_data = items_response.json()
-    inventory_items = items_data.get('inventoryItems', [])
-    print(f"Found {len(inventory_items)} inventory item(s)")
+
+def render_listing_card(listing):
+    """HTML of one listing card."""
+    listing = dict(listing)
+    description = listing['description'] or ''
+    listing['description'] = description[:200] + '...' if len(description) > 200 else description
+    status_class = 'status-draft' if not listing['listing_id'] else 'status-published'
+    status_text = 'Draft' if not listing['listing_id'] else 'Published'
     
-    # Get offers for each item
-    offers_with_details = []
-    print("Fetching offer details...")
+    if listing['status'] == 'UNPUBLISHED':
+        status_class = 'status-unpublished'
+        status_text = 'Unpublished'
     
-    for i, item in enumerate(inventory_items, 1):
-        sku = item.get('sku')
-        if sku:
-            print(f"  [{i}/{len(inventory_items)}] {sku[:50]}...")
-            offer_result = client.get_offer_by_sku(sku)
-            if offer_result.get('success') and offer_result.get('offer'):
-                offer = offer_result['offer']
-                
-                # Get title
-                title = (
-                    offer.get('listing', {}).get('title', '') or
-                    offer.get('title', '') or
-                    offer.get('product', {}).get('title', '') or
-                    'Untitled Listing'
-                )
-                
-                listing_id = offer.get('listingId')
-                offer_id = offer.get('offerId')
-                group_key = offer.get('inventoryItemGroupKey', '')
-                status = offer.get('status', 'UNKNOWN')
-                
-                # Get pricing
-                pricing = offer.get('pricingSummary', {})
-                price = pricing.get('price', {}).get('value', 'N/A') if pricing else 'N/A'
-                currency = pricing.get('price', {}).get('currency', 'USD') if pricing else 'USD'
-                
-                # Get quantity
-                quantity = offer.get('availableQuantity', offer.get('quantity', 'N/A'))
-                
-                # Get description
-                description = offer.get('listing', {}).get('description', '') or ''
-                
-                # Get category
-                category_id = offer.get('categoryId', 'N/A')
-                
-                offers_with_details.append({
-                    'title': title,
-                    'sku': sku,
-                    'offer_id': offer_id,
-                    'listing_id': listing_id,
-                    'group_key': group_key,
-                    'status': status,
-                    'price': price,
-                    'currency': currency,
-                    'quantity': quantity,
-                    'description': description[:200] + '...' if len(description) > 200 else description,
-                    'category_id': category_id
-                })
+    listing_url = f"https://sandbox.ebay.com/itm/{listing['listing_id']}" if listing['listing_id'] else None
     
-    print()
-    print(f"Found {len(offers_with_details)} listings with details")
-    print()
-    
-    # Generate HTML
+    return f"""
+        <div class="listing-card">
+            <div class="listing-header">
+                <div class="listing-title">{listing['title']}</div>
+                <div class="listing-status {status_class}">{status_text}</div>
+            </div>
+            
+            <div class="listing-details">
+                <div class="detail-item">
+                    <div class="detail-label">SKU</div>
+                    <div class="detail-value">{listing['sku']}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Price</div>
+                    <div class="detail-value price">${listing['price']} {listing['currency']}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Quantity</div>
+                    <div class="detail-value">{listing['quantity']}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Offer ID</div>
+                    <div class="detail-value">{listing['offer_id']}</div>
+                </div>
+                {f'<div class="detail-item"><div class="detail-label">Listing ID</div><div class="detail-value">{listing["listing_id"]}</div></div>' if listing['listing_id'] else ''}
+                {f'<div class="detail-item"><div class="detail-label">Group Key</div><div class="detail-value">{listing["group_key"]}</div></div>' if listing['group_key'] else ''}
+                <div class="detail-item">
+                    <div class="detail-label">Category</div>
+                    <div class="detail-value">{listing['category_id']}</div>
+                </div>
+            </div>
+            
+            {f'<div class="description"><strong>Description:</strong> {listing["description"] or "No description"}</div>' if listing['description'] else ''}
+            
+            {f'<a href="{listing_url}" target="_blank" class="listing-link">🔗 View Listing on eBay Sandbox</a>' if listing_url else '<div class="no-link">⚠️ Draft listing - no direct link available. Publish to get a viewable link.</div>'}
+        </div>
+"""
+
+
+def render_listings_page(cards, rows, page, pages, context):
+    """One page of the report around already rendered cards."""
+    stats = context['stats']
+    nav = page_nav(page, pages)
+    page_label = f" | Page {page} of {len(pages)}" if len(pages) > 1 else ""
     html_content = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -259,6 +242,24 @@ def generate_html():
             font-size: 0.95em;
             line-height: 1.6;
         }}
+        .pagination {{
+            margin: 30px 0 10px;
+            text-align: center;
+        }}
+        .pagination a, .pagination span {{
+            display: inline-block;
+            padding: 8px 14px;
+            margin: 2px;
+            border-radius: 8px;
+            background: #f8f9fa;
+            color: #667eea;
+            text-decoration: none;
+            font-weight: bold;
+        }}
+        .pagination .current {{
+            background: #667eea;
+            color: white;
+        }}
         .footer {{
             margin-top: 40px;
             padding-top: 20px;
@@ -272,77 +273,31 @@ def generate_html():
 <body>
     <div class="container">
         <h1>📦 Your eBay Sandbox Listings</h1>
-        <p class="subtitle">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | Environment: {config.EBAY_ENVIRONMENT.upper()}</p>
+        <p class="subtitle">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | Environment: {context['environment']}{page_label}</p>
         
         <div class="stats">
             <div class="stat-card">
-                <div class="stat-number">{len(offers_with_details)}</div>
+                <div class="stat-number">{stats['total']}</div>
                 <div class="stat-label">Total Listings</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len([o for o in offers_with_details if o['listing_id']])}</div>
+                <div class="stat-number">{stats['published']}</div>
                 <div class="stat-label">Published</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len([o for o in offers_with_details if not o['listing_id']])}</div>
+                <div class="stat-number">{stats['drafts']}</div>
                 <div class="stat-label">Drafts</div>
             </div>
         </div>
         
+        {nav}
         <div class="listings">
 """
     
-    # Add each listing
-    for listing in offers_with_details:
-        status_class = 'status-draft' if not listing['listing_id'] else 'status-published'
-        status_text = 'Draft' if not listing['listing_id'] else 'Published'
-        
-        if listing['status'] == 'UNPUBLISHED':
-            status_class = 'status-unpublished'
-            status_text = 'Unpublished'
-        
-        listing_url = f"https://sandbox.ebay.com/itm/{listing['listing_id']}" if listing['listing_id'] else None
-        
-        html_content += f"""
-            <div class="listing-card">
-                <div class="listing-header">
-                    <div class="listing-title">{listing['title']}</div>
-                    <div class="listing-status {status_class}">{status_text}</div>
-                </div>
-                
-                <div class="listing-details">
-                    <div class="detail-item">
-                        <div class="detail-label">SKU</div>
-                        <div class="detail-value">{listing['sku']}</div>
-                    </div>
-                    <div class="detail-item">
-                        <div class="detail-label">Price</div>
-                        <div class="detail-value price">${listing['price']} {listing['currency']}</div>
-                    </div>
-                    <div class="detail-item">
-                        <div class="detail-label">Quantity</div>
-                        <div class="detail-value">{listing['quantity']}</div>
-                    </div>
-                    <div class="detail-item">
-                        <div class="detail-label">Offer ID</div>
-                        <div class="detail-value">{listing['offer_id']}</div>
-                    </div>
-                    {f'<div class="detail-item"><div class="detail-label">Listing ID</div><div class="detail-value">{listing["listing_id"]}</div></div>' if listing['listing_id'] else ''}
-                    {f'<div class="detail-item"><div class="detail-label">Group Key</div><div class="detail-value">{listing["group_key"]}</div></div>' if listing['group_key'] else ''}
-                    <div class="detail-item">
-                        <div class="detail-label">Category</div>
-                        <div class="detail-value">{listing['category_id']}</div>
-                    </div>
-                </div>
-                
-                {f'<div class="description"><strong>Description:</strong> {listing["description"] or "No description"}</div>' if listing['description'] else ''}
-                
-                {f'<a href="{listing_url}" target="_blank" class="listing-link">🔗 View Listing on eBay Sandbox</a>' if listing_url else '<div class="no-link">⚠️ Draft listing - no direct link available. Publish to get a viewable link.</div>'}
-            </div>
-"""
-    
-    html_content += """
+    html_content += "".join(cards)
+    html_content += f"""
         </div>
+        {nav}
         
         <div class="footer">
             <p>This page was generated from eBay Sandbox API data.</p>
@@ -352,11 +307,34 @@ def generate_html():
 </body>
 </html>
 """
+    return html_content
+
+
+def generate_html(refresh=False):
+    """Generate (or update) the HTML report of all listings."""
+    print("=" * 80)
+    print("Generating HTML View of Your Listings")
+    print("=" * 80)
+    print()
+    
+    config = Config()
+    print(f"Environment: {config.EBAY_ENVIRONMENT.upper()}")
+    print()
+    
+    rows = listing_rows(load_snapshot(refresh=refresh))
+    published = len([row for row in rows if row['listing_id']])
+    context = {
+        'environment': config.EBAY_ENVIRONMENT.upper(),
+        'stats': {'total': len(rows), 'published': published, 'drafts': len(rows) - published},
+    }
     
-    # Save HTML file
     html_file = 'my_listings.html'
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    result = ReportWriter(html_file, render_listing_card, render_listings_page).build(rows, context)
+    
+    print()
+    print(f"Found {result['listings']} listings: {result['rendered']} rendered, {result['reused']} unchanged")
+    print(f"Wrote {result['written']} of {result['pages']} page(s)")
+    print()
     
     file_path = os.path.abspath(html_file)
     print(f"[SUCCESS] HTML file generated!")
@@ -376,4 +354,6 @@ def generate_html():
     print("=" * 80)
 
 if __name__ == "__main__":
-    generate_html()
+    parser = argparse.ArgumentParser(description="Generate an HTML view of your listings")
+    parser.add_argument('--refresh', action='store_true', help="Re-read the account instead of using a recent snapshot")
+    generate_html(refresh=parser.parse_args().refresh)
@@ -2,7 +2,7 @@
 Get Production OAuth 2.0 token using the actual OAuth redirect flow.
 This bypasses the manual token generation which gives Auth'n'Auth tokens.
 """
-import requests
+import http_session
 import base64
 import webbrowser
 import urllib.parse
@@ -112,7 +112,7 @@ def get_oauth_token():
     }
     
     try:
-        response = requests.post(token_url, headers=headers, data=data, timeout=30)
+        response = http_session.post(token_url, headers=headers, data=data, timeout=30)
         
         if response.status_code != 200:
             print(f"[ERROR] Token exchange failed: {response.status_code}")
@@ -0,0 +1,110 @@
+"""Delta tracking for inventory item group writes.
+
+eBay's PUT inventory_item_group/{key} replaces the whole group, so the client
+cannot send only the fields that changed. What it can do is remember the last
+payload eBay accepted for each group, diff the next payload against it, and
+skip the PUT when nothing changed - the WORKAROUND/update paths in
+ebay_listing.py re-send the full group (title, aspects, description, every
+variant SKU, images) several times per listing, mostly unchanged.
+
+    delta = store.diff(group_key, payload)   # None: no known state, must send
+    if delta == []:
+        ...skip the PUT...
+
+The known state is dropped whenever eBay is seen to disagree with it (a GET of
+the group returns a different title/description/variants/images) or the group
+is deleted, so a retry after a failed verification is always sent.
+"""
+import copy
+import json
+import threading
+from typing import Dict, List, Optional
+
+_MISSING = object()
+
+
+def structural_diff(old, new, path: str = '') -> List[str]:
+    """
+    Dotted paths of every value that differs between two JSON-like payloads.
+
+    Dicts are compared key by key; lists and scalars as whole values
+    (variant order matters to eBay, so a reordered list is a change).
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = []
+        for key in sorted(set(old) | set(new), key=str):
+            child = f"{path}.{key}" if path else str(key)
+            changed.extend(structural_diff(old.get(key, _MISSING), new.get(key, _MISSING), child))
+        return changed
+    return [] if old == new else [path or '<root>']
+
+
+def payload_size(payload: Dict) -> int:
+    """Bytes of the JSON body a PUT of this payload would send."""
+    return len(json.dumps(payload).encode('utf-8'))
+
+
+def _visible_state(group: Dict) -> Dict:
+    """Fields eBay returns for a group, normalised across the PUT and GET shapes."""
+    nested = group.get('inventoryItemGroup') or {}
+    return {
+        "title": group.get('title'),
+        "description": (group.get('description') or nested.get('description') or '').strip(),
+        "variantSKUs": list(group.get('variantSKUs') or []),
+        "imageUrls": list(group.get('imageUrls') or nested.get('imageUrls') or [])
+    }
+
+
+class GroupStateStore:
+    """Last payload eBay accepted per group key (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: Dict[str, Dict] = {}
+        self._stats = {"sent": 0, "skipped": 0, "bytes_sent": 0, "bytes_saved": 0, "dropped": 0}
+
+    def diff(self, group_key: str, payload: Dict) -> Optional[List[str]]:
+        """Changed paths against the known state, or None when the group's state is unknown."""
+        with self._lock:
+            known = self._groups.get(group_key)
+        if known is None:
+            return None
+        return structural_diff(known, payload)
+
+    def record(self, group_key: str, payload: Dict):
+        """Remember a payload eBay accepted (call after a successful PUT)."""
+        with self._lock:
+            self._groups[group_key] = copy.deepcopy(payload)
+            self._stats["sent"] += 1
+            self._stats["bytes_sent"] += payload_size(payload)
+
+    def skipped(self, payload: Dict) -> int:
+        """Count a PUT that was not sent; returns the bytes saved."""
+        size = payload_size(payload)
+        with self._lock:
+            self._stats["skipped"] += 1
+            self._stats["bytes_saved"] += size
+        return size
+
+    def reconcile(self, group_key: str, fetched: Dict) -> bool:
+        """
+        Check a freshly fetched group against the known state.
+
+        Returns False (and forgets the state) when eBay's copy differs, so the
+        next write of that group is sent even if its payload is unchanged.
+        """
+        with self._lock:
+            known = self._groups.get(group_key)
+            if known is None or _visible_state(known) == _visible_state(fetched):
+                return True
+            del self._groups[group_key]
+            self._stats["dropped"] += 1
+            return False
+
+    def forget(self, group_key: str):
+        with self._lock:
+            self._groups.pop(group_key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, tracked=len(self._groups))
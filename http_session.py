@@ -0,0 +1,351 @@
+"""Shared outbound HTTP layer with pooled keep-alive connections.
+
+Every module that talks to eBay, Beckett or an image host should go through
+this module instead of calling bare requests.get/post. A bare call opens a new
+TCP+TLS connection every time; the adapters here keep connections alive per
+host and apply default connect/read timeouts so no call can hang forever.
+"""
+import time
+import threading
+from typing import Callable, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+# Connection pool size per host. eBay API hosts use HTTP_POOL_MAXSIZE from config;
+# scraped hosts are kept small so concurrent callers stay polite.
+HOST_POOL_SIZES = {
+    'www.ebay.com': 8,
+    'i.ebayimg.com': 16,
+    'www.beckett.com': 4,
+    'www.cardsmithsbreaks.com': 4,
+    'api.tcgplayer.com': 4,
+    'api.scryfall.com': 4,
+}
+
+EBAY_API_HOSTS = [
+    'api.ebay.com',
+    'api.sandbox.ebay.com',
+    'apiz.ebay.com',
+    'apiz.sandbox.ebay.com',
+]
+
+DEFAULT_POOL_SIZE = 10
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default (connect, read) timeout."""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class RateBudget:
+    """
+    Thread-safe token bucket shared by everything that spends one API budget.
+
+    `rate` calls per second on average with bursts up to `burst`; rate <= 0
+    disables limiting. acquire() blocks until a call may be made.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else max(1, self.rate)))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waited = 0.0
+
+    def acquire(self):
+        if self.rate <= 0:
+            self.calls += 1
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is this caller's place in the queue
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.calls += 1
+            self.waited += delay
+        if delay:
+            time.sleep(delay)
+
+
+class _Fetch:
+    """One in-flight read that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+        self.stale = False
+
+
+class ReadCache:
+    """
+    Read-through cache for idempotent GETs, with in-flight coalescing.
+
+    Keyed by path + params. Callers asking for a key that is already being
+    fetched wait for that fetch instead of sending their own request. Cacheable
+    results are reused for `ttl` seconds (0 = coalesce only, keep nothing).
+    Expired entries are dropped when looked up or when a newer one is stored,
+    and at most `max_entries` are kept (oldest dropped first).
+    invalidate(path) - called for every write - drops the resource, everything
+    below it and the collections above it, so a PUT to /offer/123 also drops
+    cached GET /offer?sku=... lookups.
+    """
+
+    def __init__(self, ttl: float = 30, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(path: str, params: Optional[dict] = None) -> tuple:
+        return (path.rstrip('/'), tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+    def fetch(self, key: tuple, loader: Callable, cacheable: Callable = lambda value: True):
+        """Return the cached value for `key`, or load it once for all concurrent callers."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if time.monotonic() - entry[0] < self.ttl:
+                        self.hits += 1
+                        return entry[1]
+                    del self._entries[key]
+                fetch = self._inflight.get(key)
+                owner = fetch is None
+                if owner:
+                    fetch = self._inflight[key] = _Fetch()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if owner:
+                break
+            fetch.done.wait()
+            if not fetch.failed:
+                return fetch.value
+            # The owner raised - try again (possibly as the new owner)
+
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fetch.failed = True
+            fetch.done.set()
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            # A write to this resource while the read was in flight makes it unsafe to keep
+            if self.ttl > 0 and not fetch.stale and cacheable(value):
+                self._store(key, value)
+        fetch.value = value
+        fetch.done.set()
+        return value
+
+    def _store(self, key: tuple, value):
+        """Insert in time order, then drop expired and over-cap entries from the old end (lock held)."""
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        self._entries[key] = (now, value)
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if len(self._entries) <= self.max_entries and now - self._entries[oldest][0] < self.ttl:
+                break
+            del self._entries[oldest]
+
+    @staticmethod
+    def _related(cached_path: str, written_path: str) -> bool:
+        return (cached_path == written_path
+                or cached_path.startswith(written_path + '/')
+                or written_path.startswith(cached_path + '/'))
+
+    def invalidate(self, path: str):
+        """Drop cached reads affected by a write to `path`."""
+        path = path.split('?', 1)[0].rstrip('/')
+        parent, _, last = path.rpartition('/')
+        if last.startswith('bulk_'):
+            # bulk_* endpoints touch many resources of the API they belong to
+            path = parent
+        with self._lock:
+            for key in [key for key in self._entries if self._related(key[0], path)]:
+                del self._entries[key]
+            for key, fetch in self._inflight.items():
+                if self._related(key[0], path):
+                    fetch.stale = True
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries)
+            }
+
+
+_lock = threading.Lock()
+_adapters = None
+_shared_session = None
+_http2_client = None
+
+
+def _build_adapter(pool_size: int, timeout) -> TimeoutHTTPAdapter:
+    # Only connection failures are retried here (the request never reached the
+    # server, so it is safe for POST/PUT too). Status-based retries (401/429/5xx)
+    # stay with the callers, e.g. eBayAPIClient._send_request.
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=0,
+        backoff_factor=0.3,
+        raise_on_status=False
+    )
+    return TimeoutHTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+        timeout=timeout
+    )
+
+
+def _get_adapters() -> dict:
+    """Build the process-wide adapters once (keyed by URL prefix)."""
+    global _adapters
+    if _adapters is None:
+        with _lock:
+            if _adapters is None:
+                config = Config()
+                timeout = (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT)
+                adapters = {}
+                for host in EBAY_API_HOSTS:
+                    adapters[f"https://{host}"] = _build_adapter(config.HTTP_POOL_MAXSIZE, timeout)
+                for host, pool_size in HOST_POOL_SIZES.items():
+                    adapters[f"https://{host}"] = _build_adapter(pool_size, timeout)
+                adapters['https://'] = _build_adapter(DEFAULT_POOL_SIZE, timeout)
+                adapters['http://'] = _build_adapter(DEFAULT_POOL_SIZE, timeout)
+                _adapters = adapters
+    return _adapters
+
+
+def new_session() -> requests.Session:
+    """
+    Create a Session with its own headers/cookies but the shared connection pools.
+
+    Use this when a caller needs per-instance headers (e.g. a per-user eBay token)
+    while still reusing keep-alive connections opened by other callers.
+    """
+    session = requests.Session()
+    for prefix, adapter in _get_adapters().items():
+        session.mount(prefix, adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide shared Session (no default headers)."""
+    global _shared_session
+    if _shared_session is None:
+        with _lock:
+            if _shared_session is None:
+                _shared_session = new_session()
+    return _shared_session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for requests.get using the shared pools."""
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for requests.post using the shared pools."""
+    return get_session().post(url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for requests.head using the shared pools."""
+    return get_session().head(url, **kwargs)
+
+
+def get_http2_client():
+    """
+    Get a shared HTTP/2 client if HTTP2_ENABLED=true and httpx[http2] is installed.
+
+    Returns None otherwise, in which case callers should use get_session()
+    (get_page() makes that choice for plain page GETs).
+    urllib3 (and therefore requests) only speaks HTTP/1.1, so HTTP/2 is opt-in
+    for callers that can work with an httpx client.
+    """
+    global _http2_client
+    if not Config().HTTP2_ENABLED:
+        return None
+    if _http2_client is None:
+        with _lock:
+            if _http2_client is None:
+                try:
+                    import httpx
+                    import h2  # noqa: F401 - httpx needs it for http2=True
+                except ImportError:
+                    print("[WARNING] HTTP2_ENABLED is set but httpx[http2] is not installed - using HTTP/1.1")
+                    return None
+                config = Config()
+                _http2_client = httpx.Client(
+                    http2=True,
+                    timeout=httpx.Timeout(config.HTTP_READ_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT),
+                    limits=httpx.Limits(max_connections=config.HTTP_POOL_MAXSIZE, max_keepalive_connections=config.HTTP_POOL_MAXSIZE)
+                )
+    return _http2_client
+
+
+def _as_requests_response(response) -> requests.Response:
+    """Wrap an httpx response so callers keep using requests' API and exceptions."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.headers = requests.structures.CaseInsensitiveDict(response.headers)
+    converted._content = response.content
+    converted.encoding = response.encoding
+    converted.reason = response.reason_phrase
+    converted.url = str(response.url)
+    return converted
+
+
+def get_page(url: str, **kwargs) -> requests.Response:
+    """
+    GET a page over HTTP/2 when HTTP2_ENABLED and httpx[http2] are available,
+    else (or if the HTTP/2 request fails) through the pooled get_session().
+
+    Always returns a requests.Response, so raise_for_status() and the
+    requests.exceptions callers already catch behave the same either way.
+    """
+    client = get_http2_client()
+    if client is not None and set(kwargs) <= {'headers', 'params', 'timeout'}:
+        import httpx
+        try:
+            return _as_requests_response(client.get(url, follow_redirects=True, **kwargs))
+        except httpx.HTTPError as e:
+            print(f"[WARNING] HTTP/2 request to {url} failed ({type(e).__name__}) - retrying over HTTP/1.1")
+    return get_session().get(url, **kwargs)
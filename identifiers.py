@@ -0,0 +1,181 @@
+"""SKU, group key and card sort-key generation with precompiled patterns.
+
+eBay limits: SKUs are max 50 chars; inventory item group keys are max 50 chars
+and must be alphanumeric only. Every SKU ends in a short content hash of the
+card's identity, so the same card in the same set always gets the same SKU
+(safe to re-run a listing) and truncating long names can never make two cards
+collide.
+"""
+import re
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_SKU_LENGTH = 50
+MAX_GROUP_KEY_LENGTH = 50
+SKU_HASH_LENGTH = 10
+
+_URL_PREFIX_PATTERN = re.compile(r'^\s*(?:https?://)?(?:www\.)?', re.IGNORECASE)
+_SKU_SEPARATOR_PATTERN = re.compile(r'[\s\-/:.]+')
+_SKU_INVALID_PATTERN = re.compile(r'[^A-Z0-9_]')
+_ALNUM_INVALID_PATTERN = re.compile(r'[^A-Z0-9]')
+_DIGITS_PATTERN = re.compile(r'\d+')
+
+# Insert checklist prefix order: FD-, PP-, A-, BIA-, BDN-, BS-, C-, 79D-
+INSERT_PREFIX_ORDER = {
+    'FD': 1,   # Final Draft
+    'PP': 2,   # Prized Prospects
+    'A': 3,    # Axis
+    'BIA': 4,  # Bowman In Action
+    'BDN': 5,  # Bowman Draft Night
+    'BS': 6,   # Bowman Spotlights
+    'C': 7,    # Crystallized
+    '79D': 8,  # Dream Draft Pick
+}
+
+
+@lru_cache(maxsize=8192)
+def _sku_part(value: str, max_length: int) -> str:
+    value = _URL_PREFIX_PATTERN.sub('', value).upper()
+    value = _SKU_SEPARATOR_PATTERN.sub('_', value)
+    return _SKU_INVALID_PATTERN.sub('', value)[:max_length]
+
+
+def sku_part(value: str, max_length: int = 20) -> str:
+    """Uppercase SKU fragment: separators become '_', everything else non-alphanumeric is dropped."""
+    return _sku_part(str(value or ''), max_length)
+
+
+@lru_cache(maxsize=1024)
+def _alnum_part(value: str) -> str:
+    return _ALNUM_INVALID_PATTERN.sub('', _URL_PREFIX_PATTERN.sub('', value).upper())
+
+
+def alnum_part(value: str, max_length: Optional[int] = None) -> str:
+    """Uppercase alphanumeric-only fragment (group keys allow nothing else)."""
+    value = _alnum_part(str(value or ''))
+    return value[:max_length] if max_length else value
+
+
+def card_identity(card: Dict, namespace: str = '') -> str:
+    """Canonical identity string for a card - what its SKU hash is derived from."""
+    return '|'.join((
+        str(card.get('set_name') or namespace or '').strip().lower(),
+        str(card.get('name', '')).strip().lower(),
+        str(card.get('number', '')).strip().lower(),
+        str(card.get('parallel', '') or '').strip().lower(),
+    ))
+
+
+def _identity_hash(identity: str, occurrence: int = 0) -> str:
+    if occurrence:
+        identity = f"{identity}#{occurrence}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:SKU_HASH_LENGTH].upper()
+
+
+def _sku_prefix(card: Dict, namespace: str = '') -> str:
+    budget = MAX_SKU_LENGTH - SKU_HASH_LENGTH - 1
+    name = sku_part(card.get('name', 'Unknown'), 20).strip('_')
+    number = sku_part(card.get('number', ''), 10).strip('_')
+    # The set name gives way to the name and number (the hash covers it anyway)
+    room = budget - len('CARD') - sum(len(part) + 1 for part in (name, number) if part) - 1
+    set_name = sku_part(card.get('set_name') or namespace or 'SET', 20)[:max(0, room)].strip('_')
+    readable = '_'.join(part for part in ('CARD', set_name, name, number) if part)
+    return readable[:budget].rstrip('_')
+
+
+def is_valid_sku(sku: str) -> bool:
+    return bool(sku) and len(sku) <= MAX_SKU_LENGTH and not _SKU_INVALID_PATTERN.search(sku)
+
+
+def make_sku(card: Dict, namespace: str = '', occurrence: int = 0) -> str:
+    """
+    Deterministic SKU for one card.
+
+    Format: CARD_<SET>_<NAME>_<NUMBER>_<HASH>, at most 50 chars: the set name
+    is shortened first and the hash is always intact. The set is the card's
+    set_name, else the namespace. `occurrence` distinguishes repeated
+    identical cards.
+    """
+    return f"{_sku_prefix(card, namespace)}_{_identity_hash(card_identity(card, namespace), occurrence)}"
+
+
+def generate_skus(cards: Iterable[Dict], namespace: str = '') -> List[str]:
+    """
+    SKUs for a whole card list in one pass, guaranteed unique within the list.
+
+    Identical cards (and the astronomically rare hash collision) get the next
+    occurrence number, so the result is still stable for the same input order.
+    A card that already carries a valid SKU (e.g. streamed by
+    /api/fetch-checklist) keeps it.
+    """
+    skus = []
+    seen = set()
+    occurrences = {}
+    for card in cards:
+        preset = str(card.get('sku') or '')
+        if is_valid_sku(preset) and preset not in seen:
+            seen.add(preset)
+            skus.append(preset)
+            continue
+        identity = card_identity(card, namespace)
+        prefix = _sku_prefix(card, namespace)
+        occurrence = occurrences.get(identity, 0)
+        sku = f"{prefix}_{_identity_hash(identity, occurrence)}"
+        while sku in seen:
+            occurrence += 1
+            sku = f"{prefix}_{_identity_hash(identity, occurrence)}"
+        occurrences[identity] = occurrence + 1
+        seen.add(sku)
+        skus.append(sku)
+    return skus
+
+
+def make_group_key(set_name: str, suffix: str, prefix: str = "GROUP", set_length: int = 20) -> str:
+    """
+    Alphanumeric-only inventory item group key: PREFIX + set name + suffix, max 50 chars.
+
+    The suffix (e.g. a timestamp) is never truncated; the set name gives way instead.
+    """
+    suffix = alnum_part(suffix)
+    set_name_clean = alnum_part(set_name, set_length) or "CARDSET"
+    max_set_len = max(0, MAX_GROUP_KEY_LENGTH - len(prefix) - len(suffix))
+    return alnum_part(f"{prefix}{set_name_clean[:max_set_len]}{suffix}", MAX_GROUP_KEY_LENGTH)
+
+
+def card_sort_key(card: Dict, checklist_type: str = 'base') -> Tuple:
+    """
+    Sort key for checklist cards.
+
+    Inserts sort by prefix order (FD, PP, A, ...) then number, autographs
+    alphabetically by card number, everything else by number then prefix.
+    """
+    num = str(card.get('number', ''))
+    if not num:
+        return (999, '', '')
+    try:
+        if '-' in num:
+            # Prefixed format: "BD-1", "FD-1", "A-1", etc.
+            prefix, num_part = num.split('-', 1)
+            if checklist_type == 'inserts':
+                num_match = _DIGITS_PATTERN.search(num_part)
+                # Special formats like "79D-DM" have no number
+                return (INSERT_PREFIX_ORDER.get(prefix, 999), int(num_match.group()) if num_match else 0)
+            elif checklist_type == 'autographs':
+                # Examples: CPA-AE, DPPBA-EW, BIA-BC - sort alphabetically
+                return (0, num)
+            # Base cards with prefixes (BD-1, BDC-1): number first, then prefix
+            return (int(num_part), prefix, num)
+        elif num.isdigit():
+            return (int(num), '', num)
+        match = _DIGITS_PATTERN.search(num)
+        if match:
+            return (int(match.group()), '', num)
+        return (999, '', num)
+    except (ValueError, TypeError):
+        return (999, '', num)
+
+
+def sort_cards(cards: List[Dict], checklist_type: str = 'base') -> List[Dict]:
+    """Sort a checklist with card_sort_key."""
+    return sorted(cards, key=lambda card: card_sort_key(card, checklist_type))
@@ -0,0 +1,168 @@
+"""Pre-flight image URL validation and normalization for listings.
+
+Runs before any inventory item or group is created so broken image links are
+dropped up front instead of surfacing as a failed publish and a retry cycle.
+"""
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import http_session
+
+# eBay allows up to 24 pictures per listing (inventory item group imageUrls)
+MAX_IMAGES_PER_LISTING = 24
+
+# Size variant eBay serves for full-size listing pictures
+EBAY_IMAGE_SIZE = "s-l1600"
+
+# How long a HEAD result is trusted (seconds)
+IMAGE_CHECK_TTL = 6 * 60 * 60
+
+_EBAY_SIZE_PATTERN = re.compile(r'/s-l\d+\.(jpg|jpeg|png|webp|gif)', re.IGNORECASE)
+_EBAY_IMAGE_HOST_PATTERN = re.compile(r'^https?://(i|thumbs\d*)\.ebayimg\.com/', re.IGNORECASE)
+
+# url -> (ok, reason, checked_at); shared across listings in this process
+_check_cache: Dict[str, Tuple[bool, str, float]] = {}
+_check_cache_lock = threading.Lock()
+
+
+def normalize_image_url(url: str) -> Optional[str]:
+    """
+    Normalize an image URL for eBay.
+
+    Strips whitespace, forces https on eBay's image CDN and rewrites ebayimg
+    size variants (s-l64, s-l225, s-l500...) to the full-size s-l1600 variant.
+    Returns None for values that are not http(s) URLs.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        return None
+    if _EBAY_IMAGE_HOST_PATTERN.match(url):
+        if url.lower().startswith('http://'):
+            url = 'https://' + url[len('http://'):]
+        url = _EBAY_SIZE_PATTERN.sub(lambda m: f"/{EBAY_IMAGE_SIZE}.{m.group(1)}", url)
+    return url
+
+
+def check_image_url(url: str, timeout: float = 10) -> Tuple[bool, str]:
+    """
+    HEAD-check a single image URL (cached). Returns (ok, reason).
+
+    Falls back to a streamed GET when the host does not allow HEAD. Only a
+    definitive answer (4xx, or a non-image Content-Type) rejects the URL. A
+    request that fails twice, a 429 or a 5xx keeps it as unverified (ok, not
+    cached), so a network blip never strips a listing of its pictures.
+    """
+    now = time.time()
+    with _check_cache_lock:
+        cached = _check_cache.get(url)
+    if cached and now - cached[2] < IMAGE_CHECK_TTL:
+        return cached[0], cached[1]
+
+    for attempt in range(2):
+        try:
+            response = http_session.head(url, allow_redirects=True, timeout=timeout)
+            if response.status_code in (403, 405, 501):
+                response = http_session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+                response.close()
+            break
+        except Exception as e:
+            if attempt == 1:
+                return True, f"Unverified (request failed: {e})"
+
+    content_type = response.headers.get('Content-Type', '').lower()
+    if response.status_code == 429 or response.status_code >= 500:
+        return True, f"Unverified (HTTP {response.status_code})"
+    if response.status_code != 200:
+        result = (False, f"HTTP {response.status_code}")
+    elif content_type and not content_type.startswith('image/'):
+        result = (False, f"Not an image (Content-Type: {content_type})")
+    else:
+        result = (True, "OK")
+
+    with _check_cache_lock:
+        _check_cache[url] = (result[0], result[1], now)
+    return result
+
+
+def check_image_urls(urls: List[str], max_workers: int = 8) -> Dict[str, Tuple[bool, str]]:
+    """HEAD-check many URLs concurrently. Returns {url: (ok, reason)}."""
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+        results = list(executor.map(check_image_url, unique_urls))
+    return dict(zip(unique_urls, results))
+
+
+def prepare_listing_images(
+    cards: List[Dict],
+    extra_images: List[str] = None,
+    max_images: int = MAX_IMAGES_PER_LISTING,
+    validate: bool = True
+) -> Dict:
+    """
+    Validate and normalize every image referenced by a listing.
+
+    Args:
+        cards: Card dicts (image_url or imageUrl per card)
+        extra_images: Listing-level images (e.g. the `images` argument)
+        max_images: Per-listing image limit for the group imageUrls
+        validate: HEAD-check URLs (set False to only normalize)
+
+    Returns:
+        Dict with 'card_images' (normalized valid URL or '' per card, same order),
+        'image_urls' (deduped group images, capped at max_images) and
+        'rejected' (list of {'url', 'reason'}).
+    """
+    rejected = []
+    raw_card_urls = [card.get('image_url') or card.get('imageUrl') or '' for card in cards]
+    normalized_cards = []
+    for raw_url in raw_card_urls:
+        normalized = normalize_image_url(raw_url)
+        if raw_url and not normalized:
+            rejected.append({"url": raw_url, "reason": "Not an http(s) URL"})
+        normalized_cards.append(normalized or '')
+
+    normalized_extra = []
+    for raw_url in extra_images or []:
+        normalized = normalize_image_url(raw_url)
+        if normalized:
+            normalized_extra.append(normalized)
+        elif raw_url:
+            rejected.append({"url": raw_url, "reason": "Not an http(s) URL"})
+
+    # Listing-level images first, then card images, de-duplicated in order
+    candidates = list(dict.fromkeys(normalized_extra + [url for url in normalized_cards if url]))
+
+    if validate and candidates:
+        start = time.time()
+        checks = check_image_urls(candidates)
+        valid = set()
+        for url, (ok, reason) in checks.items():
+            if ok:
+                valid.add(url)
+                if reason != "OK":
+                    print(f"[IMAGES] [WARNING] Keeping image {url[:100]}: {reason}")
+            else:
+                rejected.append({"url": url, "reason": reason})
+        print(f"[IMAGES] Checked {len(candidates)} image URL(s) in {time.time() - start:.1f}s: {len(valid)} OK, {len(candidates) - len(valid)} rejected")
+    else:
+        valid = set(candidates)
+
+    image_urls = [url for url in candidates if url in valid]
+    if len(image_urls) > max_images:
+        print(f"[IMAGES] {len(image_urls)} images exceed the per-listing limit of {max_images} - keeping the first {max_images}")
+        image_urls = image_urls[:max_images]
+
+    for item in rejected:
+        print(f"[IMAGES] [WARNING] Dropping image {item['url'][:100]}: {item['reason']}")
+
+    return {
+        "card_images": [url if url in valid else '' for url in normalized_cards],
+        "image_urls": image_urls,
+        "rejected": rejected
+    }
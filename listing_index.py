@@ -0,0 +1,225 @@
+"""Cached, queryable listing state for the listing manager dashboard.
+
+/api/listings in listing_manager_ui.py did a group GET and an offer GET for
+every tracked listing on every page load, so the dashboard got slower with
+each listing. The ListingIndex instead keeps one row per inventory item
+group, built from the same inventory snapshot as the HTML reports
+(listing_report.load_snapshot: paginated items and offers, one GET per group).
+
+- a query filters (status, set, price range), sorts and pages the cached rows
+  in memory. A response carries only the rows of its page, plus the overall
+  counts for the dashboard's stat cards.
+- rows older than LISTING_INDEX_TTL_SECONDS are still served while a
+  background thread re-reads the account. At most one refresh runs at a time.
+- edits made through the dashboard are patched into the cached rows, so they
+  show up before the next refresh.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+from listing_report import listing_rows, load_snapshot
+
+SORT_KEYS = ('title', 'price', 'quantity', 'status', 'set', 'group_key')
+DRAFT_STATUSES = ('UNPUBLISHED', 'Unknown')
+
+
+def _price(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def group_rows(snapshot: Dict, known: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    One dashboard row per inventory item group (no network I/O). Tracked
+    listings (known) that are not in the snapshot are kept with exists=False.
+    """
+    groups = snapshot.get('groups', {})
+    names = {listing['group_key']: listing.get('name') for listing in known or []}
+    by_group: Dict[str, List[Dict]] = {}
+    for row in listing_rows(snapshot):
+        if row['group_key']:
+            by_group.setdefault(row['group_key'], []).append(row)
+
+    rows = []
+    for group_key, offers in by_group.items():
+        group = groups.get(group_key)
+        if group is None:
+            continue  # group deleted, offers left behind: the orphan sweeper's business
+        prices = [p for p in (_price(offer['price']) for offer in offers) if p is not None]
+        quantities = [offer['quantity'] for offer in offers if isinstance(offer['quantity'], int)]
+        listed = [offer for offer in offers if offer['listing_id']]
+        aspects = group.get('aspects') or {}
+        title = group.get('title') or offers[0]['title']
+        rows.append({
+            "group_key": group_key,
+            "sku": offers[0]['sku'],
+            "name": names.get(group_key) or title,
+            "title": title,
+            "set": (aspects.get('Set') or [''])[0] or title,
+            "status": 'ACTIVE' if listed else offers[0]['status'],
+            "price": min(prices) if prices else 'N/A',
+            "quantity": sum(quantities) if quantities else 'N/A',
+            "offer_id": offers[0]['offer_id'] or 'N/A',
+            "listing_id": listed[0]['listing_id'] if listed else None,
+            "variations": len(offers),
+            "exists": True,
+        })
+
+    seen = {row['group_key'] for row in rows}
+    for listing in known or []:
+        if listing['group_key'] not in seen:
+            rows.append({
+                "group_key": listing['group_key'], "sku": listing.get('sku'), "name": listing.get('name'),
+                "title": 'N/A', "set": '', "status": 'Unknown', "price": 'N/A', "quantity": 'N/A',
+                "offer_id": 'N/A', "listing_id": None, "variations": 0, "exists": False,
+            })
+    return rows
+
+
+def query_listings(rows: List[Dict], status: Optional[str] = None, set_name: Optional[str] = None,
+                   min_price: Optional[float] = None, max_price: Optional[float] = None,
+                   sort: str = 'title', order: str = 'asc', page: int = 1, page_size: int = 50) -> Dict:
+    """
+    Filter, sort and page rows. status may be a comma-separated list; set_name
+    and price bounds match case-insensitively / inclusively. Rows without a
+    price never match a price filter and sort last.
+    """
+    statuses = {s.strip().upper() for s in status.split(',') if s.strip()} if status else None
+    needle = set_name.strip().lower() if set_name else ''
+    matched = []
+    for row in rows:
+        if statuses and str(row['status']).upper() not in statuses:
+            continue
+        if needle and needle not in row['set'].lower() and needle not in row['title'].lower():
+            continue
+        price = _price(row['price'])
+        if (min_price is not None or max_price is not None) and price is None:
+            continue
+        if min_price is not None and price < min_price:
+            continue
+        if max_price is not None and price > max_price:
+            continue
+        matched.append(row)
+
+    sort = sort if sort in SORT_KEYS else 'title'
+    if sort in ('price', 'quantity'):
+        present = [row for row in matched if _price(row[sort]) is not None]
+        missing = [row for row in matched if _price(row[sort]) is None]
+        present.sort(key=lambda row: _price(row[sort]), reverse=order == 'desc')
+        matched = present + missing
+    else:
+        matched.sort(key=lambda row: str(row[sort]).lower(), reverse=order == 'desc')
+
+    page_size = max(1, page_size)
+    pages = max(1, math.ceil(len(matched) / page_size))
+    page = min(max(1, page), pages)
+    return {
+        "listings": matched[(page - 1) * page_size:page * page_size],
+        "total": len(matched),
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+        "counts": {
+            "total": len(rows),
+            "draft": len([row for row in rows if row['status'] in DRAFT_STATUSES]),
+            "active": len([row for row in rows if row['status'] == 'ACTIVE']),
+        },
+    }
+
+
+class ListingIndex:
+    """
+    Dashboard rows kept in memory and refreshed in the background.
+
+    loader(refresh) returns an inventory snapshot; by default the saved
+    snapshot file on the first load (whatever its age) and a fresh read of the
+    account on every refresh. known returns the tracked listings.
+    """
+
+    def __init__(self, client=None, ttl_seconds: Optional[float] = None,
+                 loader: Optional[Callable[[bool], Dict]] = None,
+                 known: Optional[Callable[[], List[Dict]]] = None, clock: Callable[[], float] = time.time):
+        config = Config()
+        self.client = client
+        self.ttl = config.LISTING_INDEX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.loader = loader or self._load_snapshot
+        self.known = known or (lambda: [])
+        self.clock = clock
+        self.rows: Optional[List[Dict]] = None
+        self.refreshed_at = 0.0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load_snapshot(self, refresh: bool) -> Dict:
+        return load_snapshot(self.client, max_age_minutes=None if refresh else float('inf'), refresh=refresh)
+
+    def _apply(self, snapshot: Dict):
+        rows = group_rows(snapshot, self.known())
+        with self._lock:
+            self.rows = rows
+            self.refreshed_at = snapshot.get('taken_at') or self.clock()
+
+    def refresh(self):
+        """Re-read the account now (blocking); keeps the old rows if that fails."""
+        try:
+            self._apply(self.loader(True))
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[WARNING] Listing refresh failed, serving cached listings: {e}")
+
+    def refresh_async(self) -> bool:
+        """Start a background refresh unless one is running; True when one was started."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self.refresh, name="listing-index-refresh", daemon=True)
+            self._thread.start()
+            return True
+
+    @property
+    def refreshing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def current(self) -> List[Dict]:
+        """The cached rows; loads them on first use and schedules a refresh once they are stale."""
+        if self.rows is None:
+            self._apply(self.loader(False))
+        if self.clock() - self.refreshed_at >= self.ttl:
+            self.refresh_async()
+        return self.rows
+
+    def query(self, **filters) -> Dict:
+        """query_listings over the cached rows, plus when they were read."""
+        result = query_listings(self.current(), **filters)
+        result["refreshed_at"] = self.refreshed_at
+        result["refreshing"] = self.refreshing
+        return result
+
+    def get(self, group_key: str) -> Optional[Dict]:
+        for row in self.current():
+            if row['group_key'] == group_key:
+                return row
+        return None
+
+    def patch(self, group_key: str, **fields):
+        """Apply a change made through the dashboard to the cached row."""
+        with self._lock:
+            for row in self.rows or []:
+                if row['group_key'] == group_key:
+                    row.update(fields)
+
+    def discard(self, group_key: str):
+        with self._lock:
+            if self.rows is not None:
+                self.rows = [row for row in self.rows if row['group_key'] != group_key]
+
+    def invalidate(self):
+        """Mark the rows stale so the next query triggers a background refresh."""
+        self.refreshed_at = 0.0
@@ -4,6 +4,8 @@ A simple web interface to manage your eBay listings via API.
 """
 from flask import Flask, render_template, request, jsonify, redirect, url_for
 from ebay_api_client import eBayAPIClient
+from config import Config
+from listing_index import ListingIndex
 import sys
 import json
 
@@ -31,6 +33,10 @@ KNOWN_LISTINGS = [
     },
 ]
 
+# Dashboard rows come from the cached inventory snapshot, refreshed in the background
+config = Config()
+listing_index = ListingIndex(client, known=lambda: KNOWN_LISTINGS)
+
 
 @app.route('/')
 def index():
@@ -38,36 +44,45 @@ def index():
     return render_template('index.html')
 
 
+def _float_arg(name):
+    value = request.args.get(name, '').strip()
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
 @app.route('/api/listings')
 def get_listings():
-    """Get all known listings with their current status."""
-    listings = []
-    
-    for listing in KNOWN_LISTINGS:
-        group_key = listing['group_key']
-        sku = listing['sku']
-        
-        # Get group info
-        group_result = client.get_inventory_item_group(group_key)
-        group_data = group_result.get('data', {}) if group_result.get('success') else {}
-        
-        # Get offer info
-        offer_result = client.get_offer_by_sku(sku)
-        offer = offer_result.get('offer', {}) if offer_result.get('success') else {}
-        
-        listings.append({
-            "group_key": group_key,
-            "sku": sku,
-            "name": listing['name'],
-            "title": group_data.get('title', 'N/A'),
-            "status": offer.get('listingStatus', 'Unknown'),
-            "price": offer.get('pricingSummary', {}).get('price', {}).get('value', 'N/A'),
-            "quantity": offer.get('availableQuantity', offer.get('quantity', 'N/A')),
-            "offer_id": offer.get('offerId', 'N/A'),
-            "exists": group_result.get('success', False)
-        })
-    
-    return jsonify(listings)
+    """
+    One page of listings from the cached inventory state.
+    
+    Query parameters: status (comma-separated), set, min_price, max_price,
+    sort (title|price|quantity|status|set|group_key), order (asc|desc),
+    page, page_size (at most 200).
+    """
+    page_size = request.args.get('page_size', type=int) or config.LISTING_API_PAGE_SIZE
+    try:
+        result = listing_index.query(
+            status=request.args.get('status'),
+            set_name=request.args.get('set'),
+            min_price=_float_arg('min_price'),
+            max_price=_float_arg('max_price'),
+            sort=request.args.get('sort', 'title'),
+            order=request.args.get('order', 'asc'),
+            page=request.args.get('page', 1, type=int),
+            page_size=min(page_size, 200)
+        )
+    except Exception as e:
+        return jsonify({"error": f"Could not load listings: {e}"}), 502
+    return jsonify(result)
+
+
+@app.route('/api/listings/refresh', methods=['POST'])
+def refresh_listings():
+    """Re-read the account in the background."""
+    started = listing_index.refresh_async()
+    return jsonify({"success": True, "started": started})
 
 
 @app.route('/api/listing/<group_key>')
@@ -173,6 +188,12 @@ def update_listing(group_key):
     result = client.update_offer(offer_id, update_data)
     
     if result.get('success'):
+        changes = {}
+        if new_price:
+            changes['price'] = float(new_price)
+        if new_quantity:
+            changes['quantity'] = int(new_quantity)
+        listing_index.patch(group_key, **changes)
         return jsonify({"success": True, "message": "Listing updated"})
     else:
         return jsonify({"error": result.get('error', 'Update failed')}), 400
@@ -209,6 +230,7 @@ def delete_listing(group_key):
     if result.get('success'):
         # Remove from known listings
         KNOWN_LISTINGS = [l for l in KNOWN_LISTINGS if l['group_key'] != group_key]
+        listing_index.discard(group_key)
         return jsonify({"success": True, "message": "Listing deleted"})
     else:
         return jsonify({"error": result.get('error', 'Delete failed')}), 400
@@ -235,6 +257,7 @@ def add_listing():
         "sku": sku,
         "name": name
     })
+    listing_index.invalidate()
     
     return jsonify({"success": True, "message": "Listing added to tracking"})
 
@@ -355,6 +378,7 @@ def publish_test_listing():
             "sku": created_skus[0],
             "name": "Test Variation Listing"
         })
+        listing_index.invalidate()
         return jsonify({
             "success": True,
             "listing_id": listing_id,
@@ -0,0 +1,209 @@
+"""Incremental static HTML reports over a local inventory snapshot.
+
+generate_listings_html.py and editable_listings_viewer.py used to read the
+first 100 inventory items, look up offers one SKU at a time and rebuild the
+whole HTML file on every run. Reports now work in two steps:
+
+- the account is read into a snapshot file (LISTING_SNAPSHOT_FILE) by the
+  orphan sweeper's take_snapshot: paginated items and offers plus one GET per
+  group, so there is no 100-item cap and no per-SKU call. A snapshot younger
+  than LISTING_SNAPSHOT_MAX_AGE_MINUTES is reused as is.
+- ReportWriter renders one card per listing and remembers each card by the
+  hash of its row, so only listings that changed since the last run are
+  rendered again. Cards are split into pages of LISTING_REPORT_PAGE_SIZE, a
+  page is only written when something on it changed, and every file is
+  written to a temporary file and swapped in, so a browser never sees half a
+  report.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+
+def write_atomic(path: str, text: str):
+    """Write a text file through a temporary file and an atomic rename."""
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+def load_snapshot(client=None, snapshot_file: Optional[str] = None, max_age_minutes: Optional[float] = None,
+                  refresh: bool = False) -> Dict:
+    """
+    The saved inventory snapshot, or a new one when it is missing, older than
+    max_age_minutes or refresh is set. A client is only created when needed.
+    """
+    config = Config()
+    snapshot_file = snapshot_file or config.LISTING_SNAPSHOT_FILE
+    max_age = config.LISTING_SNAPSHOT_MAX_AGE_MINUTES if max_age_minutes is None else max_age_minutes
+    if not refresh and os.path.exists(snapshot_file):
+        try:
+            with open(snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            age = time.time() - snapshot.get('taken_at', 0)
+            if age < max_age * 60:
+                print(f"[INFO] Using inventory snapshot from {age / 60:.1f} minutes ago ({snapshot_file})")
+                return snapshot
+        except Exception as e:
+            print(f"[WARNING] Could not read inventory snapshot {snapshot_file}: {e}")
+
+    from orphan_sweeper import take_snapshot
+    if client is None:
+        from ebay_api_client import eBayAPIClient
+        client = eBayAPIClient()
+    print("[INFO] Reading inventory snapshot from eBay...")
+    snapshot = take_snapshot(client)
+    for error in snapshot.get('errors', []):
+        print(f"[WARNING] {error}")
+    write_atomic(snapshot_file, json.dumps(snapshot))
+    print(f"[INFO] Snapshot: {len(snapshot['items'])} items, {len(snapshot['offers'])} offers, "
+          f"{len(snapshot['groups'])} groups")
+    return snapshot
+
+
+def listing_rows(snapshot: Dict) -> List[Dict]:
+    """One report row per offer, joined with its inventory item and group (no network I/O)."""
+    items, groups = snapshot.get('items', {}), snapshot.get('groups', {})
+    rows = []
+    for offer in snapshot.get('offers', []):
+        sku = offer.get('sku')
+        if not sku:
+            continue
+        item = items.get(sku) or {}
+        group_key = offer.get('inventoryItemGroupKey', '')
+        group = groups.get(group_key) or {}
+        product = item.get('product', {})
+        listing = offer.get('listing', {})
+        price = (offer.get('pricingSummary') or {}).get('price', {})
+        rows.append({
+            'title': (
+                group.get('title') or
+                product.get('title') or
+                listing.get('title') or
+                'Untitled Listing'
+            ),
+            'sku': sku,
+            'offer_id': offer.get('offerId'),
+            'listing_id': offer.get('listingId') or listing.get('listingId'),
+            'group_key': group_key,
+            'status': offer.get('status', 'UNKNOWN'),
+            'price': price.get('value', 'N/A'),
+            'currency': price.get('currency', 'USD'),
+            'quantity': offer.get('availableQuantity', offer.get('quantity', 'N/A')),
+            'description': offer.get('listingDescription') or listing.get('description') or '',
+            'category_id': offer.get('categoryId', 'N/A'),
+            'images': product.get('imageUrls') or group.get('imageUrls') or listing.get('imageUrls') or [],
+        })
+    rows.sort(key=lambda row: (row['group_key'], row['sku']))
+    return rows
+
+
+def content_hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def page_file(output_file: str, page: int) -> str:
+    """Page 1 is output_file itself, later pages get a _p<n> suffix."""
+    if page == 1:
+        return output_file
+    base, ext = os.path.splitext(output_file)
+    return f"{base}_p{page}{ext}"
+
+
+def page_nav(page: int, pages: List[str]) -> str:
+    """Prev/next links plus one link per page; '' for a single page."""
+    if len(pages) <= 1:
+        return ''
+    links = []
+    if page > 1:
+        links.append(f'<a href="{os.path.basename(pages[page - 2])}">&laquo; Prev</a>')
+    for n, path in enumerate(pages, 1):
+        if n == page:
+            links.append(f'<span class="current">{n}</span>')
+        else:
+            links.append(f'<a href="{os.path.basename(path)}">{n}</a>')
+    if page < len(pages):
+        links.append(f'<a href="{os.path.basename(pages[page])}">Next &raquo;</a>')
+    return f'<div class="pagination">{" ".join(links)}</div>'
+
+
+class ReportWriter:
+    """
+    Paginated HTML report that only re-renders changed listings.
+
+    render_card(row) returns the HTML of one listing; render_page(cards, rows,
+    page, pages, context) wraps a page of cards. Rendered cards and page hashes
+    are kept in state_file (default: next to output_file) between runs.
+    """
+
+    def __init__(self, output_file: str, render_card: Callable[[Dict], str], render_page: Callable[..., str],
+                 page_size: Optional[int] = None, state_file: Optional[str] = None):
+        self.output_file = output_file
+        self.render_card = render_card
+        self.render_page = render_page
+        self.page_size = max(1, page_size or Config().LISTING_REPORT_PAGE_SIZE)
+        self.state_file = state_file or f"{os.path.splitext(output_file)[0]}.report.json"
+        self.state = self._load()
+
+    def _load(self) -> Dict:
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"[WARNING] Could not read report state {self.state_file}: {e}")
+        return {"cards": {}, "pages": {}}
+
+    def build(self, rows: List[Dict], context: Optional[Dict] = None) -> Dict:
+        """
+        Render and write the report. context is passed to render_page and is
+        part of every page's hash, so keep timestamps out of it.
+        """
+        context = context or {}
+        old_cards = self.state.get('cards', {})
+        old_pages = self.state.get('pages', {})
+        cards, rendered = {}, 0
+        for row in rows:
+            key = row['sku']
+            digest = content_hash(row)
+            cached = old_cards.get(key)
+            if cached and cached['hash'] == digest:
+                cards[key] = cached
+            else:
+                cards[key] = {"hash": digest, "html": self.render_card(row)}
+                rendered += 1
+
+        chunks = [rows[i:i + self.page_size] for i in range(0, len(rows), self.page_size)] or [[]]
+        pages = [page_file(self.output_file, n) for n in range(1, len(chunks) + 1)]
+        context_hash = content_hash(context)
+        page_hashes, written = {}, 0
+        for n, chunk in enumerate(chunks, 1):
+            path = pages[n - 1]
+            digest = content_hash([len(pages), context_hash] + [cards[row['sku']]['hash'] for row in chunk])
+            page_hashes[path] = digest
+            if old_pages.get(path) == digest and os.path.exists(path):
+                continue
+            html = self.render_page([cards[row['sku']]['html'] for row in chunk], chunk, n, pages, context)
+            write_atomic(path, html)
+            written += 1
+
+        # Pages past the new last page would link into a report that no longer exists
+        for path in old_pages:
+            if path not in page_hashes and os.path.exists(path):
+                os.remove(path)
+
+        self.state = {"cards": cards, "pages": page_hashes}
+        write_atomic(self.state_file, json.dumps(self.state))
+        return {
+            "listings": len(rows),
+            "rendered": rendered,
+            "reused": len(rows) - rendered,
+            "pages": len(pages),
+            "written": written,
+            "files": pages,
+        }
@@ -0,0 +1,114 @@
+"""Shard planning for variation listings larger than eBay's per-listing limit.
+
+eBay caps the number of variations in one listing (inventory item group). Big
+checklists are split up front - before any inventory item is created - into
+shards that each fit, keeping checklist sections together and splitting
+oversized sections into balanced card-number ranges.
+"""
+import math
+from typing import Dict, List
+
+# eBay's limit on variations (variantSKUs) per listing
+MAX_VARIATIONS_PER_LISTING = 250
+
+# eBay listing title limit
+MAX_TITLE_LENGTH = 80
+
+# Card keys that name the checklist section a card came from
+SECTION_KEYS = ('section', 'type', 'parallel')
+
+
+def card_section(card: Dict) -> str:
+    """Section label for a card ('' when the checklist has no sections)."""
+    for key in SECTION_KEYS:
+        value = card.get(key)
+        if value:
+            return str(value).strip()
+    return ''
+
+
+def _number_range(cards: List[Dict]) -> str:
+    first = str(cards[0].get('number', '')).strip()
+    last = str(cards[-1].get('number', '')).strip()
+    if not first or not last:
+        return ''
+    return f"#{first}" if first == last else f"#{first}-{last}"
+
+
+def _split_balanced(cards: List[Dict], max_size: int) -> List[List[Dict]]:
+    """Split into the fewest chunks <= max_size, with sizes as even as possible."""
+    count = math.ceil(len(cards) / max_size)
+    size = math.ceil(len(cards) / count)
+    return [cards[i:i + size] for i in range(0, len(cards), size)]
+
+
+def plan_shards(cards: List[Dict], max_variations: int = MAX_VARIATIONS_PER_LISTING) -> List[Dict]:
+    """
+    Plan how to split a card list into listings of at most `max_variations`.
+
+    Consecutive cards of the same section stay together; small adjacent sections
+    are packed into one shard, oversized sections are split by number range.
+
+    Returns:
+        List of {'cards', 'sections', 'label'}; a single shard when everything fits.
+    """
+    if len(cards) <= max_variations:
+        return [{"cards": list(cards), "sections": sorted({card_section(c) for c in cards} - {''}), "label": ""}]
+
+    # Runs of consecutive cards with the same section, in checklist order
+    runs = []
+    for card in cards:
+        section = card_section(card)
+        if runs and runs[-1][0] == section:
+            runs[-1][1].append(card)
+        else:
+            runs.append((section, [card]))
+
+    shards = []
+    pending = {"cards": [], "sections": []}
+    for section, run in runs:
+        if len(run) > max_variations:
+            if pending["cards"]:
+                shards.append(pending)
+                pending = {"cards": [], "sections": []}
+            for chunk in _split_balanced(run, max_variations):
+                shards.append({"cards": chunk, "sections": [section] if section else [], "split": True})
+            continue
+        if len(pending["cards"]) + len(run) > max_variations:
+            shards.append(pending)
+            pending = {"cards": [], "sections": []}
+        pending["cards"].extend(run)
+        if section and section not in pending["sections"]:
+            pending["sections"].append(section)
+    if pending["cards"]:
+        shards.append(pending)
+
+    for shard in shards:
+        parts = []
+        if shard["sections"]:
+            parts.append(" / ".join(s.title() for s in shard["sections"]))
+        if shard.pop("split", False) or not shard["sections"]:
+            parts.append(_number_range(shard["cards"]))
+        shard["label"] = " ".join(p for p in parts if p)
+    return shards
+
+
+def shard_title(title: str, shard: Dict, index: int, total: int, max_length: int = MAX_TITLE_LENGTH) -> str:
+    """
+    Listing title for one shard: the base title plus the shard label (or
+    "Part i/n"), trimming the base title so the result fits eBay's limit.
+    """
+    if total <= 1:
+        return title[:max_length]
+    suffix = f" {shard['label']}" if shard.get('label') else ""
+    suffix = f"{suffix} ({index}/{total})" if len(suffix) < 25 else f" ({index}/{total})"
+    base = title[:max(0, max_length - len(suffix))].rstrip(" -")
+    return f"{base}{suffix}"
+
+
+def summarize_shards(shards: List[Dict]) -> List[Dict]:
+    """Printable/serializable view of a plan (no card lists)."""
+    return [
+        {"index": i, "cards": len(shard["cards"]), "label": shard["label"], "sections": shard["sections"]}
+        for i, shard in enumerate(shards, start=1)
+    ]
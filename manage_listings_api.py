@@ -3,6 +3,7 @@ Manage eBay listings via API - View, Update, Delete listings created via API.
 Since drafts may not appear in Seller Hub, use this to manage them via API.
 """
 from ebay_api_client import eBayAPIClient
+from repricing import RepricingEngine
 import sys
 import json
 from typing import List, Dict, Optional
@@ -14,6 +15,7 @@ class ListingManager:
     
     def __init__(self):
         self.client = eBayAPIClient()
+        self.repricer = RepricingEngine(client=self.client)
     
     def list_all_groups(self) -> List[Dict]:
         """List all inventory item groups (variation listings)."""
@@ -160,77 +162,31 @@ class ListingManager:
         print(f"Updating price for SKU: {sku}")
         print(f"New price: ${new_price}")
         print()
-        
-        # Get current offer
-        offer_result = self.client.get_offer_by_sku(sku)
-        if not offer_result.get('success'):
-            print(f"[ERROR] Could not get offer: {offer_result.get('error')}")
-            return False
-        
-        offer = offer_result['offer']
-        offer_id = offer.get('offerId')
-        
-        # Build update
-        update_data = {
-            "sku": sku,
-            "marketplaceId": offer.get('marketplaceId', 'EBAY_US'),
-            "format": offer.get('format', 'FIXED_PRICE'),
-            "categoryId": offer.get('categoryId'),
-            "pricingSummary": {
-                "price": {
-                    "value": str(new_price),
-                    "currency": "USD"
-                }
-            },
-            "quantity": offer.get('availableQuantity', offer.get('quantity', 1)),
-            "availableQuantity": offer.get('availableQuantity', offer.get('quantity', 1)),
-            "listingDuration": offer.get('listingDuration', 'GTC'),
-            "merchantLocationKey": offer.get('merchantLocationKey')
-        }
-        
-        result = self.client.update_offer(offer_id, update_data)
-        if result.get('success'):
-            print("[OK] Offer price updated")
-            return True
-        else:
-            print(f"[ERROR] {result.get('error')}")
-            return False
+        return self.update_prices({sku: {"price": new_price}}, skus=[sku], refresh=True).get('success', False)
     
     def update_offer_quantity(self, sku: str, new_quantity: int):
         """Update offer quantity."""
         print(f"Updating quantity for SKU: {sku}")
         print(f"New quantity: {new_quantity}")
         print()
-        
-        # Get current offer
-        offer_result = self.client.get_offer_by_sku(sku)
-        if not offer_result.get('success'):
-            print(f"[ERROR] Could not get offer: {offer_result.get('error')}")
-            return False
-        
-        offer = offer_result['offer']
-        offer_id = offer.get('offerId')
-        
-        # Build update
-        update_data = {
-            "sku": sku,
-            "marketplaceId": offer.get('marketplaceId', 'EBAY_US'),
-            "format": offer.get('format', 'FIXED_PRICE'),
-            "categoryId": offer.get('categoryId'),
-            "pricingSummary": offer.get('pricingSummary', {}),
-            "quantity": new_quantity,
-            "availableQuantity": new_quantity,
-            "listingDuration": offer.get('listingDuration', 'GTC'),
-            "merchantLocationKey": offer.get('merchantLocationKey')
-        }
-        
-        result = self.client.update_offer(offer_id, update_data)
-        if result.get('success'):
-            print("[OK] Offer quantity updated")
-            return True
-        else:
-            print(f"[ERROR] {result.get('error')}")
-            return False
+        return self.update_prices({sku: {"quantity": new_quantity}}, skus=[sku], refresh=True).get('success', False)
+    
+    def update_prices(self, table, skus: List[str] = None, group_keys: List[str] = None,
+                      refresh: bool = False, dry_run: bool = False) -> Dict:
+        """
+        Bulk update prices/quantities from a price table (CSV path or dict keyed by
+        SKU, card number or name). Diffs against the local offer state and only sends
+        changed SKUs, 25 per bulk call.
+        """
+        result = self.repricer.reprice(table, skus=skus, group_keys=group_keys, refresh=refresh, dry_run=dry_run)
+        for sku, outcome in result['results'].items():
+            if outcome.get('success'):
+                print(f"[OK] {sku} updated")
+            else:
+                print(f"[ERROR] {sku}: {outcome.get('error')}")
+        for sku in result['unchanged']:
+            print(f"[OK] {sku} already up to date")
+        return result
     
     def delete_group(self, group_key: str):
         """Delete an inventory item group and its offers."""
@@ -337,13 +293,16 @@ def main():
     print("4. Update quantity:")
     print("   manager.update_offer_quantity('CARD_DIFF_APPROACH_TEST_1_0', 5)")
     print()
-    print("5. Update group title:")
+    print("5. Bulk reprice a group from a CSV (sku/number/name, price, quantity):")
+    print("   manager.update_prices('prices.csv', group_keys=['GROUPSAHF8A3F381768715399'])")
+    print()
+    print("6. Update group title:")
     print("   manager.update_group_title('GROUPSAHF8A3F381768715399', 'New Title')")
     print()
-    print("6. Delete a group:")
+    print("7. Delete a group:")
     print("   manager.delete_group('GROUPSAHF8A3F381768715399')")
     print()
-    print("7. List test listings:")
+    print("8. List test listings:")
     print("   manager.list_test_listings()")
     print()
     print("=" * 80)
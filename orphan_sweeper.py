@@ -0,0 +1,336 @@
+"""Garbage collection of orphaned inventory from failed listing runs.
+
+A listing run that dies half way leaves inventory items, offers and groups
+behind. They cannot be published, and they slow down every later account scan.
+The cleanup_* scripts each listed inventory, looked up offers one SKU at a
+time and deleted serially. The sweeper instead works from one snapshot:
+
+- every inventory item and offer, read through the client's paginator
+- every group any item or offer refers to, fetched concurrently
+
+It then finds the orphans locally:
+
+- offers without a group: unpublished, with no group key (on the offer or
+  its item) or a group that no longer exists
+- items without offers
+- groups with missing SKUs: variant SKUs that are no longer inventory items,
+  in a group with no published offer. These are only reported: deleting the
+  group would orphan every other variation of the draft.
+
+Deletes run concurrently under one rate budget: offers first, then items.
+Published listings are never touched. An orphan is only deleted
+after it has been seen for ORPHAN_GRACE_MINUTES, because a listing that is
+still being created looks orphaned for a moment. That makes the sweeper safe
+to leave running in the background (--watch). First-seen times are kept in
+ORPHAN_SWEEP_STATE_FILE.
+
+    python orphan_sweeper.py            # dry run: report only
+    python orphan_sweeper.py --delete   # delete orphans past the grace period
+    python orphan_sweeper.py --delete --watch
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from config import Config
+from http_session import RateBudget
+
+OFFER_WITHOUT_GROUP = 'offer_without_group'
+ITEM_WITHOUT_OFFER = 'item_without_offer'
+GROUP_MISSING_SKUS = 'group_missing_skus'
+
+# Delete order: offers before their items
+DELETE_ORDER = (OFFER_WITHOUT_GROUP, ITEM_WITHOUT_OFFER)
+# Reported, never deleted (a group still holds live variations)
+REPORT_ONLY = (GROUP_MISSING_SKUS,)
+ORPHAN_KINDS = DELETE_ORDER + REPORT_ONLY
+
+ITEMS_ENDPOINT = '/sell/inventory/v1/inventory_item'
+OFFERS_ENDPOINT = '/sell/inventory/v1/offer'
+
+
+def _offers_for_sku(client, sku: str) -> List[Dict]:
+    """Offers of one SKU; [] when it has none, raises when eBay can't say."""
+    response = client._make_request('GET', OFFERS_ENDPOINT, params={"sku": sku})
+    if response.status_code == 200:
+        return response.json().get('offers') or []
+    if response.status_code == 404:
+        return []
+    raise requests.HTTPError(f"GET offers for {sku} failed: HTTP {response.status_code}", response=response)
+
+
+def take_snapshot(client, max_workers: int = 8) -> Dict:
+    """
+    Everything the orphan rules need, in as few rounds as possible.
+
+    Raises requests.HTTPError if items or offers cannot be listed completely.
+    A partial snapshot would make live records look orphaned.
+    """
+    items = {item['sku']: item for item in client.iter_collection(ITEMS_ENDPOINT, 'inventoryItems') if item.get('sku')}
+    try:
+        offers = list(client.iter_collection(OFFERS_ENDPOINT, 'offers'))
+    except requests.HTTPError:
+        # Some accounts only answer offer queries per SKU
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            offers = [offer for offers in executor.map(lambda sku: _offers_for_sku(client, sku), items) for offer in offers]
+
+    group_keys = {offer['inventoryItemGroupKey'] for offer in offers if offer.get('inventoryItemGroupKey')}
+    for item in items.values():
+        group_keys.update(item.get('groupIds') or item.get('inventoryItemGroupKeys') or [])
+    groups = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for key, result in zip(sorted(group_keys), executor.map(client.get_inventory_item_group, sorted(group_keys))):
+            if result.get('success'):
+                groups[key] = result.get('data') or {}
+            elif result.get('status_code') == 404:
+                groups[key] = None
+            else:
+                # Unknown state: no rule may act on this group
+                errors.append(f"Could not get group {key}: {result.get('error')}")
+    return {"items": items, "offers": offers, "groups": groups, "errors": errors, "taken_at": time.time()}
+
+
+def _is_published(offer: Dict) -> bool:
+    return bool(offer.get('listingId') or offer.get('status') == 'PUBLISHED'
+                or (offer.get('listing') or {}).get('listingId'))
+
+
+def _item_group_keys(item: Optional[Dict]) -> List[str]:
+    return (item or {}).get('groupIds') or (item or {}).get('inventoryItemGroupKeys') or []
+
+
+def find_orphans(snapshot: Dict) -> List[Dict]:
+    """Apply the orphan rules to a snapshot (no network I/O)."""
+    items, offers, groups = snapshot['items'], snapshot['offers'], snapshot['groups']
+    skus_with_offers = {offer.get('sku') for offer in offers}
+    published_groups = {offer.get('inventoryItemGroupKey') for offer in offers if _is_published(offer)}
+    orphans = []
+
+    for offer in offers:
+        if _is_published(offer) or not offer.get('offerId'):
+            continue
+        group_key = offer.get('inventoryItemGroupKey')
+        if not group_key:
+            # The offer payload may leave the key out; the item still names its group.
+            # A group that is live, or whose state is unknown, keeps the offer.
+            if any(groups.get(key, {}) is not None for key in _item_group_keys(items.get(offer.get('sku')))):
+                continue
+            reason = "unpublished offer not in any group"
+        elif group_key in groups and groups[group_key] is None:
+            reason = f"group {group_key} no longer exists"
+        else:
+            continue
+        orphans.append({"kind": OFFER_WITHOUT_GROUP, "id": offer['offerId'], "sku": offer.get('sku'), "reason": reason})
+
+    for sku in items:
+        if sku not in skus_with_offers:
+            orphans.append({"kind": ITEM_WITHOUT_OFFER, "id": sku, "sku": sku, "reason": "inventory item has no offer"})
+
+    for key, group in groups.items():
+        if group is None or key in published_groups:
+            continue
+        missing = [sku for sku in group.get('variantSKUs') or [] if sku not in items]
+        if missing:
+            sample = ', '.join(missing[:3]) + (f" (+{len(missing) - 3} more)" if len(missing) > 3 else "")
+            orphans.append({"kind": GROUP_MISSING_SKUS, "id": key, "sku": None,
+                            "reason": f"{len(missing)} variant SKU(s) no longer exist: {sample} (report only)"})
+    return orphans
+
+
+class OrphanSweeper:
+    """
+    Snapshot, find orphans, delete the ones past the grace period.
+
+    Args:
+        client: eBayAPIClient
+        state_file: Where first-seen times are kept (None = in memory only)
+        grace_minutes: Minimum time an orphan must have been seen before it is deleted
+        concurrency: Deletes (and group lookups) in flight at once
+        rate_limit: eBay API calls per second (default EBAY_RATE_LIMIT)
+        interval_minutes: Period of the background loop
+    """
+
+    def __init__(
+        self,
+        client,
+        state_file: Optional[str] = None,
+        grace_minutes: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        interval_minutes: Optional[float] = None
+    ):
+        config = Config()
+        self.client = client
+        self.state_file = state_file
+        self.grace = 60 * (config.ORPHAN_GRACE_MINUTES if grace_minutes is None else grace_minutes)
+        self.concurrency = max(1, concurrency or config.ORPHAN_SWEEP_CONCURRENCY)
+        self.rate_limit = config.EBAY_RATE_LIMIT if rate_limit is None else rate_limit
+        self.interval = 60 * (config.ORPHAN_SWEEP_INTERVAL_MINUTES if interval_minutes is None else interval_minutes)
+        self.first_seen: Dict[str, float] = self._load()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_report = None
+
+    def _load(self) -> Dict[str, float]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('first_seen', {})
+        except Exception as e:
+            print(f"[WARNING] Could not read orphan sweeper state {self.state_file}: {e}")
+            return {}
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"first_seen": self.first_seen}, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _delete(self, orphan: Dict) -> Dict:
+        delete = {
+            OFFER_WITHOUT_GROUP: self.client.delete_offer,
+            ITEM_WITHOUT_OFFER: self.client.delete_inventory_item
+        }[orphan['kind']]
+        try:
+            result = delete(orphan['id'])
+        except Exception as e:
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        return {**orphan, "deleted": bool(result.get('success')), "error": None if result.get('success') else result.get('error')}
+
+    def sweep(self, dry_run: bool = True, now: Optional[float] = None) -> Dict:
+        """
+        One pass: snapshot, find orphans, delete those past the grace period (unless dry_run).
+
+        Returns a report with every orphan found, which were eligible, and the delete results.
+        """
+        now = time.time() if now is None else now
+        started = time.monotonic()
+        previous_budget = self.client.rate_budget
+        if previous_budget is None:
+            self.client.rate_budget = RateBudget(self.rate_limit)
+        try:
+            snapshot = take_snapshot(self.client, max_workers=self.concurrency)
+            orphans = find_orphans(snapshot)
+
+            # Forget orphans that resolved themselves; remember when new ones were first seen
+            current = {f"{o['kind']}:{o['id']}" for o in orphans}
+            self.first_seen = {key: seen for key, seen in self.first_seen.items() if key in current}
+            for orphan in orphans:
+                seen = self.first_seen.setdefault(f"{orphan['kind']}:{orphan['id']}", now)
+                orphan["age_minutes"] = round((now - seen) / 60, 1)
+                orphan["eligible"] = orphan['kind'] not in REPORT_ONLY and now - seen >= self.grace
+
+            results = []
+            if not dry_run:
+                for kind in DELETE_ORDER:
+                    batch = [o for o in orphans if o['kind'] == kind and o['eligible']]
+                    if batch:
+                        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                            results.extend(executor.map(self._delete, batch))
+                for result in results:
+                    if result['deleted']:
+                        self.first_seen.pop(f"{result['kind']}:{result['id']}", None)
+            self._save()
+        finally:
+            self.client.rate_budget = previous_budget
+
+        report = {
+            "dry_run": dry_run,
+            "items": len(snapshot['items']),
+            "offers": len(snapshot['offers']),
+            "groups": len(snapshot['groups']),
+            "errors": snapshot['errors'],
+            "orphans": orphans,
+            "by_kind": {kind: sum(1 for o in orphans if o['kind'] == kind) for kind in ORPHAN_KINDS},
+            "eligible": sum(1 for o in orphans if o['eligible']),
+            "deleted": sum(1 for r in results if r['deleted']),
+            "failed": [r for r in results if not r['deleted']],
+            "seconds": round(time.monotonic() - started, 1)
+        }
+        self.last_report = report
+        print(f"[SWEEP] {report['items']} items, {report['offers']} offers, {report['groups']} groups: "
+              f"{len(orphans)} orphan(s), {report['eligible']} past grace, "
+              f"{'dry run' if dry_run else str(report['deleted']) + ' deleted'} ({report['seconds']}s)")
+        return report
+
+    def _run(self, dry_run: bool):
+        while not self._stop.is_set():
+            try:
+                self.sweep(dry_run=dry_run)
+            except Exception as e:
+                # Includes incomplete snapshots: nothing is deleted, try again next interval
+                print(f"[SWEEP] Sweep failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self, dry_run: bool = False) -> 'OrphanSweeper':
+        """Sweep in a daemon thread now and every interval; returns immediately."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(dry_run,), name="orphan-sweeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def _status(orphan: Dict) -> str:
+    if orphan['kind'] in REPORT_ONLY:
+        return 'report'
+    return 'eligible' if orphan['eligible'] else f"{orphan['age_minutes']} min"
+
+
+def format_report(report: Dict, limit: int = 50) -> str:
+    lines = [f"  {o['kind']:<20} {o['id']:<40} {_status(o):<10} {o['reason']}"
+             for o in report['orphans'][:limit]]
+    if len(report['orphans']) > limit:
+        lines.append(f"  ... and {len(report['orphans']) - limit} more")
+    lines.extend(f"  FAILED {r['kind']} {r['id']}: {r['error']}" for r in report['failed'])
+    lines.extend(f"  WARNING {error}" for error in report['errors'])
+    return "\n".join(lines) if lines else "  No orphans found"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find and delete orphaned offers and items, report broken groups")
+    parser.add_argument('--delete', action='store_true', help="Delete orphans past the grace period (default: dry run)")
+    parser.add_argument('--grace-minutes', type=float, default=None, help="Override ORPHAN_GRACE_MINUTES (0 = delete now)")
+    parser.add_argument('--watch', action='store_true', help="Keep sweeping every ORPHAN_SWEEP_INTERVAL_MINUTES")
+    parser.add_argument('--report', help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    from ebay_api_client import eBayAPIClient
+    sweeper = OrphanSweeper(eBayAPIClient(), state_file=Config().ORPHAN_SWEEP_STATE_FILE,
+                            grace_minutes=args.grace_minutes)
+    if args.watch:
+        sweeper.start(dry_run=not args.delete)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            sweeper.stop()
+            return 0
+
+    report = sweeper.sweep(dry_run=not args.delete)
+    print(format_report(report))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0 if not report['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Lazy parallel x base-card variation generation.
+
+A parallels/#'ed checklist is N base cards plus M parallel types ("Gold
+Refractor /50", ...), i.e. N*M sellable variations. Big sets reach tens of
+thousands of combinations, so they are never materialized: iter_variations()
+yields one CardRecord per (card, parallel) on demand, and callers consume
+them as a stream (/api/fetch-checklist) or in fixed-size chunks (listing).
+
+Every variation carries its parallel in `parallel_type`, which is part of the
+card identity the SKU hash is built from - the same card/parallel always gets
+the same SKU, no matter which chunk or request produced it.
+"""
+import re
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from card_record import CardRecord, intern_parallel_types
+from identifiers import make_sku
+
+_NUMBERING_PATTERN = re.compile(r'/\s*(\d+)\s*$')
+
+
+def parse_numbering(parallel: str) -> str:
+    """Print run suffix of a parallel name: "Gold Refractor /50" -> "/50" ('' when unnumbered)."""
+    match = _NUMBERING_PATTERN.search(parallel or '')
+    return f"/{match.group(1)}" if match else ''
+
+
+def _parallel_filter(parallels: Optional[Iterable[str]]) -> Optional[set]:
+    if not parallels:
+        return None
+    if isinstance(parallels, str):
+        parallels = [parallels]
+    return {p.strip().lower() for p in parallels if p and p.strip()} or None
+
+
+def _card_parallels(card: Dict, parallel_types) -> tuple:
+    if card.get('parallel_type'):
+        # Card line already names its parallel (numbered checklists)
+        return (card.get('parallel_type'),)
+    if parallel_types is not None:
+        return intern_parallel_types(parallel_types)
+    return intern_parallel_types(card.get('parallel_types'))
+
+
+def iter_variations(
+    cards: Iterable[Dict],
+    parallel_types: Optional[Iterable[str]] = None,
+    parallels: Optional[Iterable[str]] = None,
+    set_name: Optional[str] = None
+) -> Iterator[CardRecord]:
+    """
+    Yield one CardRecord per (card, parallel) combination, lazily.
+
+    Args:
+        cards: Base cards (dicts or CardRecords), in checklist order
+        parallel_types: Parallel names to cross with every card (defaults to
+                        each card's own 'parallel_types')
+        parallels: Optional filter - only these parallel names (case-insensitive)
+        set_name: Stamped on each variation so its SKU does not depend on the
+                  listing title
+    """
+    wanted = _parallel_filter(parallels)
+    if parallel_types is not None:
+        parallel_types = intern_parallel_types(parallel_types)
+    for card in cards:
+        names = _card_parallels(card, parallel_types)
+        if wanted is not None:
+            names = [p for p in names if p.lower() in wanted]
+        if not names:
+            continue
+        base = CardRecord.from_dict(card, set_name=set_name) if set_name else CardRecord.from_dict(card)
+        for parallel in names:
+            variation = base.copy()
+            variation['parallel_type'] = parallel
+            variation['numbering'] = base.numbering or parse_numbering(parallel)
+            yield variation
+
+
+def count_variations(
+    cards: Iterable[Dict],
+    parallel_types: Optional[Iterable[str]] = None,
+    parallels: Optional[Iterable[str]] = None
+) -> int:
+    """Number of variations iter_variations() would yield, without building them."""
+    wanted = _parallel_filter(parallels)
+    if parallel_types is not None:
+        parallel_types = intern_parallel_types(parallel_types)
+    total = 0
+    for card in cards:
+        names = _card_parallels(card, parallel_types)
+        total += len(names) if wanted is None else sum(1 for p in names if p.lower() in wanted)
+    return total
+
+
+def variation_sku(record: Dict, namespace: str = '') -> str:
+    """Stable SKU for one variation (same as the listing pipeline generates)."""
+    return make_sku(record, namespace)
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Group any iterable into lists of at most `size` items, lazily."""
+    if size < 1:
+        raise ValueError("chunk size must be at least 1")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,276 @@
+"""Client-side validation of Inventory API item, group and offer payloads.
+
+Problems eBay only reports at publish (error 25016 for the group description,
+25009 for a missing return policy, variation aspects that do not match
+variesBy) otherwise cost a create/update/publish round-trip each, plus the
+retry/sleep workarounds in ebay_listing.py. Each payload type has a rule table
+that is compiled once at import into (key path, check) pairs, so validating a
+record is a handful of dict lookups with no network I/O.
+
+Errors are reported per SKU (group-level problems under GROUP_KEY):
+
+    result = validate_listing(items, group, offers)
+    if not result["valid"]:
+        print(format_validation_errors(result["errors"]))
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# eBay limits
+MAX_TITLE_BYTES = 80              # Titles are measured in UTF-8 bytes
+MIN_DESCRIPTION_LENGTH = 50       # Shorter group descriptions fail publish with 25016
+MAX_ASPECT_NAME_LENGTH = 65
+MAX_ASPECT_VALUE_LENGTH = 65
+MAX_SKU_LENGTH = 50
+
+# Key for errors that belong to the group rather than one SKU
+GROUP_KEY = 'group'
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------------
+# Checks: value -> bool (value is _MISSING when the key path is absent)
+# ---------------------------------------------------------------------------
+
+def _is_text(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _title(value) -> bool:
+    return _is_text(value) and len(value.encode('utf-8')) <= MAX_TITLE_BYTES
+
+
+def _description(value) -> bool:
+    return isinstance(value, str) and len(value.strip()) >= MIN_DESCRIPTION_LENGTH
+
+
+def _sku(value) -> bool:
+    return _is_text(value) and len(value) <= MAX_SKU_LENGTH
+
+
+def _non_empty_list(value) -> bool:
+    return isinstance(value, list) and bool(value)
+
+
+def _non_empty_mapping(value) -> bool:
+    return isinstance(value, dict) and bool(value)
+
+
+def _quantity(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _price(value) -> bool:
+    try:
+        return float(value) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def _optional(check: Callable) -> Callable:
+    return lambda value: value is _MISSING or check(value)
+
+
+# ---------------------------------------------------------------------------
+# Rule tables: (key path, check, message)
+# ---------------------------------------------------------------------------
+
+ITEM_RULES = [
+    ("product.title", _title, f"required, at most {MAX_TITLE_BYTES} bytes"),
+    ("product.aspects", _non_empty_mapping, "required"),
+    ("condition", _is_text, "required"),
+    ("availability.shipToLocationAvailability.quantity", _quantity, "must be a whole number >= 0"),
+]
+
+GROUP_RULES = [
+    ("title", _title, f"required, at most {MAX_TITLE_BYTES} bytes"),
+    ("inventoryItemGroup.description", _description,
+     f"required, at least {MIN_DESCRIPTION_LENGTH} characters (eBay error 25016)"),
+    ("variesBy.specifications", _non_empty_list, "required for a variation listing"),
+    ("variantSKUs", _non_empty_list, "required"),
+]
+
+GROUP_PUBLISH_RULES = [
+    ("imageUrls", _non_empty_list, "at least one image is required to publish"),
+]
+
+OFFER_RULES = [
+    ("sku", _sku, f"required, at most {MAX_SKU_LENGTH} characters"),
+    ("marketplaceId", _is_text, "required"),
+    ("format", _is_text, "required"),
+    ("categoryId", _is_text, "required"),
+    ("pricingSummary.price.value", _price, "must be a price > 0"),
+    ("availableQuantity", _optional(_quantity), "must be a whole number >= 0"),
+    ("listingDescription", _optional(_description),
+     f"must be at least {MIN_DESCRIPTION_LENGTH} characters (eBay error 25016)"),
+    ("listing.title", _optional(_title), f"at most {MAX_TITLE_BYTES} bytes"),
+]
+
+OFFER_PUBLISH_RULES = [
+    ("listingPolicies.fulfillmentPolicyId", _is_text, "required to publish (set FULFILLMENT_POLICY_ID)"),
+    ("listingPolicies.returnPolicyId", _is_text, "required to publish (eBay error 25009, set RETURN_POLICY_ID)"),
+]
+
+
+def compile_rules(rules: Iterable[Tuple[str, Callable, str]]) -> Callable[[Dict], List[str]]:
+    """
+    Compile a rule table into a validator: payload -> list of error messages.
+
+    Key paths are split once here; validating walks the pre-split keys.
+    """
+    compiled = [(tuple(path.split('.')), check, f"{path}: {message}") for path, check, message in rules]
+
+    def validate(payload: Dict) -> List[str]:
+        errors = []
+        for keys, check, message in compiled:
+            value = payload
+            for key in keys:
+                value = value.get(key, _MISSING) if isinstance(value, dict) else _MISSING
+            if not check(value):
+                errors.append(message)
+        return errors
+
+    return validate
+
+
+_check_item = compile_rules(ITEM_RULES)
+_check_group = compile_rules(GROUP_RULES)
+_check_group_publish = compile_rules(GROUP_PUBLISH_RULES)
+_check_offer = compile_rules(OFFER_RULES)
+_check_offer_publish = compile_rules(OFFER_PUBLISH_RULES)
+
+
+def _aspect_errors(aspects: Dict) -> List[str]:
+    errors = []
+    for name, values in aspects.items():
+        if not name or len(name) > MAX_ASPECT_NAME_LENGTH:
+            errors.append(f"aspect name '{name}' must be 1-{MAX_ASPECT_NAME_LENGTH} characters")
+        if not isinstance(values, list):
+            errors.append(f"aspect '{name}' must be a list of values")
+            continue
+        for value in values:
+            if not isinstance(value, str) or len(value) > MAX_ASPECT_VALUE_LENGTH:
+                errors.append(f"aspect '{name}' value '{value}' must be text of at most {MAX_ASPECT_VALUE_LENGTH} characters")
+    return errors
+
+
+def validate_item(item: Dict) -> List[str]:
+    """Errors in one inventory item payload (PUT inventory_item/{sku})."""
+    errors = _check_item(item)
+    aspects = (item.get('product') or {}).get('aspects')
+    if isinstance(aspects, dict):
+        errors.extend(_aspect_errors(aspects))
+    return errors
+
+
+def validate_group(group: Dict, publish: bool = True) -> List[str]:
+    """Errors in one inventory item group payload (PUT inventory_item_group/{key})."""
+    errors = _check_group(group)
+    if publish:
+        errors.extend(_check_group_publish(group))
+    return errors
+
+
+def validate_offer(offer: Dict, publish: bool = True) -> List[str]:
+    """Errors in one offer payload (POST offer); policy IDs are only required to publish."""
+    errors = _check_offer(offer)
+    if publish:
+        errors.extend(_check_offer_publish(offer))
+    return errors
+
+
+def variation_errors(group: Dict, items: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """
+    Cross-check the group's variesBy against each variant's aspects.
+
+    Every variant must carry each varying aspect (names compared case-insensitively,
+    as eBay does) with one of the declared values, no two variants may share the
+    same combination, and every declared value must belong to a variant.
+    """
+    errors = {}
+    specs = [
+        (spec.get('name', ''), set(spec.get('values') or []))
+        for spec in (group.get('variesBy') or {}).get('specifications') or []
+    ]
+    used = {name: set() for name, _ in specs}
+    seen = {}
+    for sku in group.get('variantSKUs') or []:
+        item = items.get(sku)
+        if item is None:
+            errors.setdefault(GROUP_KEY, []).append(f"variantSKUs: {sku} has no inventory item")
+            continue
+        aspects = {name.lower(): values for name, values in ((item.get('product') or {}).get('aspects') or {}).items()}
+        combination = []
+        for name, values in specs:
+            value = (aspects.get(name.lower()) or [None])[0]
+            if value is None:
+                errors.setdefault(sku, []).append(f"aspect '{name}' (variesBy) is missing")
+            elif value not in values:
+                errors.setdefault(sku, []).append(f"aspect '{name}' value '{value}' is not in variesBy")
+            else:
+                used[name].add(value)
+            combination.append(value)
+        combination = tuple(combination)
+        if specs and None not in combination:
+            if combination in seen:
+                errors.setdefault(sku, []).append(f"same variation ({', '.join(combination)}) as {seen[combination]}")
+            else:
+                seen[combination] = sku
+    for name, values in specs:
+        unused = values - used[name]
+        if unused:
+            sample = ', '.join(sorted(unused)[:3])
+            errors.setdefault(GROUP_KEY, []).append(
+                f"variesBy '{name}' has {len(unused)} value(s) no variant uses: {sample}"
+            )
+    return errors
+
+
+def validate_listing(
+    items: Dict[str, Dict],
+    group: Optional[Dict] = None,
+    offers: Optional[Iterable[Dict]] = None,
+    publish: bool = True
+) -> Dict:
+    """
+    Validate every payload of a variation listing before any of it is sent.
+
+    Args:
+        items: {sku: inventory item payload}
+        group: Inventory item group payload
+        offers: Offer payloads (one per SKU)
+        publish: Also apply the rules eBay only enforces when publishing
+
+    Returns:
+        {'valid': bool, 'errors': {sku or GROUP_KEY: [messages]}, 'error_count': int}
+    """
+    errors = {}
+    for sku, item in items.items():
+        if not _sku(sku):
+            errors.setdefault(sku, []).append(f"sku: required, at most {MAX_SKU_LENGTH} characters")
+        item_errors = validate_item(item)
+        if item_errors:
+            errors.setdefault(sku, []).extend(item_errors)
+    if group is not None:
+        group_errors = validate_group(group, publish)
+        if group_errors:
+            errors.setdefault(GROUP_KEY, []).extend(group_errors)
+        for key, messages in variation_errors(group, items).items():
+            errors.setdefault(key, []).extend(messages)
+    for offer in offers or []:
+        offer_errors = validate_offer(offer, publish)
+        if offer_errors:
+            errors.setdefault(offer.get('sku') or 'offer', []).extend(offer_errors)
+    return {
+        "valid": not errors,
+        "errors": errors,
+        "error_count": sum(len(messages) for messages in errors.values())
+    }
+
+
+def format_validation_errors(errors: Dict[str, List[str]], limit: int = 10) -> str:
+    """One line per error ('SKU: message'), at most `limit` lines."""
+    lines = [f"{key}: {message}" for key, messages in errors.items() for message in messages]
+    if len(lines) > limit:
+        lines = lines[:limit] + [f"... and {len(lines) - limit} more"]
+    return "\n".join(lines)
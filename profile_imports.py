@@ -0,0 +1,90 @@
+"""Profile start-up import time of the entry points.
+
+Runs each entry point in a fresh interpreter with `python -X importtime` and
+prints the slowest modules (cumulative time) plus which heavy modules were
+loaded at start-up.
+
+Usage:
+    python profile_imports.py              # app and ebay_bot --help
+    python profile_imports.py app --top 30
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# What each entry point runs at start-up
+ENTRY_POINTS = {
+    "app": ["-c", "import app"],
+    "ebay_bot": ["ebay_bot.py", "--help"],
+}
+
+# Modules that should only load when a request/command actually needs them
+HEAVY_MODULES = ("bs4", "requests", "ebay_api_client", "ebay_listing", "card_checklist")
+
+
+def profile_entry_point(name: str) -> Dict:
+    """
+    Run one entry point under -X importtime.
+
+    Returns:
+        {'returncode', 'error', 'total_ms', 'modules': [(module, self_ms, cumulative_ms), ...], 'heavy': [...]}
+
+        A crash part way through still yields the modules imported until then,
+        so check returncode (argparse's --help exits with 0).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *ENTRY_POINTS[name]],
+        cwd=HERE, capture_output=True, text=True, encoding="utf-8", errors="replace",
+        env={**os.environ, "CHECKLIST_PREFETCH_ENABLED": "false"}
+    )
+    modules = []
+    other = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            other.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        # One leading space marks a top-level import; nested imports are indented further
+        modules.append((name.strip(), self_us / 1000, cumulative_us / 1000, len(name) - len(name.lstrip()) <= 1))
+    loaded = {m[0] for m in modules}
+    return {
+        "returncode": result.returncode,
+        "error": "\n".join(other[-5:]) if result.returncode else None,
+        "total_ms": round(sum(m[2] for m in modules if m[3]), 1),
+        "modules": [m[:3] for m in modules],
+        "heavy": [m for m in HEAVY_MODULES if m in loaded],
+    }
+
+
+def print_profile(name: str, profile: Dict, top: int = 15):
+    print(f"\n{name}: {profile['total_ms']} ms of imports")
+    if profile["returncode"]:
+        print(f"  [ERROR] Exited with {profile['returncode']}:\n{profile['error']}")
+    print(f"  Heavy modules loaded: {', '.join(profile['heavy']) or 'none'}")
+    for module, self_ms, cumulative_ms in sorted(profile["modules"], key=lambda m: -m[2])[:top]:
+        print(f"  {cumulative_ms:8.1f} ms  {self_ms:7.1f} ms self  {module}")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Profile start-up import time")
+    parser.add_argument("entry_points", nargs="*", help=f"Entry points to profile: {', '.join(ENTRY_POINTS)} (default: all)")
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest modules to show")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.entry_points if name not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(unknown)}")
+    for name in args.entry_points or ENTRY_POINTS:
+        print_profile(name, profile_entry_point(name), args.top)
+
+
+if __name__ == "__main__":
+    main()
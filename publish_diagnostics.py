@@ -0,0 +1,265 @@
+"""Publish-failure diagnostics for variation listings.
+
+When publishing a group fails, one snapshot of everything eBay checks is
+fetched concurrently - the group, every variant's offer, and the fulfillment
+and return policy lists - and all rule checks then run locally over that
+snapshot. This replaces per-error debug helpers that each refetched the group,
+offers and policies one call at a time.
+
+    report = diagnose(collect_snapshot(client, group_key),
+                      fulfillment_policy_id=config.FULFILLMENT_POLICY_ID,
+                      return_policy_id=config.RETURN_POLICY_ID)
+
+The report keeps the keys the publish error messages already read
+('policies_checked', 'return_policies_checked', 'offers_checked', 'issues_found').
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from payload_validator import MIN_DESCRIPTION_LENGTH
+
+# Offers fetched per diagnosis (one GET each, run concurrently)
+MAX_OFFERS_CHECKED = 50
+
+
+def _policy_map(result: Dict, id_key: str) -> Dict[str, Dict]:
+    return {policy.get(id_key): policy for policy in result.get('policies') or [] if policy.get(id_key)}
+
+
+def collect_snapshot(client, group_key: str, max_workers: int = 8, max_offers: int = MAX_OFFERS_CHECKED) -> Dict:
+    """
+    Fetch the group, its offers and the seller's policies in two concurrent rounds.
+
+    Round one: group + fulfillment policies + return policies. Round two: one
+    offer lookup per variant SKU (up to `max_offers`).
+    """
+    snapshot = {
+        "group_key": group_key,
+        "group": None,
+        "offers": {},
+        "fulfillment_policies": {},
+        "return_policies": {},
+        "errors": [],
+        "api_calls": 0
+    }
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        group_future = executor.submit(client.get_inventory_item_group, group_key)
+        fulfillment_future = executor.submit(client.get_fulfillment_policies)
+        return_future = executor.submit(client.get_return_policies)
+
+        group_result = group_future.result()
+        snapshot["api_calls"] += 1
+        if group_result.get('success'):
+            snapshot["group"] = group_result.get('data') or {}
+        else:
+            snapshot["errors"].append(f"Could not get inventory item group: {group_result.get('error', 'Unknown')}")
+
+        skus = list((snapshot["group"] or {}).get('variantSKUs') or [])[:max_offers]
+        offer_results = list(executor.map(client.get_offer_by_sku, skus))
+        snapshot["api_calls"] += len(skus)
+        snapshot["offers"] = {sku: result.get('offer') for sku, result in zip(skus, offer_results)}
+
+        for future, key, id_key, label in (
+            (fulfillment_future, "fulfillment_policies", 'fulfillmentPolicyId', "fulfillment"),
+            (return_future, "return_policies", 'returnPolicyId', "return")
+        ):
+            result = future.result()
+            snapshot["api_calls"] += 1
+            if result.get('error'):
+                # None (not {}) so the rules don't report every policy as missing
+                snapshot["errors"].append(f"Could not list {label} policies: {result['error']}")
+                snapshot[key] = None
+            else:
+                snapshot[key] = _policy_map(result, id_key)
+    return snapshot
+
+
+def _offer_policy(offer: Dict, key: str) -> Optional[str]:
+    return (offer.get('listingPolicies') or {}).get(key) or ((offer.get('listing') or {}).get('listingPolicies') or {}).get(key)
+
+
+def describe_fulfillment_policy(policy_id: str, policy: Optional[Dict], source: str) -> Dict:
+    """Shipping options/services of one fulfillment policy, flagging seller-paid services."""
+    info = {"policy_id": policy_id, "source": source, "found": policy is not None}
+    if policy is None:
+        return info
+    shipping_options = policy.get('shippingOptions') or []
+    services_detail = []
+    buyer_responsible_issues = []
+    option_issues = []
+    for option in shipping_options:
+        services = option.get('shippingServices') or []
+        if not services:
+            option_issues.append(f"Option {option.get('optionType')} has no shipping services")
+        for service in services:
+            code = service.get('shippingServiceCode', 'N/A')
+            buyer_pays = service.get('buyerResponsibleForShipping')
+            services_detail.append({
+                "code": code,
+                "carrier": service.get('shippingCarrierCode', 'N/A'),
+                "cost": (service.get('shippingCost') or {}).get('value', 'N/A'),
+                "buyer_pays": buyer_pays
+            })
+            if buyer_pays is False:
+                buyer_responsible_issues.append(f"{code} has buyerResponsibleForShipping=False")
+    info.update({
+        "policy_name": policy.get('name'),
+        "has_shipping_options": bool(shipping_options),
+        "shipping_options_count": len(shipping_options),
+        "services": [s["code"] for s in services_detail],
+        "services_detail": services_detail,
+        "buyer_responsible_issues": buyer_responsible_issues,
+        "option_issues": option_issues
+    })
+    if buyer_responsible_issues:
+        info["warning"] = "Some services have buyerResponsibleForShipping=False. eBay may require buyer to pay for Trading Cards category."
+    return info
+
+
+def _service_label(service: Dict) -> str:
+    label = f"{service['code']} ({service['carrier']})"
+    if service['cost'] != 'N/A':
+        label += f" - ${service['cost']}"
+    if service['buyer_pays'] is not None:
+        label += f" - Buyer Pays: {service['buyer_pays']}"
+    return label
+
+
+def diagnose(
+    snapshot: Dict,
+    fulfillment_policy_id: Optional[str] = None,
+    return_policy_id: Optional[str] = None
+) -> Dict:
+    """
+    Run every publish rule over a snapshot (no network I/O).
+
+    Args:
+        snapshot: From collect_snapshot
+        fulfillment_policy_id: Policy the listing was meant to use (usually from config)
+        return_policy_id: Return policy the listing was meant to use
+
+    Returns:
+        Combined report: group summary, policies_checked, return_policies_checked,
+        offers_checked (per SKU, with its issues) and issues_found.
+    """
+    issues: List[str] = list(snapshot["errors"])
+    report = {
+        "group_key": snapshot["group_key"],
+        "api_calls": snapshot["api_calls"],
+        "policies_checked": [],
+        "return_policies_checked": [],
+        "offers_checked": [],
+        "issues_found": issues
+    }
+    fulfillment_policies = snapshot["fulfillment_policies"]
+    return_policies = snapshot["return_policies"]
+    fulfillment_listed = fulfillment_policies is not None
+    return_listed = return_policies is not None
+    fulfillment_policies = fulfillment_policies or {}
+    return_policies = return_policies or {}
+
+    # Group
+    group = snapshot["group"]
+    if group is not None:
+        description = group.get('description') or (group.get('inventoryItemGroup') or {}).get('description') or ''
+        variant_skus = group.get('variantSKUs') or []
+        report["group"] = {
+            "title": group.get('title'),
+            "description_length": len(description.strip()),
+            "image_count": len(group.get('imageUrls') or []),
+            "variant_count": len(variant_skus)
+        }
+        if not variant_skus:
+            issues.append("No variant SKUs found in group")
+        if len(description.strip()) < MIN_DESCRIPTION_LENGTH:
+            issues.append(f"Group description is {len(description.strip())} characters; eBay requires {MIN_DESCRIPTION_LENGTH}+ (Error 25016)")
+        if not group.get('imageUrls'):
+            issues.append("Group has no imageUrls; publishing requires at least one image")
+        if len(variant_skus) > len(snapshot["offers"]):
+            issues.append(f"Only the first {len(snapshot['offers'])} of {len(variant_skus)} offers were checked")
+
+    # Offers
+    fulfillment_sources = {}
+    return_in_offers = set()
+    for sku, offer in snapshot["offers"].items():
+        offer_info = {"sku": sku, "policy_id": None, "return_policy_id": None, "policy_valid": False, "issues": []}
+        report["offers_checked"].append(offer_info)
+        if not offer:
+            offer_info["issues"].append("No offer found for this SKU")
+            continue
+        offer_info["offer_id"] = offer.get('offerId')
+
+        policy_id = _offer_policy(offer, 'fulfillmentPolicyId')
+        offer_info["policy_id"] = policy_id
+        if not policy_id:
+            offer_info["issues"].append("No fulfillmentPolicyId in offer")
+        else:
+            fulfillment_sources.setdefault(policy_id, "offers")
+            policy = describe_fulfillment_policy(policy_id, fulfillment_policies.get(policy_id), "offers")
+            if not policy["found"]:
+                if fulfillment_listed:
+                    offer_info["issues"].append(f"Fulfillment policy {policy_id} does not exist for this account/marketplace")
+            else:
+                offer_info["policy_name"] = policy["policy_name"]
+                offer_info["shipping_options_count"] = policy["shipping_options_count"]
+                offer_info["services"] = [_service_label(s) for s in policy["services_detail"]]
+                offer_info["policy_valid"] = policy["has_shipping_options"]
+                if not policy["has_shipping_options"]:
+                    offer_info["issues"].append("Policy has no shipping options")
+                offer_info["issues"].extend(policy["option_issues"])
+                offer_info["issues"].extend(
+                    f"Service {s['code']} has buyerResponsibleForShipping=False (seller pays). eBay may require buyer to pay for Trading Cards."
+                    for s in policy["services_detail"] if s["buyer_pays"] is False
+                )
+            if fulfillment_policy_id and policy_id != fulfillment_policy_id:
+                offer_info["issues"].append(f"Fulfillment policy mismatch: offer has {policy_id}, config has {fulfillment_policy_id}")
+
+        offer_return = _offer_policy(offer, 'returnPolicyId')
+        offer_info["return_policy_id"] = offer_return
+        if not offer_return:
+            offer_info["issues"].append("No returnPolicyId in offer")
+        else:
+            return_in_offers.add(offer_return)
+            if return_listed and offer_return not in return_policies:
+                offer_info["issues"].append(f"Return policy {offer_return} does not exist for this account/marketplace (Error 25009)")
+            if return_policy_id and offer_return != return_policy_id:
+                offer_info["issues"].append(f"Return policy ID mismatch: offer has {offer_return}, config has {return_policy_id}")
+
+    distinct = {info["policy_id"] for info in report["offers_checked"] if info["policy_id"]}
+    if len(distinct) > 1:
+        issues.append(f"Variants use {len(distinct)} different fulfillment policies: {', '.join(sorted(distinct))}")
+
+    # Policies
+    if fulfillment_policy_id:
+        fulfillment_sources = {fulfillment_policy_id: "config", **fulfillment_sources}
+    for policy_id, source in fulfillment_sources.items():
+        policy = describe_fulfillment_policy(policy_id, fulfillment_policies.get(policy_id), source)
+        if fulfillment_listed and not policy["found"]:
+            issues.append(f"{source.capitalize()} fulfillment policy {policy_id} not found")
+        report["policies_checked"].append(policy)
+
+    return_ids = ([return_policy_id] if return_policy_id else []) + sorted(return_in_offers - {return_policy_id})
+    if not return_ids:
+        issues.append("No return policy set (Error 25009) - set RETURN_POLICY_ID")
+    for policy_id in return_ids:
+        policy = return_policies.get(policy_id)
+        report["return_policies_checked"].append({
+            "policy_id": policy_id,
+            "source": "config" if policy_id == return_policy_id else "offers",
+            "in_offers": policy_id in return_in_offers,
+            "found": policy is not None,
+            "policy_name": (policy or {}).get('name')
+        })
+        if return_listed and policy is None:
+            issues.append(f"Return policy {policy_id} not found")
+
+    report["issue_count"] = len(issues) + sum(len(info["issues"]) for info in report["offers_checked"])
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text summary of a diagnosis: group-level issues, then per-SKU issues."""
+    lines = [f"  - {issue}" for issue in report["issues_found"]]
+    for offer in report["offers_checked"]:
+        lines.extend(f"  - {offer['sku']}: {issue}" for issue in offer["issues"])
+    return "\n".join(lines) if lines else "  No issues found"
@@ -0,0 +1,340 @@
+"""Publish orchestrator: many pending groups published concurrently.
+
+Publishing used to happen one listing at a time - inline after each listing,
+or in loops (start.py step 6, publish_draft.py) that publish a draft, sleep,
+and move on, with any retry blocking everything behind it. PublishQueue takes
+any number of inventory item group keys (or single offer IDs) and publishes
+them on a small worker pool that shares one eBay rate budget:
+
+- jobs are taken highest priority first
+- a transient failure (25016 description not yet propagated, 429, 5xx,
+  timeouts) puts the job back with exponential backoff; it waits in a delayed
+  heap, not in a worker, so other groups keep publishing
+- any other error fails the job at once, and no job is tried more than
+  PUBLISH_MAX_ATTEMPTS times
+- queue state is written atomically to PUBLISH_QUEUE_FILE after every change,
+  so an interrupted run resumes where it stopped
+
+    queue = PublishQueue(client)
+    queue.add("GROUPABC123", priority=10)
+    report = queue.run()
+
+CLI: python publish_queue.py GROUPKEY [GROUPKEY ...] [--priority N] [--resume]
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from config import Config
+from http_session import RateBudget
+
+# eBay errors that succeed on a later attempt without changing the listing
+TRANSIENT_ERROR_IDS = {
+    25016,  # description not yet propagated to the group (sandbox especially)
+    25001,  # system error
+    25002,  # internal error
+}
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+_ERROR_ID_PATTERN = re.compile(r'Error ID:\s*(\d+)|\b(25\d{3})\b')
+
+PENDING = 'pending'
+PUBLISHED = 'published'
+FAILED = 'failed'
+
+
+def error_id(result: Dict) -> Optional[int]:
+    """eBay error ID from a failed publish result, if the message carries one."""
+    match = _ERROR_ID_PATTERN.search(str(result.get('error') or ''))
+    if not match:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+def is_transient(result: Dict) -> bool:
+    """Whether a failed publish is worth retrying unchanged."""
+    if result.get('status_code') in TRANSIENT_STATUS_CODES:
+        return True
+    if error_id(result) in TRANSIENT_ERROR_IDS:
+        return True
+    error = str(result.get('error') or '').lower()
+    return 'timed out' in error or 'timeout' in error or 'connection' in error
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 600.0) -> float:
+    """Exponential backoff with jitter: ~base, 2*base, 4*base, ... (at most cap)."""
+    delay = min(cap, base * (2 ** max(0, attempt - 1)))
+    return delay * random.uniform(0.75, 1.0)
+
+
+class PublishQueue:
+    """
+    Priority queue of pending publishes, worked by a pool under one rate budget.
+
+    Args:
+        client: eBayAPIClient (shared by all workers)
+        state_file: JSON file the queue is persisted to (None = in memory only)
+        concurrency: Publishes in flight at once
+        rate_limit: eBay API calls per second for the run (0 = unlimited)
+        max_attempts: Tries per job before it is marked failed
+        retry_base: First retry delay in seconds (doubles per attempt)
+    """
+
+    def __init__(
+        self,
+        client,
+        state_file: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        marketplace_id: str = "EBAY_US"
+    ):
+        config = Config()
+        self.client = client
+        self.state_file = state_file
+        self.concurrency = max(1, concurrency or config.PUBLISH_CONCURRENCY)
+        self.rate_limit = config.EBAY_RATE_LIMIT if rate_limit is None else rate_limit
+        self.max_attempts = max(1, max_attempts or config.PUBLISH_MAX_ATTEMPTS)
+        self.retry_base = config.PUBLISH_RETRY_BASE_SECONDS if retry_base is None else retry_base
+        self.marketplace_id = marketplace_id
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._jobs: Dict[str, Dict] = {}
+        self._running = set()
+        self._session = set()  # jobs this instance resumed or was given; reported by run()
+        self._ready = []      # (-priority, seq, key)
+        self._delayed = []    # (not_before, seq, key)
+        self._seq = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def job_id(key: str, kind: str) -> str:
+        return key if kind == 'group' else f"{kind}:{key}"
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                jobs = json.load(f).get('jobs', [])
+        except Exception as e:
+            print(f"[WARNING] Could not read publish queue {self.state_file}: {e}")
+            return
+        for job in jobs:
+            job.setdefault('kind', 'group')
+            self._jobs[self.job_id(job['key'], job['kind'])] = job
+            if job['status'] == PENDING:
+                self._schedule(job)
+                self._session.add(self.job_id(job['key'], job['kind']))
+        pending = sum(1 for job in jobs if job['status'] == PENDING)
+        if pending:
+            print(f"[INFO] Resuming publish queue: {pending} pending job(s) from {self.state_file}")
+
+    def _save(self):
+        """Write the queue (atomic replace); call with the lock held."""
+        if not self.state_file:
+            return
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"updated_at": time.time(), "jobs": list(self._jobs.values())}, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _schedule(self, job: Dict):
+        self._seq += 1
+        job_id = self.job_id(job['key'], job['kind'])
+        if job.get('not_before', 0) > time.time():
+            heapq.heappush(self._delayed, (job['not_before'], self._seq, job_id))
+        else:
+            heapq.heappush(self._ready, (-job['priority'], self._seq, job_id))
+
+    def add(self, key: str, priority: int = 0, kind: str = 'group', label: Optional[str] = None) -> Dict:
+        """
+        Queue a publish. kind='group' publishes an inventory item group key,
+        kind='offer' a single offer ID. A job that is already pending keeps its
+        attempts and takes the higher of the two priorities.
+        """
+        job_id = self.job_id(key, kind)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            self._session.add(job_id)
+            if job and job['status'] == PENDING:
+                job['priority'] = max(job['priority'], priority)
+            else:
+                job = {
+                    "key": key, "kind": kind, "label": label or key, "priority": priority,
+                    "status": PENDING, "attempts": 0, "not_before": 0,
+                    "listing_id": None, "last_error": None, "error_id": None, "added_at": time.time()
+                }
+                self._jobs[job_id] = job
+            self._schedule(job)
+            self._save()
+        self._wakeup.set()
+        return job
+
+    def jobs(self, session_only: bool = False) -> List[Dict]:
+        with self._lock:
+            return [dict(job) for job_id, job in self._jobs.items() if not session_only or job_id in self._session]
+
+    # ------------------------------------------------------------------
+    # Work
+    # ------------------------------------------------------------------
+
+    def _next_ready(self) -> Optional[Dict]:
+        """Pop the highest-priority runnable job (call with the lock held)."""
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, seq, job_id = heapq.heappop(self._delayed)
+            job = self._jobs.get(job_id)
+            if job and job['status'] == PENDING:
+                heapq.heappush(self._ready, (-job['priority'], seq, job_id))
+        while self._ready:
+            _, _, job_id = heapq.heappop(self._ready)
+            job = self._jobs.get(job_id)
+            # Skip stale heap entries (re-added or finished jobs)
+            if job and job['status'] == PENDING and job_id not in self._running and job['not_before'] <= now:
+                self._running.add(job_id)
+                return job
+        return None
+
+    def _seconds_until_next(self) -> Optional[float]:
+        with self._lock:
+            if self._ready:
+                return 0.0
+            # Drop entries of jobs that finished or were re-queued meanwhile
+            while self._delayed and (self._jobs[self._delayed[0][2]]['status'] != PENDING
+                                     or self._delayed[0][2] in self._running):
+                heapq.heappop(self._delayed)
+            if self._delayed:
+                return max(0.0, self._delayed[0][0] - time.time())
+            return None
+
+    def _publish(self, job: Dict) -> Dict:
+        try:
+            if job['kind'] == 'offer':
+                result = self.client.publish_offer(job['key'])
+                if result.get('success'):
+                    result['listing_id'] = (result.get('data') or {}).get('listingId')
+                return result
+            return self.client.publish_offer_by_inventory_item_group(job['key'], self.marketplace_id)
+        except Exception as e:
+            return {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+    def _finish(self, job: Dict, result: Dict):
+        with self._lock:
+            self._running.discard(self.job_id(job['key'], job['kind']))
+            job['attempts'] += 1
+            job['last_attempt_at'] = time.time()
+            if result.get('success'):
+                job.update(status=PUBLISHED, listing_id=result.get('listing_id'), last_error=None, error_id=None)
+                print(f"[PUBLISH] ✓ {job['label']} → listing {job['listing_id']} (attempt {job['attempts']})")
+            else:
+                job['last_error'] = str(result.get('error'))[:500]
+                job['error_id'] = error_id(result)
+                if is_transient(result) and job['attempts'] < self.max_attempts:
+                    delay = backoff_delay(job['attempts'], self.retry_base)
+                    job['not_before'] = time.time() + delay
+                    self._schedule(job)
+                    print(f"[PUBLISH] ↻ {job['label']}: {job['last_error'][:80]} - retry in {delay:.0f}s "
+                          f"(attempt {job['attempts']}/{self.max_attempts})")
+                else:
+                    job['status'] = FAILED
+                    print(f"[PUBLISH] ✗ {job['label']}: {job['last_error'][:200]}")
+            self._save()
+        self._wakeup.set()
+
+    def run(self) -> Dict:
+        """
+        Publish until every job is published or failed.
+
+        Returns:
+            {'total', 'published', 'failed', 'pending', 'attempts', 'api_calls',
+             'duration_seconds', 'jobs'} over the jobs this queue was given or resumed
+        """
+        started = time.time()
+        previous_budget = self.client.rate_budget
+        if previous_budget is None:
+            self.client.rate_budget = RateBudget(self.rate_limit)
+        budget = self.client.rate_budget
+        calls_before = budget.calls
+        in_flight = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while True:
+                    self._wakeup.clear()
+                    while len(in_flight) < self.concurrency:
+                        with self._lock:
+                            job = self._next_ready()
+                        if job is None:
+                            break
+                        in_flight[executor.submit(self._publish, job)] = job
+                    if not in_flight and self._seconds_until_next() is None:
+                        break
+                    if in_flight:
+                        # A full pool only frees up when a publish finishes
+                        timeout = None if len(in_flight) >= self.concurrency else self._seconds_until_next()
+                        done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(in_flight.pop(future), future.result())
+                    else:
+                        # Only backed-off jobs left: sleep until the first is due (or a new add)
+                        self._wakeup.wait(self._seconds_until_next())
+        finally:
+            self.client.rate_budget = previous_budget
+
+        jobs = self.jobs(session_only=True)
+        return {
+            "total": len(jobs),
+            "published": sum(1 for job in jobs if job['status'] == PUBLISHED),
+            "failed": sum(1 for job in jobs if job['status'] == FAILED),
+            "pending": sum(1 for job in jobs if job['status'] == PENDING),
+            "attempts": sum(job['attempts'] for job in jobs),
+            "api_calls": budget.calls - calls_before,
+            "duration_seconds": round(time.time() - started, 1),
+            "jobs": jobs
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Publish many inventory item groups concurrently")
+    parser.add_argument('group_keys', nargs='*', help="Inventory item group keys to publish")
+    parser.add_argument('--offer', action='append', default=[], metavar='OFFER_ID', help="Also publish a single offer")
+    parser.add_argument('--priority', type=int, default=0, help="Priority for the keys given (higher first)")
+    parser.add_argument('--resume', action='store_true', help="Run the jobs left pending in the queue file (always resumed)")
+    parser.add_argument('--concurrency', type=int, default=None)
+    parser.add_argument('--rate-limit', type=float, default=None, help="eBay API calls per second (0 = unlimited)")
+    args = parser.parse_args(argv)
+    if not args.group_keys and not args.offer and not args.resume:
+        parser.error("give group keys, --offer IDs, or --resume")
+
+    from ebay_api_client import eBayAPIClient
+    queue = PublishQueue(eBayAPIClient(), state_file=Config().PUBLISH_QUEUE_FILE,
+                         concurrency=args.concurrency, rate_limit=args.rate_limit)
+    for key in args.group_keys:
+        queue.add(key, priority=args.priority)
+    for offer_id in args.offer:
+        queue.add(offer_id, priority=args.priority, kind='offer')
+
+    report = queue.run()
+    print(f"\nPublished {report['published']}/{report['total']}, failed {report['failed']} "
+          f"({report['attempts']} attempt(s), {report['api_calls']} API call(s), {report['duration_seconds']}s)")
+    for job in report['jobs']:
+        if job['status'] == FAILED:
+            print(f"  ✗ {job['label']}: {job['last_error']}")
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
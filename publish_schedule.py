@@ -0,0 +1,392 @@
+"""Scheduled release of many listings across daily publish windows.
+
+On a release day dozens of sets are listed as drafts and then published by
+hand, one at a time, at peak. The scheduler does that in three steps instead:
+
+1. plan   - spread a start time for every group over the configured local
+            windows (PUBLISH_WINDOWS), evenly, at most PUBLISH_WINDOW_MAX per
+            window and PUBLISH_MIN_GAP_MINUTES apart
+2. stage  - well ahead of time, build each variant offer's update payload with
+            its listingStartDate and push them all concurrently under one rate
+            budget (eBay has no bulk offer update, so "bulk" is one concurrent
+            round, not one call)
+3. release - a local timer publishes each group PUBLISH_RELEASE_LEAD_MINUTES
+            before its start time through the PublishQueue (retries, backoff);
+            eBay holds it as a scheduled listing until listingStartDate
+
+The plan is persisted to PUBLISH_SCHEDULE_FILE (atomic writes), so `run` can
+be stopped and started again.
+
+    python publish_schedule.py plan GROUPKEY ... [--report batch_report.json]
+    python publish_schedule.py run
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from http_session import RateBudget
+from publish_queue import PUBLISHED, PublishQueue
+
+PLANNED = 'planned'
+STAGED = 'staged'
+RELEASED = 'released'
+FAILED = 'failed'
+
+# Offer fields copied into the update payload (everything else is read-only)
+OFFER_FIELDS = (
+    'sku', 'marketplaceId', 'format', 'availableQuantity', 'pricingSummary', 'listingPolicies',
+    'categoryId', 'secondaryCategoryId', 'merchantLocationKey', 'listingDescription', 'listingDuration',
+    'includeCatalogProductDetails', 'quantityLimitPerBuyer', 'storeCategoryNames', 'tax', 'lotSize'
+)
+
+
+def format_start_date(moment: datetime) -> str:
+    """eBay listingStartDate format (UTC, milliseconds, Z)."""
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def parse_start_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.000Z').replace(tzinfo=timezone.utc)
+
+
+def parse_windows(spec: str) -> List[Tuple[int, int]]:
+    """'09:00-11:00,18:00-21:00' -> [(540, 660), (1080, 1260)] in minutes after midnight."""
+    windows = []
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            start, end = (datetime.strptime(t.strip(), '%H:%M') for t in part.split('-'))
+        except ValueError:
+            raise ValueError(f"Invalid publish window '{part}' (expected HH:MM-HH:MM)")
+        start_minute, end_minute = start.hour * 60 + start.minute, end.hour * 60 + end.minute
+        if end_minute <= start_minute:
+            end_minute += 24 * 60  # window runs past midnight
+        windows.append((start_minute, end_minute))
+    if not windows:
+        raise ValueError("No publish windows configured (PUBLISH_WINDOWS)")
+    return sorted(windows)
+
+
+def _window_spans(windows: List[Tuple[int, int]], earliest: datetime) -> Iterable[Tuple[datetime, datetime]]:
+    """Concrete (start, end) of each window from `earliest` onwards, in time order."""
+    midnight = earliest.replace(hour=0, minute=0, second=0, microsecond=0)
+    day = 0
+    while True:
+        base = midnight + timedelta(days=day)
+        for start_minute, end_minute in windows:
+            start = base + timedelta(minutes=start_minute)
+            end = base + timedelta(minutes=end_minute)
+            if end > earliest:
+                yield max(start, earliest), end
+        day += 1
+
+
+def plan_start_times(
+    group_keys: List[str],
+    windows: List[Tuple[int, int]],
+    earliest: datetime,
+    per_window: int = 20,
+    min_gap_minutes: float = 2
+) -> Dict[str, datetime]:
+    """
+    Give every group a start time inside the windows, in order.
+
+    Each window takes at most `per_window` groups (0 = as many as `min_gap_minutes`
+    allows), spaced evenly across the window. Times are in `earliest`'s timezone.
+    """
+    plan = {}
+    remaining = list(group_keys)
+    gap = timedelta(minutes=max(min_gap_minutes, 0.1))
+    for start, end in _window_spans(windows, earliest):
+        if not remaining:
+            break
+        capacity = int((end - start) / gap)
+        if per_window > 0:
+            capacity = min(capacity, per_window)
+        count = min(capacity, len(remaining))
+        if count <= 0:
+            continue
+        spacing = (end - start) / count
+        for index in range(count):
+            plan[remaining.pop(0)] = start + spacing * index
+    return plan
+
+
+def group_keys_from_report(report_file: str) -> List[str]:
+    """Group keys of the successful, unpublished listings in an ebay_bot --batch report."""
+    with open(report_file, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    keys = []
+    for result in report.get('results', []):
+        if result.get('success') and result.get('groupKey') and not result.get('listingId'):
+            keys.append(result['groupKey'])
+    return keys
+
+
+class PublishScheduler:
+    """
+    Persistent plan of {group_key: start time}, staged onto offers and released on time.
+
+    Args:
+        client: eBayAPIClient
+        state_file: JSON file for the plan (None = in memory only)
+        concurrency: Offer updates / publishes in flight at once
+        rate_limit: eBay API calls per second (default EBAY_RATE_LIMIT)
+        lead_minutes: Publish this long before each start time
+    """
+
+    def __init__(
+        self,
+        client,
+        state_file: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        lead_minutes: Optional[float] = None,
+        queue_file: Optional[str] = None
+    ):
+        self.config = Config()
+        self.client = client
+        self.state_file = state_file
+        self.concurrency = max(1, concurrency or self.config.PUBLISH_CONCURRENCY)
+        self.rate_limit = self.config.EBAY_RATE_LIMIT if rate_limit is None else rate_limit
+        self.lead = timedelta(minutes=self.config.PUBLISH_RELEASE_LEAD_MINUTES if lead_minutes is None else lead_minutes)
+        self.queue_file = queue_file
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return {entry['group_key']: entry for entry in json.load(f).get('entries', [])}
+        except Exception as e:
+            print(f"[WARNING] Could not read publish schedule {self.state_file}: {e}")
+            return {}
+
+    def _save(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            snapshot = {"updated_at": time.time(), "entries": list(self.entries.values())}
+            tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+
+    # ------------------------------------------------------------------
+    # Plan
+    # ------------------------------------------------------------------
+
+    def plan(
+        self,
+        group_keys: List[str],
+        windows: Optional[str] = None,
+        now: Optional[datetime] = None,
+        per_window: Optional[int] = None,
+        min_gap_minutes: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Add groups to the schedule, after everything already planned.
+
+        Returns {group_key: listingStartDate} for the groups added.
+        """
+        now = (now or datetime.now()).astimezone()
+        # Failed groups can be planned again; everything else keeps its slot
+        keys = [key for key in dict.fromkeys(group_keys)
+                if key not in self.entries or self.entries[key]['status'] == FAILED]
+        for key in keys:
+            self.entries.pop(key, None)
+        # Leave time to stage and release, and start after the last group already planned
+        earliest = now + self.lead * 2
+        if self.entries:
+            latest = max(parse_start_date(entry['start_at']) for entry in self.entries.values())
+            earliest = max(earliest, latest.astimezone(now.tzinfo) + timedelta(seconds=1))
+        plan = plan_start_times(
+            keys, parse_windows(windows or self.config.PUBLISH_WINDOWS), earliest,
+            per_window=self.config.PUBLISH_WINDOW_MAX if per_window is None else per_window,
+            min_gap_minutes=self.config.PUBLISH_MIN_GAP_MINUTES if min_gap_minutes is None else min_gap_minutes
+        )
+        for key, start in plan.items():
+            self.entries[key] = {
+                "group_key": key, "start_at": format_start_date(start), "status": PLANNED,
+                "offers_staged": 0, "listing_id": None, "error": None
+            }
+        self._save()
+        return {key: self.entries[key]['start_at'] for key in plan}
+
+    # ------------------------------------------------------------------
+    # Stage
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def offer_payload(offer: Dict, start_at: str) -> Dict:
+        """Update payload for an existing offer with a new listingStartDate."""
+        payload = {field: offer[field] for field in OFFER_FIELDS if field in offer}
+        payload['listingStartDate'] = start_at
+        return payload
+
+    def _stage_group(self, entry: Dict) -> Dict:
+        group = self.client.get_inventory_item_group(entry['group_key'])
+        if not group.get('success'):
+            return {"success": False, "error": f"Could not get group: {group.get('error')}"}
+        skus = (group.get('data') or {}).get('variantSKUs') or []
+        if not skus:
+            return {"success": False, "error": "Group has no variant SKUs"}
+        updates = []
+        for sku in skus:
+            offer = self.client.get_offer_by_sku(sku).get('offer')
+            if not offer:
+                return {"success": False, "error": f"No offer for {sku}"}
+            if offer.get('listingId'):
+                return {"success": True, "already_published": True, "listing_id": offer['listingId']}
+            updates.append((offer['offerId'], self.offer_payload(offer, entry['start_at'])))
+        for offer_id, payload in updates:
+            result = self.client.update_offer(offer_id, payload)
+            if not result.get('success'):
+                return {"success": False, "error": f"Offer {offer_id}: {result.get('error')}"}
+        return {"success": True, "offers": len(updates)}
+
+    def _stage_one(self, entry: Dict):
+        try:
+            result = self._stage_group(entry)
+        except Exception as e:
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        with self._lock:
+            if result.get('already_published'):
+                entry.update(status=RELEASED, listing_id=result['listing_id'])
+            elif result.get('success'):
+                entry.update(status=STAGED, offers_staged=result['offers'], error=None)
+            else:
+                entry.update(status=FAILED, error=str(result.get('error'))[:500])
+        print(f"[SCHEDULE] {entry['group_key']}: {entry['status']} (start {entry['start_at']})"
+              + (f" - {entry['error']}" if entry['status'] == FAILED else ""))
+
+    def stage(self) -> int:
+        """Push listingStartDate onto every planned group's offers, concurrently. Returns groups staged."""
+        planned = [entry for entry in self.entries.values() if entry['status'] == PLANNED]
+        if not planned:
+            return 0
+        previous_budget = self.client.rate_budget
+        if previous_budget is None:
+            self.client.rate_budget = RateBudget(self.rate_limit)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                list(executor.map(self._stage_one, planned))
+        finally:
+            self.client.rate_budget = previous_budget
+        self._save()
+        return sum(1 for entry in planned if entry['status'] == STAGED)
+
+    # ------------------------------------------------------------------
+    # Release
+    # ------------------------------------------------------------------
+
+    def release_at(self, entry: Dict) -> datetime:
+        return parse_start_date(entry['start_at']) - self.lead
+
+    def due(self, now: Optional[datetime] = None) -> List[Dict]:
+        now = now or datetime.now(timezone.utc)
+        return sorted(
+            (entry for entry in self.entries.values() if entry['status'] == STAGED and self.release_at(entry) <= now),
+            key=lambda entry: entry['start_at']
+        )
+
+    def release(self, entries: List[Dict]) -> Dict:
+        """Publish staged groups through the publish queue, earliest start first."""
+        queue = PublishQueue(self.client, state_file=self.queue_file,
+                             concurrency=self.concurrency, rate_limit=self.rate_limit)
+        for entry in entries:
+            start = parse_start_date(entry['start_at'])
+            queue.add(entry['group_key'], priority=-int(start.timestamp()))
+        report = queue.run()
+        jobs = {job['key']: job for job in report['jobs']}
+        for entry in entries:
+            job = jobs.get(entry['group_key'], {})
+            if job.get('status') == PUBLISHED:
+                entry.update(status=RELEASED, listing_id=job.get('listing_id'), error=None)
+            else:
+                entry.update(status=FAILED, error=job.get('last_error'))
+        self._save()
+        return report
+
+    def next_release(self) -> Optional[datetime]:
+        staged = [self.release_at(entry) for entry in self.entries.values() if entry['status'] in (PLANNED, STAGED)]
+        return min(staged) if staged else None
+
+    def run(self, poll_seconds: float = 60, clock=None, sleep=time.sleep) -> Dict:
+        """
+        Stage what is planned, then release groups as they come due until none are left.
+
+        Returns counts by status.
+        """
+        clock = clock or (lambda: datetime.now(timezone.utc))
+        while True:
+            self.stage()
+            due = self.due(clock())
+            if due:
+                print(f"[SCHEDULE] Releasing {len(due)} group(s)")
+                self.release(due)
+                continue
+            upcoming = self.next_release()
+            if upcoming is None:
+                break
+            wait = (upcoming - clock()).total_seconds()
+            sleep(max(0.0, min(poll_seconds, wait)))
+        return self.summary()
+
+    def summary(self) -> Dict:
+        counts = {PLANNED: 0, STAGED: 0, RELEASED: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry['status']] += 1
+        return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Plan and release scheduled listings across publish windows")
+    sub = parser.add_subparsers(dest='command', required=True)
+    plan_parser = sub.add_parser('plan', help="Give groups start times in the publish windows")
+    plan_parser.add_argument('group_keys', nargs='*')
+    plan_parser.add_argument('--report', help="ebay_bot --batch report: plan its unpublished groups")
+    plan_parser.add_argument('--windows', help="HH:MM-HH:MM,... (default PUBLISH_WINDOWS)")
+    plan_parser.add_argument('--per-window', type=int, default=None)
+    plan_parser.add_argument('--stage', action='store_true', help="Push the start dates onto the offers now")
+    run_parser = sub.add_parser('run', help="Stage and release groups as their windows come up")
+    run_parser.add_argument('--poll', type=float, default=60, help="Seconds between checks")
+    sub.add_parser('show', help="Print the plan")
+    args = parser.parse_args(argv)
+
+    config = Config()
+    from ebay_api_client import eBayAPIClient
+    scheduler = PublishScheduler(eBayAPIClient(), state_file=config.PUBLISH_SCHEDULE_FILE,
+                                 queue_file=config.PUBLISH_QUEUE_FILE)
+    if args.command == 'plan':
+        keys = list(args.group_keys)
+        if args.report:
+            keys.extend(group_keys_from_report(args.report))
+        if not keys:
+            parser.error("give group keys or --report")
+        for key, start in scheduler.plan(keys, windows=args.windows, per_window=args.per_window).items():
+            print(f"  {key}: starts {start}")
+        if args.stage:
+            scheduler.stage()
+    elif args.command == 'run':
+        print(f"[SCHEDULE] Done: {scheduler.run(poll_seconds=args.poll)}")
+    for entry in sorted(scheduler.entries.values(), key=lambda e: e['start_at']):
+        if args.command == 'show' or entry['status'] == FAILED:
+            print(f"  {entry['start_at']}  {entry['status']:<9} {entry['group_key']}"
+                  + (f"  {entry['error']}" if entry['error'] else ""))
+    return 0 if scheduler.summary()[FAILED] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,29 +18,30 @@ def query_drafts():
     client = eBayAPIClient()
     
     # Try different ways to query offers/drafts
-    print("Method 1: Query offers with limit...")
+    print("Method 1: Stream every offer...")
     try:
-        response = client._make_request('GET', '/sell/inventory/v1/offer', params={'limit': 50})
-        if response.status_code == 200:
-            data = response.json()
-            offers = data.get('offers', [])
-            print(f"  Found {len(offers)} offers")
-            
+        offer_count = 0
+        draft_count = 0
+        drafts = []  # first 10 only
+        for offer in client.iter_collection('/sell/inventory/v1/offer', 'offers'):
+            offer_count += 1
             # Filter for unpublished
-            drafts = [o for o in offers if o.get('status') == 'UNPUBLISHED']
-            print(f"  Unpublished (drafts): {len(drafts)}")
-            
-            if drafts:
+            if offer.get('status') == 'UNPUBLISHED':
+                draft_count += 1
+                if len(drafts) < 10:
+                    drafts.append(offer)
+        print(f"  Found {offer_count} offers")
+        print(f"  Unpublished (drafts): {draft_count}")
+        
+        if drafts:
+            print()
+            print("Draft Listings Found:")
+            for i, draft in enumerate(drafts, 1):
+                print(f"  {i}. SKU: {draft.get('sku', 'N/A')}")
+                print(f"     Offer ID: {draft.get('offerId', 'N/A')}")
+                print(f"     Group Key: {draft.get('inventoryItemGroupKey', 'N/A')}")
+                print(f"     Category: {draft.get('categoryId', 'N/A')}")
                 print()
-                print("Draft Listings Found:")
-                for i, draft in enumerate(drafts[:10], 1):
-                    print(f"  {i}. SKU: {draft.get('sku', 'N/A')}")
-                    print(f"     Offer ID: {draft.get('offerId', 'N/A')}")
-                    print(f"     Group Key: {draft.get('inventoryItemGroupKey', 'N/A')}")
-                    print(f"     Category: {draft.get('categoryId', 'N/A')}")
-                    print()
-        else:
-            print(f"  [ERROR] {response.status_code}: {response.text[:200]}")
     except Exception as e:
         print(f"  [ERROR] {e}")
     
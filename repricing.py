@@ -0,0 +1,379 @@
+"""
+Bulk repricing / quantity engine.
+
+Takes a price table (CSV or dict) keyed by SKU, card number or card name,
+diffs it against a local snapshot of offer state and pushes only the changed
+rows through eBay's bulk_update_price_quantity endpoint (25 SKUs per call),
+several calls at a time.
+
+Usage:
+    python repricing.py prices.csv [--group GROUPKEY ...] [--dry-run]
+"""
+import os
+import csv
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+from ebay_api_client import eBayAPIClient
+
+# eBay limit for bulk_update_price_quantity and bulk_get_inventory_item
+BULK_BATCH_SIZE = 25
+
+# Local snapshot of offer state: {sku: {offerId, price, quantity, name, number, updated_at}}
+OFFER_STATE_FILE = ".offer_state.json"
+
+OFFERS_ENDPOINT = '/sell/inventory/v1/offer'
+
+
+def _chunks(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _normalize_key(value) -> str:
+    return str(value or '').strip().lower()
+
+
+def load_price_table(source: Union[str, Dict]) -> List[Dict]:
+    """
+    Load a price table.
+
+    Args:
+        source: CSV file path (columns: sku / number / name, price, quantity -
+                headers are case-insensitive) or a dict {key: price} /
+                {key: {"price": .., "quantity": ..}}
+
+    Returns:
+        List of rows {'key', 'price', 'quantity'} (price/quantity None = unchanged)
+    """
+    rows = []
+    if isinstance(source, dict):
+        for key, value in source.items():
+            if isinstance(value, dict):
+                price, quantity = value.get('price'), value.get('quantity')
+            else:
+                price, quantity = value, None
+            rows.append({
+                'key': str(key),
+                'price': round(float(price), 2) if price not in (None, '') else None,
+                'quantity': int(quantity) if quantity not in (None, '') else None
+            })
+        return rows
+
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Price table not found: {source}")
+
+    with open(source, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower().replace(' ', '_'): name for name in (reader.fieldnames or [])}
+        key_column = next((fields[c] for c in ('sku', 'number', 'card_number', 'name', 'card_name') if c in fields), None)
+        if not key_column:
+            raise ValueError("Price table needs a sku, number or name column")
+        price_column = fields.get('price')
+        quantity_column = fields.get('quantity') or fields.get('qty')
+        for line_number, row in enumerate(reader, start=2):
+            key = (row.get(key_column) or '').strip()
+            if not key:
+                continue
+            try:
+                price = row.get(price_column) if price_column else None
+                quantity = row.get(quantity_column) if quantity_column else None
+                rows.append({
+                    'key': key,
+                    'price': round(float(str(price).replace('$', '')), 2) if price not in (None, '') else None,
+                    'quantity': int(quantity) if quantity not in (None, '') else None
+                })
+            except ValueError as e:
+                print(f"[WARNING] Skipping line {line_number} of {source}: {e}")
+    return rows
+
+
+class RepricingEngine:
+    """Diff a price table against offer state and bulk-update only what changed."""
+
+    def __init__(
+        self,
+        client: Optional[eBayAPIClient] = None,
+        state_file: Optional[str] = OFFER_STATE_FILE,
+        max_workers: int = 4,
+        currency: str = "USD"
+    ):
+        self.client = client or eBayAPIClient()
+        self.state_file = state_file
+        self.max_workers = max_workers
+        self.currency = currency
+        self._state_lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[WARNING] Could not read offer state {self.state_file}: {e}")
+            return {}
+
+    def save_state(self):
+        """Write the offer state snapshot (atomic replace)."""
+        if not self.state_file:
+            return
+        with self._state_lock:
+            snapshot = dict(self.state)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _fetch_offer(self, sku: str) -> Optional[Dict]:
+        result = self.client.get_offer_by_sku(sku)
+        offer = result.get('offer') if result.get('success') else None
+        return self._offer_state(offer) if offer else None
+
+    @staticmethod
+    def _offer_state(offer: Dict) -> Dict:
+        price = offer.get('pricingSummary', {}).get('price', {}).get('value')
+        return {
+            "offerId": offer.get('offerId'),
+            "price": round(float(price), 2) if price not in (None, '') else None,
+            "quantity": offer.get('availableQuantity', offer.get('quantity'))
+        }
+
+    def refresh_state(self, skus: Iterable[str] = None, group_keys: Iterable[str] = None) -> Dict[str, Dict]:
+        """
+        Pull current offer state from eBay (concurrently) into the local snapshot.
+
+        Card name/number come from the inventory items' aspects (bulk GET, 25 per call)
+        so the price table can be keyed by number or name. With neither skus nor
+        group_keys, every offer in the account is refreshed from one paginated
+        listing (raises requests.HTTPError if it can't be listed completely).
+        """
+        skus = list(dict.fromkeys(skus or []))
+        listed = {}
+        if not skus and not group_keys:
+            for offer in self.client.iter_collection(OFFERS_ENDPOINT, 'offers'):
+                if offer.get('sku'):
+                    listed[offer['sku']] = self._offer_state(offer)
+            skus = list(listed)
+        for group_key in group_keys or []:
+            group_result = self.client.get_inventory_item_group(group_key)
+            if group_result.get('success'):
+                skus.extend(s for s in group_result.get('data', {}).get('variantSKUs', []) if s not in skus)
+            else:
+                print(f"[WARNING] Could not get group {group_key}: {group_result.get('error')}")
+        if not skus:
+            return {}
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            offers = listed or dict(zip(skus, executor.map(self._fetch_offer, skus)))
+            item_batches = list(executor.map(self.client.bulk_get_inventory_item, _chunks(skus, BULK_BATCH_SIZE)))
+
+        items = {}
+        for batch in item_batches:
+            items.update(batch.get('items', {}))
+
+        refreshed = {}
+        now = int(time.time())
+        for sku, offer in offers.items():
+            if not offer:
+                print(f"[WARNING] No offer found for SKU {sku}")
+                continue
+            aspects = items.get(sku, {}).get('product', {}).get('aspects', {})
+            offer["name"] = (aspects.get('Card Name') or [''])[0]
+            offer["number"] = (aspects.get('Card Number') or [''])[0]
+            offer["updated_at"] = now
+            refreshed[sku] = offer
+
+        with self._state_lock:
+            self.state.update(refreshed)
+        self.save_state()
+        print(f"[REPRICE] Refreshed {len(refreshed)}/{len(skus)} offer(s) in {time.time() - start:.1f}s")
+        return refreshed
+
+    def _match_rows(self, rows: List[Dict], skus: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """Resolve price table rows to SKUs. SKU matches win over number, number over name."""
+        with self._state_lock:
+            state = {sku: self.state[sku] for sku in (skus or self.state) if sku in self.state}
+        by_sku = {_normalize_key(sku): sku for sku in state}
+        by_number, by_name = {}, {}
+        for sku, offer in state.items():
+            if offer.get('number'):
+                by_number.setdefault(_normalize_key(offer['number']), []).append(sku)
+            if offer.get('name'):
+                by_name.setdefault(_normalize_key(offer['name']), []).append(sku)
+
+        targets = {}
+        precedence = {}
+        for row in rows:
+            key = _normalize_key(row['key'])
+            if key in by_sku:
+                matched, rank = [by_sku[key]], 0
+            elif key in by_number:
+                matched, rank = by_number[key], 1
+            else:
+                matched, rank = by_name.get(key, []), 2
+            for sku in matched:
+                if rank <= precedence.get(sku, rank):
+                    precedence[sku] = rank
+                    targets[sku] = row
+        return targets
+
+    def plan(self, table: Union[str, Dict, List[Dict]], skus: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Diff a price table against the local offer state.
+
+        Returns {'changes': [{sku, offerId, price, quantity, old_price, old_quantity}],
+                 'unchanged': [skus], 'unmatched': [keys]}
+        """
+        rows = table if isinstance(table, list) else load_price_table(table)
+        targets = self._match_rows(rows, skus)
+        matched_keys = {_normalize_key(row['key']) for row in targets.values()}
+
+        changes, unchanged = [], []
+        for sku, row in targets.items():
+            offer = self.state[sku]
+            price_changed = row['price'] is not None and row['price'] != offer.get('price')
+            quantity_changed = row['quantity'] is not None and row['quantity'] != offer.get('quantity')
+            if not (price_changed or quantity_changed):
+                unchanged.append(sku)
+                continue
+            changes.append({
+                "sku": sku,
+                "offerId": offer.get('offerId'),
+                "price": row['price'] if price_changed else None,
+                "quantity": row['quantity'] if quantity_changed else None,
+                "old_price": offer.get('price'),
+                "old_quantity": offer.get('quantity')
+            })
+        unmatched = [row['key'] for row in rows if _normalize_key(row['key']) not in matched_keys]
+        return {"changes": changes, "unchanged": unchanged, "unmatched": unmatched}
+
+    def _build_request(self, change: Dict) -> Dict:
+        offer = {"offerId": change['offerId']}
+        request = {"sku": change['sku'], "offers": [offer]}
+        if change['price'] is not None:
+            offer["price"] = {"value": f"{change['price']:.2f}", "currency": self.currency}
+        if change['quantity'] is not None:
+            offer["availableQuantity"] = change['quantity']
+            request["shipToLocationAvailability"] = {"quantity": change['quantity']}
+        return request
+
+    def _push_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        result = self.client.bulk_update_price_quantity([self._build_request(change) for change in batch])
+        if not result.get('success'):
+            return {change['sku']: {"success": False, "error": result.get('error'), "status_code": result.get('status_code')}
+                    for change in batch}
+
+        # One response per offer/SKU; anything missing from the response is treated as failed
+        outcomes = {change['sku']: {"success": False, "error": "No response for SKU"} for change in batch}
+        for response in result.get('responses', []):
+            sku = response.get('sku')
+            if sku not in outcomes:
+                continue
+            if response.get('statusCode') == 200:
+                outcomes[sku] = {"success": True}
+            else:
+                errors = response.get('errors') or []
+                outcomes[sku] = {
+                    "success": False,
+                    "status_code": response.get('statusCode'),
+                    "error": "; ".join(f"{e.get('message', '')} (Error ID: {e.get('errorId', '')})" for e in errors) or "Unknown error"
+                }
+        return outcomes
+
+    def apply(self, changes: List[Dict], dry_run: bool = False) -> Dict[str, Dict]:
+        """Push changes in batches of 25, concurrently. Returns {sku: {success, error, ...}}."""
+        if dry_run or not changes:
+            return {change['sku']: {"success": True, "dry_run": dry_run, **change} for change in changes}
+
+        start = time.time()
+        batches = _chunks(changes, BULK_BATCH_SIZE)
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for outcomes in executor.map(self._push_batch, batches):
+                results.update(outcomes)
+
+        now = int(time.time())
+        with self._state_lock:
+            for change in changes:
+                outcome = results[change['sku']]
+                outcome.update({k: change[k] for k in ('price', 'quantity', 'old_price', 'old_quantity')})
+                if outcome.get('success'):
+                    state = self.state.setdefault(change['sku'], {"offerId": change['offerId']})
+                    if change['price'] is not None:
+                        state['price'] = change['price']
+                    if change['quantity'] is not None:
+                        state['quantity'] = change['quantity']
+                    state['updated_at'] = now
+        self.save_state()
+
+        ok = sum(1 for r in results.values() if r.get('success'))
+        print(f"[REPRICE] Updated {ok}/{len(changes)} SKU(s) in {len(batches)} bulk call(s), {time.time() - start:.1f}s")
+        return results
+
+    def reprice(
+        self,
+        table: Union[str, Dict, List[Dict]],
+        skus: Iterable[str] = None,
+        group_keys: Iterable[str] = None,
+        refresh: bool = False,
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Reprice from a table in one call: refresh (if asked or state is missing), diff, push.
+
+        Returns {'success', 'results', 'unchanged', 'unmatched'}. success needs every
+        table key matched, every requested SKU updated or already up to date, and
+        no failed update.
+        """
+        skus = list(skus or [])
+        requested = list(skus)
+        if refresh or group_keys or any(sku not in self.state for sku in skus):
+            refreshed = self.refresh_state(skus=skus, group_keys=group_keys)
+            skus = list(dict.fromkeys(skus + list(refreshed)))
+        plan = self.plan(table, skus or None)
+        results = self.apply(plan['changes'], dry_run=dry_run)
+        for key in plan['unmatched']:
+            print(f"[REPRICE] [WARNING] No offer matches price table key: {key}")
+        settled = set(results) | set(plan['unchanged'])
+        return {
+            "success": (
+                not plan['unmatched']
+                and all(sku in settled for sku in requested)
+                and all(r.get('success') for r in results.values())
+            ),
+            "results": results,
+            "unchanged": plan['unchanged'],
+            "unmatched": plan['unmatched']
+        }
+
+
+def main():
+    import argparse
+    sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description='Bulk reprice eBay offers from a price table')
+    parser.add_argument('table', help='CSV price table (sku/number/name, price, quantity)')
+    parser.add_argument('--group', action='append', default=[], help='Inventory item group key to (re)load offers from')
+    parser.add_argument('--sku', action='append', default=[], help='Limit to these SKUs')
+    parser.add_argument('--refresh', action='store_true', help='Refresh offer state from eBay before diffing')
+    parser.add_argument('--dry-run', action='store_true', help='Only show what would change')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent bulk calls')
+    args = parser.parse_args()
+
+    engine = RepricingEngine(max_workers=args.workers)
+    outcome = engine.reprice(args.table, skus=args.sku, group_keys=args.group, refresh=args.refresh, dry_run=args.dry_run)
+    for sku, result in outcome['results'].items():
+        status = "DRY RUN" if result.get('dry_run') else ("OK" if result.get('success') else "ERROR")
+        print(f"  [{status}] {sku}: price {result.get('old_price')} -> {result.get('price')}, "
+              f"quantity {result.get('old_quantity')} -> {result.get('quantity')}"
+              + (f" ({result.get('error')})" if result.get('error') else ""))
+    print(f"Changed: {len(outcome['results'])}, unchanged: {len(outcome['unchanged'])}, unmatched: {len(outcome['unmatched'])}")
+    sys.exit(0 if outcome['success'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Setup script to use ngrok for OAuth redirect (HTTPS requirement).
 This creates an HTTPS tunnel to localhost for eBay OAuth.
 """
 import subprocess
-import requests
+import http_session
 import time
 import json
 from config import Config
@@ -11,7 +11,7 @@ from config import Config
 def get_ngrok_url():
     """Get the current ngrok tunnel URL."""
     try:
-        response = requests.get("http://localhost:4040/api/tunnels", timeout=2)
+        response = http_session.get("http://localhost:4040/api/tunnels", timeout=2)
         if response.status_code == 200:
             data = response.json()
             tunnels = data.get("tunnels", [])
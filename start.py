@@ -2,6 +2,7 @@
 import streamlit as st
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add current directory to path for imports
@@ -1626,54 +1627,33 @@ def step6_publish_drafts():
         if st.button("🚀 Publish ALL Drafts", type="primary", use_container_width=True):
             with st.spinner("Publishing all drafts (this may take a few minutes)..."):
                 from ebay_api_client import eBayAPIClient
-                import time
-                import subprocess
-                import sys
+                from publish_queue import PublishQueue, PUBLISHED
                 
                 client = eBayAPIClient()
                 
-                published_count = 0
-                failed_count = 0
-                results = []
-                
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for i, draft in enumerate(drafts):
-                    status_text.text(f"Publishing {i+1}/{len(drafts)}: {draft['title'][:40]}...")
-                    progress_bar.progress((i + 1) / len(drafts))
-                    
-                    try:
-                        # Use the publish_draft script which handles everything
-                        result = subprocess.run(
-                            [sys.executable, "publish_draft.py", draft['sku']],
-                            capture_output=True,
-                            text=True,
-                            timeout=60,
-                            cwd=os.getcwd()
-                        )
-                        
-                        output = result.stdout + result.stderr
-                        
-                        if "SUCCESS" in output or "Listing Published" in output or "Listing ID:" in output:
-                            published_count += 1
-                            # Extract listing ID if present
-                            import re
-                            listing_id_match = re.search(r'Listing ID:\s*(\d+)', output)
-                            if listing_id_match:
-                                listing_id = listing_id_match.group(1)
-                                results.append(f"✅ {draft['sku'][:30]}... → Published (ID: {listing_id})")
-                            else:
-                                results.append(f"✅ {draft['sku'][:30]}... → Published")
-                        else:
-                            failed_count += 1
-                            error_msg = output[-200:] if len(output) > 200 else output
-                            results.append(f"❌ {draft['sku'][:30]}... → Failed")
-                        
-                        time.sleep(2)  # Rate limiting
-                    except Exception as e:
-                        failed_count += 1
-                        results.append(f"❌ {draft['sku'][:30]}... → Error: {str(e)[:50]}")
+                # One job per variation group (not per SKU), single offers by offer ID;
+                # published concurrently with transient errors (25016) retried
+                queue = PublishQueue(client, state_file=Config().PUBLISH_QUEUE_FILE)
+                for draft in drafts:
+                    if draft.get('group_key'):
+                        queue.add(draft['group_key'], label=draft['title'][:40])
+                    elif draft.get('offer_id'):
+                        queue.add(draft['offer_id'], kind='offer', label=draft['title'][:40])
+                status_text.text(f"Publishing {len(queue.jobs(session_only=True))} listing(s)...")
+                report = queue.run()
+                progress_bar.progress(1.0)
+                
+                published_count = report['published']
+                failed_count = report['failed']
+                results = []
+                for job in report['jobs']:
+                    if job['status'] == PUBLISHED:
+                        results.append(f"✅ {job['label']}... → Published (ID: {job['listing_id']})")
+                    else:
+                        results.append(f"❌ {job['label']}... → Failed: {str(job['last_error'])[:80]}")
                 
                 progress_bar.empty()
                 status_text.empty()
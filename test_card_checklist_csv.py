@@ -0,0 +1,57 @@
+"""
+Offline test for streaming CSV checklist ingestion.
+"""
+import os
+import tempfile
+from card_checklist import CardChecklistFetcher
+
+
+CSV_TEXT = (
+    "\ufeffCard Name,Card Number,Price,Quantity,Team,Notes\n"
+    "LeBron James,1,$5.00,2,Lakers,\n"
+    "Stephen Curry,2,abc,1,Warriors,\n"
+    ",3,1.00,1,Nets,\n"
+    "\"Kevin Durant\",4,,,Suns,\"two\nlines\"\n"
+    "Luka Doncic,5,3.5,x,Mavericks,\n"
+    "\n"
+    "Jayson Tatum,6,1.25,1,Celtics\n"
+)
+
+
+def _write_csv(tmp):
+    path = os.path.join(tmp, "cards.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(CSV_TEXT)
+    return path
+
+
+def test_iter_csv_cards_validates_with_line_numbers():
+    fetcher = CardChecklistFetcher(source='csv')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_csv(tmp)
+        errors = []
+        cards = list(fetcher.iter_csv_cards(path, errors=errors))
+
+    assert [c['name'] for c in cards] == ["LeBron James", "Kevin Durant", "Jayson Tatum"]
+    assert cards[0]['price'] == 5.0 and cards[0]['quantity'] == 2 and cards[0]['team'] == "Lakers"
+    assert cards[1]['price'] is None and cards[1]['quantity'] == 1 and cards[1]['notes'] == "two\nlines"
+    assert cards[2]['notes'] == ""
+    assert [(e['line'], e['column']) for e in errors] == [(3, "Price"), (4, "name"), (7, "Quantity")]
+
+
+def test_iter_csv_chunks_and_fetch_from_csv():
+    fetcher = CardChecklistFetcher(source='csv')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_csv(tmp)
+        chunks = list(fetcher.iter_csv_chunks(path, chunk_size=2))
+        cards = fetcher.get_set_checklist(csv_file=path)
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert len(cards) == 3
+    assert len(fetcher.last_csv_errors) == 3
+
+
+if __name__ == "__main__":
+    test_iter_csv_cards_validates_with_line_numbers()
+    test_iter_csv_chunks_and_fetch_from_csv()
+    print("All CSV ingestion tests passed")
@@ -0,0 +1,74 @@
+"""
+Offline tests for the slotted CardRecord used between the checklist and listing code.
+"""
+import json
+import tracemalloc
+from card_record import CardRecord, intern_parallel_types, to_records
+from listing_shards import plan_shards
+from identifiers import generate_skus
+
+
+def _parser_cards(count):
+    types = ["Refractor", "Gold Refractor", "Red Refractor"]
+    return [{"number": str(n), "name": f"Player {n}", "team": f"Team {n % 30}",
+             "parallel_type": "", "numbering": "", "parallel_types": list(types)}
+            for n in range(1, count + 1)]
+
+
+def test_record_reads_like_a_dict():
+    record = CardRecord.from_dict({"name": "Cooper Flagg", "number": 1, "imageUrl": "https://x/1.jpg",
+                                   "type": "base", "section": "Base Set", "quantity": "2"})
+    assert record.get("name") == "Cooper Flagg"
+    assert record["number"] == "1"
+    assert record.get("image_url") == record.get("imageUrl") == "https://x/1.jpg"
+    assert record.get("type") == "base"
+    assert record.get("quantity") == 2
+    assert record.get("section") == "Base Set"  # unknown keys are kept
+    assert "team" not in record and record.get("team", "n/a") == "n/a"
+    # Provided-but-empty values behave like dict values, not like missing keys
+    assert CardRecord(number="").get("number", 7) == ""
+    assert not hasattr(record, "__dict__")
+
+    clone = record.copy()
+    clone["quantity"] = 5
+    clone["section"] = "Inserts"
+    assert record.get("quantity") == 2 and record.get("section") == "Base Set"
+    assert CardRecord.from_dict(json.loads(json.dumps(record.to_dict()))) == record
+
+
+def test_parallel_types_are_shared():
+    records = to_records(_parser_cards(50))
+    assert all(r.parallel_types is records[0].parallel_types for r in records)
+    assert intern_parallel_types(["Refractor", "Gold Refractor", "Red Refractor"]) is records[0].parallel_types
+    assert records[0].to_api(price=0.99, quantity=0) == {
+        "number": "1", "name": "Player 1", "team": "Team 1", "price": 0.99, "quantity": 0, "imageUrl": ""
+    }
+
+
+def test_records_flow_through_listing_helpers():
+    records = to_records(_parser_cards(300), card_type="base")
+    assert len(set(generate_skus(records, namespace="2025 Topps"))) == 300
+    shards = plan_shards(records, max_variations=250)
+    assert [len(s["cards"]) for s in shards] == [150, 150]
+    assert shards[0]["label"] == "Base #1-150"
+
+
+def test_records_use_less_memory_than_dicts():
+    def measure(build):
+        tracemalloc.start()
+        data = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return data, size
+
+    source = json.dumps(_parser_cards(5000))
+    _, dict_size = measure(lambda: json.loads(source))
+    _, record_size = measure(lambda: to_records(json.loads(source)))
+    assert record_size < dict_size * 0.6
+
+
+if __name__ == "__main__":
+    test_record_reads_like_a_dict()
+    test_parallel_types_are_shared()
+    test_records_use_less_memory_than_dicts()
+    print("CardRecord tests passed (run with pytest for the full suite)")
@@ -0,0 +1,113 @@
+"""
+Offline tests for the local checklist catalog and its search index.
+"""
+import os
+import time
+import tempfile
+from checklist_catalog import ChecklistCatalog, normalize_url
+from card_checklist import CardChecklistFetcher
+
+CHROME_URL = "https://www.beckett.com/news/2025-26-topps-chrome-basketball-cards/"
+BOWMAN_URL = "https://www.beckett.com/news/2025-bowman-draft-baseball-cards/"
+
+
+def _catalog(path=None):
+    catalog = ChecklistCatalog(path, max_age_hours=0)
+    catalog.put(CHROME_URL, "base", [
+        {"number": "1", "name": "Cooper Flagg", "team": "Dallas Mavericks"},
+        {"number": "2", "name": "Dylan Harper", "team": "San Antonio Spurs"},
+        {"number": "12", "name": "Victor Wembanyama", "team": "San Antonio Spurs"},
+    ], description="<p><strong>2025-26 Topps Chrome Basketball</strong></p>")
+    catalog.put(BOWMAN_URL, "inserts", [
+        {"number": "BCP-12", "name": "Cooper Flagg", "team": "Duke"},
+        {"number": "PP-1", "name": "Eli Willis", "team": "Mets"},
+    ])
+    return catalog
+
+
+def test_search_by_player_team_number_and_set():
+    catalog = _catalog()
+    flagg = catalog.search("flag")
+    assert [hit["card"]["number"] for hit in flagg["cards"]] == ["BCP-12", "1"]
+    assert flagg["cards"][1]["set_name"] == "2025-26 Topps Chrome Basketball"
+
+    # Words may hit the set name or the card
+    assert [hit["card"]["name"] for hit in catalog.search("chrome flagg")["cards"]] == ["Cooper Flagg"]
+    assert [hit["card"]["name"] for hit in catalog.search("spurs chrome")["cards"]] == ["Dylan Harper", "Victor Wembanyama"]
+    # Card numbers match exactly, with or without separators
+    assert [hit["card"]["name"] for hit in catalog.search("12")["cards"]] == ["Cooper Flagg", "Victor Wembanyama"]
+    assert [hit["card"]["name"] for hit in catalog.search("bcp12")["cards"]] == ["Cooper Flagg"]
+
+    bowman = catalog.search("bowman draft")
+    assert [s["name"] for s in bowman["sets"]] == ["2025 Bowman Draft Baseball"] and bowman["cards"] == []
+    assert catalog.search("nobody here") == {"sets": [], "cards": []}
+    assert [s["name"] for s in catalog.search_sets("flagg")] == ["2025 Bowman Draft Baseball", "2025-26 Topps Chrome Basketball"]
+
+
+def test_catalog_persists_and_replaces_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.json")
+        _catalog(path)
+        reloaded = ChecklistCatalog(path, max_age_hours=0)
+        cards, description = reloaded.get("http://beckett.com/news/2025-26-topps-chrome-basketball-cards", "BASE")
+        assert len(cards) == 3 and "Topps Chrome" in description
+        assert reloaded.get(CHROME_URL, "inserts") is None
+
+        reloaded.put(CHROME_URL, "base", [{"number": "99", "name": "New Player", "team": "Knicks"}])
+        assert reloaded.search("wembanyama")["cards"] == []
+        assert len(reloaded.search("knicks")["cards"]) == 1
+    assert normalize_url("https://www.Beckett.com/news/x/?utm=1") == "beckett.com/news/x"
+
+
+def test_fetcher_serves_cataloged_urls_without_network(monkeypatch):
+    catalog = ChecklistCatalog(None, max_age_hours=0)
+    calls = []
+
+    def fake_fetch(self, url, checklist_type='base'):
+        calls.append(url)
+        return [{"number": "1", "name": "Cooper Flagg", "team": "Dallas Mavericks"}], "<p>desc</p>"
+
+    monkeypatch.setattr(CardChecklistFetcher, "_fetch_checklist_from_url", fake_fetch)
+    fetcher = CardChecklistFetcher(source="beckett", catalog=catalog)
+
+    first = fetcher.fetch_from_beckett_url(CHROME_URL, "base")
+    assert not fetcher.last_from_catalog
+    second = fetcher.fetch_from_beckett_url(CHROME_URL, "base")
+    assert fetcher.last_from_catalog and second == first and len(calls) == 1
+    fetcher.fetch_from_beckett_url(CHROME_URL, "base", refresh=True)
+    assert len(calls) == 2
+    assert fetcher.search_set("flagg")[0]["matches"][0]["name"] == "Cooper Flagg"
+
+
+def test_search_is_fast_on_large_catalog():
+    catalog = ChecklistCatalog(None, max_age_hours=0)
+    for s in range(40):
+        catalog.put(f"https://www.beckett.com/news/set-{s}-cards/", "base", [
+            {"number": str(n), "name": f"Player{n} Surname{s}", "team": f"Team {n % 30}"} for n in range(500)
+        ], save=False)
+    catalog.search("player")  # builds the sorted token list once
+    start = time.perf_counter()
+    result = catalog.search("player12 surname7", limit=10)
+    elapsed = time.perf_counter() - start
+    assert [hit["card"]["number"] for hit in result["cards"]][:3] == ["12", "120", "121"]
+    assert elapsed < 0.05
+
+
+def test_search_endpoint_clamps_limit(monkeypatch):
+    import app as app_module
+    catalog = _catalog()
+    monkeypatch.setattr(app_module, "get_catalog", lambda: catalog)
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_email"] = app_module.OWNER_EMAIL
+
+    assert len(client.get("/api/search-checklists?q=spurs&limit=abc").get_json()["cards"]) == 2
+    assert len(client.get("/api/search-checklists?q=spurs&limit=-5").get_json()["cards"]) == 1
+    assert client.get("/api/search-checklists?q=spurs&limit=9999").status_code == 200
+
+
+if __name__ == "__main__":
+    test_search_by_player_team_number_and_set()
+    test_catalog_persists_and_replaces_entries()
+    test_search_is_fast_on_large_catalog()
+    print("Checklist catalog tests passed (run with pytest for the full suite)")
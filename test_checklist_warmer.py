@@ -0,0 +1,82 @@
+"""
+Offline tests for background checklist prefetching (parsers replaced by a fake).
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+from card_checklist import CardChecklistFetcher
+from checklist_catalog import ChecklistCatalog
+from checklist_warmer import ChecklistWarmer, load_prefetch_jobs
+
+
+def test_load_prefetch_jobs_merges_file_and_env():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prefetch.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(["https://www.beckett.com/news/a-cards/",
+                       {"url": "https://www.beckett.com/news/b-cards/", "types": ["base", "inserts"]}], f)
+        jobs = load_prefetch_jobs(path, "https://beckett.com/news/a-cards, https://www.beckett.com/news/c-cards/")
+    assert [(j["url"].rsplit("/news/", 1)[1], j["checklist_type"]) for j in jobs] == [
+        ("a-cards/", "base"), ("b-cards/", "base"), ("b-cards/", "inserts"), ("c-cards/", "base")
+    ]
+    assert load_prefetch_jobs("missing.json", "") == []
+
+
+class SlowParser:
+    """Stands in for the Beckett parsers; tracks how many pages are parsed at once."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, fetcher, url, checklist_type='base'):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append((url, checklist_type))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return [{"number": "1", "name": f"Player {url[-8:]}"}], "<p>desc</p>"
+
+
+def test_warmer_bounded_concurrency_and_cache_hits(monkeypatch):
+    parser = SlowParser()
+    monkeypatch.setattr(CardChecklistFetcher, "_fetch_checklist_from_url",
+                        lambda self, url, checklist_type='base': parser(self, url, checklist_type))
+    catalog = ChecklistCatalog(None, max_age_hours=1)
+    jobs = [{"url": f"https://www.beckett.com/news/set-{i}-cards/", "checklist_type": "base"} for i in range(6)]
+
+    warmer = ChecklistWarmer(jobs, catalog, max_workers=2, interval_hours=0)
+    started = time.monotonic()
+    warmer.start()
+    assert time.monotonic() - started < 0.05  # never blocks startup
+
+    # A user request for a set the warmer is parsing waits for it instead of parsing again
+    time.sleep(0.02)
+    cards, _ = CardChecklistFetcher(source="beckett", catalog=catalog).fetch_from_beckett_url(jobs[0]["url"], "base")
+    assert cards[0]["name"].startswith("Player")
+
+    deadline = time.monotonic() + 5
+    while warmer.last_run is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    warmer.stop(timeout=5)
+    assert parser.max_active == 2
+    assert len(parser.calls) == 6
+    assert warmer.last_run["fetched"] == 6
+
+    # Second run: everything is fresh, nothing is parsed
+    assert warmer.warm()["fresh"] == 6 and len(parser.calls) == 6
+    fetcher = CardChecklistFetcher(source="beckett", catalog=catalog)
+    fetcher.fetch_from_beckett_url(jobs[3]["url"], "base")
+    assert fetcher.last_from_catalog and len(parser.calls) == 6
+
+
+if __name__ == "__main__":
+    test_load_prefetch_jobs_merges_file_and_env()
+    print("Prefetch list test passed (run with pytest for the full suite)")
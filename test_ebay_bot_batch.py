@@ -0,0 +1,108 @@
+"""
+Offline test for ebay_bot.py batch mode (listing manager replaced by a fake).
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+import ebay_listing
+from ebay_bot import eBayCardBot
+from http_session import RateBudget
+
+
+class FakeClient:
+    rate_budget = None
+
+
+class FakeListingManager:
+    """Records concurrency; spends one rate-budget call per listing."""
+    created = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, token_override=None, api_client=None, policies=None):
+        self.api_client = api_client or FakeClient()
+        self.policies = policies if policies is not None else {"fetched": True}
+        self.group_key_suffix = ''
+
+    def get_category_id(self, category):
+        return "261328"
+
+    def create_variation_listing(self, cards, title, **kwargs):
+        cls = FakeListingManager
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        if self.api_client.rate_budget:
+            self.api_client.rate_budget.acquire()
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+            cls.created.append((title, len(cards), kwargs.get('price'), id(self.api_client), self.group_key_suffix))
+        if "Broken" in title:
+            return {"success": False, "error": "Listing failed"}
+        return {"success": True, "listingId": f"L{len(cards)}", "group_key": "GROUPX", "itemsCreated": len(cards)}
+
+
+def test_run_batch_shares_client_and_writes_report(monkeypatch):
+    monkeypatch.setattr(ebay_listing, "eBayListingManager", FakeListingManager)
+    FakeListingManager.created = []
+    FakeListingManager.max_active = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_files = []
+        for i in range(5):
+            path = os.path.join(tmp, f"set{i}.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("name,number\n" + "".join(f"Player {n},{n}\n" for n in range(i + 2)))
+            csv_files.append(path)
+        manifest = {
+            "defaults": {"price": 1.5, "publish": False},
+            "listings": [{"csv_file": p, "title": f"Set {i}"} for i, p in enumerate(csv_files[:4])]
+            + [{"csv_file": csv_files[4], "title": "Broken set", "price": 3.0}]
+            + [{"csv_file": os.path.join(tmp, "missing.csv")}]
+        }
+        manifest_path = os.path.join(tmp, "manifest.json")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        report_path = os.path.join(tmp, "report.json")
+
+        bot = eBayCardBot(listing_manager=FakeListingManager())
+        report = bot.run_batch(manifest_path, concurrency=3, rate_limit=0, report_file=report_path)
+
+        with open(report_path, encoding="utf-8") as f:
+            saved = json.load(f)
+
+    assert saved["total"] == 6 and saved["succeeded"] == 4 and saved["failed"] == 2
+    assert report["succeeded"] == 4
+    assert [r["index"] for r in saved["results"]] == list(range(6))
+    assert "FileNotFoundError" in saved["results"][5]["error"]
+    assert saved["results"][0]["itemsCreated"] == 2
+    assert 1 < FakeListingManager.max_active <= 3
+    # One shared client for every pipeline, per-job options applied
+    assert len({created[3] for created in FakeListingManager.created}) == 1
+    assert sorted(created[2] for created in FakeListingManager.created) == [1.5, 1.5, 1.5, 1.5, 3.0]
+    # Every job generates its own group keys, even when started in the same second
+    suffixes = [created[4] for created in FakeListingManager.created]
+    assert len(set(suffixes)) == 5 and all(suffix.startswith("J") and suffix.isalnum() for suffix in suffixes)
+    assert bot.listing_manager.api_client.rate_budget is None
+
+
+def test_rate_budget_limits_calls_per_second():
+    budget = RateBudget(rate=20, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=budget.acquire) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+    assert budget.calls == 6
+    assert 0.2 <= elapsed < 1.0  # 5 waits of 50ms after the first free call
+
+
+if __name__ == "__main__":
+    test_rate_budget_limits_calls_per_second()
+    print("Rate budget test passed (run with pytest for the full suite)")
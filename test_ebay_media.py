@@ -0,0 +1,106 @@
+"""
+Offline test for local image hosting (eBay Media API replaced by a local HTTP server).
+"""
+import os
+import io
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from ebay_media import eBayMediaUploader, prepare_image_file, hash_image_file
+
+
+class FakeMediaHandler(BaseHTTPRequestHandler):
+    """Stand-in for /commerce/media/v1_beta/image endpoints."""
+    uploads = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        image_id = f"img{len(FakeMediaHandler.uploads) + 1}"
+        FakeMediaHandler.uploads.append((image_id, len(body)))
+        self.send_response(201)
+        self.send_header('Location', f"http://{self.headers['Host']}/commerce/media/v1_beta/image/{image_id}")
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        image_id = self.path.rstrip('/').split('/')[-1]
+        body = json.dumps({"imageUrl": f"https://i.ebayimg.com/images/g/{image_id}/s-l1600.jpg"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_jpeg(path, size, color):
+    from PIL import Image
+    Image.new('RGB', size, color).save(path, format='JPEG')
+
+
+def test_upload_images_uses_content_hash_index():
+    FakeMediaHandler.uploads = []
+    server = HTTPServer(('127.0.0.1', 0), FakeMediaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            front = os.path.join(tmp, "front.jpg")
+            back = os.path.join(tmp, "back.jpg")
+            copy = os.path.join(tmp, "front copy.jpg")
+            _write_jpeg(front, (40, 60), (200, 0, 0))
+            _write_jpeg(back, (40, 60), (0, 0, 200))
+            with open(front, 'rb') as src, open(copy, 'wb') as dst:
+                dst.write(src.read())
+            index_file = os.path.join(tmp, "index.json")
+
+            uploader = eBayMediaUploader(token="test-token", base_url=base_url, index_file=index_file)
+            results = uploader.upload_images([front, back, copy, os.path.join(tmp, "missing.jpg")])
+
+            assert len(FakeMediaHandler.uploads) == 2  # identical content uploaded once
+            assert results[front]['success'] and not results[front]['cached']
+            assert results[copy]['url'] == results[front]['url']
+            assert results[back]['url'] != results[front]['url']
+            assert results[os.path.join(tmp, "missing.jpg")]['success'] is False
+
+            # A second run (fresh process state, same index) uploads nothing
+            again = eBayMediaUploader(token="test-token", base_url=base_url, index_file=index_file)
+            second = again.upload_images([front, back])
+            assert len(FakeMediaHandler.uploads) == 2
+            assert all(r['cached'] for r in second.values())
+            assert second[front]['url'] == results[front]['url']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_prepare_image_file_downsizes_oversized():
+    from PIL import Image
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, "big.png")
+        Image.new('RGB', (3200, 2000), (10, 120, 30)).save(big, format='PNG')
+        data, filename = prepare_image_file(big, max_dimension=1600)
+        assert filename == "big.jpg"
+        with Image.open(io.BytesIO(data)) as img:
+            assert img.format == 'JPEG'
+            assert max(img.size) == 1600
+
+        small = os.path.join(tmp, "small.jpg")
+        _write_jpeg(small, (100, 140), (0, 0, 0))
+        data, filename = prepare_image_file(small)
+        with open(small, 'rb') as f:
+            assert data == f.read()
+        assert filename == "small.jpg"
+        assert len(hash_image_file(small)) == 64
+
+
+if __name__ == "__main__":
+    test_upload_images_uses_content_hash_index()
+    test_prepare_image_file_downsizes_oversized()
+    print("All media upload tests passed")
@@ -0,0 +1,83 @@
+"""
+Offline test for the concurrent card image resolver (no network calls).
+"""
+import os
+import tempfile
+import threading
+from fetch_card_images import CardImageResolver, HostRateLimiter, image_from_checklist, get_placeholder_image
+
+
+def test_resolver_caches_and_dedupes():
+    """Each (player, set) is looked up once; a warm cache needs no lookups."""
+    calls = []
+    lock = threading.Lock()
+
+    def fake_source(card, set_name):
+        with lock:
+            calls.append(card['name'])
+        if card['name'] == 'Nobody':
+            return None
+        return f"https://i.ebayimg.com/images/g/{card['name'].replace(' ', '')}/s-l1600.jpg"
+
+    cards = [
+        {"name": "LeBron James", "number": "1"},
+        {"name": "LeBron James", "number": "1-R"},
+        {"name": "Stephen Curry", "number": "2"},
+        {"name": "Nobody", "number": "3"},
+        {"name": "Kevin Durant", "number": "4", "image_url": "https://example.com/kd.jpg"},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "images.json")
+        resolver = CardImageResolver(sources=[image_from_checklist, fake_source], max_workers=4, cache_file=cache_file)
+        results = resolver.annotate_cards(cards, "2024 Topps")
+
+        assert sorted(calls) == ["LeBron James", "Nobody", "Stephen Curry"]
+        assert results[0]['image_url'] == results[1]['image_url']
+        assert results[3]['image_url'] == get_placeholder_image()
+        assert results[4]['image_url'] == "https://example.com/kd.jpg"
+        assert 'image_url' not in cards[0]  # input cards are not mutated
+
+        calls.clear()
+        warm = CardImageResolver(sources=[image_from_checklist, fake_source], cache_file=cache_file)
+        warm_results = warm.annotate_cards(cards, "2024 Topps")
+        assert calls == []
+        assert [c['image_url'] for c in warm_results] == [c['image_url'] for c in results]
+        assert warm.stats['cache_hits'] == 4
+
+
+def test_failed_lookups_are_not_cached_as_misses():
+    """A timeout/429 gives a placeholder for this run only; the card is looked up again next run."""
+    outage = {"down": True}
+
+    def flaky_source(card, set_name):
+        if outage["down"]:
+            raise TimeoutError("read timed out")
+        return "https://i.ebayimg.com/images/g/found/s-l1600.jpg"
+
+    cards = [{"name": "LeBron James", "number": "1"}]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "images.json")
+        first = CardImageResolver(sources=[flaky_source], cache_file=cache_file).annotate_cards(cards, "2024 Topps")
+        assert first[0]['image_url'] == get_placeholder_image()
+
+        outage["down"] = False
+        second = CardImageResolver(sources=[flaky_source], cache_file=cache_file).annotate_cards(cards, "2024 Topps")
+        assert second[0]['image_url'] == "https://i.ebayimg.com/images/g/found/s-l1600.jpg"
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(min_interval=0.05)
+    import time
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.wait('https://www.ebay.com/sch/i.html')
+    limiter.wait('i.ebayimg.com')  # other host is not delayed by the first
+    elapsed = time.monotonic() - start
+    assert 0.14 <= elapsed < 1.0
+
+
+if __name__ == "__main__":
+    test_resolver_caches_and_dedupes()
+    test_rate_limiter_spaces_requests_per_host()
+    print("All image resolver tests passed")
@@ -0,0 +1,113 @@
+"""
+Offline tests for delta-tracked inventory item group writes (eBay API faked).
+"""
+import json
+import ebay_api_client
+from ebay_api_client import eBayAPIClient
+from group_delta import GroupStateStore, structural_diff
+
+DESCRIPTION = "Select your card from the variations below. All cards are Near Mint or better."
+
+
+def _group(description=DESCRIPTION, skus=("S1", "S2")):
+    return {
+        "title": "2025 Topps Chrome Basketball",
+        "variesBy": {"specifications": [{"name": "PICK YOUR CARD", "values": ["1 A", "2 B"]}]},
+        "inventoryItemGroup": {"aspects": {"Sport": ["Basketball"]}, "description": description},
+        "variantSKUs": list(skus),
+        "imageUrls": ["https://example.com/a.jpg"]
+    }
+
+
+def test_structural_diff_reports_changed_paths():
+    old = _group()
+    assert structural_diff(old, _group()) == []
+    assert structural_diff(old, _group(description=DESCRIPTION + " Ships fast.")) == ["inventoryItemGroup.description"]
+    new = _group(skus=("S2", "S1"))
+    new["groupDetails"] = {"x": 1}
+    assert structural_diff(old, new) == ["groupDetails", "variantSKUs"]
+
+
+def test_store_drops_state_when_ebay_disagrees():
+    store = GroupStateStore()
+    assert store.diff("G1", _group()) is None
+    store.record("G1", _group())
+    # GET shape: description at the root
+    fetched = {"title": "2025 Topps Chrome Basketball", "description": DESCRIPTION,
+               "variantSKUs": ["S1", "S2"], "imageUrls": ["https://example.com/a.jpg"]}
+    assert store.reconcile("G1", fetched)
+    assert store.diff("G1", _group()) == []
+    assert not store.reconcile("G1", dict(fetched, description=""))
+    assert store.diff("G1", _group()) is None
+    assert store.stats()["dropped"] == 1
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.text = self.content.decode()
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _client(monkeypatch, sent, server):
+    monkeypatch.setattr(ebay_api_client.Config, "validate", lambda self, require_token=True: True)
+    monkeypatch.setenv("EBAY_SANDBOX_TOKEN", "token")
+    monkeypatch.setenv("EBAY_PRODUCTION_TOKEN", "token")
+    monkeypatch.setenv("EBAY_READ_CACHE_TTL", "0")
+    client = eBayAPIClient(token_override="token")
+
+    def fake_send(method, endpoint, data=None, params=None, retries=None):
+        sent.append(method)
+        if method == 'PUT':
+            return FakeResponse(204)
+        if method == 'GET':
+            return FakeResponse(200, server)
+        return FakeResponse(204)
+
+    monkeypatch.setattr(client, "_send_request", fake_send)
+    return client
+
+
+def test_unchanged_group_put_is_skipped(monkeypatch):
+    sent = []
+    server = {"title": "2025 Topps Chrome Basketball", "description": DESCRIPTION,
+              "variantSKUs": ["S1", "S2"], "imageUrls": ["https://example.com/a.jpg"]}
+    client = _client(monkeypatch, sent, server)
+
+    assert client.create_inventory_item_group("G1", _group())["success"]
+    second = client.create_inventory_item_group("G1", _group())
+    assert second["success"] and second["unchanged"]
+    assert sent == ['PUT']
+
+    # A changed description is sent; force always sends
+    assert not client.create_inventory_item_group("G1", _group(description=DESCRIPTION + " New.")).get("unchanged")
+    assert not client.create_inventory_item_group("G1", _group(description=DESCRIPTION + " New."), force=True).get("unchanged")
+    assert sent == ['PUT', 'PUT', 'PUT']
+
+    stats = client.group_write_stats()
+    assert stats["skipped"] == 1 and stats["sent"] == 3 and stats["bytes_saved"] > 0
+
+
+def test_verification_mismatch_lets_the_retry_through(monkeypatch):
+    sent = []
+    server = {"title": "2025 Topps Chrome Basketball", "description": "",
+              "variantSKUs": ["S1", "S2"], "imageUrls": ["https://example.com/a.jpg"]}
+    client = _client(monkeypatch, sent, server)
+
+    client.create_inventory_item_group("G1", _group())
+    client.get_inventory_item_group("G1")  # eBay lost the description
+    assert not client.create_inventory_item_group("G1", _group()).get("unchanged")
+
+    client.delete_inventory_item_group("G1")
+    assert not client.create_inventory_item_group("G1", _group()).get("unchanged")
+    assert sent == ['PUT', 'GET', 'PUT', 'DELETE', 'PUT']
+
+
+if __name__ == "__main__":
+    test_structural_diff_reports_changed_paths()
+    test_store_drops_state_when_ebay_disagrees()
+    print("Group delta tests passed (run with pytest for the full suite)")
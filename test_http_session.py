@@ -0,0 +1,71 @@
+"""
+Offline tests for the optional HTTP/2 page fetch (httpx replaced by fakes, no network calls).
+"""
+import sys
+import types
+import pytest
+import requests
+import http_session
+
+
+class FakeHTTPError(Exception):
+    pass
+
+
+class FakeHttpxResponse:
+    status_code = 404
+    headers = {"Content-Type": "text/html"}
+    content = b"<html>missing</html>"
+    encoding = "utf-8"
+    reason_phrase = "Not Found"
+    url = "https://www.beckett.com/news/set"
+
+
+class FakeHttp2Client:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            raise FakeHTTPError("stream reset")
+        return FakeHttpxResponse()
+
+
+@pytest.fixture
+def fake_httpx(monkeypatch):
+    monkeypatch.setitem(sys.modules, "httpx", types.SimpleNamespace(HTTPError=FakeHTTPError))
+
+
+def test_get_page_uses_http2_and_returns_a_requests_response(monkeypatch, fake_httpx):
+    client = FakeHttp2Client()
+    monkeypatch.setattr(http_session, "get_http2_client", lambda: client)
+    response = http_session.get_page("https://www.beckett.com/news/set", headers={"User-Agent": "x"}, timeout=60)
+
+    assert isinstance(response, requests.Response)
+    assert response.text == "<html>missing</html>" and response.headers["content-type"] == "text/html"
+    assert client.calls == [{"follow_redirects": True, "headers": {"User-Agent": "x"}, "timeout": 60}]
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_get_page_falls_back_to_the_pooled_session(monkeypatch, fake_httpx):
+    sent = []
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            sent.append(url)
+            return "http/1.1 response"
+
+    monkeypatch.setattr(http_session, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(http_session, "get_http2_client", lambda: FakeHttp2Client(fail=True))
+    assert http_session.get_page("https://www.beckett.com/a", timeout=60) == "http/1.1 response"
+
+    monkeypatch.setattr(http_session, "get_http2_client", lambda: None)  # HTTP2_ENABLED unset
+    assert http_session.get_page("https://www.beckett.com/b") == "http/1.1 response"
+    assert sent == ["https://www.beckett.com/a", "https://www.beckett.com/b"]
+
+
+if __name__ == "__main__":
+    print("Run with pytest: python -m pytest test_http_session.py")
@@ -0,0 +1,62 @@
+"""
+Offline tests for SKU / group key / sort key generation.
+"""
+from identifiers import (
+    generate_skus, make_sku, make_group_key, card_sort_key, sort_cards, MAX_SKU_LENGTH
+)
+
+
+def test_skus_are_stable_unique_and_valid():
+    cards = [
+        {"name": "Shohei Ohtani", "number": "1", "set_name": "https://www.beckett.com/news/2025-topps-series-1-baseball-checklist/"},
+        {"name": "Shohei Ohtani", "number": "1", "set_name": "https://www.beckett.com/news/2025-topps-series-1-baseball-checklist/"},
+        {"name": "Jo Adell's-Very Long.Name Jr", "number": "BD-12"},
+        {"name": "Jo Adell's-Very Long.Name Jr", "number": "BD-13"},
+    ]
+    skus = generate_skus(cards, namespace="2025 Topps Series 1")
+    assert len(set(skus)) == len(skus)
+    assert skus == generate_skus(cards, namespace="2025 Topps Series 1")  # deterministic
+    assert skus[0] == make_sku(cards[0], "2025 Topps Series 1")
+    for sku in skus:
+        assert len(sku) <= MAX_SKU_LENGTH
+        assert sku.startswith("CARD_")
+        assert all(c.isalnum() or c == '_' for c in sku) and sku == sku.upper()
+    # Same card in a different listing gets a different SKU
+    assert generate_skus(cards[2:3], namespace="Other set") != generate_skus(cards[2:3], namespace="2025 Topps Series 1")
+
+    # Long set names are shortened, never the card number; no empty parts
+    sku = make_sku({"name": "LeBron James", "number": "1"}, "2025-26 Topps Chrome Basketball")
+    assert sku.startswith("CARD_2025_26_TOPPS_CHROM_LEBRON_JAMES_1_") and "__" not in sku
+    assert sku == make_sku({"name": "LeBron James", "number": "1", "set_name": "2025-26 Topps Chrome Basketball"})
+
+
+def test_generate_skus_10k_unique():
+    cards = [{"name": f"Player {i % 700}", "number": str(i % 350)} for i in range(10000)]
+    skus = generate_skus(cards, namespace="Big set")
+    assert len(set(skus)) == 10000
+
+
+def test_group_key_alphanumeric_and_keeps_suffix():
+    key = make_group_key("https://www.beckett.com/news/2025-26-topps-chrome-basketball-checklist/", "1735689600")
+    assert key.isalnum() and len(key) <= 50
+    assert key.startswith("GROUPBECKETTCOMNEWS")
+    assert key.endswith("1735689600")
+    assert make_group_key("!!!", "123") == "GROUPCARDSET123"
+
+
+def test_card_sort_key_matches_checklist_rules():
+    inserts = [{"number": "A-2"}, {"number": "79D-DM"}, {"number": "FD-10"}, {"number": "FD-2"}, {"number": "ZZ-1"}]
+    assert [c["number"] for c in sort_cards(inserts, "inserts")] == ["FD-2", "FD-10", "A-2", "79D-DM", "ZZ-1"]
+
+    base = [{"number": "10"}, {"number": "2"}, {"number": "1a"}, {"number": ""}, {"number": "X"}]
+    assert [c["number"] for c in sort_cards(base)] == ["1a", "2", "10", "", "X"]
+    assert card_sort_key({"number": "CPA-AE"}, "autographs") == (0, "CPA-AE")
+    assert card_sort_key({"number": "BD-7"}) == (7, "BD", "BD-7")
+
+
+if __name__ == "__main__":
+    test_skus_are_stable_unique_and_valid()
+    test_generate_skus_10k_unique()
+    test_group_key_alphanumeric_and_keeps_suffix()
+    test_card_sort_key_matches_checklist_rules()
+    print("All identifier tests passed")
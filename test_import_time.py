@@ -0,0 +1,28 @@
+"""
+Start-up budget for the entry points: heavy modules stay deferred until used.
+"""
+from profile_imports import profile_entry_point
+
+# Generous: catches a heavy import sneaking back in, not machine-to-machine noise
+IMPORT_BUDGET_MS = {"app": 1500, "ebay_bot": 1000}
+
+
+def test_app_import_defers_listing_stack():
+    profile = profile_entry_point("app")
+    assert profile["returncode"] == 0, profile["error"]
+    assert profile["modules"], "no -X importtime output"
+    assert profile["heavy"] == []
+    assert profile["total_ms"] < IMPORT_BUDGET_MS["app"]
+
+
+def test_ebay_bot_help_defers_listing_stack():
+    profile = profile_entry_point("ebay_bot")
+    assert profile["returncode"] == 0, profile["error"]
+    assert profile["heavy"] == []
+    assert profile["total_ms"] < IMPORT_BUDGET_MS["ebay_bot"]
+
+
+if __name__ == "__main__":
+    test_app_import_defers_listing_stack()
+    test_ebay_bot_help_defers_listing_stack()
+    print("Import-time budget tests passed")
@@ -0,0 +1,74 @@
+"""
+Offline test for the listing image pre-flight (no network calls).
+"""
+import listing_images
+from listing_images import normalize_image_url, prepare_listing_images
+
+
+def test_normalize_image_url():
+    assert normalize_image_url(" http://i.ebayimg.com/images/g/abc/s-l225.jpg ") == "https://i.ebayimg.com/images/g/abc/s-l1600.jpg"
+    assert normalize_image_url("https://i.ebayimg.com/images/g/abc/s-l500.webp") == "https://i.ebayimg.com/images/g/abc/s-l1600.webp"
+    # Non-eBay hosts are left alone
+    assert normalize_image_url("https://example.com/s-l225.jpg") == "https://example.com/s-l225.jpg"
+    assert normalize_image_url("C:\\Pictures\\card.jpg") is None
+    assert normalize_image_url("") is None
+
+
+def test_prepare_listing_images_drops_broken_and_caps(monkeypatch):
+    broken = "https://example.com/broken.jpg"
+    checked = []
+
+    def fake_check(url, timeout=10):
+        checked.append(url)
+        return (False, "HTTP 404") if url == broken else (True, "OK")
+
+    monkeypatch.setattr(listing_images, "check_image_url", fake_check)
+
+    cards = [{"name": f"Card {i}", "image_url": f"https://i.ebayimg.com/images/g/{i}/s-l64.jpg"} for i in range(30)]
+    cards.append({"name": "Dup", "imageUrl": "https://i.ebayimg.com/images/g/0/s-l225.jpg"})
+    cards.append({"name": "Broken", "image_url": broken})
+    cards.append({"name": "No image"})
+
+    result = prepare_listing_images(cards, extra_images=["https://example.com/main.jpg"], max_images=24)
+
+    assert len(checked) == len(set(checked)) == 32  # deduped before checking
+    assert len(result["image_urls"]) == 24
+    assert result["image_urls"][0] == "https://example.com/main.jpg"
+    assert result["card_images"][0] == result["card_images"][30] == "https://i.ebayimg.com/images/g/0/s-l1600.jpg"
+    assert result["card_images"][31] == ""
+    assert result["card_images"][32] == ""
+    assert [r["url"] for r in result["rejected"]] == [broken]
+
+
+class FakeResponse:
+    def __init__(self, status_code, content_type="image/jpeg"):
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+
+
+def test_check_image_url_keeps_transient_failures(monkeypatch):
+    calls = []
+
+    def fake_head(url, **kwargs):
+        calls.append(url)
+        if url.endswith("flaky.jpg") and len(calls) == 1:
+            raise ConnectionResetError("reset")
+        if url.endswith("down.jpg"):
+            raise TimeoutError("timed out")
+        return FakeResponse({"busy.jpg": 503, "gone.jpg": 404}.get(url.rsplit("/", 1)[-1], 200))
+
+    monkeypatch.setattr(listing_images.http_session, "head", fake_head)
+    monkeypatch.setattr(listing_images, "_check_cache", {})
+
+    assert listing_images.check_image_url("https://example.com/flaky.jpg") == (True, "OK")  # retried once
+    ok, reason = listing_images.check_image_url("https://example.com/down.jpg")
+    assert ok and reason.startswith("Unverified")
+    assert listing_images.check_image_url("https://example.com/busy.jpg")[0] is True
+    assert listing_images.check_image_url("https://example.com/gone.jpg") == (False, "HTTP 404")
+    # Only definitive answers are cached
+    assert set(listing_images._check_cache) == {"https://example.com/flaky.jpg", "https://example.com/gone.jpg"}
+
+
+if __name__ == "__main__":
+    test_normalize_image_url()
+    print("normalize_image_url OK (run with pytest for the full suite)")
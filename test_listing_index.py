@@ -0,0 +1,78 @@
+"""
+Offline tests for the dashboard's listing index (snapshots built by hand, no eBay calls).
+"""
+import threading
+import time
+from listing_index import ListingIndex, group_rows, query_listings
+
+
+def make_snapshot(groups=20, price_of=lambda n: f"{n}.99"):
+    offers, items, group_data = [], {}, {}
+    for n in range(groups):
+        key = f"G{n:02d}"
+        group_data[key] = {"title": f"{'Prizm' if n % 2 else 'Select'} Set {n}", "variantSKUs": [f"{key}A", f"{key}B"]}
+        for suffix in "AB":
+            sku = f"{key}{suffix}"
+            items[sku] = {"sku": sku}
+            offers.append({"offerId": f"O{sku}", "sku": sku, "inventoryItemGroupKey": key,
+                           "status": "PUBLISHED" if n % 3 == 0 else "UNPUBLISHED",
+                           "listingId": f"L{n}" if n % 3 == 0 else None, "availableQuantity": 2,
+                           "pricingSummary": {"price": {"value": price_of(n), "currency": "USD"}}})
+    return {"items": items, "offers": offers, "groups": group_data, "taken_at": time.time()}
+
+
+def test_one_row_per_group_with_tracked_missing_groups():
+    rows = group_rows(make_snapshot(3), known=[{"group_key": "G01", "name": "Tracked"},
+                                               {"group_key": "GONE", "sku": "X", "name": "Deleted"}])
+    by_key = {row["group_key"]: row for row in rows}
+    assert by_key["G00"]["status"] == "ACTIVE" and by_key["G00"]["listing_id"] == "L0"
+    assert by_key["G01"]["name"] == "Tracked" and by_key["G01"]["status"] == "UNPUBLISHED"
+    assert by_key["G02"]["quantity"] == 4 and by_key["G02"]["variations"] == 2 and by_key["G02"]["price"] == 2.99
+    assert by_key["GONE"]["exists"] is False
+
+
+def test_filter_sort_and_page():
+    rows = group_rows(make_snapshot(20))
+    result = query_listings(rows, set_name="prizm", min_price=5, max_price=15, sort="price", order="desc",
+                            page=2, page_size=2)
+    assert result["total"] == 5  # Prizm = odd groups, priced 5.99 .. 13.99
+    assert [row["price"] for row in result["listings"]] == [9.99, 7.99]
+    assert result["pages"] == 3 and result["counts"] == {"total": 20, "draft": 13, "active": 7}
+
+    drafts = query_listings(rows, status="UNPUBLISHED,Unknown", page=99, page_size=50)
+    assert drafts["total"] == 13 and drafts["page"] == 1
+    assert query_listings(rows, sort="bogus")["listings"][0]["title"] == "Prizm Set 1"
+
+
+def test_stale_rows_are_served_while_refreshing_in_background():
+    clock = {"now": 1000.0}
+    release = threading.Event()
+    loads = []
+
+    def loader(refresh):
+        loads.append(refresh)
+        if refresh:
+            release.wait(5)
+            return dict(make_snapshot(3, price_of=lambda n: "50.00"), taken_at=clock["now"])
+        return dict(make_snapshot(3), taken_at=1000.0)
+
+    index = ListingIndex(ttl_seconds=60, loader=loader, clock=lambda: clock["now"])
+    assert index.query()["total"] == 3 and loads == [False]
+
+    clock["now"] += 61
+    result = index.query()  # stale: old rows right away, refresh started
+    assert result["refreshing"] and result["listings"][0]["price"] != 50.0
+    assert not index.refresh_async()  # one refresh at a time
+    release.set()
+    index._thread.join(5)
+    assert index.query()["listings"][0]["price"] == 50.0 and loads == [False, True]
+
+    index.patch("G00", price=1.5)
+    index.discard("G01")
+    assert [row["price"] for row in index.query(sort="price")["listings"]] == [1.5, 50.0]
+
+
+if __name__ == "__main__":
+    test_one_row_per_group_with_tracked_missing_groups()
+    test_filter_sort_and_page()
+    print("Listing index tests passed (run with pytest for the full suite)")
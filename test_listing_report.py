@@ -0,0 +1,88 @@
+"""
+Offline tests for the incremental listing reports (no eBay calls: snapshots are built by hand).
+"""
+import json
+import os
+import time
+import generate_listings_html
+import editable_listings_viewer
+from listing_report import ReportWriter, listing_rows, load_snapshot
+
+
+def make_snapshot(count):
+    items = {f"S{n}": {"sku": f"S{n}", "product": {"title": f"Card {n}", "imageUrls": [f"https://img/{n}.jpg"]}}
+             for n in range(count)}
+    offers = [{"offerId": f"O{n}", "sku": f"S{n}", "inventoryItemGroupKey": "G1" if n < 3 else "",
+               "status": "PUBLISHED" if n % 2 else "UNPUBLISHED", "listingId": f"L{n}" if n % 2 else None,
+               "pricingSummary": {"price": {"value": "1.99", "currency": "USD"}}, "availableQuantity": 1}
+              for n in range(count)]
+    return {"items": items, "offers": offers, "groups": {"G1": {"title": "Group Title"}}, "errors": [],
+            "taken_at": time.time()}
+
+
+def test_rows_join_items_offers_and_groups():
+    rows = {row["sku"]: row for row in listing_rows(make_snapshot(5))}
+    assert len(rows) == 5
+    assert rows["S0"]["title"] == "Group Title" and rows["S4"]["title"] == "Card 4"
+    assert rows["S1"]["listing_id"] == "L1" and rows["S4"]["images"] == ["https://img/4.jpg"]
+    assert rows["S2"]["price"] == "1.99" and rows["S2"]["currency"] == "USD"
+
+
+def test_only_changed_listings_and_pages_are_rewritten(tmp_path):
+    output = str(tmp_path / "my_listings.html")
+    rendered = []
+
+    def render_card(row):
+        rendered.append(row["sku"])
+        return generate_listings_html.render_listing_card(row)
+
+    def build(snapshot, page_size=4):
+        rows = listing_rows(snapshot)
+        writer = ReportWriter(output, render_card, generate_listings_html.render_listings_page, page_size=page_size)
+        return writer.build(rows, {"environment": "SANDBOX", "stats": {"total": len(rows), "published": 0, "drafts": 0}})
+
+    snapshot = make_snapshot(10)
+    result = build(snapshot)
+    assert result["rendered"] == 10 and result["pages"] == 3 and result["written"] == 3
+    assert os.path.exists(str(tmp_path / "my_listings_p3.html"))
+    assert 'href="my_listings_p2.html"' in open(output, encoding="utf-8").read()
+
+    # Nothing changed: no card rendered, no file written
+    rendered.clear()
+    result = build(snapshot)
+    assert rendered == [] and result["written"] == 0 and result["reused"] == 10
+
+    # One price change re-renders one card and rewrites only its page
+    snapshot["offers"][9]["pricingSummary"]["price"]["value"] = "2.49"
+    rendered.clear()
+    result = build(snapshot)
+    assert rendered == ["S9"] and result["written"] == 1
+    assert "$2.49" in open(str(tmp_path / "my_listings_p2.html"), encoding="utf-8").read()  # ungrouped rows sort first
+
+    # Fewer listings: the page that no longer exists is removed
+    result = build(make_snapshot(6))
+    assert result["pages"] == 2 and not os.path.exists(str(tmp_path / "my_listings_p3.html"))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_editable_viewer_uses_stable_ids_per_page(tmp_path):
+    rows = listing_rows(make_snapshot(3))
+    writer = ReportWriter(str(tmp_path / "editable.html"), editable_listings_viewer.render_editable_card,
+                          editable_listings_viewer.render_editable_page, page_size=2)
+    writer.build(rows, {"environment": "SANDBOX", "stats": {"total": 3, "published": 1, "drafts": 2}})
+    page2 = open(str(tmp_path / "editable_p2.html"), encoding="utf-8").read()
+    key = editable_listings_viewer.listing_key(rows[2]["sku"])
+    assert f'id="images-{key}"' in page2 and f'"key": "{key}"' in page2
+    assert rows[0]["sku"] not in page2
+
+
+def test_fresh_snapshot_is_reused_without_a_client(tmp_path):
+    snapshot_file = str(tmp_path / "snapshot.json")
+    json.dump(make_snapshot(2), open(snapshot_file, "w"))
+    snapshot = load_snapshot(snapshot_file=snapshot_file, max_age_minutes=15)
+    assert len(snapshot["offers"]) == 2
+
+
+if __name__ == "__main__":
+    test_rows_join_items_offers_and_groups()
+    print("Listing report tests passed (run with pytest for the full suite)")
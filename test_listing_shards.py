@@ -0,0 +1,110 @@
+"""
+Offline tests for variation-limit sharding (no network calls).
+"""
+import threading
+import ebay_listing
+from ebay_listing import eBayListingManager
+from listing_shards import plan_shards, shard_title, MAX_TITLE_LENGTH
+
+
+def _cards(count, section=None, start=1):
+    return [{"name": f"Player {n}", "number": str(n), **({"type": section} if section else {})}
+            for n in range(start, start + count)]
+
+
+def test_plan_shards_keeps_sections_and_balances_splits():
+    cards = _cards(300, "base") + _cards(40, "inserts") + _cards(60, "autographs") + _cards(10, "parallels")
+    shards = plan_shards(cards, max_variations=250)
+
+    assert [len(s["cards"]) for s in shards] == [150, 150, 110]
+    assert [s["label"] for s in shards] == ["Base #1-150", "Base #151-300", "Inserts / Autographs / Parallels"]
+    assert sum(len(s["cards"]) for s in shards) == len(cards)
+    assert all(len(s["cards"]) <= 250 for s in shards)
+
+    unsectioned = plan_shards(_cards(501), max_variations=250)
+    assert [len(s["cards"]) for s in unsectioned] == [167, 167, 167]
+    assert unsectioned[1]["label"] == "#168-334"
+
+    assert len(plan_shards(_cards(250), max_variations=250)) == 1
+
+
+def test_shard_title_fits_ebay_limit():
+    title = "2025-26 Topps Chrome Basketball Complete Your Set Pick Your Card Base Refractor Lot"
+    shards = plan_shards(_cards(600), max_variations=250)
+    titles = [shard_title(title, shard, i, len(shards)) for i, shard in enumerate(shards, start=1)]
+    assert all(len(t) <= MAX_TITLE_LENGTH for t in titles)
+    assert titles[0].endswith("#1-200 (1/3)")
+    assert len(set(titles)) == 3
+    assert shard_title("Short", shards[0], 1, 1) == "Short"
+
+
+class FakeClient:
+    rate_budget = None
+
+
+def test_create_variation_listing_shards_before_creating_items(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_inventory_api(self, cards, title, description, *args, **kwargs):
+        with lock:
+            calls.append((title, len(cards), description))
+        if "(2/3)" in title:
+            return {"success": False, "error": "Publish failed"}
+        return {"success": True, "listingId": f"L{len(calls)}", "group_key": f"G{len(calls)}",
+                "itemsCreated": len(cards), "skus": [f"S{c['number']}" for c in cards]}
+
+    monkeypatch.setattr(eBayListingManager, "_create_listing_via_inventory_api", fake_inventory_api)
+    monkeypatch.setenv("MAX_VARIATIONS_PER_LISTING", "100")
+    monkeypatch.setenv("FULFILLMENT_POLICY_ID", "F1")
+    monkeypatch.setattr(ebay_listing.Config, "validate", lambda self, require_token=True: True)
+
+    manager = eBayListingManager(api_client=FakeClient(), policies={"fulfillment_policy_id": "F1", "return_policy_id": "R1"})
+    description = "Shared description for every shard of this listing, long enough for eBay."
+    result = manager.create_variation_listing(_cards(250), "2025 Topps Series 1", description, "261328", 0.99, publish=False)
+
+    assert len(calls) == 3
+    assert all(count <= 100 for _, count, _ in calls)
+    assert {desc for _, _, desc in calls} == {description}
+    assert result["success"] is False and result["sharded"] is True
+    assert result["itemsCreated"] == 166
+    assert len(result["listingIds"]) == 2
+    assert [s["success"] for s in result["shards"]] == [True, False, True]
+    assert "Publish failed" in result["error"]
+
+    # Without a description every shard gets the default for the base title, not its own
+    calls.clear()
+    manager.create_variation_listing(_cards(250), "2025 Topps Series 1", "", "261328", 0.99, publish=False)
+    descriptions = {desc for _, _, desc in calls}
+    assert len(descriptions) == 1 and "2025 Topps Series 1." in descriptions.pop()
+
+
+def test_shards_started_in_the_same_second_get_distinct_group_keys(monkeypatch):
+    keys = []
+    lock = threading.Lock()
+
+    def fake_inventory_api(self, cards, title, description, *args, **kwargs):
+        key = self._new_group_key("2025 Topps Series 1")
+        with lock:
+            keys.append(key)
+        return {"success": True, "listingId": f"L{key}", "group_key": key, "itemsCreated": len(cards), "skus": []}
+
+    monkeypatch.setattr(eBayListingManager, "_create_listing_via_inventory_api", fake_inventory_api)
+    monkeypatch.setattr(ebay_listing.time, "time", lambda: 1768715280.5)
+    monkeypatch.setenv("MAX_VARIATIONS_PER_LISTING", "100")
+    monkeypatch.setattr(ebay_listing.Config, "validate", lambda self, require_token=True: True)
+
+    manager = eBayListingManager(api_client=FakeClient(), policies={"fulfillment_policy_id": "F1", "return_policy_id": "R1"})
+    manager.group_key_suffix = "JA1B2C3"  # batch job suffix, kept under the shard suffix
+    description = "Shared description for every shard of this listing, long enough for eBay."
+    result = manager.create_variation_listing(_cards(200), "2025 Topps Series 1", description, "261328", 0.99, publish=False)
+
+    assert len(keys) == 2 and len(set(keys)) == 2
+    assert all(key.isalnum() and len(key) <= 50 and "1768715280JA1B2C3S" in key for key in keys)
+    assert sorted(s["group_key"] for s in result["shards"]) == sorted(keys)
+
+
+if __name__ == "__main__":
+    test_plan_shards_keeps_sections_and_balances_splits()
+    test_shard_title_fits_ebay_limit()
+    print("Shard planning tests passed (run with pytest for the full suite)")
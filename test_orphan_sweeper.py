@@ -0,0 +1,190 @@
+"""
+Offline tests for the orphan sweeper (eBay inventory replaced by a fake account).
+"""
+import json
+import threading
+import time
+import pytest
+import requests
+import ebay_api_client
+from ebay_api_client import eBayAPIClient
+from orphan_sweeper import (
+    GROUP_MISSING_SKUS, ITEM_WITHOUT_OFFER, OFFER_WITHOUT_GROUP, OrphanSweeper, find_orphans, take_snapshot
+)
+
+
+class FakeAccount:
+    """Items, offers and groups of one account; records deletes."""
+
+    def __init__(self):
+        self.rate_budget = None
+        self.lock = threading.Lock()
+        self.deleted = []
+        self.items = {sku: {"sku": sku} for sku in ("LIVE1", "LIVE2", "DRAFT1", "LOOSE", "STRAY", "BROKEN1")}
+        self.offers = [
+            {"offerId": "O1", "sku": "LIVE1", "inventoryItemGroupKey": "LIVEGROUP", "listingId": "111"},
+            {"offerId": "O2", "sku": "LIVE2", "inventoryItemGroupKey": "LIVEGROUP", "listingId": "111"},
+            {"offerId": "O3", "sku": "DRAFT1", "inventoryItemGroupKey": "DRAFTGROUP"},
+            {"offerId": "O4", "sku": "LOOSE"},
+            {"offerId": "O5", "sku": "BROKEN1", "inventoryItemGroupKey": "BROKENGROUP"},
+            {"offerId": "O6", "sku": "GONE", "inventoryItemGroupKey": "DELETEDGROUP"},
+        ]
+        self.groups = {
+            "LIVEGROUP": {"variantSKUs": ["LIVE1", "LIVE2", "SOLDOUT"]},
+            "DRAFTGROUP": {"variantSKUs": ["DRAFT1"]},
+            "BROKENGROUP": {"variantSKUs": ["BROKEN1", "MISSING1"]},
+        }
+
+    def iter_collection(self, endpoint, records_key, params=None, page_size=200):
+        yield from (list(self.items.values()) if records_key == 'inventoryItems' else self.offers)
+
+    def get_inventory_item_group(self, group_key):
+        if group_key in self.groups:
+            return {"success": True, "data": self.groups[group_key]}
+        return {"success": False, "error": "not found", "status_code": 404}
+
+    def _record(self, kind, key):
+        with self.lock:
+            self.deleted.append((kind, key))
+        return {"success": True}
+
+    def delete_inventory_item_group(self, key):
+        return self._record("group", key)
+
+    def delete_offer(self, offer_id):
+        return self._record("offer", offer_id)
+
+    def delete_inventory_item(self, sku):
+        return self._record("item", sku)
+
+
+def test_orphans_found_from_one_snapshot():
+    orphans = find_orphans(take_snapshot(FakeAccount()))
+    found = {(o["kind"], o["id"]) for o in orphans}
+    assert found == {
+        (OFFER_WITHOUT_GROUP, "O4"),
+        (OFFER_WITHOUT_GROUP, "O6"),
+        (ITEM_WITHOUT_OFFER, "STRAY"),
+        (GROUP_MISSING_SKUS, "BROKENGROUP"),
+    }  # LIVEGROUP is missing SOLDOUT but has a published listing
+
+
+def test_dry_run_then_grace_period_then_delete(tmp_path):
+    account = FakeAccount()
+    state_file = str(tmp_path / "sweeper.json")
+    sweeper = OrphanSweeper(account, state_file=state_file, grace_minutes=60, rate_limit=0)
+
+    report = sweeper.sweep(dry_run=True, now=1000)
+    assert len(report["orphans"]) == 4 and report["eligible"] == 0 and account.deleted == []
+
+    # Within the grace period nothing is deleted, even when not a dry run
+    assert sweeper.sweep(dry_run=False, now=1000 + 30 * 60)["deleted"] == 0
+
+    # A new sweeper reads the first-seen times back; an orphan that resolved itself is forgotten
+    account.items.pop("STRAY")
+    later = OrphanSweeper(account, state_file=state_file, grace_minutes=60, rate_limit=0)
+    report = later.sweep(dry_run=False, now=1000 + 61 * 60)
+    assert report["deleted"] == 2 and report["failed"] == []
+    assert [kind for kind, _ in account.deleted] == ["offer", "offer"]  # the broken group is only reported
+    assert json.load(open(state_file))["first_seen"] == {f"{GROUP_MISSING_SKUS}:BROKENGROUP": 1000}
+
+
+def test_live_groups_and_their_offers_are_never_orphans():
+    account = FakeAccount()
+    # Published without a top-level listingId, and missing a variant SKU
+    account.offers[0] = {"offerId": "O1", "sku": "LIVE1", "inventoryItemGroupKey": "LIVEGROUP",
+                         "status": "PUBLISHED", "listing": {"listingId": "99"}}
+    account.offers[1] = {"offerId": "O2", "sku": "LIVE2", "inventoryItemGroupKey": "LIVEGROUP", "status": "PUBLISHED"}
+    # Draft variation whose offer payload leaves out the group key
+    account.offers[2] = {"offerId": "O3", "sku": "DRAFT1"}
+    account.items["DRAFT1"]["groupIds"] = ["DRAFTGROUP"]
+    found = {(o["kind"], o["id"]) for o in find_orphans(take_snapshot(account))}
+    assert (GROUP_MISSING_SKUS, "LIVEGROUP") not in found and (OFFER_WITHOUT_GROUP, "O3") not in found
+    assert (OFFER_WITHOUT_GROUP, "O4") in found
+
+
+def test_incomplete_snapshot_deletes_nothing():
+    account = FakeAccount()
+
+    def failing(endpoint, records_key, params=None, page_size=200):
+        if records_key == 'offers':
+            raise requests.HTTPError("HTTP 500")
+        yield from account.items.values()
+
+    account.iter_collection = failing
+    account._make_request = lambda method, endpoint, params=None: FakeResponse(500, {})
+    with pytest.raises(requests.HTTPError):
+        OrphanSweeper(account, grace_minutes=0, rate_limit=0).sweep(dry_run=False)
+    assert account.deleted == []
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def test_client_paginates_past_the_old_page_cap(monkeypatch):
+    monkeypatch.setattr(ebay_api_client.Config, "validate", lambda self, require_token=True: True)
+    monkeypatch.setenv("EBAY_SANDBOX_TOKEN", "token")
+    monkeypatch.setenv("EBAY_PRODUCTION_TOKEN", "token")
+    monkeypatch.setenv("EBAY_READ_CACHE_TTL", "30")
+    client = eBayAPIClient(token_override="token")
+    offsets = []
+
+    def fake_send(method, endpoint, data=None, params=None, retries=None):
+        offsets.append(params["offset"])
+        start = params["offset"]
+        records = [{"sku": f"S{n}"} for n in range(start, min(start + params["limit"], 25))]
+        return FakeResponse(200, {"total": 25, "inventoryItems": records})
+
+    monkeypatch.setattr(client, "_send_request", fake_send)
+    skus = [item["sku"] for item in client.iter_collection('/sell/inventory/v1/inventory_item', 'inventoryItems', page_size=2)]
+    assert skus == [f"S{n}" for n in range(25)]
+    assert len(offsets) == 13
+    assert client.read_cache_stats()["entries"] == 0  # pages are streamed, not cached
+
+    monkeypatch.setattr(client, "_send_request", lambda *a, **k: FakeResponse(500, {}))
+    with pytest.raises(requests.HTTPError):
+        list(client.iter_collection('/sell/inventory/v1/offer', 'offers'))
+
+
+def test_client_prefetches_pages_concurrently_in_order(monkeypatch):
+    monkeypatch.setattr(ebay_api_client.Config, "validate", lambda self, require_token=True: True)
+    client = eBayAPIClient(token_override="token")
+    lock = threading.Lock()
+    state = {"active": 0, "max_active": 0}
+
+    def fake_send(method, endpoint, data=None, params=None, retries=None):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        time.sleep(0.02 if params["offset"] % 20 else 0.05)  # out-of-order completion
+        with lock:
+            state["active"] -= 1
+        start = params["offset"]
+        records = [{"offerId": str(n)} for n in range(start, min(start + params["limit"], 100))]
+        return FakeResponse(200, {"total": 100, "offers": records})
+
+    monkeypatch.setattr(client, "_send_request", fake_send)
+    ids = [offer["offerId"] for offer in client.iter_collection('/sell/inventory/v1/offer', 'offers',
+                                                                 page_size=10, prefetch=3)]
+    assert ids == [str(n) for n in range(100)]
+    assert state["max_active"] == 3
+
+    # A caller that stops early leaves no more than the window in flight
+    state["max_active"] = 0
+    stream = client.iter_collection('/sell/inventory/v1/offer', 'offers', page_size=10, prefetch=2)
+    assert next(stream)["offerId"] == "0"
+    stream.close()
+    assert state["max_active"] <= 2
+
+
+if __name__ == "__main__":
+    test_orphans_found_from_one_snapshot()
+    print("Orphan sweeper tests passed (run with pytest for the full suite)")
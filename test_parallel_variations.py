@@ -0,0 +1,96 @@
+"""
+Offline tests for lazy parallel x base-card variations (no network calls).
+"""
+import json
+import app as app_module
+import card_checklist
+from card_record import CardRecord
+from identifiers import generate_skus
+from parallel_variations import iter_variations, count_variations, variation_sku, iter_chunks, parse_numbering
+
+PARALLELS = ["Refractor /250", "Gold Refractor /50", "Superfractor /1"]
+
+
+def _cards(count):
+    return [{"number": str(n), "name": f"Player {n}", "team": "Team", "parallel_type": "",
+             "numbering": "", "parallel_types": list(PARALLELS)} for n in range(1, count + 1)]
+
+
+def test_variations_are_lazy_and_filterable():
+    consumed = []
+
+    def card_source():
+        for card in _cards(1000):
+            consumed.append(card)
+            yield card
+
+    variations = iter_variations(card_source(), set_name="2025 Topps Chrome")
+    first = [next(variations) for _ in range(4)]
+    assert len(consumed) == 2  # only as many base cards as needed
+    assert [v.parallel_type for v in first] == PARALLELS + PARALLELS[:1]
+    assert first[1].numbering == "/50" and first[1].get("number") == "1"
+    assert first[0].parallel_types is first[3].parallel_types
+
+    gold = list(iter_variations(_cards(10), parallels=["gold refractor /50"]))
+    assert len(gold) == 10 == count_variations(_cards(10), parallels="Gold Refractor /50")
+    assert count_variations(_cards(10)) == 30
+    # A card that already names its parallel is not crossed again
+    assert count_variations([{"name": "X", "number": "1", "parallel_type": "Orange /25"}], PARALLELS) == 1
+    assert parse_numbering("Superfractor /1") == "/1" and parse_numbering("Refractor") == ""
+
+
+def test_skus_are_stable_across_chunks():
+    variations = list(iter_variations(_cards(40), set_name="2025 Topps Chrome"))
+    skus = [variation_sku(v) for v in variations]
+    assert len(set(skus)) == 120
+    chunked = [sku for chunk in iter_chunks(iter_variations(_cards(40), set_name="2025 Topps Chrome"), 25)
+               for sku in generate_skus(chunk, namespace="any listing title")]
+    assert chunked == skus
+    assert [len(c) for c in iter_chunks(range(7), 3)] == [3, 3, 1]
+
+
+class FakeFetcher:
+    last_from_catalog = False
+
+    def __init__(self, source=None):
+        pass
+
+    def fetch_from_beckett_url(self, url, checklist_type='base', refresh=False):
+        return _cards(5), "<p><strong>2025 Topps Chrome</strong></p>"
+
+
+def test_fetch_checklist_streams_variations(monkeypatch):
+    monkeypatch.setattr(card_checklist, "CardChecklistFetcher", FakeFetcher)
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_email"] = app_module.OWNER_EMAIL
+
+    response = client.post("/api/fetch-checklist", json={
+        "url": "https://www.beckett.com/news/2025-topps-chrome-cards/", "type": "parallels",
+        "defaultPrice": 2.5, "expandParallels": True, "parallels": ["Gold Refractor /50", "Superfractor /1"]
+    })
+    assert response.is_streamed
+    data = json.loads(response.get_data(as_text=True))
+    assert data["count"] == len(data["cards"]) == 10 and data["baseCount"] == 5
+    assert data["parallelTypes"] == PARALLELS
+    assert data["cards"][1] == {"number": "1", "name": "Player 1", "team": "Team", "price": 2.5, "quantity": 0,
+                                "imageUrl": "", "parallelType": "Superfractor /1", "numbering": "/1",
+                                "sku": data["cards"][1]["sku"]}
+    assert len({c["sku"] for c in data["cards"]}) == 10
+
+    # /api/list rebuilds the card without the SKU (edited rows) or with it: same SKU either way
+    streamed = data["cards"][1]
+    rebuilt = CardRecord(name=streamed["name"], number=streamed["number"], parallel_type=streamed["parallelType"],
+                         numbering=streamed["numbering"], set_name=data["setName"])
+    assert generate_skus([rebuilt], namespace="edited listing title") == [streamed["sku"]]
+    rebuilt["sku"] = streamed["sku"]
+    assert generate_skus([rebuilt]) == [streamed["sku"]]
+
+    plain = client.post("/api/fetch-checklist", json={"url": "https://www.beckett.com/x", "type": "parallels"})
+    assert plain.get_json()["count"] == 5 and "expanded" not in plain.get_json()
+
+
+if __name__ == "__main__":
+    test_variations_are_lazy_and_filterable()
+    test_skus_are_stable_across_chunks()
+    print("Parallel variation tests passed (run with pytest for the full suite)")
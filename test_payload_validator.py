@@ -0,0 +1,118 @@
+"""
+Offline tests for the item/group/offer payload validator (no network calls).
+"""
+import time
+import ebay_listing
+from ebay_listing import eBayListingManager
+from payload_validator import (
+    GROUP_KEY, validate_group, validate_item, validate_listing, validate_offer, format_validation_errors
+)
+
+DESCRIPTION = "Select your card from the variations below. All cards are Near Mint or better."
+
+
+def _item(value, title="Player #1", quantity=1):
+    return {
+        "product": {"title": title, "aspects": {"Card Name": ["Player"], "Pick Your Card": [value]}},
+        "condition": "USED_VERY_GOOD",
+        "availability": {"shipToLocationAvailability": {"quantity": quantity}}
+    }
+
+
+def _group(values, skus, description=DESCRIPTION):
+    return {
+        "title": "2025 Topps Chrome Basketball",
+        "variesBy": {"specifications": [{"name": "PICK YOUR CARD", "values": values}]},
+        "inventoryItemGroup": {"aspects": {}, "description": description},
+        "variantSKUs": skus,
+        "imageUrls": ["https://example.com/a.jpg"]
+    }
+
+
+def _offer(sku, price="1.99", return_policy="R1"):
+    return {
+        "sku": sku, "marketplaceId": "EBAY_US", "format": "FIXED_PRICE", "categoryId": "261328",
+        "pricingSummary": {"price": {"value": price, "currency": "USD"}}, "availableQuantity": 1,
+        "listingPolicies": {"fulfillmentPolicyId": "F1", "returnPolicyId": return_policy}
+    }
+
+
+def test_single_payload_rules():
+    assert validate_item(_item("1 Player")) == []
+    assert validate_item(_item("1 Player", title="é" * 41, quantity=-1)) == [
+        "product.title: required, at most 80 bytes",
+        "availability.shipToLocationAvailability.quantity: must be a whole number >= 0"
+    ]
+    assert "aspect 'Pick Your Card' value" in validate_item(_item("x" * 66))[0]
+
+    assert validate_group(_group(["1 Player"], ["S1"])) == []
+    short = validate_group(_group(["1 Player"], ["S1"], description="Too short"), publish=False)
+    assert short == ["inventoryItemGroup.description: required, at least 50 characters (eBay error 25016)"]
+
+    assert validate_offer(_offer("S1")) == []
+    assert validate_offer(_offer("S1", return_policy=None), publish=False) == []
+    assert validate_offer(_offer("S1", price="0", return_policy=None)) == [
+        "pricingSummary.price.value: must be a price > 0",
+        "listingPolicies.returnPolicyId: required to publish (eBay error 25009, set RETURN_POLICY_ID)"
+    ]
+
+
+def test_listing_reports_errors_per_sku():
+    items = {"S1": _item("1 Player"), "S2": _item("2 Other"), "S3": _item("1 Player")}
+    group = _group(["1 Player", "2 Other", "3 Nobody"], ["S1", "S2", "S3", "S4"])
+    result = validate_listing(items, group, [_offer("S1"), _offer("S2", price="free")])
+
+    assert not result["valid"]
+    assert result["errors"]["S3"] == ["same variation (1 Player) as S1"]
+    assert result["errors"]["S2"] == ["pricingSummary.price.value: must be a price > 0"]
+    assert result["errors"][GROUP_KEY] == [
+        "variantSKUs: S4 has no inventory item",
+        "variesBy 'PICK YOUR CARD' has 1 value(s) no variant uses: 3 Nobody"
+    ]
+    assert result["error_count"] == 4
+    assert format_validation_errors(result["errors"], limit=2).endswith("... and 2 more")
+
+    mismatch = validate_listing({"S1": _item("1 Player Gold")}, _group(["1 Player"], ["S1"]))
+    assert mismatch["errors"]["S1"] == ["aspect 'PICK YOUR CARD' value '1 Player Gold' is not in variesBy"]
+
+
+def test_validation_is_fast():
+    items = {f"S{n}": _item(f"{n} Player") for n in range(1000)}
+    group = _group([f"{n} Player" for n in range(1000)], list(items))
+    offers = [_offer(sku) for sku in items]
+    start = time.perf_counter()
+    assert validate_listing(items, group, offers)["valid"]
+    assert time.perf_counter() - start < 0.1
+
+
+class RecordingClient:
+    """Fails the test on any eBay API call."""
+    rate_budget = None
+
+    def __getattr__(self, name):
+        raise AssertionError(f"eBay API called before validation: {name}")
+
+
+def test_invalid_listing_makes_no_api_calls(monkeypatch):
+    monkeypatch.setattr(ebay_listing.Config, "validate", lambda self, require_token=True: True)
+    monkeypatch.setattr(ebay_listing, "prepare_listing_images",
+                        lambda cards, extra_images=None: {"card_images": [None] * len(cards), "image_urls": []})
+    manager = eBayListingManager(api_client=RecordingClient(), policies={"fulfillment_policy_id": "F1"})
+    cards = [{"name": "Cooper Flagg", "number": "1"}, {"name": "Cooper Flagg", "number": "1"},
+             {"name": "Dylan Harper", "number": "2", "quantity": -2}]
+
+    result = manager.create_variation_listing(cards, "2025-26 Topps Chrome Basketball", DESCRIPTION, "261328", 0.99)
+
+    assert result["success"] is False
+    errors = result["validation_errors"]
+    assert any("25009" in message for message in errors[next(iter(errors))])
+    sku_2 = [sku for sku, messages in errors.items() if any("same variation" in m for m in messages)]
+    assert len(sku_2) == 1
+    assert any("quantity" in message for messages in errors.values() for message in messages)
+
+
+if __name__ == "__main__":
+    test_single_payload_rules()
+    test_listing_reports_errors_per_sku()
+    test_validation_is_fast()
+    print("Payload validator tests passed (run with pytest for the full suite)")
@@ -0,0 +1,110 @@
+"""
+Offline tests for publish-failure diagnostics (eBay API replaced by a fake client).
+"""
+import threading
+import time
+from publish_diagnostics import collect_snapshot, diagnose, format_report
+
+POLICY_OK = {
+    "fulfillmentPolicyId": "F1", "name": "Cards PWE",
+    "shippingOptions": [{"optionType": "DOMESTIC", "shippingServices": [
+        {"shippingServiceCode": "USPSFirstClass", "shippingCarrierCode": "USPS",
+         "shippingCost": {"value": "1.00"}, "buyerResponsibleForShipping": True}]}]
+}
+POLICY_SELLER_PAYS = {
+    "fulfillmentPolicyId": "F2", "name": "Free shipping",
+    "shippingOptions": [{"optionType": "DOMESTIC", "shippingServices": [
+        {"shippingServiceCode": "USPSGround", "shippingCarrierCode": "USPS", "buyerResponsibleForShipping": False}]}]
+}
+
+
+class FakeClient:
+    """Canned group/offers/policies; records calls and how many ran at once."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.offers = {
+            "S1": {"offerId": "O1", "listingPolicies": {"fulfillmentPolicyId": "F1", "returnPolicyId": "R1"}},
+            "S2": {"offerId": "O2", "listingPolicies": {"fulfillmentPolicyId": "F2"}},
+            "S3": None,
+        }
+
+    def _call(self, name, result):
+        with self.lock:
+            self.calls.append(name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return result
+
+    def get_inventory_item_group(self, group_key):
+        return self._call("group", {"success": True, "data": {
+            "title": "2025 Topps Chrome", "description": "Too short", "imageUrls": [], "variantSKUs": list(self.offers)
+        }})
+
+    def get_offer_by_sku(self, sku):
+        offer = self.offers[sku]
+        return self._call("offer", {"success": bool(offer), "offer": offer})
+
+    def get_fulfillment_policies(self):
+        return self._call("fulfillment", {"policies": [POLICY_OK, POLICY_SELLER_PAYS], "error": None})
+
+    def get_return_policies(self):
+        return self._call("return", {"policies": [{"returnPolicyId": "R1", "name": "30 days"}], "error": None})
+
+
+def test_snapshot_is_fetched_concurrently_once():
+    client = FakeClient()
+    started = time.monotonic()
+    snapshot = collect_snapshot(client, "GROUP1")
+    elapsed = time.monotonic() - started
+
+    assert sorted(client.calls) == ["fulfillment", "group", "offer", "offer", "offer", "return"]
+    assert snapshot["api_calls"] == 6
+    assert client.max_active >= 3
+    assert elapsed < 0.05 * 4  # two rounds, not six sequential calls
+
+
+def test_diagnose_combines_every_rule():
+    report = diagnose(collect_snapshot(FakeClient(delay=0), "GROUP1"), fulfillment_policy_id="F1", return_policy_id="R1")
+
+    assert report["group"]["description_length"] == 9
+    assert any("25016" in issue for issue in report["issues_found"])
+    assert any("no imageUrls" in issue for issue in report["issues_found"])
+    assert any("2 different fulfillment policies" in issue for issue in report["issues_found"])
+
+    offers = {offer["sku"]: offer for offer in report["offers_checked"]}
+    assert offers["S1"]["issues"] == [] and offers["S1"]["policy_valid"]
+    assert offers["S1"]["services"] == ["USPSFirstClass (USPS) - $1.00 - Buyer Pays: True"]
+    assert "No returnPolicyId in offer" in offers["S2"]["issues"]
+    assert any("buyerResponsibleForShipping=False" in issue for issue in offers["S2"]["issues"])
+    assert any("mismatch" in issue for issue in offers["S2"]["issues"])
+    assert offers["S3"]["issues"] == ["No offer found for this SKU"]
+
+    assert [p["policy_id"] for p in report["policies_checked"]] == ["F1", "F2"]
+    assert report["policies_checked"][1]["buyer_responsible_issues"] == ["USPSGround has buyerResponsibleForShipping=False"]
+    assert report["return_policies_checked"] == [
+        {"policy_id": "R1", "source": "config", "in_offers": True, "found": True, "policy_name": "30 days"}
+    ]
+    assert "S3: No offer found for this SKU" in format_report(report)
+
+
+def test_unlisted_policies_are_not_reported_missing():
+    client = FakeClient(delay=0)
+    client.get_return_policies = lambda: {"policies": [], "error": "HTTP 500: down"}
+    report = diagnose(collect_snapshot(client, "GROUP1"), return_policy_id="R9")
+    assert "Could not list return policies: HTTP 500: down" in report["issues_found"]
+    assert not any("Return policy R9 not found" in issue for issue in report["issues_found"])
+
+
+if __name__ == "__main__":
+    test_snapshot_is_fetched_concurrently_once()
+    test_diagnose_combines_every_rule()
+    test_unlisted_policies_are_not_reported_missing()
+    print("Publish diagnostics tests passed")
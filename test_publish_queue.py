@@ -0,0 +1,107 @@
+"""
+Offline tests for the publish queue (eBay publish calls replaced by a fake client).
+"""
+import json
+import threading
+import time
+from publish_queue import FAILED, PUBLISHED, PENDING, PublishQueue, error_id, is_transient
+
+
+class FakeClient:
+    """Publishes after a delay; per-group scripted failures before success."""
+
+    def __init__(self, failures=None, delay=0.05):
+        self.rate_budget = None
+        self.failures = {key: list(results) for key, results in (failures or {}).items()}
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def publish_offer_by_inventory_item_group(self, group_key, marketplace_id="EBAY_US"):
+        with self.lock:
+            self.calls.append(group_key)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            scripted = self.failures.get(group_key)
+            result = scripted.pop(0) if scripted else {"success": True, "listing_id": f"L-{group_key}"}
+        if self.rate_budget:
+            self.rate_budget.acquire()
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return result
+
+    def publish_offer(self, offer_id):
+        return {"success": True, "data": {"listingId": f"L-{offer_id}"}}
+
+
+DESCRIPTION_ERROR = {"success": False, "status_code": 400,
+                     "error": "A description is required. (Error ID: 25016)"}
+POLICY_ERROR = {"success": False, "status_code": 400,
+                "error": "Invalid return policy (Error ID: 25009)"}
+
+
+def test_error_classification():
+    assert error_id(DESCRIPTION_ERROR) == 25016 and is_transient(DESCRIPTION_ERROR)
+    assert is_transient({"success": False, "status_code": 503, "error": "Service Unavailable"})
+    assert error_id(POLICY_ERROR) == 25009 and not is_transient(POLICY_ERROR)
+
+
+def test_groups_publish_concurrently_by_priority():
+    client = FakeClient()
+    queue = PublishQueue(client, concurrency=2, rate_limit=0, max_attempts=3, retry_base=0.01)
+    for n in range(6):
+        queue.add(f"G{n}", priority=n)
+    queue.add("123", kind='offer')
+    started = time.monotonic()
+    report = queue.run()
+
+    assert report["published"] == 7 and report["failed"] == 0
+    assert client.max_active == 2
+    assert client.calls[:2] == ["G5", "G4"]
+    assert time.monotonic() - started < 0.05 * 6
+    assert {job["listing_id"] for job in report["jobs"]} >= {"L-G0", "L-123"}
+    assert client.rate_budget is None  # the run's budget is removed afterwards
+
+
+def test_transient_errors_back_off_without_blocking_others():
+    client = FakeClient(failures={"SLOW": [DESCRIPTION_ERROR, DESCRIPTION_ERROR], "BAD": [POLICY_ERROR]}, delay=0.01)
+    queue = PublishQueue(client, concurrency=1, rate_limit=0, max_attempts=5, retry_base=0.1)
+    for key in ("SLOW", "A", "B", "BAD"):
+        queue.add(key, priority=1 if key == "SLOW" else 0)
+    report = queue.run()
+
+    jobs = {job["key"]: job for job in report["jobs"]}
+    assert jobs["SLOW"]["status"] == PUBLISHED and jobs["SLOW"]["attempts"] == 3
+    assert jobs["BAD"]["status"] == FAILED and jobs["BAD"]["attempts"] == 1 and jobs["BAD"]["error_id"] == 25009
+    # Other groups published while SLOW waited out its backoff
+    assert client.calls.index("A") < client.calls.index("SLOW", 1)
+    assert report["attempts"] == 6
+
+
+def test_queue_state_persists_and_resumes(tmp_path):
+    state_file = str(tmp_path / "queue.json")
+    client = FakeClient(failures={"G1": [DESCRIPTION_ERROR]}, delay=0)
+    queue = PublishQueue(client, state_file=state_file, rate_limit=0, max_attempts=1)
+    queue.add("G1")
+    queue.add("G2")
+    assert queue.run()["failed"] == 1
+
+    saved = {job["key"]: job for job in json.load(open(state_file))["jobs"]}
+    assert saved["G1"]["status"] == FAILED and saved["G2"]["status"] == PUBLISHED
+
+    # Simulate an interrupted run: a pending job left in the file is picked up again
+    saved["G3"] = dict(saved["G2"], key="G3", status=PENDING, listing_id=None, attempts=0)
+    json.dump({"jobs": list(saved.values())}, open(state_file, "w"))
+    resumed = PublishQueue(FakeClient(delay=0), state_file=state_file, rate_limit=0)
+    report = resumed.run()
+    assert report["total"] == 1 and report["jobs"][0]["key"] == "G3" and report["published"] == 1
+
+
+if __name__ == "__main__":
+    test_error_classification()
+    test_groups_publish_concurrently_by_priority()
+    test_transient_errors_back_off_without_blocking_others()
+    print("Publish queue tests passed (run with pytest for the full suite)")
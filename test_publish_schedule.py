@@ -0,0 +1,97 @@
+"""
+Offline tests for the scheduled release planner (eBay API replaced by a fake client).
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from publish_schedule import (
+    FAILED, RELEASED, STAGED, PublishScheduler, parse_start_date, parse_windows, plan_start_times
+)
+
+UTC = timezone.utc
+
+
+def test_start_times_spread_across_windows():
+    windows = parse_windows("18:00-20:00, 09:00-10:00")
+    assert windows == [(540, 600), (1080, 1200)]
+    earliest = datetime(2026, 10, 20, 9, 30, tzinfo=UTC)
+    plan = plan_start_times([f"G{n}" for n in range(7)], windows, earliest, per_window=3, min_gap_minutes=5)
+
+    times = [plan[f"G{n}"] for n in range(7)]
+    assert times[:3] == [datetime(2026, 10, 20, 9, 30, tzinfo=UTC) + timedelta(minutes=10 * i) for i in range(3)]
+    assert times[3:6] == [datetime(2026, 10, 20, 18, 0, tzinfo=UTC) + timedelta(minutes=40 * i) for i in range(3)]
+    assert times[6] == datetime(2026, 10, 21, 9, 0, tzinfo=UTC)
+    # The gap caps a window too: 60 minutes / 25 = 2 slots
+    tight = plan_start_times(["A", "B", "C"], [(540, 600)], datetime(2026, 10, 20, 8, 0, tzinfo=UTC),
+                             per_window=0, min_gap_minutes=25)
+    assert tight["C"].day == 21
+    assert parse_windows("22:00-01:00") == [(1320, 1500)]
+
+
+class FakeClient:
+    def __init__(self):
+        self.rate_budget = None
+        self.lock = threading.Lock()
+        self.updates = {}
+        self.published = []
+        self.groups = {"G1": ["S1", "S2"], "G2": ["S3"], "LIVE": ["S4"]}
+
+    def get_inventory_item_group(self, group_key):
+        if group_key not in self.groups:
+            return {"success": False, "error": "not found"}
+        return {"success": True, "data": {"variantSKUs": self.groups[group_key]}}
+
+    def get_offer_by_sku(self, sku):
+        offer = {"offerId": f"O-{sku}", "sku": sku, "marketplaceId": "EBAY_US", "format": "FIXED_PRICE",
+                 "pricingSummary": {"price": {"value": "1.99", "currency": "USD"}}, "status": "UNPUBLISHED",
+                 "listingPolicies": {"fulfillmentPolicyId": "F1"}, "categoryId": "261328"}
+        if sku == "S4":
+            offer["listingId"] = "111"
+        return {"success": True, "offer": offer}
+
+    def update_offer(self, offer_id, payload):
+        with self.lock:
+            self.updates[offer_id] = payload
+        return {"success": True}
+
+    def publish_offer_by_inventory_item_group(self, group_key, marketplace_id="EBAY_US"):
+        with self.lock:
+            self.published.append(group_key)
+        return {"success": True, "listing_id": f"L-{group_key}"}
+
+
+def test_plan_stage_and_release_on_a_timer(tmp_path):
+    client = FakeClient()
+    state_file = str(tmp_path / "schedule.json")
+    scheduler = PublishScheduler(client, state_file=state_file, rate_limit=0, lead_minutes=30)
+    now = datetime(2026, 10, 20, 8, 0, tzinfo=UTC)
+    plan = scheduler.plan(["G1", "G2", "LIVE", "MISSING"], windows="09:00-10:00", now=now,
+                          per_window=2, min_gap_minutes=1)
+    assert plan["G1"] == "2026-10-20T09:00:00.000Z" and plan["G2"] == "2026-10-20T09:30:00.000Z"
+    assert plan["LIVE"].startswith("2026-10-21T09:00")
+
+    scheduler.stage()
+    assert client.updates["O-S1"]["listingStartDate"] == plan["G1"]
+    assert "status" not in client.updates["O-S1"] and client.updates["O-S1"]["categoryId"] == "261328"
+    assert scheduler.entries["G1"]["status"] == STAGED and scheduler.entries["G1"]["offers_staged"] == 2
+    assert scheduler.entries["LIVE"]["status"] == RELEASED and scheduler.entries["LIVE"]["listing_id"] == "111"
+    assert scheduler.entries["MISSING"]["status"] == FAILED
+
+    # Reloaded from disk, then run with a fake clock: each group is published 30 minutes early
+    resumed = PublishScheduler(client, state_file=state_file, rate_limit=0, lead_minutes=30)
+    clock = {"now": now}
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += timedelta(seconds=seconds)
+
+    summary = resumed.run(poll_seconds=3600, clock=lambda: clock["now"], sleep=fake_sleep)
+    assert client.published == ["G1", "G2"]
+    assert sleeps == [1800, 1800]
+    assert summary == {"planned": 0, "staged": 0, "released": 3, "failed": 1}
+    assert parse_start_date(resumed.entries["G2"]["start_at"]) - clock["now"] == timedelta(minutes=30)
+
+
+if __name__ == "__main__":
+    test_start_times_spread_across_windows()
+    print("Publish schedule tests passed (run with pytest for the full suite)")
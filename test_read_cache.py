@@ -0,0 +1,134 @@
+"""
+Offline tests for the GET read-through cache with in-flight coalescing.
+"""
+import threading
+import time
+import ebay_api_client
+from ebay_api_client import eBayAPIClient
+from http_session import ReadCache
+
+
+def test_concurrent_reads_are_coalesced():
+    cache = ReadCache(ttl=30)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"status": 200}
+
+    key = ReadCache.key("/sell/inventory/v1/inventory_item_group/G1")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch(key, load))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and len(results) == 8
+    assert cache.fetch(key, load) is results[0]
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 7, 1)
+
+
+def test_writes_invalidate_resource_subtree_and_parent_collections():
+    cache = ReadCache(ttl=30)
+    keys = {
+        "group": ReadCache.key("/sell/inventory/v1/inventory_item_group/G1"),
+        "other_group": ReadCache.key("/sell/inventory/v1/inventory_item_group/G2"),
+        "offer_by_sku": ReadCache.key("/sell/inventory/v1/offer", {"sku": "S1", "marketplaceId": "EBAY_US"}),
+        "policy": ReadCache.key("/sell/account/v1/fulfillment_policy", {"marketplace_id": "EBAY_US"}),
+    }
+    for name, key in keys.items():
+        cache.fetch(key, lambda: name)
+
+    cache.invalidate("/sell/inventory/v1/inventory_item_group/G1")
+    cache.invalidate("/sell/inventory/v1/offer/12345")
+    remaining = set(cache._entries)
+    assert remaining == {keys["other_group"], keys["policy"]}
+
+    cache.invalidate("/sell/inventory/v1/bulk_update_price_quantity")
+    assert set(cache._entries) == {keys["policy"]}
+    # Param order does not matter
+    assert ReadCache.key("/x", {"a": 1, "b": 2}) == ReadCache.key("/x/", {"b": "2", "a": "1"})
+
+
+def test_read_in_flight_during_write_is_not_kept():
+    cache = ReadCache(ttl=30)
+    key = ReadCache.key("/sell/inventory/v1/inventory_item_group/G1")
+
+    def slow_load():
+        time.sleep(0.05)
+        return "before write"
+
+    reader = threading.Thread(target=lambda: cache.fetch(key, slow_load))
+    reader.start()
+    time.sleep(0.01)
+    cache.invalidate("/sell/inventory/v1/inventory_item_group/G1")
+    reader.join()
+    assert cache.fetch(key, lambda: "after write") == "after write"
+
+
+def test_uncacheable_and_expired_results_are_refetched():
+    cache = ReadCache(ttl=0.05)
+    key = ReadCache.key("/sell/inventory/v1/offer", {"sku": "S1"})
+    assert cache.fetch(key, lambda: 404, cacheable=lambda v: v == 200) == 404
+    assert cache.fetch(key, lambda: 200, cacheable=lambda v: v == 200) == 200
+    assert cache.fetch(key, lambda: 500) == 200
+    time.sleep(0.06)
+    assert cache.fetch(key, lambda: 201) == 201
+
+
+def test_expired_entries_are_dropped_and_entries_capped():
+    cache = ReadCache(ttl=0.05, max_entries=3)
+    for n in range(5):
+        cache.fetch(ReadCache.key(f"/offer/{n}"), lambda: n)
+    assert cache.stats()["entries"] == 3 and cache.fetch(ReadCache.key("/offer/0"), lambda: "reloaded") == "reloaded"
+
+    time.sleep(0.06)
+    cache.fetch(ReadCache.key("/offer/9"), lambda: 9)  # storing sweeps every expired entry
+    assert cache.stats()["entries"] == 1
+    time.sleep(0.06)
+    assert cache.fetch(ReadCache.key("/offer/9"), lambda: None, cacheable=lambda v: False) is None
+    assert cache.stats()["entries"] == 0  # an expired entry is dropped when looked up
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = body
+        self.headers = {}
+
+
+def test_client_serves_repeat_gets_from_cache(monkeypatch):
+    monkeypatch.setattr(ebay_api_client.Config, "validate", lambda self, require_token=True: True)
+    monkeypatch.setenv("EBAY_SANDBOX_TOKEN", "token")
+    monkeypatch.setenv("EBAY_PRODUCTION_TOKEN", "token")
+    monkeypatch.setenv("EBAY_READ_CACHE_TTL", "30")
+    client = eBayAPIClient(token_override="token")
+    sent = []
+
+    def fake_send(method, endpoint, data=None, params=None, retries=None):
+        sent.append((method, endpoint))
+        return FakeResponse(200 if method == 'GET' else 204, b"{}")
+
+    monkeypatch.setattr(client, "_send_request", fake_send)
+    for _ in range(3):
+        client._make_request('GET', '/sell/inventory/v1/inventory_item_group/G1')
+    client._make_request('PUT', '/sell/inventory/v1/inventory_item_group/G1', data={})
+    client._make_request('GET', '/sell/inventory/v1/inventory_item_group/G1')
+
+    assert [m for m, _ in sent] == ['GET', 'PUT', 'GET']
+    stats = client.read_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+    monkeypatch.setenv("EBAY_READ_CACHE_TTL", "0")
+    assert eBayAPIClient(token_override="token").read_cache_stats() == {}
+
+
+if __name__ == "__main__":
+    test_concurrent_reads_are_coalesced()
+    test_writes_invalidate_resource_subtree_and_parent_collections()
+    test_read_in_flight_during_write_is_not_kept()
+    test_uncacheable_and_expired_results_are_refetched()
+    print("Read cache tests passed (run with pytest for the full suite)")
@@ -0,0 +1,124 @@
+"""
+Offline test for the bulk repricing engine (fake API client, no network calls).
+"""
+import os
+import tempfile
+import threading
+from repricing import RepricingEngine, load_price_table
+
+
+class FakeClient:
+    """Minimal stand-in for eBayAPIClient with 60 offers in one group."""
+
+    def __init__(self):
+        self.offers = {
+            f"CARD_SET_PLAYER_{i}": {"offerId": str(1000 + i), "price": "1.00", "quantity": 1}
+            for i in range(60)
+        }
+        self.bulk_calls = []
+        self.lock = threading.Lock()
+
+    def get_inventory_item_group(self, group_key):
+        return {"success": True, "data": {"variantSKUs": list(self.offers)}}
+
+    def get_offer_by_sku(self, sku, marketplace_id="EBAY_US"):
+        if sku not in self.offers:
+            return {"success": False, "error": "No offer found"}
+        offer = self.offers[sku]
+        return {"success": True, "offerId": offer["offerId"], "offer": {
+            "offerId": offer["offerId"], "availableQuantity": offer["quantity"],
+            "pricingSummary": {"price": {"value": offer["price"], "currency": "USD"}}
+        }}
+
+    def iter_collection(self, endpoint, records_key, params=None, page_size=200):
+        for sku in self.offers:
+            yield {"sku": sku, **FakeClient.get_offer_by_sku(self, sku)["offer"]}
+
+    def bulk_get_inventory_item(self, skus):
+        assert len(skus) <= 25
+        return {"success": True, "items": {
+            sku: {"product": {"aspects": {"Card Name": [f"Player {sku.rsplit('_', 1)[1]}"],
+                                          "Card Number": [sku.rsplit('_', 1)[1]]}}}
+            for sku in skus
+        }}
+
+    def bulk_update_price_quantity(self, requests_list):
+        assert len(requests_list) <= 25
+        with self.lock:
+            self.bulk_calls.append([r["sku"] for r in requests_list])
+        responses = []
+        for r in requests_list:
+            if r["sku"] == "CARD_SET_PLAYER_7":
+                responses.append({"sku": r["sku"], "statusCode": 400, "errors": [{"errorId": 25001, "message": "Bad price"}]})
+            else:
+                responses.append({"sku": r["sku"], "offerId": r["offers"][0]["offerId"], "statusCode": 200})
+        return {"success": True, "responses": responses, "status_code": 207}
+
+
+def test_reprice_only_sends_changed_rows_in_batches():
+    client = FakeClient()
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "state.json")
+        engine = RepricingEngine(client=client, state_file=state_file, max_workers=3)
+
+        table = {f"CARD_SET_PLAYER_{i}": 2.5 for i in range(40)}  # by SKU
+        table["CARD_SET_PLAYER_40"] = 1.00                           # unchanged
+        table["45"] = {"quantity": 3}                                # by card number
+        table["Player 50"] = {"price": "3.25", "quantity": 2}        # by card name
+        table["No such card"] = 9.99
+
+        outcome = engine.reprice(table, group_keys=["GROUP1"])
+
+        sent = [sku for call in client.bulk_calls for sku in call]
+        assert sorted(sent) == sorted([f"CARD_SET_PLAYER_{i}" for i in range(40)] + ["CARD_SET_PLAYER_45", "CARD_SET_PLAYER_50"])
+        assert len(client.bulk_calls) == 2
+        assert outcome["results"]["CARD_SET_PLAYER_7"]["success"] is False
+        assert "25001" in outcome["results"]["CARD_SET_PLAYER_7"]["error"]
+        assert outcome["results"]["CARD_SET_PLAYER_45"]["quantity"] == 3
+        assert outcome["results"]["CARD_SET_PLAYER_45"]["price"] is None
+        assert "CARD_SET_PLAYER_40" in outcome["unchanged"]
+        assert outcome["unmatched"] == ["No such card"]
+
+        # Second run from the persisted local state: only the failed SKU is retried
+        client.bulk_calls.clear()
+        again = RepricingEngine(client=client, state_file=state_file)
+        second = again.reprice(table)
+        assert client.bulk_calls == [["CARD_SET_PLAYER_7"]]
+        assert list(second["results"]) == ["CARD_SET_PLAYER_7"]
+
+
+def test_load_price_table_csv():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prices.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Card Number,Price,Qty\n1,$2.50,\n2,,4\n3,abc,1\n,1.00,1\n")
+        rows = load_price_table(path)
+    assert rows == [
+        {"key": "1", "price": 2.5, "quantity": None},
+        {"key": "2", "price": None, "quantity": 4},
+    ]
+
+
+def test_reprice_fails_for_a_sku_without_an_offer():
+    client = FakeClient()
+    engine = RepricingEngine(client=client, state_file=None)
+    outcome = engine.reprice({"CARD_SET_MISSING_1": 2.0}, skus=["CARD_SET_MISSING_1"], refresh=True)
+    assert outcome["success"] is False and outcome["results"] == {}
+    assert outcome["unmatched"] == ["CARD_SET_MISSING_1"]
+    assert engine.reprice({"CARD_SET_PLAYER_3": 1.00}, skus=["CARD_SET_PLAYER_3"], refresh=True)["success"] is True
+
+
+def test_refresh_without_skus_reprices_the_whole_inventory():
+    client = FakeClient()
+    client.get_offer_by_sku = None  # the whole-inventory refresh must not look offers up one SKU at a time
+    engine = RepricingEngine(client=client, state_file=None)
+    outcome = engine.reprice({"59": 4.0}, refresh=True)
+    assert outcome["success"] is True
+    assert client.bulk_calls == [["CARD_SET_PLAYER_59"]]
+    assert len(engine.state) == 60
+
+
+if __name__ == "__main__":
+    test_reprice_only_sends_changed_rows_in_batches()
+    test_load_price_table_csv()
+    print("All repricing tests passed")
@@ -0,0 +1,98 @@
+"""
+Offline tests for response compression, fingerprinted static assets and cached renders.
+"""
+import gzip
+import json
+import re
+import zlib
+import app as app_module
+import card_checklist
+import web_assets
+from test_parallel_variations import FakeFetcher
+
+
+def _client():
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_email"] = app_module.OWNER_EMAIL
+    return client
+
+
+def test_choose_encoding():
+    assert web_assets.choose_encoding("gzip, deflate") == "gzip"
+    assert web_assets.choose_encoding("gzip;q=0, identity") is None
+    assert web_assets.choose_encoding("") is None
+    assert web_assets.choose_encoding("*") == "gzip"
+    if web_assets.brotli is None:
+        assert web_assets.choose_encoding("br, gzip") == "gzip"
+
+
+def test_app_page_uses_fingerprinted_assets():
+    client = _client()
+    page = client.get("/app", headers={"Accept-Encoding": "gzip"})
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in page.headers["Vary"]
+    html = gzip.decompress(page.data).decode("utf-8")
+    assert "<script>" not in html and "<style>" not in html
+    js_url = re.search(r'src="(/static/js/app\.js\?v=\w{12})"', html).group(1)
+    assert re.search(r'href="/static/css/app\.css\?v=\w{12}"', html)
+    # Cached render returns the same page
+    assert gzip.decompress(client.get("/app", headers={"Accept-Encoding": "gzip"}).data).decode("utf-8") == html
+
+    asset = client.get(js_url, headers={"Accept-Encoding": "gzip"})
+    assert asset.headers["Cache-Control"] == web_assets.ASSET_CACHE_CONTROL
+    assert b"function" in gzip.decompress(asset.data)
+    stale = client.get("/static/js/app.js?v=000000000000")
+    assert stale.headers["Cache-Control"] == web_assets.STATIC_CACHE_CONTROL
+    assert "Content-Encoding" not in stale.headers
+
+
+def test_json_and_streamed_json_are_compressed(monkeypatch):
+    monkeypatch.setattr(card_checklist, "CardChecklistFetcher", FakeFetcher)
+    client = _client()
+    body = {"url": "https://www.beckett.com/news/2025-topps-chrome-cards/", "type": "parallels"}
+
+    plain = client.post("/api/fetch-checklist", json=body, headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(plain.data))["count"] == 5
+
+    streamed = client.post("/api/fetch-checklist", json=dict(body, expandParallels=True),
+                           headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["Content-Encoding"] == "gzip" and "Content-Length" not in streamed.headers
+    assert json.loads(gzip.decompress(streamed.get_data()))["count"] == 15
+
+    uncompressed = client.post("/api/fetch-checklist", json=body)
+    assert "Content-Encoding" not in uncompressed.headers and uncompressed.get_json()["count"] == 5
+
+
+class FakeBrotli:
+    """Stands in for the optional brotli package (zlib inside, 'br' on the wire)."""
+
+    class Compressor:
+        def __init__(self, quality=11):
+            self.zlib = zlib.compressobj()
+
+        def process(self, data):
+            return self.zlib.compress(data)
+
+        def flush(self):
+            return self.zlib.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish(self):
+            return self.zlib.flush()
+
+
+def test_streamed_json_uses_the_negotiated_encoding(monkeypatch):
+    monkeypatch.setattr(card_checklist, "CardChecklistFetcher", FakeFetcher)
+    monkeypatch.setattr(web_assets, "brotli", FakeBrotli)
+    body = {"url": "https://www.beckett.com/news/2025-topps-chrome-cards/", "type": "parallels",
+            "expandParallels": True}
+
+    streamed = _client().post("/api/fetch-checklist", json=body, headers={"Accept-Encoding": "br, gzip"})
+    assert streamed.headers["Content-Encoding"] == "br"
+    assert json.loads(zlib.decompress(streamed.get_data()))["count"] == 15
+
+
+if __name__ == "__main__":
+    test_choose_encoding()
+    print("Encoding negotiation test passed (run with pytest for the full suite)")
@@ -0,0 +1,225 @@
+"""Response compression, fingerprinted static assets and cached page renders for app.py.
+
+- compress_response(): gzip (or Brotli, when the optional `brotli` package is
+  installed) for JSON/HTML/CSS/JS responses the client accepts, including
+  streamed responses such as /api/fetch-checklist.
+- asset_url(): /static/... URL carrying a content hash (?v=...), so the file
+  can be cached for a year and a deploy that changes it busts the cache.
+- render_cached(): rendered template output cached per context; a template
+  edit (mtime change) invalidates it.
+"""
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import brotli  # optional - gzip is used when it is not installed
+except ImportError:
+    brotli = None
+
+# Only compress bodies at least this large (smaller ones grow or gain nothing)
+MIN_COMPRESS_SIZE = 500
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript', 'image/svg+xml'
+)
+
+# Fingerprinted static files: cache for a year, never revalidate
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Unversioned static files: always revalidate (ETag/Last-Modified still apply)
+STATIC_CACHE_CONTROL = 'no-cache'
+
+_COMPRESSED_CACHE_SIZE = 64
+_RENDER_CACHE_SIZE = 128
+
+_lock = threading.Lock()
+_asset_hashes: Dict[str, tuple] = {}
+_compressed_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_render_cache: 'OrderedDict[tuple, str]' = OrderedDict()
+
+
+# --- compression -------------------------------------------------------------
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts: 'br' (if available), 'gzip' or None."""
+    accepted = {}
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0 or ('gzip' not in accepted and accepted.get('*', 0) > 0):
+        return 'gzip'
+    return None
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks: Iterable, encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk (each chunk is flushed to the client)."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress, finish = compressor.compress, compressor.flush
+        flush = partial(compressor.flush, zlib.Z_SYNC_FLUSH)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compress(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+def _is_compressible(response) -> bool:
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code == 204:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    return (response.mimetype or '') in COMPRESSIBLE_TYPES
+
+
+def compress_response(response, accept_encoding: str, cache_key: Optional[str] = None):
+    """
+    Compress a Flask response in place when the client accepts it.
+
+    Args:
+        response: Flask/Werkzeug response
+        accept_encoding: The request's Accept-Encoding header
+        cache_key: Stable key for bodies that never change (fingerprinted
+                   static files) - their compressed bytes are reused
+    """
+    if not _is_compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encoding)
+    if not encoding:
+        return response
+
+    if response.is_streamed and not response.direct_passthrough:
+        # Generators (streamed JSON): compress on the fly, length unknown
+        response.response = _compress_stream(response.response, encoding)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    # send_file() responses are passthrough file wrappers; static files are small
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    key = (cache_key, encoding) if cache_key else None
+    compressed = None
+    if key:
+        with _lock:
+            compressed = _compressed_cache.get(key)
+    if compressed is None:
+        compressed = compress_bytes(data, encoding)
+        if key:
+            with _lock:
+                _compressed_cache[key] = compressed
+                while len(_compressed_cache) > _COMPRESSED_CACHE_SIZE:
+                    _compressed_cache.popitem(last=False)
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    if response.headers.get('ETag'):
+        # Same entity, different bytes: only a weak validator still holds
+        etag, _ = response.get_etag()
+        response.set_etag(etag, weak=True)
+    return response
+
+
+# --- fingerprinted static assets --------------------------------------------
+
+def asset_hash(static_folder: str, filename: str) -> str:
+    """Content hash of a static file (recomputed only when its mtime changes)."""
+    path = os.path.join(static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return ''
+    with _lock:
+        cached = _asset_hashes.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    with _lock:
+        _asset_hashes[path] = (mtime, digest)
+    return digest
+
+
+def asset_url(static_url_path: str, static_folder: str, filename: str) -> str:
+    """/static/<filename>?v=<content hash> - safe to cache forever."""
+    digest = asset_hash(static_folder, filename)
+    url = f"{static_url_path.rstrip('/')}/{filename}"
+    return f"{url}?v={digest}" if digest else url
+
+
+def static_cache_headers(response, static_folder: str, filename: str, version: Optional[str]) -> Optional[str]:
+    """
+    Set Cache-Control on a static file response.
+
+    Returns the compression cache key when the request was for the current
+    fingerprint (immutable body), else None.
+    """
+    if version and version == asset_hash(static_folder, filename):
+        response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+        return f"{filename}@{version}"
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return None
+
+
+# --- cached page renders -----------------------------------------------------
+
+def render_cached(flask_app, template_name: str, **context) -> str:
+    """
+    render_template() with the output cached per (template, context).
+
+    Context values must be hashable (strings/numbers). The template's mtime is
+    part of the key, so edits show up without a restart.
+    """
+    from flask import render_template
+
+    try:
+        mtime = os.path.getmtime(os.path.join(flask_app.root_path, flask_app.template_folder, template_name))
+    except OSError:
+        mtime = None
+    key = (template_name, mtime, tuple(sorted(context.items())))
+    with _lock:
+        html = _render_cache.get(key)
+        if html is not None:
+            _render_cache.move_to_end(key)
+            return html
+    html = render_template(template_name, **context)
+    with _lock:
+        _render_cache[key] = html
+        while len(_render_cache) > _RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+    return html